@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+benchmark_endpoints command
+
+Seeds a form with synthetic submissions and records the latency percentiles,
+query counts and peak memory of the data, forms, OpenRosa and export endpoints,
+and of the platform statistics report.
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.translation import gettext as _
+
+from onadata.libs.profiling.benchmark import (
+    CASES,
+    DEFAULT_TOLERANCE,
+    EndpointBenchmark,
+    get_regressions,
+    load_baseline,
+    save_baseline,
+    seed,
+)
+
+
+class Command(BaseCommand):
+    """Benchmark the API endpoints against a seeded form
+
+    Usage:
+    python manage.py benchmark_endpoints --rows 100000 --save-baseline b.json
+    python manage.py benchmark_endpoints --rows 100000 --baseline b.json
+    python manage.py benchmark_endpoints --rows 1000000 --endpoints data forms
+
+    The command seeds the database it runs against, so it only runs with DEBUG
+    on unless --confirm is passed.
+    """
+
+    help = _("Benchmark the latency, queries and memory of the API endpoints")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=10000,
+            help=_("Number of submissions the form is seeded with"),
+        )
+        parser.add_argument(
+            "--forms", type=int, default=10, help=_("Number of forms to publish")
+        )
+        parser.add_argument(
+            "--reseed",
+            action="store_true",
+            help=_("Delete and seed the forms of an earlier run again"),
+        )
+        parser.add_argument(
+            "--endpoints", nargs="+", help=_("Endpoints to benchmark, all by default")
+        )
+        parser.add_argument(
+            "--iterations", type=int, default=20, help=_("Requests per endpoint")
+        )
+        parser.add_argument(
+            "--warmup",
+            type=int,
+            default=2,
+            help=_("Requests per endpoint that are not measured"),
+        )
+        parser.add_argument(
+            "--baseline", help=_("Baseline file to compare the results to")
+        )
+        parser.add_argument(
+            "--save-baseline", help=_("File to save the results to as the baseline")
+        )
+        parser.add_argument(
+            "--confirm",
+            action="store_true",
+            help=_("Seed the database even though DEBUG is off"),
+        )
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=DEFAULT_TOLERANCE,
+            help=_("Allowed latency and memory increase over the baseline"),
+        )
+
+    def _report(self, name, result):
+        self.stdout.write(
+            f"{name}: p50 {result['p50'] * 1000:.1f}ms "
+            f"p95 {result['p95'] * 1000:.1f}ms p99 {result['p99'] * 1000:.1f}ms "
+            f"{result['queries']} queries "
+            f"{result['peak_memory'] / 1024 / 1024:.1f}MB peak memory"
+        )
+
+    def handle(self, *args, **options):
+        if options["iterations"] < 1:
+            raise CommandError("--iterations must be at least 1")
+        endpoints = options["endpoints"]
+        unknown = set(endpoints or []) - set(CASES)
+        if unknown:
+            raise CommandError(f"Unknown endpoints: {', '.join(sorted(unknown))}")
+        if not settings.DEBUG and not options["confirm"]:
+            raise CommandError(
+                "DEBUG is off, pass --confirm to seed the benchmark forms in "
+                f"the {settings.DATABASES['default']['NAME']} database"
+            )
+
+        rows = options["rows"]
+        xform = seed(rows, num_of_forms=options["forms"], reseed=options["reseed"])
+        benchmark = EndpointBenchmark(
+            xform, iterations=options["iterations"], warmup=options["warmup"]
+        )
+
+        self.stdout.write(f"Benchmarking form {xform.pk} with {rows} submissions")
+        results = benchmark.run(endpoints)
+        for name, result in results.items():
+            self._report(name, result)
+
+        if options["save_baseline"]:
+            save_baseline(options["save_baseline"], rows, results)
+            self.stdout.write(f"Baseline saved to {options['save_baseline']}")
+
+        if options["baseline"]:
+            baseline = load_baseline(options["baseline"], rows)
+            if not baseline:
+                raise CommandError(f"No baseline for {rows} submissions")
+            regressions = get_regressions(results, baseline, options["tolerance"])
+            if regressions:
+                raise CommandError("\n".join(["Regressions:", *regressions]))
+            self.stdout.write(self.style.SUCCESS("No regressions"))
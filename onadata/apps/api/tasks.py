@@ -6,6 +6,7 @@ Celery api.tasks module.
 import logging
 import os
 import sys
+import time
 from datetime import timedelta
 
 from django.conf import settings
@@ -13,6 +14,7 @@ from django.contrib.auth import get_user_model
 from django.core.files.storage import default_storage
 from django.core.files.uploadedfile import TemporaryUploadedFile
 from django.db import DatabaseError, OperationalError
+from django.db.models import Max, Min
 from django.utils import timezone
 from django.utils.datastructures import MultiValueDict
 
@@ -23,11 +25,18 @@ from onadata.apps.logger.models import Instance, Project, ProjectInvitation, XFo
 from onadata.celeryapp import app
 from onadata.libs.models.share_project import ShareProject
 from onadata.libs.utils.cache_tools import (
+    XFORM_REGENERATE_INSTANCE_JSON_PROGRESS,
     XFORM_REGENERATE_INSTANCE_JSON_TASK,
+    XFORM_REGENERATE_INSTANCE_JSON_TASK_TTL,
     safe_cache_delete,
+    safe_cache_get,
+    safe_cache_set,
 )
 from onadata.libs.utils.email import ProjectInvitationEmail, send_generic_email
-from onadata.libs.utils.logger_tools import delete_xform_submissions
+from onadata.libs.utils.logger_tools import (
+    delete_xform_submissions,
+    regenerate_instances_json,
+)
 from onadata.libs.utils.model_tools import queryset_iterator
 
 logger = logging.getLogger(__name__)
@@ -175,11 +184,87 @@ def send_project_invitation_email_async(invitation_id: str, url: str):
         email.send()
 
 
+def _instance_json_shard_key(xform_id: int, shard: int) -> str:
+    return f"{XFORM_REGENERATE_INSTANCE_JSON_PROGRESS}{xform_id}-{shard}"
+
+
+def _get_instance_json_shards(xform: XForm) -> list:
+    """Returns the submission id ranges regenerated by each shard task.
+
+    The ranges are cached so that a resumed regeneration splits the form the
+    same way as the run it resumes.
+    """
+    cache_key = f"{XFORM_REGENERATE_INSTANCE_JSON_PROGRESS}{xform.pk}"
+    shards = safe_cache_get(cache_key)
+
+    if shards is None:
+        id_range = xform.instances.filter(deleted_at__isnull=True).aggregate(
+            min_id=Min("pk"), max_id=Max("pk")
+        )
+        shards = []
+        if id_range["min_id"] is not None:
+            count = getattr(settings, "INSTANCE_JSON_SHARDS", 4)
+            size = -(-(id_range["max_id"] - id_range["min_id"] + 1) // count)
+            shards = [
+                (start, min(start + size - 1, id_range["max_id"]))
+                for start in range(id_range["min_id"], id_range["max_id"] + 1, size)
+            ]
+        safe_cache_set(cache_key, shards, XFORM_REGENERATE_INSTANCE_JSON_TASK_TTL)
+
+    return shards
+
+
+def get_instance_json_progress(xform_id: int) -> dict | None:
+    """Returns the progress of a form's instances json regeneration.
+
+    None is returned when no regeneration is in progress.
+    """
+    shards = safe_cache_get(f"{XFORM_REGENERATE_INSTANCE_JSON_PROGRESS}{xform_id}")
+    if shards is None:
+        return None
+
+    progress = [
+        safe_cache_get(_instance_json_shard_key(xform_id, shard)) or {}
+        for shard in range(len(shards))
+    ]
+    rows = sum(item.get("rows", 0) for item in progress)
+    # shards run in parallel, the slowest one is the elapsed time
+    duration = max((item.get("duration", 0) for item in progress), default=0)
+
+    return {
+        "shards": len(shards),
+        "done": sum(1 for item in progress if item.get("done")),
+        "failed": sum(1 for item in progress if item.get("failed")),
+        "rows": rows,
+        "duration": duration,
+        "per_second": rows / duration if duration else 0,
+    }
+
+
+def _finish_instance_json_regeneration(xform: XForm, shards: list):
+    """Mark the form as regenerated once every shard is done."""
+    for shard in range(len(shards)):
+        progress = safe_cache_get(_instance_json_shard_key(xform.pk, shard))
+        if not progress or not progress["done"]:
+            return
+
+    # Every shard task checks after finishing, so this may run more than once
+    xform.is_instance_json_regenerated = True
+    xform.save(update_fields=["is_instance_json_regenerated"])
+    # Clear cache used to store the task id from the AsyncResult
+    safe_cache_delete(f"{XFORM_REGENERATE_INSTANCE_JSON_TASK}{xform.pk}")
+    safe_cache_delete(f"{XFORM_REGENERATE_INSTANCE_JSON_PROGRESS}{xform.pk}")
+    for shard in range(len(shards)):
+        safe_cache_delete(_instance_json_shard_key(xform.pk, shard))
+
+
 @app.task(track_started=True, base=AutoRetryTask)
 def regenerate_form_instance_json(xform_id: int):
     """Regenerate a form's instances json
 
-    Json data recreated afresh and any existing json data is overriden
+    Json data recreated afresh and any existing json data is overriden.
+    The submissions are split by id into shards regenerated in parallel by
+    `regenerate_instance_json_shard` tasks, shards already done are skipped.
     """
     try:
         xform: XForm = XForm.objects.get(pk=xform_id)
@@ -188,23 +273,80 @@ def regenerate_form_instance_json(xform_id: int):
 
     else:
         if not xform.is_instance_json_regenerated:
-            instances = xform.instances.filter(deleted_at__isnull=True)
-
-            for instance in queryset_iterator(instances):
-                # We do not want to trigger Model.save or any signal
-                # Queryset.update is a workaround to achieve this.
-                # Instance.save and the post/pre signals may contain
-                # some side-effects which we are not interested in e.g
-                # updating date_modified which we do not want
-                Instance.objects.filter(pk=instance.pk).update(
-                    json=instance.get_full_dict()
-                )
+            shards = _get_instance_json_shards(xform)
+
+            if not shards:
+                _finish_instance_json_regeneration(xform, shards)
+                return
+
+            for shard in range(len(shards)):
+                progress = safe_cache_get(_instance_json_shard_key(xform_id, shard))
+                if not progress or not progress["done"]:
+                    regenerate_instance_json_shard.delay(xform_id, shard)
+
+
+@app.task(bind=True, base=AutoRetryTask)
+def regenerate_instance_json_shard(self, xform_id: int, shard: int):
+    """Regenerate the instances json of one shard of a form's submissions
+
+    Progress is saved after every chunk so a retried task resumes from the last
+    submission written.
+    """
+    try:
+        xform: XForm = XForm.objects.get(pk=xform_id)
+    except XForm.DoesNotExist as err:
+        logger.exception(err)
+        return
+
+    shards = safe_cache_get(f"{XFORM_REGENERATE_INSTANCE_JSON_PROGRESS}{xform_id}")
+    if not shards or shard >= len(shards):
+        # The regeneration finished or expired, it is restarted from the form
+        return
+
+    start_id, end_id = shards[shard]
+    progress_key = _instance_json_shard_key(xform_id, shard)
+    progress = safe_cache_get(progress_key) or {
+        "last_id": start_id - 1,
+        "rows": 0,
+        "duration": 0,
+        "done": False,
+    }
+    if progress["done"]:
+        return
+
+    progress["failed"] = False
+    elapsed = progress["duration"]
+    started = time.monotonic()
 
-            xform.is_instance_json_regenerated = True
-            xform.save()
-            # Clear cache used to store the task id from the AsyncResult
-            cache_key = f"{XFORM_REGENERATE_INSTANCE_JSON_TASK}{xform_id}"
-            safe_cache_delete(cache_key)
+    try:
+        for last_id, rows in regenerate_instances_json(
+            xform, progress["last_id"] + 1, end_id
+        ):
+            progress["last_id"] = last_id
+            progress["rows"] += rows
+            progress["duration"] = elapsed + time.monotonic() - started
+            safe_cache_set(
+                progress_key, progress, XFORM_REGENERATE_INSTANCE_JSON_TASK_TTL
+            )
+    except Exception:
+        if self.request.retries >= self.max_retries:
+            progress["failed"] = True
+            safe_cache_set(
+                progress_key, progress, XFORM_REGENERATE_INSTANCE_JSON_TASK_TTL
+            )
+        raise
+
+    progress["done"] = True
+    safe_cache_set(progress_key, progress, XFORM_REGENERATE_INSTANCE_JSON_TASK_TTL)
+    logger.info(
+        "Regenerated json of form %s shard %s: %d rows in %.1fs (%.1f rows/s)",
+        xform_id,
+        shard,
+        progress["rows"],
+        progress["duration"],
+        progress["rows"] / progress["duration"] if progress["duration"] else 0,
+    )
+    _finish_instance_json_regeneration(xform, shards)
 
 
 @app.task(base=AutoRetryTask)
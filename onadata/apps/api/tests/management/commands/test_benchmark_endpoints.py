@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""Test benchmark_endpoints management command."""
+
+import os
+import tempfile
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import CommandError, call_command
+
+from onadata.apps.main.tests.test_base import TestBase
+from onadata.libs.profiling.benchmark import load_baseline, save_baseline
+
+
+class BenchmarkEndpointsTest(TestBase):
+    """Test benchmark_endpoints management command."""
+
+    def _benchmark(self, **options):
+        out = StringIO()
+        options = {"endpoints": ["data"], "confirm": True, **options}
+        call_command(
+            "benchmark_endpoints",
+            rows=10,
+            forms=1,
+            iterations=1,
+            warmup=0,
+            stdout=out,
+            **options,
+        )
+        return out.getvalue()
+
+    def test_save_baseline(self):
+        """The results are reported and saved as the baseline"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "baseline.json")
+            output = self._benchmark(save_baseline=path)
+            baseline = load_baseline(path, 10)
+
+        self.assertIn("data: p50", output)
+        self.assertEqual(list(baseline), ["data"])
+
+    def test_regression(self):
+        """A result over its query budget fails the benchmark"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "baseline.json")
+            save_baseline(
+                path,
+                10,
+                {
+                    "data": {
+                        "p50": 60,
+                        "p95": 60,
+                        "p99": 60,
+                        "queries": 0,
+                        "peak_memory": 2**40,
+                    }
+                },
+            )
+            with self.assertRaisesMessage(CommandError, "the budget is 0"):
+                self._benchmark(baseline=path)
+
+    @patch("onadata.apps.api.management.commands.benchmark_endpoints.seed")
+    def test_unknown_endpoint(self, mock_seed):
+        """An unknown endpoint is reported before seeding"""
+        with self.assertRaisesMessage(CommandError, "Unknown endpoints: report"):
+            self._benchmark(endpoints=["report"])
+        mock_seed.assert_not_called()
+
+    @patch("onadata.apps.api.management.commands.benchmark_endpoints.seed")
+    def test_confirm_required_without_debug(self, mock_seed):
+        """The database is not seeded with DEBUG off unless confirmed"""
+        with self.assertRaisesMessage(CommandError, "pass --confirm"):
+            self._benchmark(confirm=False)
+        mock_seed.assert_not_called()
+
+    def test_platform_stats(self):
+        """The platform statistics report is benchmarked"""
+        output = self._benchmark(endpoints=["platform_stats"])
+
+        self.assertIn("platform_stats: p50", output)
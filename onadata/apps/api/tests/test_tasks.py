@@ -6,11 +6,14 @@ from unittest.mock import patch
 from django.contrib.auth import get_user_model
 from django.core.cache import cache
 from django.db import DatabaseError, OperationalError
+from django.test import override_settings
 
 from onadata.apps.api.tasks import (
     ShareProject,
     delete_xform_submissions_async,
+    get_instance_json_progress,
     regenerate_form_instance_json,
+    regenerate_instance_json_shard,
     send_project_invitation_email_async,
     share_project_async,
 )
@@ -118,6 +121,64 @@ class RegenerateFormInstanceJsonTestCase(TestBase):
         instance.refresh_from_db()
         self.assertFalse(instance.json)
 
+    @override_settings(INSTANCE_JSON_SHARDS=2, INSTANCE_JSON_CHUNK_SIZE=2)
+    def test_regenerates_in_shards(self):
+        """Submissions are regenerated in shards, related rows are prefetched"""
+
+        def mock_get_full_dict(
+            self, include_related=True
+        ):  # pylint: disable=unused-argument
+            return {}
+
+        with patch.object(Instance, "get_full_dict", mock_get_full_dict):
+            self._publish_transportation_form()
+            self._make_submissions()
+
+        instances = self.xform.instances.filter(deleted_at__isnull=True)
+        for instance in instances[:2]:
+            instance.tags.add("foo")
+        self.assertGreater(instances.count(), 2)
+        regenerate_form_instance_json.delay(self.xform.pk)
+
+        for instance in instances:
+            self.assertEqual(instance.json["_id"], instance.pk)
+        self.assertEqual(
+            sum(1 for instance in instances if instance.json["_tags"] == ["foo"]), 2
+        )
+        self.xform.refresh_from_db()
+        self.assertTrue(self.xform.is_instance_json_regenerated)
+        # progress is cleared once every shard is done
+        self.assertIsNone(get_instance_json_progress(self.xform.pk))
+
+    def test_shard_resumes(self):
+        """A shard resumes after the last submission written"""
+
+        def mock_get_full_dict(
+            self, include_related=True
+        ):  # pylint: disable=unused-argument
+            return {}
+
+        with patch.object(Instance, "get_full_dict", mock_get_full_dict):
+            self._publish_transportation_form()
+            self._make_submissions()
+
+        first, *rest = self.xform.instances.order_by("pk")
+        last = rest[-1]
+        progress_key = f"xfm-regenerate_instance_json_progress-{self.xform.pk}"
+        cache.set(progress_key, [(first.pk, last.pk)])
+        cache.set(
+            f"{progress_key}-0",
+            {"last_id": first.pk, "rows": 1, "duration": 1, "done": False},
+        )
+        regenerate_instance_json_shard.delay(self.xform.pk, 0)
+
+        first.refresh_from_db()
+        last.refresh_from_db()
+        self.assertFalse(first.json)
+        self.assertEqual(last.json["_id"], last.pk)
+        self.xform.refresh_from_db()
+        self.assertTrue(self.xform.is_instance_json_regenerated)
+
 
 def set_cache_for_org(org, request):
     """Utility to set org cache"""
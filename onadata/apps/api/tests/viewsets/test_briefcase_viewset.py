@@ -7,6 +7,7 @@ import codecs
 import os
 import shutil
 from unittest.mock import patch
+from xml.etree import ElementTree
 
 from django.conf import settings
 from django.core.files.storage import storages
@@ -17,10 +18,7 @@ from django.utils import timezone
 from django_digest.test import DigestAuth
 
 from onadata.apps.api.tests.viewsets.test_abstract_viewset import TestAbstractViewSet
-from onadata.apps.api.viewsets.briefcase_viewset import (
-    BriefcaseViewset,
-    _query_optimization_fence,
-)
+from onadata.apps.api.viewsets.briefcase_viewset import BriefcaseViewset
 from onadata.apps.api.viewsets.xform_submission_viewset import XFormSubmissionViewSet
 from onadata.apps.api.viewsets.xform_viewset import XFormViewSet
 from onadata.apps.logger.models import Instance, XForm
@@ -33,6 +31,17 @@ def ordered_instances(xform):
     return Instance.objects.filter(xform=xform).order_by("id")
 
 
+def submission_list_ids(response):
+    """Returns the submission uuids listed in a streamed idChunk response."""
+    content = b"".join(response.streaming_content).decode("utf-8")
+    id_chunk = ElementTree.fromstring(content)
+
+    return [
+        node.text.replace("uuid:", "")
+        for node in id_chunk.iter("{http://opendatakit.org/submissions}id")
+    ]
+
+
 class TestBriefcaseViewSet(TestAbstractViewSet):
     """
     Test BriefcaseViewset
@@ -117,7 +126,7 @@ class TestBriefcaseViewSet(TestAbstractViewSet):
         request.META.update(auth(request.META, response))
         response = view(request, username=self.user.username)
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(response.data["instances"].count(), 0)
+        self.assertEqual(submission_list_ids(response), [])
 
     def test_view_submission_list(self):
         view = BriefcaseViewset.as_view({"get": "list"})
@@ -276,7 +285,7 @@ class TestBriefcaseViewSet(TestAbstractViewSet):
         # check that number of instances returned by response is equal to
         # number of instances that have not been soft deleted
         self.assertEqual(
-            response.data.get("instances").count(),
+            len(submission_list_ids(response)),
             Instance.objects.filter(xform=self.xform, deleted_at__isnull=True).count(),
         )
 
@@ -785,20 +794,43 @@ class TestBriefcaseViewSet(TestAbstractViewSet):
                 text = text.replace(*var)
             self.assertContains(response, instanceId, status_code=200)
 
-    def test_query_optimization_fence(self):
+    @patch("onadata.apps.api.viewsets.briefcase_viewset.BRIEFCASE_PULL_CHUNK_SIZE", 1)
+    def test_view_submission_list_keyset_pages(self):
+        """Submission ids are read one keyset page at a time"""
+        view = BriefcaseViewset.as_view({"get": "list"})
         self._publish_xml_form()
         self._make_submissions()
         instances = ordered_instances(self.xform)
-        optimized_instances = _query_optimization_fence(instances, 4)
-        self.assertEqual(instances.count(), optimized_instances.count())
-        op_sql_query = (
-            'SELECT "logger_instance"."id" AS "pk", '
-            '"logger_instance"."uuid" AS "uuid" FROM "logger_instance"'
-            f' WHERE "logger_instance"."id" IN ({optimized_instances[0].get("pk")},'
-            f" {optimized_instances[1].get('pk')}, {optimized_instances[2].get('pk')},"
-            f" {optimized_instances[3].get('pk')})"
-        )
-        self.assertEqual(str(optimized_instances.query), op_sql_query)
+        params = {"formId": self.xform.id_string, "cursor": instances[0].pk}
+        request = self.factory.get(self._submission_list_url, data=params)
+        response = view(request, username=self.user.username)
+        auth = DigestAuth(self.login_username, self.login_password)
+        request.META.update(auth(request.META, response))
+        response = view(request, username=self.user.username)
+        self.assertEqual(response.status_code, 200)
+
+        with self.assertNumQueries(NUM_INSTANCES):
+            uuids = submission_list_ids(response)
+
+        self.assertEqual(uuids, [i.uuid for i in instances[1:]])
+
+    def test_view_submission_list_zero_num_entries(self):
+        """numEntries=0 does not limit the submissions listed"""
+        view = BriefcaseViewset.as_view({"get": "list"})
+        self._publish_xml_form()
+        self._make_submissions()
+        params = {"formId": self.xform.id_string, "numEntries": 0}
+        request = self.factory.get(self._submission_list_url, data=params)
+        response = view(request, username=self.user.username)
+        auth = DigestAuth(self.login_username, self.login_password)
+        request.META.update(auth(request.META, response))
+        response = view(request, username=self.user.username)
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(
+            submission_list_ids(response),
+            [i.uuid for i in ordered_instances(self.xform)],
+        )
 
     def tearDown(self):
         # remove media files
@@ -42,6 +42,7 @@ from onadata.apps.api.viewsets.xform_viewset import XFormViewSet
 from onadata.apps.logger.models import (
     Attachment,
     Instance,
+    SubmissionDeletion,
     SubmissionReview,
     SurveyType,
     XForm,
@@ -53,6 +54,7 @@ from onadata.apps.main.models.meta_data import MetaData
 from onadata.apps.main.tests.test_base import TestBase
 from onadata.apps.messaging.constants import SUBMISSION_DELETED, XFORM
 from onadata.libs import permissions as role
+from onadata.libs.kms.tools import save_decryption_error
 from onadata.libs.permissions import (
     DataEntryMinorRole,
     DataEntryOnlyRole,
@@ -68,6 +70,7 @@ from onadata.libs.serializers.submission_review_serializer import (
 )
 from onadata.libs.utils.common_tags import MONGO_STRFTIME
 from onadata.libs.utils.logger_tools import create_instance
+from onadata.libs.utils.osm import _update_instance_osm_json
 
 
 @urlmatch(netloc=r"(.*\.)?enketo\.ona\.io$")
@@ -810,6 +813,52 @@ class TestDataViewSet(SerializeMixin, TestBase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(len(response.data), 4)
 
+    @override_settings(SUBMISSION_RETRIEVAL_THRESHOLD=2)
+    def test_data_ndjson(self):
+        """Submissions are streamed as newline delimited JSON"""
+        self._make_submissions()
+        view = DataViewSet.as_view({"get": "list"})
+        formid = self.xform.pk
+        expected_ids = list(
+            self.xform.instances.order_by("id").values_list("id", flat=True)
+        )
+
+        request = self.factory.get("/", **self.extra)
+        response = view(request, pk=formid, format="ndjson")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertTrue(response.has_header("ETag"))
+        # the data is not paginated past the retrieval threshold
+        self.assertFalse(response.has_header("Link"))
+        content = "".join(c.decode("utf-8") for c in response.streaming_content)
+        self.assertTrue(content.endswith("\n"))
+        records = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual(sorted(r["_id"] for r in records), expected_ids)
+
+        # sorted data is read from a server-side cursor
+        request = self.factory.get(
+            "/", data={"sort": '{"date_created":-1}'}, **self.extra
+        )
+        response = view(request, pk=formid, format="ndjson")
+        self.assertEqual(response.status_code, 200)
+        content = "".join(c.decode("utf-8") for c in response.streaming_content)
+        records = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual(
+            [r["_id"] for r in records],
+            list(
+                self.xform.instances.order_by("-date_created").values_list(
+                    "id", flat=True
+                )
+            ),
+        )
+
+        # pagination is applied on request
+        request = self.factory.get("/", data={"page_size": 3, "page": 1}, **self.extra)
+        response = view(request, pk=formid, format="ndjson")
+        self.assertEqual(response.status_code, 200)
+        content = "".join(c.decode("utf-8") for c in response.streaming_content)
+        self.assertEqual(len(content.splitlines()), 3)
+
     @override_settings(STREAM_DATA=True)
     def test_paginate_and_sort_streaming_data(self):
         """
@@ -1930,8 +1979,7 @@ class TestDataViewSet(SerializeMixin, TestBase):
         self.assertEqual(mock.call_count, 1)
         self.assertTrue(send_message_mock.called)
 
-    @patch("onadata.apps.api.viewsets.data_viewset.safe_cache_set")
-    def test_deletion_of_bulk_submissions(self, mock_cache_set):
+    def test_deletion_of_bulk_submissions(self):
         self._make_submissions()
         self.xform.refresh_from_db()
         formid = self.xform.pk
@@ -1972,11 +2020,8 @@ class TestDataViewSet(SerializeMixin, TestBase):
         self.assertNotEqual(current_count, initial_count)
         self.assertEqual(current_count, 2)
         self.assertEqual(self.xform.num_of_submissions, 2)
-        mock_cache_set.assert_called_once_with(
-            f"xfm-submissions-deleting-{formid}",
-            [str(i.pk) for i in records_to_be_deleted],
-            3600,
-        )
+        # The deletion markers are removed once the submissions are deleted
+        self.assertFalse(self.xform.submission_deletions.exists())
 
     @override_settings(ENABLE_SUBMISSION_PERMANENT_DELETE=True)
     @patch("onadata.apps.api.viewsets.data_viewset.send_message")
@@ -3148,6 +3193,59 @@ class TestDataViewSet(SerializeMixin, TestBase):
         self.assertEqual(response.status_code, 200)
         self.assertNotEqual(etag_value, response.get("ETag"))
 
+    def test_data_list_not_modified(self):
+        """The data is not queried when the client has the current ETag"""
+        self._make_submissions()
+        view = DataViewSet.as_view({"get": "list"})
+        request = self.factory.get("/", **self.extra)
+        response = view(request, pk=self.xform.pk)
+        self.assertEqual(response.status_code, 200)
+        etag_value = response["ETag"]
+
+        request = self.factory.get(
+            "/", HTTP_IF_NONE_MATCH=f'"{etag_value}"', **self.extra
+        )
+        with patch.object(DataViewSet, "set_object_list") as mock_set_object_list:
+            response = view(request, pk=self.xform.pk)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag_value)
+        mock_set_object_list.assert_not_called()
+
+        # editing a submission changes the ETag
+        self.xform.instances.first().save()
+        response = view(request, pk=self.xform.pk)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag_value)
+
+    def _assert_etag_changed_by(self, update):
+        view = DataViewSet.as_view({"get": "list"})
+        request = self.factory.get("/", **self.extra)
+        response = view(request, pk=self.xform.pk)
+        etag_value = response["ETag"]
+
+        update(self.xform.instances.first())
+
+        request = self.factory.get(
+            "/", HTTP_IF_NONE_MATCH=f'"{etag_value}"', **self.extra
+        )
+        response = view(request, pk=self.xform.pk)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag_value)
+
+    def test_data_list_etag_changed_by_osm_update(self):
+        """Merging OSM tags into a submission's json changes the ETag"""
+        self._make_submissions()
+        self._assert_etag_changed_by(
+            lambda instance: _update_instance_osm_json(instance, [], set())
+        )
+
+    def test_data_list_etag_changed_by_decryption_error(self):
+        """Recording a decryption error in a submission's json changes the ETag"""
+        self._make_submissions()
+        self._assert_etag_changed_by(
+            lambda instance: save_decryption_error(instance, "KEY_NOT_FOUND")
+        )
+
     def test_submission_history(self):
         """Test submission json includes has_history key"""
         # create form
@@ -3988,10 +4086,7 @@ class TestDataViewSet(SerializeMixin, TestBase):
         view = DataViewSet.as_view({"get": "list"})
         formid = self.xform.pk
         instances = self.xform.instances.all()
-        cache.set(
-            f"xfm-submissions-deleting-{self.xform.pk}",
-            [instances[0].pk, instances[1].pk],
-        )
+        SubmissionDeletion.mark(self.xform, [instances[0].pk, instances[1].pk])
         # No query
         request = self.factory.get("/", **self.extra)
         response = view(request, pk=formid)
@@ -4009,15 +4104,20 @@ class TestDataViewSet(SerializeMixin, TestBase):
         response = view(request, pk=formid)
         self.assertEqual(response.status_code, 200)
         self.assertEqual(len(response.data), 2)
-        # Cached submission ids saved as strings
-        cache.set(
-            f"xfm-submissions-deleting-{self.xform.pk}",
-            [str(instances[0].pk), str(instances[1].pk)],
+        # Markers left by a failed deletion expire
+        SubmissionDeletion.objects.update(
+            date_created=timezone.now() - timedelta(hours=2)
         )
         request = self.factory.get("/", **self.extra)
         response = view(request, pk=formid)
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(len(response.data), 2)
+        self.assertEqual(len(response.data), 4)
+        # Deletion of every submission in progress
+        SubmissionDeletion.mark(self.xform)
+        request = self.factory.get("/", **self.extra)
+        response = view(request, pk=formid)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 0)
 
     @override_settings(ENABLE_SUBMISSION_PERMANENT_DELETE=True)
     @patch(
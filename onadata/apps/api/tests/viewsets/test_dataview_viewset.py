@@ -17,7 +17,10 @@ from openpyxl import load_workbook
 
 from onadata.apps.api.tests.viewsets.test_abstract_viewset import TestAbstractViewSet
 from onadata.apps.api.viewsets.attachment_viewset import AttachmentViewSet
-from onadata.apps.api.viewsets.dataview_viewset import DataViewViewSet
+from onadata.apps.api.viewsets.dataview_viewset import (
+    DataViewViewSet,
+    get_dataview_instances,
+)
 from onadata.apps.api.viewsets.note_viewset import NoteViewSet
 from onadata.apps.api.viewsets.project_viewset import ProjectViewSet
 from onadata.apps.api.viewsets.xform_viewset import XFormViewSet
@@ -1728,6 +1731,57 @@ class TestDataViewViewSet(TestAbstractViewSet):
         self.assertEqual(response.status_code, 404)
         self.assertEqual({"detail": "Invalid page."}, response.data)
 
+        # unpaginated geojson is streamed
+        request = self.factory.get("/?fields=name", **self.extra)
+        response = view(request, pk=self.data_view.pk, format="geojson")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/geo+json")
+        data = json.loads(
+            "".join([c.decode("utf-8") for c in response.streaming_content])
+        )
+        feature_ids = [feature["properties"]["id"] for feature in data["features"]]
+        self.assertEqual(data["type"], "FeatureCollection")
+        self.assertEqual(
+            feature_ids,
+            list(
+                get_dataview_instances(self.data_view)
+                .order_by("id")
+                .values_list("id", flat=True)
+            ),
+        )
+        self.assertEqual(
+            {"name"},
+            {
+                key
+                for feature in data["features"]
+                for key in feature["properties"]
+                if key not in ("id", "xform")
+            },
+        )
+
+    @patch(
+        "onadata.apps.api.viewsets.dataview_viewset.SUBMISSION_RETRIEVAL_THRESHOLD",
+        1,
+    )
+    def test_geojson_default_page_over_threshold(self):
+        """Unpaginated geojson of large forms gets the default page"""
+        self._create_dataview()
+        view = DataViewViewSet.as_view({"get": "data"})
+
+        request = self.factory.get("/", **self.extra)
+        response = view(request, pk=self.data_view.pk, format="geojson")
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.streaming)
+        self.assertEqual(
+            [feature["properties"]["id"] for feature in response.data["features"]],
+            list(
+                get_dataview_instances(self.data_view)
+                .order_by("id")
+                .values_list("id", flat=True)[:1000]
+            ),
+        )
+
     # pylint: disable=invalid-name
     def test_dataview_project_cache_cleared(self):
         self._create_dataview()
@@ -2299,3 +2353,13 @@ class TestDataViewViewSet(TestAbstractViewSet):
 
         self.assertEqual(response.status_code, 200)
         self.assertIsNone(response.data["bbox"])
+
+    def test_tiles_empty_without_geolocated_submissions(self):
+        """The tutorial fixture has no geom, so the tile is empty."""
+        self._create_dataview()
+        view = DataViewViewSet.as_view({"get": "tiles"})
+        request = self.factory.get("/", **self.extra)
+        response = view(request, pk=self.data_view.pk, z="0", x="0", y="0")
+
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(response.content, b"")
@@ -6,11 +6,10 @@ Test OSMViewSet module.
 import csv
 import os
 from io import StringIO
-from unittest.mock import patch
+from unittest.mock import MagicMock
 
 from django.conf import settings
-from django.db import IntegrityError, transaction
-from django.db.transaction import TransactionManagementError
+from django.db.models.signals import post_save
 from django.test import RequestFactory
 from django.test.utils import override_settings
 from django.utils.dateparse import parse_datetime
@@ -19,7 +18,7 @@ from onadata.apps.api.tests.viewsets.test_abstract_viewset import TestAbstractVi
 from onadata.apps.api.viewsets.data_viewset import DataViewSet
 from onadata.apps.api.viewsets.osm_viewset import OsmViewSet
 from onadata.apps.api.viewsets.xform_viewset import XFormViewSet
-from onadata.apps.logger.models import Attachment, Instance, OsmData
+from onadata.apps.logger.models import Attachment, Instance, OsmData, OsmTagKey
 from onadata.apps.viewer.models import Export
 from onadata.libs.utils.common_tools import (
     filename_from_disposition,
@@ -181,6 +180,30 @@ class TestOSMViewSet(TestAbstractViewSet):
         response = view(request, pk=self.xform.pk, format="csv")
         self.assertEqual(response.status_code, 200)
 
+    @override_settings(CELERY_TASK_ALWAYS_EAGER=True)
+    def test_osm_tag_keys(self):
+        self._publish_osm_with_submission()
+        self.assertEqual(
+            OsmData.get_tag_keys(self.xform, "osm_road"),
+            ["ctr:lat", "ctr:lon", "highway", "lanes", "name", "way:id"],
+        )
+        self.assertEqual(
+            OsmData.get_tag_keys(self.xform, "osm_building", include_prefix=True),
+            [
+                "osm_building:building",
+                "osm_building:building:levels",
+                "osm_building:ctr:lat",
+                "osm_building:ctr:lon",
+                "osm_building:name",
+                "osm_building:way:id",
+            ],
+        )
+
+        # saving the OSM data again does not duplicate the tag keys
+        count = OsmTagKey.objects.filter(xform=self.xform).count()
+        save_osm_data(self.xform.instances.first().pk)
+        self.assertEqual(OsmTagKey.objects.filter(xform=self.xform).count(), count)
+
     def test_process_error_osm_format(self):
         self._publish_xls_form_to_project()
         self._make_submissions()
@@ -194,50 +217,36 @@ class TestOSMViewSet(TestAbstractViewSet):
             status_code=404,
         )
 
-    def test_save_osm_data_transaction_atomic(self):
+    @override_settings(CELERY_TASK_ALWAYS_EAGER=True)
+    def test_save_osm_data_upserts_osm_data(self):
         """
-        Test that an IntegrityError within save_osm_data does not cause
-        a TransactionManagementError, which arises because of new queries
-        while inside a transaction.atomic() block
+        Test that saving the OSM data again updates the existing OsmData and
+        only the OSM tags of the submission's JSON without saving it.
         """
-
-        # first publish a form and make a submission with OSM data
         self._publish_osm_with_submission()
-        # make sure we have a submission
         submission = Instance.objects.first()
-        self.assertNotEqual(submission, None)
-
-        # mock the save method on OsmData and cause it to raise an
-        # IntegrityError on its first call only, so that we get into the
-        # catch inside save_osm_data
-        with patch("onadata.libs.utils.osm.OsmData.save") as mock:
-
-            def _side_effect(*args):
-                """
-                We want to raise an IntegrityError only on the first call
-                of our mock
-                """
-
-                def __second_side_effect(*args):
-                    return None
-
-                # change the side effect so that the next time we do not
-                # raise an IntegrityError
-                mock.side_effect = __second_side_effect
-                # we need to manually rollback the atomic transaction
-                # merely raising IntegrityError is not enough
-                # doing this means that a TransactionManagementError is raised
-                # if we do new queries inside the transaction.atomic block
-                transaction.set_rollback(True)
-                raise IntegrityError
-
-            # excplicity use an atomic block
-            with transaction.atomic():
-                mock.side_effect = _side_effect
-                try:
-                    save_osm_data(submission.id)
-                except TransactionManagementError:
-                    self.fail("TransactionManagementError was raised")
+        osm_ids = set(submission.osm_data.values_list("pk", flat=True))
+        self.assertEqual(submission.json["osm_road:name"], "Patuatuli Road")
+        self.assertEqual(submission.json["osm_building:name"], "kol")
+
+        Instance.objects.filter(pk=submission.pk).update(
+            json={**submission.json, "osm_road:name": "Old Road"}
+        )
+        post_save_handler = MagicMock()
+        post_save.connect(post_save_handler, sender=Instance, weak=False)
+        try:
+            save_osm_data(submission.id)
+        finally:
+            post_save.disconnect(post_save_handler, sender=Instance)
+        post_save_handler.assert_not_called()
+
+        submission.refresh_from_db()
+        self.assertEqual(set(submission.osm_data.values_list("pk", flat=True)), osm_ids)
+        self.assertEqual(submission.json["osm_road:name"], "Patuatuli Road")
+        self.assertEqual(submission.json["fav_color"], "red")
+        self.assertEqual(
+            submission.json["_date_modified"], submission.date_modified.isoformat()
+        )
 
     def test_save_osm_data_with_non_existing_media_file(self):
         """
@@ -19,6 +19,7 @@ from unittest.mock import Mock, patch
 from xml.dom import Node
 
 from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
 from django.contrib.contenttypes.models import ContentType
 from django.core.cache import cache
 from django.core.files.storage import default_storage
@@ -67,6 +68,7 @@ from onadata.apps.viewer.models import Export
 from onadata.libs.exceptions import EncryptionError
 from onadata.libs.models.share_project import ShareProject
 from onadata.libs.permissions import (
+    META_PERMS_SCOPE_OWN,
     ROLES_ORDERED,
     DataEntryMinorRole,
     DataEntryOnlyRole,
@@ -85,6 +87,10 @@ from onadata.libs.serializers.xform_serializer import (
     XFormSerializer,
 )
 from onadata.libs.utils.api_export_tools import get_existing_file_format
+from onadata.libs.utils.bbox_tools import (
+    generate_instance_tile,
+    get_meta_perms_xform_ids,
+)
 from onadata.libs.utils.cache_tools import (
     ENKETO_URL_CACHE,
     ENKETO_URLS_CACHE,
@@ -6874,3 +6880,101 @@ class ExportAsyncTestCase(XFormViewSetBaseTestCase):
         view(request, pk=self.xform.pk)
 
         self.assertEqual(mock_cache_set.call_args.args[2], 123)
+
+    def test_tiles_returns_vector_tile_of_geolocated_submissions(self):
+        """The tiles action returns a Mapbox Vector Tile."""
+        xls_path = self._fixture_path("gps", "gps.xlsx")
+        self._publish_xls_file_and_set_xform(xls_path)
+        self._make_submissions_gps()
+
+        view = XFormViewSet.as_view({"get": "tiles"})
+        request = self.factory.get("/", **self.extra)
+        response = view(request, pk=self.xform.pk, z="0", x="0", y="0")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/vnd.mapbox-vector-tile")
+        self.assertTrue(response.content)
+
+    def test_tiles_invalid_coordinates(self):
+        """Tiles outside of the zoom level grid are not found."""
+        self._publish_xls_form_to_project()
+        view = XFormViewSet.as_view({"get": "tiles"})
+        request = self.factory.get("/", **self.extra)
+        response = view(request, pk=self.xform.pk, z="1", x="2", y="0")
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_tiles_are_cached_and_busted_on_new_submission(self):
+        """Tiles are cached, then regenerated when a submission arrives."""
+        xls_path = self._fixture_path("gps", "gps.xlsx")
+        self._publish_xls_file_and_set_xform(xls_path)
+        view = XFormViewSet.as_view({"get": "tiles"})
+        request = self.factory.get("/", **self.extra)
+
+        with patch(
+            "onadata.libs.utils.bbox_tools.generate_instance_tile",
+            wraps=generate_instance_tile,
+        ) as mock_generate:
+            # Cold form has no geoms: the empty tile is generated and cached.
+            response = view(request, pk=self.xform.pk, z="0", x="0", y="0")
+            self.assertEqual(response.status_code, 204)
+            response = view(request, pk=self.xform.pk, z="0", x="0", y="0")
+            self.assertEqual(response.status_code, 204)
+            self.assertEqual(mock_generate.call_count, 1)
+
+            # A new submission changes the tile cache key.
+            self._make_submissions_gps()
+            response = view(request, pk=self.xform.pk, z="0", x="0", y="0")
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(mock_generate.call_count, 2)
+
+    def test_tiles_apply_xform_meta_perms(self):
+        """Users that only view their own submissions only get those in tiles."""
+        xls_path = self._fixture_path("gps", "gps.xlsx")
+        self._publish_xls_file_and_set_xform(xls_path)
+        self._make_submissions_gps()
+        alice_profile = self._create_user_profile(
+            {"username": "alice", "email": "alice@localhost.com"}
+        )
+        alice = alice_profile.user
+        MetaData.xform_meta_permission(
+            self.xform, data_value="editor|dataentry-minor|readonly-no-download"
+        )
+        DataEntryMinorRole.add(alice, self.xform)
+        view = XFormViewSet.as_view({"get": "tiles"})
+        alices_extra = {"HTTP_AUTHORIZATION": f"Token {alice.auth_token.key}"}
+
+        # none of the submissions are alice's
+        with patch(
+            "onadata.libs.utils.bbox_tools.generate_instance_tile",
+            wraps=generate_instance_tile,
+        ) as mock_generate:
+            request = self.factory.get("/", **alices_extra)
+            response = view(request, pk=self.xform.pk, z="0", x="0", y="0")
+
+        self.assertEqual(response.status_code, 204)
+        mock_generate.assert_called_once_with(
+            [], 0, 0, 0, dataview=None, own_xform_ids=[self.xform.pk], user=alice
+        )
+
+        # the owner's tiles are cached separately
+        request = self.factory.get("/", **self.extra)
+        response = view(request, pk=self.xform.pk, z="0", x="0", y="0")
+        self.assertEqual(response.status_code, 200)
+
+    def test_tiles_own_meta_perms_scope_anonymous_user(self):
+        """Anonymous users are not given tiles filtered by their submissions."""
+        xls_path = self._fixture_path("gps", "gps.xlsx")
+        self._publish_xls_file_and_set_xform(xls_path)
+
+        with patch(
+            "onadata.libs.utils.bbox_tools.get_xform_meta_perms_scope",
+            return_value=META_PERMS_SCOPE_OWN,
+        ):
+            self.assertEqual(
+                get_meta_perms_xform_ids([self.xform], AnonymousUser()), ([], [])
+            )
+            self.assertEqual(
+                get_meta_perms_xform_ids([self.xform], self.user),
+                ([], [self.xform.pk]),
+            )
@@ -4,18 +4,17 @@ The /briefcase API implementation.
 """
 
 from xml.dom import NotFoundErr
+from xml.sax.saxutils import escape
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.files import File
 from django.core.validators import ValidationError
-from django.db import OperationalError
-from django.http import Http404
+from django.http import Http404, StreamingHttpResponse
 from django.utils.translation import gettext as _
 
 import six
 from rest_framework import exceptions, mixins, permissions, status, viewsets
-from rest_framework.authentication import TokenAuthentication
 from rest_framework.decorators import action
 from rest_framework.generics import get_object_or_404
 from rest_framework.renderers import BrowsableAPIRenderer
@@ -30,7 +29,10 @@ from onadata.apps.logger.xform_instance_parser import clean_and_parse_xml
 from onadata.apps.main.models.meta_data import MetaData
 from onadata.apps.main.models.user_profile import UserProfile
 from onadata.libs import filters
-from onadata.libs.authentication import DigestAuthentication
+from onadata.libs.authentication import (
+    DigestAuthentication,
+    LastLoginTokenAuthentication,
+)
 from onadata.libs.mixins.openrosa_headers_mixin import get_openrosa_headers
 from onadata.libs.renderers.renderers import TemplateXMLRenderer
 from onadata.libs.serializers.xform_serializer import (
@@ -43,6 +45,9 @@ from onadata.libs.utils.viewer_tools import get_form
 # pylint: disable=invalid-name
 User = get_user_model()
 
+# Number of submission ids read from the database per keyset page
+BRIEFCASE_PULL_CHUNK_SIZE = getattr(settings, "BRIEFCASE_PULL_CHUNK_SIZE", 1000)
+
 
 def _extract_uuid(text):
     if isinstance(text, six.string_types):
@@ -74,44 +79,44 @@ def _parse_int(num):
         return None
 
 
-def _query_optimization_fence(instances, num_entries):
+def _iter_submission_ids(instances, cursor=None, num_entries=None):
     """
-    Enhances query performance by using an optimization fence.
-
-    This utility function creates an optimization fence around the provided
-    queryset instances. It encapsulates the original query within a
-    SELECT statement with an ORDER BY and LIMIT clause,
-    optimizing the database query for improved performance.
-
-    Parameters:
-    - instances: QuerySet
-        The input QuerySet of instances to be optimized.
-    - num_entries: int
-        The number of instances to be included in the optimized result set.
-
-    Returns:
-    QuerySet
-        An optimized QuerySet containing selected fields ('pk' and 'uuid')
-        based on the provided instances.
+    Yields the ``(pk, uuid)`` of the submissions after the ``cursor``.
+
+    Submissions are read one keyset page at a time so that every page is an
+    index range scan on the submissions after the last id read.
     """
-    inner_raw_sql = str(instances.query)
+    remaining = num_entries
 
-    # Create the outer query with the LIMIT clause
-    outer_query = (
-        f"SELECT id, uuid FROM ({inner_raw_sql}) AS items "  # nosec
-        "ORDER BY id ASC LIMIT %s"  # nosec
-    )
-    raw_queryset = Instance.objects.raw(outer_query, [num_entries])
-    # convert raw queryset to queryset
-    instances_data = [
-        {"pk": item.id, "uuid": item.uuid} for item in raw_queryset.iterator()
-    ]
-    # Create QuerySet from the instances dict
-    instances = Instance.objects.filter(
-        pk__in=[item["pk"] for item in instances_data]
-    ).values("pk", "uuid")
+    while remaining is None or remaining > 0:
+        size = BRIEFCASE_PULL_CHUNK_SIZE
+        if remaining is not None:
+            size = min(size, remaining)
+            remaining -= size
+        page = instances.filter(pk__gt=cursor) if cursor else instances
+        page = list(page[:size])
+
+        yield from page
+
+        if len(page) < size:
+            break
+
+        cursor = page[-1][0]
 
-    return instances
+
+def _render_submission_list(instances, cursor=None, num_entries=None):
+    """Yields the Briefcase ``idChunk`` XML of the submissions after the cursor."""
+    resumption_cursor = cursor or 0
+
+    yield '<idChunk xmlns="http://opendatakit.org/submissions">\n    <idList>'
+    for pk, uuid in _iter_submission_ids(instances, cursor, num_entries):
+        resumption_cursor = pk
+        yield f"\n        <id>uuid:{escape(uuid)}</id>"
+    yield (
+        "\n    </idList>\n"
+        f"    <resumptionCursor>{resumption_cursor}</resumptionCursor>\n"
+        "</idChunk>\n"
+    )
 
 
 # pylint: disable=too-many-ancestors
@@ -128,7 +133,7 @@ class BriefcaseViewset(
 
     authentication_classes = (
         DigestAuthentication,
-        TokenAuthentication,
+        LastLoginTokenAuthentication,
     )
     filter_backends = (filters.AnonDjangoObjectPermissionFilter,)
     queryset = XForm.objects.filter(
@@ -223,45 +228,12 @@ class BriefcaseViewset(
             xform_kwargs["user__username__iexact"] = username
         xform = get_form(xform_kwargs)
         self.check_object_permissions(self.request, xform)
-        instances = Instance.objects.filter(
-            xform=xform, deleted_at__isnull=True
-        ).values("pk", "uuid")
+        # Served by the partial (xform_id, id) INCLUDE (uuid) index
+        instances = Instance.objects.filter(xform_id=xform.pk, deleted_at__isnull=True)
         if xform.encrypted:
             instances = instances.filter(media_all_received=True)
-        instances = instances.order_by("pk")
-        num_entries = self.request.GET.get("numEntries")
-        cursor = self.request.GET.get("cursor")
 
-        cursor = _parse_int(cursor)
-        if cursor:
-            instances = instances.filter(pk__gt=cursor)
-
-        num_entries = _parse_int(num_entries)
-        if num_entries:
-            try:
-                paginated_instances = instances[:num_entries]
-                # trigger a database call
-                _ = len(paginated_instances)
-                instances = paginated_instances
-            except OperationalError:
-                instances = _query_optimization_fence(instances, num_entries)
-
-        # Using len() instead of .count() to prevent an extra
-        # database call; len() will load the instances in memory allowing
-        # us to pre-load the queryset before generating the response
-        # and removes the need to perform a count on the database.
-        instance_count = len(instances)
-
-        # pylint: disable=attribute-defined-outside-init
-        if instance_count > 0:
-            last_instance = instances[instance_count - 1]
-            self.resumption_cursor = last_instance.get("pk")
-        elif instance_count == 0 and cursor:
-            self.resumption_cursor = cursor
-        else:
-            self.resumption_cursor = 0
-
-        return instances
+        return instances.order_by("pk").values_list("pk", "uuid")
 
     def create(self, request, *args, **kwargs):
         """Accepts an XForm XML and publishes it as a form."""
@@ -313,19 +285,18 @@ class BriefcaseViewset(
 
     def list(self, request, *args, **kwargs):
         """Returns a list of submissions with reference submission download."""
-        # pylint: disable=attribute-defined-outside-init
-        self.object_list = self.filter_queryset(self.get_queryset())
-
-        data = {
-            "instances": self.object_list,
-            "resumptionCursor": self.resumption_cursor,
-        }
-
-        return Response(
-            data,
-            headers=get_openrosa_headers(request, location=False),
-            template_name="submissionList.xml",
+        instances = self.filter_queryset(self.get_queryset())
+        cursor = _parse_int(request.GET.get("cursor"))
+        # numEntries=0 means no limit
+        num_entries = _parse_int(request.GET.get("numEntries")) or None
+        response = StreamingHttpResponse(
+            _render_submission_list(instances, cursor, num_entries),
+            content_type="text/xml; charset=utf-8",
         )
+        for header, value in get_openrosa_headers(request, location=False).items():
+            response[header] = value
+
+        return response
 
     def retrieve(self, request, *args, **kwargs):
         """Returns a single submission XML for download."""
@@ -8,7 +8,7 @@ from typing import Union
 
 from django.conf import settings
 from django.core.exceptions import PermissionDenied
-from django.db.models import Q
+from django.db.models import Q, QuerySet
 from django.db.utils import DataError, OperationalError
 from django.http import Http404, StreamingHttpResponse
 from django.utils import timezone
@@ -26,9 +26,13 @@ from rest_framework.viewsets import ModelViewSet
 from onadata.apps.api.permissions import ConnectViewsetPermissions, XFormPermissions
 from onadata.apps.api.tasks import delete_xform_submissions_async
 from onadata.apps.api.tools import add_tags_to_instance, get_baseviewset_class
-from onadata.apps.logger.models import MergedXForm, OsmData
+from onadata.apps.logger.models import OsmData, SubmissionDeletion
 from onadata.apps.logger.models.attachment import Attachment
 from onadata.apps.logger.models.instance import FormInactiveError, Instance
+from onadata.apps.logger.models.merged_xform import (
+    get_merged_xform_descriptor,
+    get_merged_xform_ids,
+)
 from onadata.apps.logger.models.xform import XForm
 from onadata.apps.messaging.constants import SUBMISSION_DELETED, XFORM
 from onadata.apps.messaging.serializers import send_message
@@ -37,12 +41,13 @@ from onadata.apps.viewer.models.parsed_instance import (
     _get_sort_fields,
     exclude_deleting_submissions_clause,
     get_etag_hash_from_query,
-    get_sql_with_params,
+    get_etag_hash_from_submissions_version,
     get_where_clause,
     query_count,
     query_data,
     query_fields_data,
 )
+from onadata.apps.viewer.parsed_instance_tools import get_query_fields
 from onadata.libs import filters
 from onadata.libs.data import parse_int, strtobool
 from onadata.libs.exceptions import EnketoError, NoRecordsPermission
@@ -70,11 +75,10 @@ from onadata.libs.serializers.data_serializer import (
 from onadata.libs.serializers.geojson_serializer import GeoJsonSerializer
 from onadata.libs.utils.api_export_tools import custom_response_handler
 from onadata.libs.utils.cache_tools import (
-    XFORM_SUBMISSIONS_DELETING,
-    XFORM_SUBMISSIONS_DELETING_TTL,
-    safe_cache_set,
+    get_xform_perms_version,
+    record_xform_query_fields,
 )
-from onadata.libs.utils.common_tools import json_stream, str_to_bool
+from onadata.libs.utils.common_tools import json_stream, ndjson_stream, str_to_bool
 from onadata.libs.utils.viewer_tools import (
     get_enketo_attachment_params,
     get_enketo_urls,
@@ -102,6 +106,11 @@ def get_data_and_form(kwargs):
     return (data_id, kwargs.get("format"))
 
 
+def get_json_string(item):
+    """Returns the ``item`` Instance instance as a JSON string."""
+    return json.dumps(item.json if isinstance(item, Instance) else item)
+
+
 def delete_instance(instance, user):
     """
     Function that calls Instance.set_deleted and catches any exception that may occur.
@@ -142,6 +151,8 @@ class DataViewSet(
         renderers.KMLRenderer,
         renderers.OSMRenderer,
         renderers.FLOIPRenderer,
+        renderers.NDJSONRenderer,
+        renderers.ParquetRenderer,
     ]
 
     filter_backends = (
@@ -217,11 +228,11 @@ class DataViewSet(
                     Instance, pk=dataid, xform__pk=form_pk, deleted_at__isnull=True
                 )
             else:
-                xforms = obj.mergedxform.xforms.filter(deleted_at__isnull=True)
-                pks = list(xforms.values_list("pk", flat=True))
-
                 obj = get_object_or_404(
-                    Instance, pk=dataid, xform_id__in=pks, deleted_at__isnull=True
+                    Instance,
+                    pk=dataid,
+                    xform_id__in=get_merged_xform_ids(obj),
+                    deleted_at__isnull=True,
                 )
 
         setattr(self, cache_attr, obj)
@@ -405,17 +416,13 @@ class DataViewSet(
                 instance_ids = None
 
             initial_num_of_submissions = self.object.num_of_submissions
+            SubmissionDeletion.mark(self.object, instance_ids)
             delete_xform_submissions_async.delay(
                 self.object.id,
                 request.user.id,
                 instance_ids,
                 not permanent_delete,
             )
-            safe_cache_set(
-                f"{XFORM_SUBMISSIONS_DELETING}{self.object.id}",
-                instance_ids,
-                XFORM_SUBMISSIONS_DELETING_TTL,
-            )
             number_of_records_deleted = (
                 len(instance_ids) if instance_ids else initial_num_of_submissions
             )
@@ -598,16 +605,12 @@ class DataViewSet(
             xform_id, is_merged_dataset = queryset[0] if queryset else (lookup, False)
             pks = [xform_id]
             if is_merged_dataset:
-                merged_form = MergedXForm.objects.get(pk=xform_id)
-                queryset = merged_form.xforms.filter(
-                    deleted_at__isnull=True,
-                    project__organization__is_active=True,
-                ).values_list("id", "num_of_submissions")
-                try:
-                    pks, num_of_submissions = [list(value) for value in zip(*queryset)]
-                    num_of_submissions = sum(num_of_submissions)
-                except ValueError:
-                    pks, num_of_submissions = [], 0
+                descriptor = get_merged_xform_descriptor(xform_id)
+                pks = descriptor["active_xform_ids"]
+                # the merged dataset's data changes with its forms' submissions
+                # pylint: disable=attribute-defined-outside-init
+                self.etag_xform_ids = pks
+                num_of_submissions = descriptor["num_of_submissions"]
             else:
                 num_of_submissions = XForm.objects.get(
                     id=xform_id,
@@ -617,14 +620,11 @@ class DataViewSet(
             # pylint: disable=attribute-defined-outside-init
             # Include geom and xform_id fields for geojson format to avoid N+1 queries
             if export_type == "geojson":
+                # The serializer loads each form once per request for the
+                # geo_field plan so the xform is not joined on every row
                 self.object_list = Instance.objects.filter(
                     xform_id__in=pks, deleted_at=None
                 ).only("id", "json", "geom", "xform_id")
-                # Add select_related for xform when geo_field param is present
-                # as the serializer needs to access xform.geotrace_xpaths() etc.
-                geo_field = request.GET.get("geo_field")
-                if geo_field:
-                    self.object_list = self.object_list.select_related("xform")
             else:
                 self.object_list = Instance.objects.filter(
                     xform_id__in=pks, deleted_at=None
@@ -671,7 +671,8 @@ class DataViewSet(
                 self.object_list = self.object_list.exclude(tags__name__in=not_tagged)
 
         if (
-            export_type is None or export_type in ["json", "jsonp", "debug", "xml"]
+            export_type is None
+            or export_type in ["json", "jsonp", "debug", "xml", "ndjson"]
         ) and hasattr(self, "object_list"):
             return self._get_data(
                 query,
@@ -752,24 +753,22 @@ class DataViewSet(
         xform = None
 
         try:
-            enable_etag = True
-
             if not is_public_request:
                 xform = self.get_object()
                 self.data_count = xform.num_of_submissions
-                enable_etag = self.data_count < SUBMISSION_RETRIEVAL_THRESHOLD
 
             where, where_params = get_where_clause(query)
 
+            if xform and query:
+                record_xform_query_fields(xform.pk, get_query_fields(query))
+
             if not is_public_request:
                 # Exclude submissions whose deletion is in progress
                 exclude_del_sql, exclude_del_params = (
-                    exclude_deleting_submissions_clause(self.get_object().id)
+                    exclude_deleting_submissions_clause()
                 )
-
-                if exclude_del_sql:
-                    where.append(f" {exclude_del_sql}")
-                    where_params.extend(exclude_del_params)
+                where.append(f" {exclude_del_sql}")
+                where_params.extend(exclude_del_params)
 
             if where:
                 # pylint: disable=attribute-defined-outside-init
@@ -822,6 +821,7 @@ class DataViewSet(
                             limit=limit,
                             is_encrypted=is_encrypted,
                             decryption_status=decryption_status,
+                            chunk_size=self._get_stream_chunk_size(),
                         )
                         # pylint: disable=attribute-defined-outside-init
                         self.object_list = data
@@ -835,6 +835,7 @@ class DataViewSet(
                             json_only=not self.kwargs.get("format") == "xml",
                             is_encrypted=is_encrypted,
                             decryption_status=decryption_status,
+                            chunk_size=self._get_stream_chunk_size(),
                         )
                         # pylint: disable=attribute-defined-outside-init
                         self.object_list = data
@@ -842,31 +843,62 @@ class DataViewSet(
                     # pylint: disable=attribute-defined-outside-init
                     self.object_list = []
 
-            # ETags are Disabled for XForms with Submissions that surpass
-            # the configured SUBMISSION_RETRIEVAL_THRESHOLD setting
-            if enable_etag:
-                sql = params = None
-
-                if xform:
-                    sql, params = get_sql_with_params(
-                        xform,
-                        query=query,
-                        sort=sort,
-                        start_index=start,
-                        limit=limit,
-                        fields=fields,
-                    )
-
-                setattr(
-                    self,
-                    "etag_hash",
-                    (get_etag_hash_from_query(sql, params)),
-                )
+            setattr(
+                self,
+                "etag_hash",
+                (
+                    self._get_etag_hash()
+                    if xform
+                    else get_etag_hash_from_query(None, None)
+                ),
+            )
         except ValueError as e:
             raise ParseError(str(e)) from e
         except DataError as e:
             raise ParseError(str(e)) from e
 
+    def _get_etag_hash(self):
+        """Returns the ETag of the requested form data.
+
+        The ETag is derived from the submissions versions of the forms, so it is
+        computed without querying the submissions.
+        """
+        xform = self.get_object()
+
+        return get_etag_hash_from_submissions_version(
+            getattr(self, "etag_xform_ids", None) or [xform.pk],
+            get_xform_perms_version(xform.pk),
+            self.request.user.pk,
+            self.request.headers.get("Accept", ""),
+            self.request.get_full_path(),
+        )
+
+    def _is_not_modified(self, etag_hash):
+        """Returns True if the request's If-None-Match header matches the ETag."""
+        if_none_match = self.request.headers.get("If-None-Match")
+        if not if_none_match:
+            return False
+
+        etags = {
+            etag.strip().removeprefix("W/").strip('"')
+            for etag in if_none_match.split(",")
+        }
+
+        return etag_hash in etags or "*" in etags
+
+    def _is_ndjson_request(self):
+        """Returns True if newline delimited JSON is requested."""
+        renderer = getattr(self.request, "accepted_renderer", None)
+
+        return getattr(renderer, "format", None) == "ndjson"
+
+    def _get_stream_chunk_size(self):
+        """Returns the number of rows fetched at a time for streamed requests."""
+        if not self._is_ndjson_request():
+            return None
+
+        return getattr(settings, "DATA_STREAM_CHUNK_SIZE", 1000)
+
     def paginate_queryset(self, queryset):
         """Returns a paginated queryset."""
         if self.paginator is None:
@@ -896,6 +928,14 @@ class DataViewSet(
         is_encrypted,
         decryption_status,
     ):
+        if not is_public_request:
+            etag_hash = self._get_etag_hash()
+            if self._is_not_modified(etag_hash):
+                # The client has the current data, skip querying it
+                return Response(
+                    status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag_hash}
+                )
+
         self.set_object_list(
             query,
             fields,
@@ -909,7 +949,10 @@ class DataViewSet(
         should_paginate = self._should_paginate()
         retrieval_threshold = getattr(settings, "SUBMISSION_RETRIEVAL_THRESHOLD", 10000)
 
-        if not should_paginate and not is_public_request:
+        # NDJSON is streamed in constant memory, it is only paginated on request
+        is_ndjson = self._is_ndjson_request() and not is_public_request
+
+        if not should_paginate and not is_public_request and not is_ndjson:
             # Paginate requests that try to retrieve data that surpasses
             # the submission retrieval threshold
             xform = self.get_object()
@@ -943,7 +986,9 @@ class DataViewSet(
 
         stream_data = getattr(settings, "STREAM_DATA", False)
 
-        if stream_data:
+        if is_ndjson:
+            response = self._get_ndjson_streaming_response()
+        elif stream_data:
             response = self._get_streaming_response()
         else:
             serializer = self.get_serializer(self.object_list, many=True)
@@ -955,11 +1000,6 @@ class DataViewSet(
         """
         Get a StreamingHttpResponse response object
         """
-
-        def get_json_string(item):
-            """Returns the ``item`` Instance instance as a JSON string."""
-            return json.dumps(item.json if isinstance(item, Instance) else item)
-
         if self.kwargs.get("format") == "xml":
             response = StreamingHttpResponse(
                 renderers.InstanceXMLRenderer().stream_data(
@@ -973,6 +1013,29 @@ class DataViewSet(
                 content_type="application/json",
             )
 
+        return self._set_streaming_response_headers(response)
+
+    def _get_ndjson_streaming_response(self):
+        """
+        Get a StreamingHttpResponse of newline delimited JSON records
+
+        Querysets are read from a server-side cursor so rows are sent as they are
+        fetched.
+        """
+        data = self.object_list
+        if isinstance(data, QuerySet):
+            data = data.values_list("json", flat=True).iterator(
+                chunk_size=self._get_stream_chunk_size()
+            )
+
+        response = StreamingHttpResponse(
+            ndjson_stream(data, get_json_string),
+            content_type=renderers.NDJSONRenderer.media_type,
+        )
+
+        return self._set_streaming_response_headers(response)
+
+    def _set_streaming_response_headers(self, response):
         # calculate etag value and add it to response headers
         if hasattr(self, "etag_hash"):
             self.set_etag_header(None, self.etag_hash)
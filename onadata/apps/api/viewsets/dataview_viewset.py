@@ -1,8 +1,9 @@
 # -*- coding: utf-8 -*-
 """The /dataview API endpoint implementation."""
 
+from django.conf import settings
 from django.db.models.signals import post_delete, post_save
-from django.http import Http404, HttpResponseBadRequest
+from django.http import Http404, HttpResponseBadRequest, StreamingHttpResponse
 from django.utils.translation import gettext as _
 
 from celery.result import AsyncResult
@@ -34,9 +35,15 @@ from onadata.libs.utils.api_export_tools import (
     process_async_export,
     response_for_format,
 )
-from onadata.libs.utils.bbox_tools import compute_instance_bbox
+from onadata.libs.utils.bbox_tools import (
+    compute_instance_bbox,
+    get_cached_instance_tile,
+    get_tile_coordinates,
+    get_tile_response,
+)
 from onadata.libs.utils.cache_tools import (
     DATAVIEW_BBOX_CACHE,
+    DATAVIEW_TILE_CACHE,
     PROJECT_LINKED_DATAVIEWS,
     clear_project_owner_cache,
     get_bbox_cache_ttl,
@@ -54,6 +61,9 @@ from onadata.libs.utils.export_tools import parse_request_export_options, str_to
 
 # pylint: disable=invalid-name
 BaseViewset = get_baseviewset_class()
+SUBMISSION_RETRIEVAL_THRESHOLD = getattr(
+    settings, "SUBMISSION_RETRIEVAL_THRESHOLD", 10000
+)
 
 
 def get_form_field_chart_url(url, field):
@@ -97,6 +107,7 @@ class DataViewViewSet(
         renderers.CSVRenderer,
         renderers.CSVZIPRenderer,
         renderers.SAVZIPRenderer,
+        renderers.ParquetRenderer,
         renderers.ZipRenderer,
         renderers.GeoJsonRenderer,
     ]
@@ -115,6 +126,20 @@ class DataViewViewSet(
 
         return serializer_class
 
+    def _is_paginated_request(self):
+        """Returns True if the request gets a page of the results.
+
+        Requests without page or page_size get the default page when the form
+        has more than SUBMISSION_RETRIEVAL_THRESHOLD submissions.
+        """
+        query_params = self.request.query_params
+
+        return (
+            self.paginator.page_query_param in query_params
+            or self.paginator.page_size_query_param in query_params
+            or self.object.xform.num_of_submissions > SUBMISSION_RETRIEVAL_THRESHOLD
+        )
+
     def list(self, request, *args, **kwargs):
         """
         List endpoint for Filtered datasets
@@ -156,10 +181,25 @@ class DataViewViewSet(
             return Response(serializer.data)
 
         if export_type == "geojson":
-            page = self.paginate_queryset(get_dataview_instances(self.object))
+            geojson_content_type = "application/geo+json"
+            instances = (
+                get_dataview_instances(self.object)
+                .only("id", "json", "geom", "xform_id")
+                .order_by("id")
+            )
+
+            if not self._is_paginated_request():
+                return StreamingHttpResponse(
+                    renderers.GeoJsonRenderer().stream_data(
+                        instances.iterator(),
+                        self.get_serializer(),
+                    ),
+                    content_type=geojson_content_type,
+                )
+
+            page = self.paginate_queryset(instances)
 
             serializer = self.get_serializer(page, many=True)
-            geojson_content_type = "application/geo+json"
             return Response(
                 serializer.data, headers={"Content-Type": geojson_content_type}
             )
@@ -191,6 +231,39 @@ class DataViewViewSet(
         safe_cache_set(cache_key, data, get_bbox_cache_ttl())
         return Response(data)
 
+    # pylint: disable=unused-argument,invalid-name
+    @action(
+        methods=["GET"],
+        detail=True,
+        url_path=r"tiles/(?P<z>\d+)/(?P<x>\d+)/(?P<y>\d+)",
+        renderer_classes=[
+            *api_settings.DEFAULT_RENDERER_CLASSES,
+            renderers.MVTRenderer,
+        ],
+    )
+    def tiles(self, request, z, x, y, *args, **kwargs):
+        """Return the ``z/x/y`` Mapbox Vector Tile of the dataview's submissions.
+
+        Applies the dataview's query filter and the form's meta permissions.
+        Cached and busted on submission create/edit/delete for the underlying
+        xform and on dataview changes.
+        """
+        # pylint: disable=attribute-defined-outside-init
+        self.object = self.get_object()
+        z, x, y = get_tile_coordinates(z, x, y)
+        tile = get_cached_instance_tile(
+            DATAVIEW_TILE_CACHE,
+            self.object.pk,
+            [self.object.xform],
+            z,
+            x,
+            y,
+            request.user,
+            dataview=self.object,
+        )
+
+        return get_tile_response(tile)
+
     # pylint: disable=too-many-locals
     @action(methods=["GET"], detail=True)
     def export_async(self, request, *args, **kwargs):
@@ -40,6 +40,7 @@ class ExportViewSet(DestroyModelMixin, ReadOnlyModelViewSet):
         renderers.CSVZIPRenderer,
         renderers.KMLRenderer,
         renderers.OSMExportRenderer,
+        renderers.ParquetRenderer,
         renderers.SAVZIPRenderer,
         renderers.XLSRenderer,
         renderers.XLSXRenderer,
@@ -18,6 +18,7 @@ from rest_framework_json_api.renderers import JSONRenderer
 
 from onadata.apps.api.permissions import XFormPermissions
 from onadata.apps.logger.models import Instance, XForm
+from onadata.apps.logger.models.merged_xform import get_merged_xform_ids
 from onadata.libs import filters
 from onadata.libs.renderers.renderers import floip_list
 from onadata.libs.serializers.floip_serializer import (
@@ -148,11 +149,8 @@ class FloipViewSet(
                 status_code = status.HTTP_201_CREATED
         else:
             if xform.is_merged_dataset:
-                pks = xform.mergedxform.xforms.filter(
-                    deleted_at__isnull=True
-                ).values_list("pk", flat=True)
                 queryset = Instance.objects.filter(
-                    xform_id__in=pks, deleted_at__isnull=True
+                    xform_id__in=get_merged_xform_ids(xform), deleted_at__isnull=True
                 ).values_list("json", flat=True)
             else:
                 queryset = xform.instances.values_list("json", flat=True)
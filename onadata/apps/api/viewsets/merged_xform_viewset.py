@@ -14,15 +14,22 @@ from rest_framework.response import Response
 from rest_framework.settings import api_settings
 
 from onadata.apps.api.permissions import XFormPermissions
-from onadata.apps.logger.models import Instance, MergedXForm
+from onadata.apps.logger.models import Instance, MergedXForm, XForm
+from onadata.apps.logger.models.merged_xform import get_merged_xform_descriptor
 from onadata.libs import filters
 from onadata.libs.pagination import StandardPageNumberPagination
 from onadata.libs.renderers import renderers
 from onadata.libs.serializers.geojson_serializer import GeoJsonSerializer
 from onadata.libs.serializers.merged_xform_serializer import MergedXFormSerializer
-from onadata.libs.utils.bbox_tools import compute_instance_bbox
+from onadata.libs.utils.bbox_tools import (
+    compute_instance_bbox,
+    get_cached_instance_tile,
+    get_tile_coordinates,
+    get_tile_response,
+)
 from onadata.libs.utils.cache_tools import (
     MERGED_XFORM_BBOX_CACHE,
+    MERGED_XFORM_TILE_CACHE,
     get_bbox_cache_ttl,
     safe_cache_get,
     safe_cache_set,
@@ -119,16 +126,44 @@ class MergedXFormViewSet(
         if cached is not None:
             return Response(cached)
 
-        xform_ids = list(
-            merged_xform.xforms.filter(
-                deleted_at__isnull=True,
-                project__organization__is_active=True,
-            ).values_list("pk", flat=True)
-        )
+        xform_ids = get_merged_xform_descriptor(merged_xform.pk)["active_xform_ids"]
         data = {"bbox": compute_instance_bbox(xform_ids)}
         safe_cache_set(cache_key, data, get_bbox_cache_ttl())
         return Response(data)
 
+    # pylint: disable=unused-argument,invalid-name
+    @action(
+        methods=["GET"],
+        detail=True,
+        url_path=r"tiles/(?P<z>\d+)/(?P<x>\d+)/(?P<y>\d+)",
+        renderer_classes=[
+            *api_settings.DEFAULT_RENDERER_CLASSES,
+            renderers.MVTRenderer,
+        ],
+    )
+    def tiles(self, request, z, x, y, *args, **kwargs):
+        """Return the ``z/x/y`` Mapbox Vector Tile across the merged xforms.
+
+        Covers the same xforms as the bbox action, limited to the submissions
+        the user may view with each form's meta permissions. Cached and busted
+        whenever a submission to any member xform is created, edited, or
+        deleted.
+        """
+        merged_xform = self.get_object()
+        z, x, y = get_tile_coordinates(z, x, y)
+        xform_ids = get_merged_xform_descriptor(merged_xform.pk)["active_xform_ids"]
+        tile = get_cached_instance_tile(
+            MERGED_XFORM_TILE_CACHE,
+            merged_xform.pk,
+            XForm.objects.filter(pk__in=xform_ids),
+            z,
+            x,
+            y,
+            request.user,
+        )
+
+        return get_tile_response(tile)
+
     # pylint: disable=unused-argument
     @action(methods=["GET"], detail=True)
     def data(self, request, *args, **kwargs):
@@ -137,10 +172,9 @@ class MergedXFormViewSet(
         export_type = self.kwargs.get("format", request.GET.get("format"))
         queryset = (
             Instance.objects.filter(
-                xform__in=merged_xform.xforms.filter(
-                    deleted_at__isnull=True,
-                    project__organization__is_active=True,
-                ),
+                xform_id__in=get_merged_xform_descriptor(merged_xform.pk)[
+                    "active_xform_ids"
+                ],
                 deleted_at__isnull=True,
             )
             .only("id", "json", "geom", "xform_id")
@@ -22,6 +22,7 @@ from rest_framework.viewsets import ModelViewSet
 from onadata.apps.api.permissions import OpenDataViewSetPermissions
 from onadata.apps.api.tools import get_baseviewset_class
 from onadata.apps.logger.models import Instance
+from onadata.apps.logger.models.merged_xform import get_merged_xform_ids
 from onadata.apps.logger.models.open_data import OpenData
 from onadata.apps.logger.models.xform import XForm, question_types_to_exclude
 from onadata.apps.viewer.models.data_dictionary import DataDictionary
@@ -261,11 +262,7 @@ class OpenDataViewSet(ETagsMixin, CacheControlMixin, BaseViewset, ModelViewSet):
 
             xform = self.object.content_object
             if xform.is_merged_dataset:
-                qs_kwargs = {
-                    "xform_id__in": list(
-                        xform.mergedxform.xforms.values_list("pk", flat=True)
-                    )
-                }
+                qs_kwargs = {"xform_id__in": get_merged_xform_ids(xform)}
             else:
                 qs_kwargs = {"xform_id": xform.pk}
             if gt_id:
@@ -14,6 +14,7 @@ from rest_framework.response import Response
 from onadata.apps.api.tools import replace_attachment_name_with_url
 from onadata.apps.api.viewsets.open_data_viewset import OpenDataViewSet
 from onadata.apps.logger.models import Instance
+from onadata.apps.logger.models.merged_xform import get_merged_xform_ids
 from onadata.apps.logger.models.xform import XForm
 from onadata.libs.data import parse_int
 from onadata.libs.pagination import RawSQLQueryPageNumberPagination
@@ -201,10 +202,7 @@ class TableauViewSet(OpenDataViewSet):
                 qs_kwargs = {}
 
                 if xform.is_merged_dataset:
-                    xform_pks = list(
-                        xform.mergedxform.xforms.values_list("pk", flat=True)
-                    )
-                    qs_kwargs = {"xform__pk__in": xform_pks}
+                    qs_kwargs = {"xform__pk__in": get_merged_xform_ids(xform)}
 
                 else:
                     qs_kwargs = {"xform__pk": xform.pk}
@@ -233,12 +231,7 @@ class TableauViewSet(OpenDataViewSet):
                 "SELECT id, json from logger_instance"  # nosec
                 " WHERE xform_id IN %s AND deleted_at IS NULL" + sql_where  # noqa W503
             )
-            xform_pks = [xform.id]
-
-            if xform.is_merged_dataset:
-                xform_pks = list(xform.mergedxform.xforms.values_list("pk", flat=True))
-
-            sql_params = [tuple(xform_pks)] + sql_where_params
+            sql_params = [tuple(get_merged_xform_ids(xform))] + sql_where_params
 
             if should_paginate:
                 raw_paginator = RawSQLQueryPageNumberPagination()
@@ -9,7 +9,6 @@ from django.shortcuts import get_object_or_404
 
 from django_filters import rest_framework as django_filter_filters
 from rest_framework import permissions, viewsets
-from rest_framework.authentication import TokenAuthentication
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
@@ -24,7 +23,11 @@ from onadata.apps.logger.models.xform import XForm, get_forms_shared_with_user
 from onadata.apps.main.models.meta_data import MetaData
 from onadata.apps.main.models.user_profile import UserProfile
 from onadata.libs import filters
-from onadata.libs.authentication import DigestAuthentication, EnketoTokenAuthentication
+from onadata.libs.authentication import (
+    DigestAuthentication,
+    EnketoTokenAuthentication,
+    LastLoginTokenAuthentication,
+)
 from onadata.libs.mixins.etags_mixin import ETagsMixin
 from onadata.libs.mixins.openrosa_headers_mixin import get_openrosa_headers
 from onadata.libs.renderers.renderers import (
@@ -61,7 +64,7 @@ class XFormListViewSet(ETagsMixin, BaseViewset, viewsets.ReadOnlyModelViewSet):
     authentication_classes = (
         DigestAuthentication,
         EnketoTokenAuthentication,
-        TokenAuthentication,
+        LastLoginTokenAuthentication,
     )
     content_negotiation_class = MediaFileContentNegotiation
     filterset_class = filters.FormIDFilter
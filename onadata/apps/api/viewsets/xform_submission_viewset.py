@@ -9,7 +9,6 @@ from django.shortcuts import get_object_or_404
 from django.utils.translation import gettext as _
 
 from rest_framework import mixins, permissions, status, viewsets
-from rest_framework.authentication import TokenAuthentication
 from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
 from rest_framework.renderers import BrowsableAPIRenderer, JSONRenderer
 from rest_framework.response import Response
@@ -21,6 +20,7 @@ from onadata.libs import filters
 from onadata.libs.authentication import (
     DigestAuthentication,
     EnketoTokenAuthentication,
+    LastLoginTokenAuthentication,
     LockoutBasicAuthentication,
 )
 from onadata.libs.mixins.authenticate_header_mixin import AuthenticateHeaderMixin
@@ -70,7 +70,7 @@ class XFormSubmissionViewSet(
     authentication_classes = (
         DigestAuthentication,
         LockoutBasicAuthentication,
-        TokenAuthentication,
+        LastLoginTokenAuthentication,
         EnketoTokenAuthentication,
     )
     filter_backends = (filters.AnonDjangoObjectPermissionFilter,)
@@ -85,13 +85,19 @@ from onadata.libs.utils.api_export_tools import (
     process_async_export,
     response_for_format,
 )
-from onadata.libs.utils.bbox_tools import compute_instance_bbox
+from onadata.libs.utils.bbox_tools import (
+    compute_instance_bbox,
+    get_cached_instance_tile,
+    get_tile_coordinates,
+    get_tile_response,
+)
 from onadata.libs.utils.cache_tools import (
     ENKETO_PREVIEW_URL_CACHE,
     ENKETO_SINGLE_SUBMIT_URL_CACHE,
     ENKETO_URL_CACHE,
     ENKETO_URLS_CACHE,
     XFORM_BBOX_CACHE,
+    XFORM_TILE_CACHE,
     clear_project_owner_cache,
     get_bbox_cache_ttl,
     get_enketo_urls_cache_ttl,
@@ -449,6 +455,7 @@ class XFormViewSet(
         renderers.CSVRenderer,
         renderers.CSVZIPRenderer,
         renderers.SAVZIPRenderer,
+        renderers.ParquetRenderer,
         renderers.SurveyRenderer,
         renderers.OSMExportRenderer,
         renderers.ZipRenderer,
@@ -1086,6 +1093,32 @@ class XFormViewSet(
         safe_cache_set(cache_key, data, get_bbox_cache_ttl())
         return Response(data)
 
+    # pylint: disable=unused-argument,invalid-name
+    @action(
+        methods=["GET"],
+        detail=True,
+        url_path=r"tiles/(?P<z>\d+)/(?P<x>\d+)/(?P<y>\d+)",
+        renderer_classes=[
+            *api_settings.DEFAULT_RENDERER_CLASSES,
+            renderers.MVTRenderer,
+        ],
+    )
+    def tiles(self, request, z, x, y, *args, **kwargs):
+        """Return the ``z/x/y`` Mapbox Vector Tile of geolocated submissions.
+
+        Each submission is a feature of the ``submissions`` layer with its
+        ``id`` and ``xform_id``. Only the submissions the user may view with
+        the form's meta permissions are included. Cached and busted on
+        submission create/edit/delete.
+        """
+        xform = self.get_object()
+        z, x, y = get_tile_coordinates(z, x, y)
+        tile = get_cached_instance_tile(
+            XFORM_TILE_CACHE, xform.pk, [xform], z, x, y, request.user
+        )
+
+        return get_tile_response(tile)
+
     @action(methods=["GET"], detail=True)
     def export_async(self, request, *args, **kwargs):
         """Returns the status of an async export."""
@@ -1106,7 +1139,7 @@ class XFormViewSet(
 
         job_uuid = request.query_params.get("job_uuid")
 
-        if export_type in ["csvzip", "savzip"]:
+        if export_type in ["csvzip", "savzip", "parquet"]:
             # Overide renderer and mediatype because all response are
             # suppose to be in json
             # TODO: Avoid overiding the format query param for export type
@@ -0,0 +1,77 @@
+"""
+Management command to queue the decryption of encrypted submissions in batches.
+"""
+
+import math
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.translation import gettext_lazy as _
+
+from onadata.apps.logger.models import Instance
+from onadata.apps.logger.tasks import decrypt_instances_async
+
+DEFAULT_BATCH_SIZE = 100
+
+
+class Command(BaseCommand):
+    """Queue the decryption of encrypted submissions in batches.
+
+    Each batch is decrypted by a single task reusing one KMS client.
+
+    Usage:
+        python manage.py decrypt_submissions
+        python manage.py decrypt_submissions --xforms <pk1> <pk2> ...
+        python manage.py decrypt_submissions --failed --batch-size 500
+    """
+
+    help = _("Queue the decryption of encrypted submissions in batches.")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--xforms",
+            dest="xform_ids",
+            nargs="+",
+            type=int,
+            help=_("Primary keys of the forms whose submissions are decrypted"),
+        )
+        parser.add_argument(
+            "--failed",
+            action="store_true",
+            help=_("Also retry submissions whose decryption failed"),
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=_("Number of submissions decrypted by each task"),
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+
+        if batch_size < 1:
+            raise CommandError("--batch-size must be at least 1")
+
+        statuses = [Instance.DecryptionStatus.PENDING]
+
+        if options["failed"]:
+            statuses.append(Instance.DecryptionStatus.FAILED)
+
+        instance_qs = Instance.objects.filter(
+            is_encrypted=True,
+            deleted_at__isnull=True,
+            decryption_status__in=statuses,
+        )
+
+        if options["xform_ids"]:
+            instance_qs = instance_qs.filter(xform_id__in=options["xform_ids"])
+
+        instance_ids = list(instance_qs.order_by("pk").values_list("pk", flat=True))
+
+        for start in range(0, len(instance_ids), batch_size):
+            decrypt_instances_async.delay(instance_ids[start : start + batch_size])
+
+        self.stdout.write(
+            f"Queued {len(instance_ids)} submissions for decryption in "
+            f"{math.ceil(len(instance_ids) / batch_size)} batches"
+        )
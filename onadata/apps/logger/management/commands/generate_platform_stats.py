@@ -8,75 +8,82 @@ import calendar
 import csv
 import os.path
 from datetime import datetime
+from datetime import timezone as dt_timezone
 
-from django.contrib.auth import get_user_model
-from django.core.management.base import BaseCommand
-from django.db.models import Q
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count, Q
 from django.utils import timezone
 from django.utils.translation import gettext as _
 
-from multidb.pinning import use_master
-
-from onadata.apps.api.models import OrganizationProfile
 from onadata.apps.logger.models import Instance, XForm
-from onadata.libs.permissions import is_organization
 
-User = get_user_model()
+# Number of forms read from the database at a time
+CHUNK_SIZE = 2000
 
 
-# pylint: disable=too-many-locals
-def _write_stats_to_file(month: int, year: int, include_extra: bool, filename: str):
-    with open(filename, "w", encoding="utf-8") as out_file:
-        writer = csv.writer(out_file)
-        headers = ["Username", "Project Name", "Form Title", "No. of submissions"]
-        form_fields = [
-            "id",
-            "project__name",
-            "project__organization__username",
-            "title",
-        ]
-        if include_extra:
-            headers += ["Is Organization", "Organization Created By", "User last login"]
-            form_fields += ["project__organization__last_login"]
+def _get_submission_counts(date_obj, database):
+    """Returns the number of submissions of each form at ``date_obj``."""
+    counts = (
+        Instance.objects.using(database)
+        .filter(
+            Q(deleted_at__isnull=True) | Q(deleted_at__gt=date_obj),
+            date_created__lte=date_obj,
+        )
+        .order_by()
+        .values_list("xform_id")
+        .annotate(num=Count("id"))
+    )
+
+    return dict(counts.iterator(chunk_size=CHUNK_SIZE))
 
-        writer.writerow(headers)
-        _, last_day = calendar.monthrange(year, month)
-        date_obj = timezone.make_aware(datetime(year, month, last_day), timezone.utc)
 
-        forms = XForm.objects.filter(
+def _write_stats_to_file(
+    month: int, year: int, include_extra: bool, filename: str, database="default"
+):
+    """Writes the platform statistics of ``month`` to ``filename``.
+
+    The submissions are counted in one grouped query and the forms, with their
+    owners, are read in a second query streamed to the file.
+    """
+    _, last_day = calendar.monthrange(year, month)
+    date_obj = timezone.make_aware(datetime(year, month, last_day), dt_timezone.utc)
+    headers = ["Username", "Project Name", "Form Title", "No. of submissions"]
+    form_fields = [
+        "id",
+        "project__name",
+        "project__organization__username",
+        "title",
+    ]
+    if include_extra:
+        headers += ["Is Organization", "Organization Created By", "User last login"]
+        form_fields += [
+            "project__organization__profile__organizationprofile__creator__username",
+            "project__organization__last_login",
+        ]
+
+    submission_counts = _get_submission_counts(date_obj, database)
+    forms = (
+        XForm.objects.using(database)
+        .filter(
             Q(deleted_at__isnull=True) | Q(deleted_at__gt=date_obj),
             date_created__lte=date_obj,
-        ).values(*form_fields)
-        with use_master:
-            for form in forms:
-                instance_count = Instance.objects.filter(
-                    Q(deleted_at__isnull=True) | Q(deleted_at__gt=date_obj),
-                    xform_id=form.get("id"),
-                    date_created__lte=date_obj,
-                ).count()
-                row = [
-                    form.get("project__organization__username"),
-                    form.get("project__name"),
-                    form.get("title"),
-                    instance_count,
-                ]
-                if include_extra:
-                    user = User.objects.get(
-                        username=form.get("project__organization__username")
-                    )
-                    is_org = is_organization(user.profile)
-                    if is_org:
-                        created_by = OrganizationProfile.objects.get(
-                            user=user
-                        ).creator.username
-                    else:
-                        created_by = "N/A"
-                    row += [
-                        is_org,
-                        created_by,
-                        form.get("project__organization__last_login"),
-                    ]
-                writer.writerow(row)
+        )
+        .order_by("id")
+        .values_list(*form_fields)
+    )
+
+    with open(filename, "w", encoding="utf-8") as out_file:
+        writer = csv.writer(out_file)
+        writer.writerow(headers)
+        for form_id, project, username, title, *extra in forms.iterator(
+            chunk_size=CHUNK_SIZE
+        ):
+            row = [username, project, title, submission_counts.get(form_id, 0)]
+            if include_extra:
+                created_by, last_login = extra
+                row += [created_by is not None, created_by or "N/A", last_login]
+            writer.writerow(row)
 
 
 class Command(BaseCommand):
@@ -116,12 +123,26 @@ class Command(BaseCommand):
                 "user last login"
             ),
         )
+        parser.add_argument(
+            "--database",
+            "-d",
+            dest="database",
+            default="default",
+            help=(
+                "Database to read the statistics from, e.g. a read replica. "
+                "Defaults to the primary database"
+            ),
+        )
 
     def handle(self, *args, **options):
         month = int(options.get("month") or datetime.now().month)
         year = int(options.get("year") or datetime.now().year)
         include_extra = bool(options.get("extra_info"))
+        database = options.get("database") or "default"
+        if database not in settings.DATABASES:
+            raise CommandError(f"Database '{database}' is not configured")
+
         filename = f"platform_statistics_{month}_{year}.csv"
-        _write_stats_to_file(month, year, include_extra, filename)
+        _write_stats_to_file(month, year, include_extra, filename, database)
         if os.path.exists(filename):
             self.stdout.write(f"File '{filename}' successfully created.")
@@ -11,7 +11,7 @@ from django.contrib.auth import get_user_model
 from django.core.management.base import BaseCommand
 from django.utils.translation import gettext as _
 
-from onadata.libs.utils.briefcase_client import BriefcaseClient
+from onadata.libs.utils.briefcase_client import DEFAULT_MAX_WORKERS, BriefcaseClient
 
 
 class Command(BaseCommand):
@@ -24,6 +24,12 @@ class Command(BaseCommand):
         parser.add_argument("-u", "--username", help=_("Username"))
         parser.add_argument("-p", "--password", help=_("Password"))
         parser.add_argument("--to", help=_("username in this server"))
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=DEFAULT_MAX_WORKERS,
+            help=_("Number of concurrent downloads or uploads"),
+        )
 
     def handle(self, *args, **options):
         """Insert all existing parsed instances into MongoDB"""
@@ -32,6 +38,11 @@ class Command(BaseCommand):
         password = options.get("password")
         user = get_user_model().objects.get(username=options.get("to"))
         client = BriefcaseClient(
-            username=username, password=password, user=user, url=url
+            username=username,
+            password=password,
+            user=user,
+            url=url,
+            max_workers=options.get("workers"),
         )
         client.push()
+        self.stdout.write(str(client.get_summary()))
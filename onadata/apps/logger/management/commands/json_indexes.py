@@ -0,0 +1,129 @@
+"""
+Management command python manage.py json_indexes
+
+Manages the indexes serving the data `query` filters on the submissions json
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils.translation import gettext_lazy
+
+from onadata.apps.logger.models import XForm
+from onadata.apps.viewer.models.parsed_instance import get_sql_with_params
+from onadata.libs.utils.cache_tools import get_xform_query_field_counts
+from onadata.libs.utils.json_index_tools import (
+    create_json_field_index,
+    create_json_path_index,
+    create_json_trigram_index,
+    drop_json_index,
+    get_json_indexes,
+)
+
+
+class Command(BaseCommand):
+    """Manage the indexes serving the data `query` filters
+
+    Usage:
+    python manage.py json_indexes --path --trigram
+    python manage.py json_indexes --form 689 --fields age name
+    python manage.py json_indexes --form 689 --frequent 3
+    python manage.py json_indexes --explain 689 --query '{"age": "25"}'
+    python manage.py json_indexes --drop logger_inst_json_trgm_idx
+    """
+
+    help = gettext_lazy("Manage the indexes serving the data query filters")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--path",
+            action="store_true",
+            help=gettext_lazy("Create the jsonb_path_ops GIN index on the json"),
+        )
+        parser.add_argument(
+            "--trigram",
+            action="store_true",
+            help=gettext_lazy("Create the pg_trgm index for the free text search"),
+        )
+        parser.add_argument(
+            "--form", type=int, help=gettext_lazy("Form to create field indexes for")
+        )
+        parser.add_argument(
+            "--fields", nargs="+", default=[], help=gettext_lazy("Fields to index")
+        )
+        parser.add_argument(
+            "--frequent",
+            type=int,
+            default=0,
+            help=gettext_lazy("Index the form's N most frequently filtered fields"),
+        )
+        parser.add_argument(
+            "--drop", nargs="+", default=[], help=gettext_lazy("Indexes to drop")
+        )
+        parser.add_argument(
+            "--explain",
+            type=int,
+            help=gettext_lazy("Form to show the plan of a data query for"),
+        )
+        parser.add_argument(
+            "--query", default="{}", help=gettext_lazy("The query to explain")
+        )
+
+    def handle(self, *args, **options):
+        for index_name in options["drop"]:
+            try:
+                drop_json_index(index_name)
+            except ValueError as error:
+                raise CommandError(str(error)) from error
+            self.stdout.write(f"Dropped {index_name}")
+
+        if options["path"]:
+            self._create(create_json_path_index)
+
+        if options["trigram"]:
+            self._create(create_json_trigram_index)
+
+        if options["form"]:
+            xform = self._get_xform(options["form"])
+            fields = list(options["fields"])
+            if options["frequent"]:
+                fields += self._get_frequent_fields(xform, options["frequent"])
+            for field in dict.fromkeys(fields):
+                self._create(create_json_field_index, xform.pk, field)
+
+        if options["explain"]:
+            self._explain(self._get_xform(options["explain"]), options["query"])
+
+        for name, definition, size in get_json_indexes():
+            self.stdout.write(f"{name} ({size}): {definition}")
+
+    def _get_xform(self, xform_id):
+        try:
+            return XForm.objects.get(pk=xform_id)
+        except XForm.DoesNotExist as error:
+            raise CommandError(f"Form {xform_id} does not exist") from error
+
+    def _get_frequent_fields(self, xform, count):
+        counts = get_xform_query_field_counts(xform.pk)
+        fields = sorted(counts, key=counts.get, reverse=True)[:count]
+        for field in fields:
+            self.stdout.write(f"{field}: filtered {counts[field]} times")
+
+        return fields
+
+    def _create(self, create_index, *args):
+        start = time.monotonic()
+        index_name = create_index(*args)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {index_name} in {time.monotonic() - start:.1f}s"
+            )
+        )
+
+    def _explain(self, xform, query):
+        sql, params = get_sql_with_params(xform, query=query)
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS) {sql}", params)
+            for (line,) in cursor.fetchall():
+                self.stdout.write(line)
@@ -11,7 +11,7 @@ from django.contrib.auth import get_user_model
 from django.core.management.base import BaseCommand
 from django.utils.translation import gettext as _
 
-from onadata.libs.utils.briefcase_client import BriefcaseClient
+from onadata.libs.utils.briefcase_client import DEFAULT_MAX_WORKERS, BriefcaseClient
 
 
 class Command(BaseCommand):
@@ -27,6 +27,12 @@ class Command(BaseCommand):
         parser.add_argument("-u", "--username", help=_("Username"))
         parser.add_argument("-p", "--password", help=_("Password"))
         parser.add_argument("--to", help=_("username in this server"))
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=DEFAULT_MAX_WORKERS,
+            help=_("Number of concurrent downloads or uploads"),
+        )
 
     def handle(self, *args, **kwargs):
         url = kwargs.get("url")
@@ -41,6 +47,11 @@ class Command(BaseCommand):
         else:
             user = get_user_model().objects.get(username=to_username)
             briefcase_client = BriefcaseClient(
-                username=username, password=password, user=user, url=url
+                username=username,
+                password=password,
+                user=user,
+                url=url,
+                max_workers=kwargs.get("workers"),
             )
             briefcase_client.download_xforms(include_instances=True)
+            self.stdout.write(str(briefcase_client.get_summary()))
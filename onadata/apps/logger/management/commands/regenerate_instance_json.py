@@ -8,7 +8,10 @@ from django.core.management.base import BaseCommand, CommandError
 
 from celery.result import AsyncResult
 
-from onadata.apps.api.tasks import regenerate_form_instance_json
+from onadata.apps.api.tasks import (
+    get_instance_json_progress,
+    regenerate_form_instance_json,
+)
 from onadata.apps.logger.models import XForm
 from onadata.libs.utils.cache_tools import (
     XFORM_REGENERATE_INSTANCE_JSON_TASK,
@@ -55,13 +58,24 @@ class Command(BaseCommand):
 
         cache_key = f"{XFORM_REGENERATE_INSTANCE_JSON_TASK}{xform.pk}"
         cached_task_id: str | None = safe_cache_get(cache_key)
-
-        if cached_task_id and AsyncResult(cached_task_id).state.upper() != "FAILURE":
-            # FAILURE is the only state that should trigger regeneration if
-            # a regeneration had earlier been triggered
-            self.stdout.write(
-                self.style.WARNING(f"Regeneration for {xform.pk} IN PROGRESS")
-            )
+        progress = get_instance_json_progress(xform.pk)
+
+        if (
+            cached_task_id
+            and AsyncResult(cached_task_id).state.upper() != "FAILURE"
+            and not (progress and progress["failed"])
+        ):
+            # FAILURE of the task or of one of its shards is the only state that
+            # should trigger regeneration if a regeneration had earlier been
+            # triggered. Shards that are done are not regenerated again.
+            message = f"Regeneration for {xform.pk} IN PROGRESS"
+            if progress:
+                message += (
+                    f": {progress['done']}/{progress['shards']} shards, "
+                    f"{progress['rows']}/{xform.num_of_submissions} rows "
+                    f"({progress['per_second']:.1f} rows/s)"
+                )
+            self.stdout.write(self.style.WARNING(message))
             return
 
         # Task has either failed or does not exist in cache, we create a new async task
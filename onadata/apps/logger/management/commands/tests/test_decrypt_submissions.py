@@ -0,0 +1,61 @@
+"""Tests for management command decrypt_submissions"""
+
+from io import StringIO
+from unittest.mock import call, patch
+
+from django.core.management import CommandError, call_command
+
+from onadata.apps.logger.models import Instance
+from onadata.apps.main.tests.test_base import TestBase
+
+
+@patch(
+    "onadata.apps.logger.management.commands.decrypt_submissions"
+    ".decrypt_instances_async.delay"
+)
+class DecryptSubmissionsTestCase(TestBase):
+    """Tests for management command decrypt_submissions"""
+
+    def setUp(self):
+        super().setUp()
+        self.out = StringIO()
+        self._publish_transportation_form()
+        self._make_submissions()
+        self.instance_ids = list(
+            self.xform.instances.order_by("pk").values_list("pk", flat=True)
+        )
+        Instance.objects.filter(pk__in=self.instance_ids).update(
+            is_encrypted=True, decryption_status=Instance.DecryptionStatus.PENDING
+        )
+
+    def test_batches_queued(self, mock_decrypt):
+        """Pending submissions are queued for decryption in batches"""
+        call_command("decrypt_submissions", batch_size=3, stdout=self.out)
+
+        mock_decrypt.assert_has_calls(
+            [call(self.instance_ids[:3]), call(self.instance_ids[3:])]
+        )
+        self.assertEqual(mock_decrypt.call_count, 2)
+        self.assertIn(
+            "Queued 4 submissions for decryption in 2 batches", self.out.getvalue()
+        )
+
+    def test_failed_submissions(self, mock_decrypt):
+        """Failed submissions are only queued when requested"""
+        Instance.objects.filter(pk=self.instance_ids[0]).update(
+            decryption_status=Instance.DecryptionStatus.FAILED
+        )
+
+        call_command("decrypt_submissions", xform_ids=[self.xform.pk], stdout=self.out)
+        mock_decrypt.assert_called_once_with(self.instance_ids[1:])
+
+        mock_decrypt.reset_mock()
+        call_command("decrypt_submissions", failed=True, stdout=self.out)
+        mock_decrypt.assert_called_once_with(self.instance_ids)
+
+    def test_invalid_batch_size(self, mock_decrypt):
+        """The batch size must be positive"""
+        with self.assertRaisesMessage(CommandError, "--batch-size"):
+            call_command("decrypt_submissions", batch_size=0, stdout=self.out)
+
+        mock_decrypt.assert_not_called()
@@ -0,0 +1,102 @@
+"""Tests for management command generate_platform_stats"""
+
+import csv
+import os
+import tempfile
+import uuid
+from datetime import timedelta
+
+from django.core.management import CommandError, call_command
+from django.utils import timezone
+
+from onadata.apps.logger.management.commands.generate_platform_stats import (
+    _write_stats_to_file,
+)
+from onadata.apps.logger.models import Instance, XForm
+from onadata.apps.main.tests.test_base import TestBase
+
+
+class GeneratePlatformStatsTestCase(TestBase):
+    """Tests for management command generate_platform_stats"""
+
+    def setUp(self):
+        super().setUp()
+
+        self._publish_transportation_form()
+        self._make_submissions()
+        # statistics are computed at the end of the month's last day
+        next_month = timezone.now() + timedelta(days=31)
+        self.month, self.year = next_month.month, next_month.year
+
+    def _get_stats(self, include_extra=False):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            filename = os.path.join(temp_dir, "stats.csv")
+            _write_stats_to_file(self.month, self.year, include_extra, filename)
+            with open(filename, encoding="utf-8") as stats_file:
+                return list(csv.reader(stats_file))
+
+    def _create_forms(self, num_of_forms, num_of_submissions):
+        """Creates copies of the form with ``num_of_submissions`` each."""
+        forms = []
+        for index in range(num_of_forms):
+            form = XForm.objects.get(pk=self.xform.pk)
+            form.pk = None
+            form.id_string = form.sms_id_string = f"copy_{index}"
+            form.uuid = uuid.uuid4().hex
+            forms.append(form)
+        forms = XForm.objects.bulk_create(forms)
+
+        instance = self.xform.instances.first()
+        Instance.objects.bulk_create(
+            Instance(
+                xform=form,
+                xml=instance.xml,
+                json=instance.json,
+                user=self.user,
+                survey_type_id=instance.survey_type_id,
+                uuid=uuid.uuid4().hex,
+            )
+            for form in forms
+            for _ in range(num_of_submissions)
+        )
+
+        return forms
+
+    def test_stats(self):
+        """The number of submissions of each form is written"""
+        instance = self.xform.instances.first()
+        instance.deleted_at = timezone.now()
+        instance.save()
+
+        rows = self._get_stats()
+        self.assertEqual(
+            rows,
+            [
+                ["Username", "Project Name", "Form Title", "No. of submissions"],
+                ["bob", self.xform.project.name, self.xform.title, "3"],
+            ],
+        )
+
+    def test_stats_extra_info(self):
+        """Organization and last login details are written"""
+        rows = self._get_stats(include_extra=True)
+        self.assertEqual(
+            rows[0][4:],
+            ["Is Organization", "Organization Created By", "User last login"],
+        )
+        self.assertEqual(rows[1][3:6], ["4", "False", "N/A"])
+
+    def test_num_queries(self):
+        """The number of queries does not grow with the number of forms"""
+        forms = self._create_forms(50, 5)
+
+        with self.assertNumQueries(2):
+            rows = self._get_stats(include_extra=True)
+
+        self.assertEqual(len(rows), len(forms) + 2)
+        self.assertEqual(sorted(row[3] for row in rows[1:]), ["4"] + ["5"] * len(forms))
+
+    def test_unknown_database(self):
+        """An unknown database is reported"""
+        with self.assertRaisesMessage(CommandError, "replica"):
+            call_command("generate_platform_stats", database="replica")
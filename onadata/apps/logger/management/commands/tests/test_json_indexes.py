@@ -0,0 +1,81 @@
+"""Tests for management command json_indexes"""
+
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+
+from onadata.apps.main.tests.test_base import TestBase
+from onadata.libs.utils.cache_tools import record_xform_query_fields
+from onadata.libs.utils.json_index_tools import (
+    JSON_PATH_INDEX,
+    get_field_index_name,
+    get_json_indexes,
+)
+
+
+class JsonIndexesTestCase(TestBase):
+    """Tests for management command json_indexes"""
+
+    def setUp(self):
+        super().setUp()
+
+        self._publish_transportation_form()
+        self._make_submissions()
+        self.out = StringIO()
+
+    def tearDown(self):
+        for name, _definition, _size in get_json_indexes():
+            call_command("json_indexes", "--drop", name, stdout=StringIO())
+
+        super().tearDown()
+
+    def test_creates_indexes(self):
+        """The GIN and the form's field indexes are created"""
+        for _query in range(5):
+            record_xform_query_fields(self.xform.pk, ["available"])
+        record_xform_query_fields(self.xform.pk, ["loop"])
+        call_command(
+            "json_indexes",
+            "--path",
+            "--form",
+            self.xform.pk,
+            "--fields",
+            "transport/loop_over_transport_types_frequency",
+            "--frequent",
+            "1",
+            stdout=self.out,
+        )
+        names = [name for name, _definition, _size in get_json_indexes()]
+
+        self.assertEqual(
+            sorted(names),
+            sorted(
+                [
+                    JSON_PATH_INDEX,
+                    get_field_index_name(
+                        self.xform.pk, "transport/loop_over_transport_types_frequency"
+                    ),
+                    get_field_index_name(self.xform.pk, "available"),
+                ]
+            ),
+        )
+        self.assertIn("available: filtered 5 times", self.out.getvalue())
+
+    def test_explain(self):
+        """The plan of a data query is shown"""
+        call_command(
+            "json_indexes",
+            "--explain",
+            self.xform.pk,
+            "--query",
+            '{"transport/available_transportation_types_to_referral_facility": '
+            '"none"}',
+            stdout=self.out,
+        )
+
+        self.assertIn("Execution Time", self.out.getvalue())
+
+    def test_drop_unmanaged_index(self):
+        """Only the managed json indexes can be dropped"""
+        with self.assertRaises(CommandError):
+            call_command("json_indexes", "--drop", "logger_instance_pkey")
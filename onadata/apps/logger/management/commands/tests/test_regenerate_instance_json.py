@@ -120,3 +120,33 @@ class RegenerateInstanceJsonTestCase(TestBase):
         )
         mock_regenerate.apply_async.assert_not_called()
         self.assertEqual(cache.get(self.cache_key), old_task_id)
+
+    @patch.object(AsyncResult, "_get_task_meta", _mock_get_task_meta_non_failure)
+    @patch(
+        "onadata.apps.logger.management.commands.regenerate_instance_json.regenerate_form_instance_json"
+    )
+    def test_progress_reported(self, mock_regenerate):
+        """The progress of the shards is reported"""
+        cache.set(self.cache_key, "796dc413-e6ea-42b8-b658-e4ac9e22b02b")
+        progress_key = f"xfm-regenerate_instance_json_progress-{self.xform.pk}"
+        cache.set(progress_key, [(1, 10), (11, 20)])
+        cache.set(
+            f"{progress_key}-0",
+            {"last_id": 10, "rows": 3, "duration": 2, "done": True},
+        )
+        call_command("regenerate_instance_json", (self.xform.pk), stdout=self.out)
+        self.assertIn(
+            f"Regeneration for {self.xform.pk} IN PROGRESS: 1/2 shards, "
+            f"3/{self.xform.num_of_submissions} rows (1.5 rows/s)",
+            self.out.getvalue(),
+        )
+        mock_regenerate.apply_async.assert_not_called()
+
+        # a failed shard is resumed
+        cache.set(
+            f"{progress_key}-1",
+            {"last_id": 12, "rows": 1, "duration": 1, "done": False, "failed": True},
+        )
+        mock_regenerate.apply_async.return_value = AsyncResult("foo")
+        call_command("regenerate_instance_json", (self.xform.pk), stdout=self.out)
+        mock_regenerate.apply_async.assert_called_once_with(args=[self.xform.pk])
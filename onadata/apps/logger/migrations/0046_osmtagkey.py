@@ -0,0 +1,53 @@
+# Generated by Django 5.2.15 on 2026-10-19 09:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Index the tag keys of the OSM data saved before tag keys were maintained.
+POPULATE_OSM_TAG_KEYS = """
+INSERT INTO "logger_osmtagkey" ("xform_id", "field_name", "key")
+SELECT DISTINCT "logger_instance"."xform_id", "logger_osmdata"."field_name",
+    JSONB_OBJECT_KEYS("logger_osmdata"."tags")
+FROM "logger_osmdata"
+INNER JOIN "logger_instance"
+    ON ("logger_osmdata"."instance_id" = "logger_instance"."id")
+WHERE JSONB_TYPEOF("logger_osmdata"."tags") = 'object'
+ON CONFLICT DO NOTHING;
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("logger", "0045_add_xform_id_date_created_date_modified_last_edited_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OsmTagKey",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("field_name", models.CharField(max_length=255)),
+                ("key", models.CharField(max_length=255)),
+                (
+                    "xform",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="osm_tag_keys",
+                        to="logger.xform",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("xform", "field_name", "key")},
+            },
+        ),
+        migrations.RunSQL(POPULATE_OSM_TAG_KEYS, reverse_sql=migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,133 @@
+# Generated manually to create the Briefcase pull index without blocking writes.
+#
+# The index is a partial covering index so that paging a form's submission ids
+# and uuids with a `cursor` is an index only range scan.
+#
+# logger_instance is a regular table by default but a partitioned table when
+# ENABLE_TABLE_PARTITIONING is on (see 0034-0037). Postgres cannot CREATE INDEX
+# CONCURRENTLY on a partitioned parent, so the index is built concurrently per
+# partition and attached to a parent index instead.
+
+from django.db import migrations, models
+
+INDEX_NAME = "logger_inst_briefcase_pull_idx"
+INDEX_SQL = '("xform_id", "id") INCLUDE ("uuid") WHERE "deleted_at" IS NULL'
+
+
+def _relkind(cursor, relation):
+    cursor.execute(
+        """
+        SELECT c.relkind
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = 'public' AND c.relname = %s
+        """,
+        [relation],
+    )
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def _drop_invalid_index(cursor, index_name):
+    """Drop an index left invalid by an interrupted concurrent build."""
+    cursor.execute(
+        """
+        SELECT c.relkind, i.indisvalid
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        JOIN pg_index i ON i.indexrelid = c.oid
+        WHERE n.nspname = 'public' AND c.relname = %s
+        """,
+        [index_name],
+    )
+    row = cursor.fetchone()
+
+    # A partitioned index is invalid until every partition index is attached,
+    # which is the state a resumed run continues from.
+    if row and row[0] == "i" and not row[1]:
+        cursor.execute(f'DROP INDEX CONCURRENTLY "{index_name}"')
+
+
+def _child_partitions(cursor, table):
+    cursor.execute(
+        """
+        SELECT c.relname
+        FROM pg_inherits h
+        JOIN pg_class c ON c.oid = h.inhrelid
+        WHERE h.inhparent = %s::regclass
+        ORDER BY c.relname
+        """,
+        [table],
+    )
+    return [row[0] for row in cursor.fetchall()]
+
+
+def _is_attached(cursor, parent_index, child_index):
+    cursor.execute(
+        """
+        SELECT 1 FROM pg_inherits
+        WHERE inhrelid = %s::regclass AND inhparent = %s::regclass
+        """,
+        [child_index, parent_index],
+    )
+    return cursor.fetchone() is not None
+
+
+def _ensure_index(cursor, table, index_name):
+    _drop_invalid_index(cursor, index_name)
+
+    if _relkind(cursor, table) == "p":
+        cursor.execute(
+            f'CREATE INDEX IF NOT EXISTS "{index_name}" ON ONLY "{table}" {INDEX_SQL}'
+        )
+        for child in _child_partitions(cursor, table):
+            child_index = f"{child}_briefcase_pull_idx"[:63]
+            _ensure_index(cursor, child, child_index)
+            if not _is_attached(cursor, index_name, child_index):
+                cursor.execute(
+                    f'ALTER INDEX "{index_name}" ATTACH PARTITION "{child_index}"'
+                )
+    else:
+        cursor.execute(
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{index_name}" '
+            f'ON "{table}" {INDEX_SQL}'
+        )
+
+
+def create_briefcase_pull_index(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        _ensure_index(cursor, "logger_instance", INDEX_NAME)
+
+
+def drop_briefcase_pull_index(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f'DROP INDEX IF EXISTS "{INDEX_NAME}"')
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("logger", "0046_osmtagkey"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunPython(
+                    create_briefcase_pull_index, drop_briefcase_pull_index
+                ),
+            ],
+            state_operations=[
+                migrations.AddIndex(
+                    model_name="instance",
+                    index=models.Index(
+                        fields=["xform_id", "id"],
+                        include=["uuid"],
+                        condition=models.Q(deleted_at__isnull=True),
+                        name=INDEX_NAME,
+                    ),
+                ),
+            ],
+        )
+    ]
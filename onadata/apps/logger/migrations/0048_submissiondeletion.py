@@ -0,0 +1,37 @@
+# Generated by Django 5.2.15 on 2026-10-19 11:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("logger", "0047_instance_briefcase_pull_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SubmissionDeletion",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("instance_id", models.IntegerField(blank=True, null=True)),
+                ("date_created", models.DateTimeField(auto_now_add=True)),
+                (
+                    "xform",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="submission_deletions",
+                        to="logger.xform",
+                    ),
+                ),
+            ],
+        ),
+    ]
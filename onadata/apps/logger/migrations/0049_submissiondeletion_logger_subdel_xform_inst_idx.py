@@ -0,0 +1,18 @@
+# Generated by Django 5.2.15 on 2026-10-19 12:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("logger", "0048_submissiondeletion"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="submissiondeletion",
+            index=models.Index(
+                fields=["xform", "instance_id"], name="logger_subdel_xform_inst_idx"
+            ),
+        ),
+    ]
@@ -14,10 +14,11 @@ from onadata.apps.logger.models.kms import KMSKey, XFormKey  # noqa
 from onadata.apps.logger.models.merged_xform import MergedXForm  # noqa
 from onadata.apps.logger.models.note import Note  # noqa
 from onadata.apps.logger.models.open_data import OpenData  # noqa
-from onadata.apps.logger.models.osmdata import OsmData  # noqa
+from onadata.apps.logger.models.osmdata import OsmData, OsmTagKey  # noqa
 from onadata.apps.logger.models.project import Project  # noqa
 from onadata.apps.logger.models.project_invitation import ProjectInvitation  # noqa
 from onadata.apps.logger.models.registration_form import RegistrationForm  # noqa
+from onadata.apps.logger.models.submission_deletion import SubmissionDeletion  # noqa
 from onadata.apps.logger.models.submission_review import SubmissionReview  # noqa
 from onadata.apps.logger.models.survey_type import SurveyType  # noqa
 from onadata.apps.logger.models.widget import Widget  # noqa
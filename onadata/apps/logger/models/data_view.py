@@ -389,14 +389,11 @@ class DataView(models.Model):
             sql_where = " AND " + " AND ".join(where)
 
         if data_view.xform.is_merged_dataset:
+            # pylint: disable=import-outside-toplevel
+            from onadata.apps.logger.models.merged_xform import get_merged_xform_ids
+
             sql += " WHERE xform_id IN %s " + sql_where + " AND deleted_at IS NULL"
-            params = [
-                tuple(
-                    list(
-                        data_view.xform.mergedxform.xforms.values_list("pk", flat=True)
-                    )
-                )
-            ] + where_params
+            params = [tuple(get_merged_xform_ids(data_view.xform))] + where_params
         else:
             sql += " WHERE xform_id = %s " + sql_where + " AND deleted_at IS NULL"
             params = [data_view.xform.pk] + where_params
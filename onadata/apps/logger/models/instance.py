@@ -45,16 +45,26 @@ from onadata.libs.utils.cache_tools import (
     PROJ_NUM_DATASET_CACHE,
     PROJ_SUB_DATE_CACHE,
     PROJECT_DATE_MODIFIED_CACHE,
+    PROJECT_DATE_MODIFIED_IDS,
+    PROJECT_DATE_MODIFIED_SHARDS,
+    PROJECT_DATE_MODIFIED_TRACKED,
     XFORM_BBOX_CACHE,
     XFORM_COUNT,
     XFORM_DATA_VERSIONS,
     XFORM_SUBMISSION_COUNT_FOR_DAY,
     XFORM_SUBMISSION_COUNT_FOR_DAY_DATE,
+    CacheLockError,
+    bump_xform_submissions_version,
+    bump_xform_tiles_version,
+    safe_cache_add,
     safe_cache_decr,
     safe_cache_delete,
+    safe_cache_delete_many,
     safe_cache_get,
+    safe_cache_get_many,
     safe_cache_incr,
     safe_cache_set,
+    set_cache_with_lock,
 )
 from onadata.libs.utils.common_tags import (
     ATTACHMENTS,
@@ -117,9 +127,18 @@ def get_attachment_url(attachment, suffix=None):
     return url
 
 
+def _is_prefetched(instance, name):
+    return name in getattr(instance, "_prefetched_objects_cache", {})
+
+
 def _get_attachments_from_instance(instance):
     attachments = []
-    for item in instance.attachments.filter(deleted_at__isnull=True):
+    if _is_prefetched(instance, "attachments"):
+        items = [item for item in instance.attachments.all() if item.deleted_at is None]
+    else:
+        items = instance.attachments.filter(deleted_at__isnull=True)
+
+    for item in items:
         attachment = {}
         attachment["download_url"] = get_attachment_url(item)
         attachment["small_download_url"] = get_attachment_url(item, "small")
@@ -127,7 +146,7 @@ def _get_attachments_from_instance(instance):
         attachment["mimetype"] = item.mimetype
         attachment["filename"] = item.media_file.name
         attachment["name"] = item.name
-        attachment["instance"] = item.instance.pk
+        attachment["instance"] = item.instance_id
         attachment["xform"] = instance.xform.id
         attachment["id"] = item.id
         attachments.append(attachment)
@@ -239,6 +258,9 @@ def invalidate_bbox_cache(xform_id):
     from onadata.apps.logger.models.merged_xform import MergedXForm
 
     safe_cache_delete(f"{XFORM_BBOX_CACHE}{xform_id}")
+    # Cached vector tiles of the form, its dataviews and merged datasets are
+    # keyed on the form's tiles version
+    bump_xform_tiles_version(xform_id)
 
     dataview_ids = DataView.objects.filter(xform_id=xform_id).values_list(
         "pk", flat=True
@@ -283,9 +305,12 @@ def update_xform_submission_count(instance):
     safe_cache_delete(f"{XFORM_COUNT}{instance.xform_id}")
     # Clear project cache
     # pylint: disable=import-outside-toplevel
+    from onadata.apps.logger.models.merged_xform import clear_merged_xform_cache
     from onadata.apps.logger.models.xform import clear_project_cache
 
     clear_project_cache(instance.xform.project_id)
+    # The merged datasets' combined count and last submission time changed
+    clear_merged_xform_cache(instance.xform_id)
 
 
 def _update_xform_submission_count_delete(instance):
@@ -315,6 +340,21 @@ def _update_xform_submission_count_delete(instance):
         xform.id, incr=False, date_created=instance.date_created
     )
 
+    clear_xform_submission_cache(xform)
+
+
+def bump_submissions_version(xform_id):
+    """Bumps the form's submissions version now and when the transaction commits.
+
+    Without the second bump, a request between the two would cache the data
+    before the commit under the new version.
+    """
+    bump_xform_submissions_version(xform_id)
+    transaction.on_commit(lambda: bump_xform_submissions_version(xform_id))
+
+
+def clear_xform_submission_cache(xform):
+    """Clears the cached counts and extents of a form that lost submissions."""
     for cache_prefix in [PROJ_NUM_DATASET_CACHE, PROJ_SUB_DATE_CACHE]:
         safe_cache_delete(f"{cache_prefix}{xform.project.pk}")
 
@@ -322,6 +362,7 @@ def _update_xform_submission_count_delete(instance):
     safe_cache_delete(f"{XFORM_DATA_VERSIONS}{xform.pk}")
     safe_cache_delete(f"{DATAVIEW_COUNT}{xform.pk}")
     safe_cache_delete(f"{XFORM_COUNT}{xform.pk}")
+    bump_submissions_version(xform.pk)
 
     # Bust bbox caches so a removed submission no longer counts toward extent.
     invalidate_bbox_cache(xform.pk)
@@ -392,22 +433,93 @@ def save_full_json(instance, include_related=True):
         json[DECRYPTION_ERROR] = instance.json[DECRYPTION_ERROR]
 
     update_fields_directly(instance, json=json)
+    bump_submissions_version(instance.xform_id)
+
+
+UPDATE_PROJECTS_DATE_MODIFIED_SQL = """
+UPDATE logger_project
+SET date_modified = GREATEST(logger_project.date_modified, modified.date_modified)
+FROM unnest(%s::integer[], %s::timestamptz[]) AS modified(id, date_modified)
+WHERE logger_project.id = modified.id
+"""
+
+
+def _update_projects_date_modified(dates):
+    """Write ``dates``, a dict of project ids and dates, to the projects."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            UPDATE_PROJECTS_DATE_MODIFIED_SQL, [list(dates), list(dates.values())]
+        )
 
 
 def update_project_date_modified(instance):
     """Update the project's date_modified
 
-    Changes the etag value of the projects endpoint.
+    Changes the etag value of the projects endpoint. The date is cached and
+    written to the project by `commit_cached_project_date_modified`.
     """
     # update the date modified field of the project which will change
     # the etag value of the projects endpoint
     timeout = getattr(settings, "PROJECT_IDS_CACHE_TIMEOUT", 3600)
     project_id = instance.xform.project_id
 
-    # Log project id and date motified in cache with timeout
-    project_ids = safe_cache_get(PROJECT_DATE_MODIFIED_CACHE, {})
-    project_ids[project_id] = instance.date_modified
-    safe_cache_set(PROJECT_DATE_MODIFIED_CACHE, project_ids, timeout=timeout)
+    # Each project has its own key, it is overwritten without being read
+    safe_cache_set(
+        f"{PROJECT_DATE_MODIFIED_CACHE}{project_id}",
+        instance.date_modified,
+        timeout=timeout,
+    )
+
+    # Only the first change since the dates were last committed tracks the project
+    tracked_key = f"{PROJECT_DATE_MODIFIED_TRACKED}{project_id}"
+    if not safe_cache_add(tracked_key, True, timeout=timeout):
+        return
+
+    try:
+        set_cache_with_lock(
+            f"{PROJECT_DATE_MODIFIED_IDS}{project_id % PROJECT_DATE_MODIFIED_SHARDS}",
+            lambda project_ids: (project_ids or set()) | {project_id},
+            cache_timeout=None,
+        )
+    except CacheLockError:
+        safe_cache_delete(tracked_key)
+        _update_projects_date_modified({project_id: instance.date_modified})
+
+
+def commit_cached_project_date_modified():
+    """Write the cached projects' date_modified to the projects
+
+    Returns the number of projects updated.
+    """
+    num_of_projects = 0
+
+    for shard in range(PROJECT_DATE_MODIFIED_SHARDS):
+        ids_key = f"{PROJECT_DATE_MODIFIED_IDS}{shard}"
+        project_ids = safe_cache_get(ids_key)
+        if not project_ids:
+            continue
+
+        # Untrack the projects before reading their dates. A later change either
+        # tracks the project again or is read below.
+        def untrack(current_ids, committed=project_ids):
+            return (current_ids or set()) - committed
+
+        set_cache_with_lock(ids_key, untrack, cache_timeout=None)
+        safe_cache_delete_many(
+            [f"{PROJECT_DATE_MODIFIED_TRACKED}{pk}" for pk in project_ids]
+        )
+        cached_dates = safe_cache_get_many(
+            [f"{PROJECT_DATE_MODIFIED_CACHE}{pk}" for pk in project_ids]
+        )
+        dates = {
+            int(key[len(PROJECT_DATE_MODIFIED_CACHE) :]): date
+            for key, date in cached_dates.items()
+        }
+        if dates:
+            _update_projects_date_modified(dates)
+            num_of_projects += len(dates)
+
+    return num_of_projects
 
 
 def convert_to_serializable_date(date):
@@ -535,7 +647,11 @@ class InstanceBaseClass:
                 doc.update(
                     {
                         ATTACHMENTS: _get_attachments_from_instance(self),
-                        TAGS: list(self.tags.names()),
+                        TAGS: (
+                            [tag.name for tag in self.tags.all()]
+                            if _is_prefetched(self, "tags")
+                            else list(self.tags.names())
+                        ),
                         NOTES: self.get_notes(),
                     }
                 )
@@ -638,6 +754,11 @@ class InstanceBaseClass:
         Returns the latest review.
         Used in favour of `get_review_status_and_comment`.
         """
+        if _is_prefetched(self, "reviews"):
+            # pylint: disable=no-member
+            reviews = self.reviews.all()
+            return max(reviews, key=lambda review: review.date_modified, default=None)
+
         try:
             # pylint: disable=no-member
             return self.reviews.latest("date_modified")
@@ -736,6 +857,13 @@ class Instance(models.Model, InstanceBaseClass):
             models.Index(fields=["xform_id", "date_created"]),
             models.Index(fields=["xform_id", "date_modified"]),
             models.Index(fields=["xform_id", "last_edited"]),
+            # Briefcase pulls page a form's submission ids and uuids by id
+            models.Index(
+                fields=["xform_id", "id"],
+                include=["uuid"],
+                condition=Q(deleted_at__isnull=True),
+                name="logger_inst_briefcase_pull_idx",
+            ),
         ]
 
     @classmethod
@@ -4,9 +4,17 @@ MergedXForm model - stores info on forms to merge.
 """
 
 from django.db import models, transaction
-from django.db.models.signals import post_save
+from django.db.models.signals import m2m_changed, post_save, pre_delete
 
 from onadata.apps.logger.models.xform import XForm
+from onadata.libs.utils.cache_tools import (
+    MERGED_XFORM_DESCRIPTOR_CACHE,
+    XFORM_MERGED_XFORM_IDS_CACHE,
+    get_merged_xform_descriptor_cache_ttl,
+    safe_cache_delete,
+    safe_cache_get,
+    safe_cache_set,
+)
 from onadata.libs.utils.model_tools import set_uuid
 
 
@@ -25,6 +33,126 @@ class MergedXForm(XForm):
         return super().save(*args, **kwargs)
 
 
+def get_merged_xform_descriptor(merged_xform_id):
+    """
+    Returns the cached descriptor of a merged dataset's child forms.
+
+    The descriptor holds the ids of the child forms that are not deleted,
+    ``xform_ids``, those whose organization is active, ``active_xform_ids``,
+    their combined ``num_of_submissions`` and latest ``last_submission_time``.
+    """
+    cache_key = f"{MERGED_XFORM_DESCRIPTOR_CACHE}{merged_xform_id}"
+    descriptor = safe_cache_get(cache_key)
+
+    if descriptor is None:
+        xforms = (
+            XForm.objects.filter(
+                mergedxform_ptr=merged_xform_id, deleted_at__isnull=True
+            )
+            .order_by("pk")
+            .values_list(
+                "pk",
+                "num_of_submissions",
+                "last_submission_time",
+                "project__organization__is_active",
+            )
+        )
+        descriptor = {
+            "xform_ids": [],
+            "active_xform_ids": [],
+            "num_of_submissions": 0,
+            "last_submission_time": None,
+        }
+        for xform_id, num_of_submissions, last_submission_time, active in xforms:
+            descriptor["xform_ids"].append(xform_id)
+            if active:
+                descriptor["active_xform_ids"].append(xform_id)
+            descriptor["num_of_submissions"] += num_of_submissions
+            if last_submission_time and (
+                descriptor["last_submission_time"] is None
+                or last_submission_time > descriptor["last_submission_time"]
+            ):
+                descriptor["last_submission_time"] = last_submission_time
+        safe_cache_set(cache_key, descriptor, get_merged_xform_descriptor_cache_ttl())
+
+    return descriptor
+
+
+def get_merged_xform_ids(xform, active=False):
+    """
+    Returns the ids of the forms an XForm's submissions are read from.
+
+    For a merged dataset these are its child forms, or the merged dataset itself
+    when it has none so that queries filtering on them match no submissions.
+    """
+    if not xform.is_merged_dataset:
+        return [xform.pk]
+
+    descriptor = get_merged_xform_descriptor(xform.pk)
+    xform_ids = descriptor["active_xform_ids" if active else "xform_ids"]
+
+    return xform_ids or [xform.pk]
+
+
+def _get_xform_merged_ids(xform_id):
+    """Returns the cached ids of the merged datasets an XForm is part of."""
+    cache_key = f"{XFORM_MERGED_XFORM_IDS_CACHE}{xform_id}"
+    merged_ids = safe_cache_get(cache_key)
+
+    if merged_ids is None:
+        merged_ids = list(
+            MergedXForm.objects.filter(xforms__pk=xform_id).values_list("pk", flat=True)
+        )
+        safe_cache_set(cache_key, merged_ids, get_merged_xform_descriptor_cache_ttl())
+
+    return merged_ids
+
+
+def _clear_xform_merged_ids(xform_ids):
+    for xform_id in xform_ids:
+        safe_cache_delete(f"{XFORM_MERGED_XFORM_IDS_CACHE}{xform_id}")
+
+
+def clear_merged_xform_cache(xform_id):
+    """Clears the descriptors of the merged datasets an XForm is part of."""
+    for merged_id in _get_xform_merged_ids(xform_id):
+        safe_cache_delete(f"{MERGED_XFORM_DESCRIPTOR_CACHE}{merged_id}")
+
+
+# pylint: disable=unused-argument
+def clear_merged_xform_cache_on_xform_change(sender, instance=None, **kwargs):
+    """Clears the merged dataset descriptors affected by a change to an XForm."""
+    if instance.is_merged_dataset:
+        safe_cache_delete(f"{MERGED_XFORM_DESCRIPTOR_CACHE}{instance.pk}")
+    else:
+        clear_merged_xform_cache(instance.pk)
+
+
+# pylint: disable=unused-argument
+def clear_merged_xform_cache_on_xforms_change(
+    sender, instance=None, action=None, reverse=False, pk_set=None, **kwargs
+):
+    """Clears the descriptors of merged datasets whose child forms changed.
+
+    The cached merged dataset ids of the child forms are cleared too.
+    """
+    if not reverse and action in ["post_add", "post_remove"]:
+        safe_cache_delete(f"{MERGED_XFORM_DESCRIPTOR_CACHE}{instance.pk}")
+        _clear_xform_merged_ids(pk_set)
+    elif not reverse and action == "pre_clear":
+        _clear_xform_merged_ids(instance.xforms.values_list("pk", flat=True))
+    elif not reverse and action == "post_clear":
+        safe_cache_delete(f"{MERGED_XFORM_DESCRIPTOR_CACHE}{instance.pk}")
+    elif reverse and action in ["post_add", "post_remove"]:
+        for merged_id in pk_set:
+            safe_cache_delete(f"{MERGED_XFORM_DESCRIPTOR_CACHE}{merged_id}")
+        _clear_xform_merged_ids([instance.pk])
+    elif reverse and action == "pre_clear":
+        clear_merged_xform_cache(instance.pk)
+    elif reverse and action == "post_clear":
+        _clear_xform_merged_ids([instance.pk])
+
+
 # pylint: disable=unused-argument
 def set_object_permissions(sender, instance=None, created=False, **kwargs):
     """Set object permissions when a MergedXForm has been created."""
@@ -56,3 +184,19 @@ post_save.connect(
     sender=MergedXForm,
     dispatch_uid="set_project_perms_to_merged_xform",
 )
+post_save.connect(
+    clear_merged_xform_cache_on_xform_change,
+    sender=XForm,
+    dispatch_uid="clear_merged_xform_cache_on_xform_save",
+)
+# Cleared before the delete cascades to the merged datasets' child form links
+pre_delete.connect(
+    clear_merged_xform_cache_on_xform_change,
+    sender=XForm,
+    dispatch_uid="clear_merged_xform_cache_on_xform_delete",
+)
+m2m_changed.connect(
+    clear_merged_xform_cache_on_xforms_change,
+    sender=MergedXForm.xforms.through,
+    dispatch_uid="clear_merged_xform_cache_on_xforms_change",
+)
@@ -34,16 +34,10 @@ class OsmData(models.Model):
         """
         Returns sorted tag keys.
         """
-        query = OsmData.objects.raw(
-            'SELECT DISTINCT JSONB_OBJECT_KEYS(tags) as id FROM "logger_osmdata"'
-            ' INNER JOIN "logger_instance"'
-            ' ON ( "logger_osmdata"."instance_id" = "logger_instance"."id" )'
-            ' WHERE "logger_instance"."xform_id" = %s AND field_name = %s',
-            [xform.pk, field_path],
-        )
+        keys = OsmTagKey.objects.filter(xform=xform, field_name=field_path)
         prefix = field_path + ":" if include_prefix else ""
 
-        return sorted([prefix + key.id for key in query])
+        return sorted([prefix + key for key in keys.values_list("key", flat=True)])
 
     def get_tags_with_prefix(self):
         """
@@ -82,3 +76,38 @@ class OsmData(models.Model):
             using=None,
             update_fields=None
         )
+
+
+class OsmTagKey(models.Model):
+    """
+    Tag keys of the OSM data of an XForm's OSM field
+    """
+
+    xform = models.ForeignKey(
+        "logger.XForm", related_name="osm_tag_keys", on_delete=models.CASCADE
+    )
+    field_name = models.CharField(max_length=255)
+    key = models.CharField(max_length=255)
+
+    class Meta:
+        app_label = "logger"
+        unique_together = ("xform", "field_name", "key")
+
+    @classmethod
+    def add_tag_keys(cls, xform_id, osm_data_list):
+        """
+        Adds the tag keys of the OsmData objects to the XForm's tag keys.
+        """
+        tag_keys = {
+            (osm_data.field_name, key)
+            for osm_data in osm_data_list
+            if isinstance(osm_data.tags, dict)
+            for key in osm_data.tags
+        }
+        cls.objects.bulk_create(
+            [
+                cls(xform_id=xform_id, field_name=field_name, key=key)
+                for field_name, key in sorted(tag_keys)
+            ],
+            ignore_conflicts=True,
+        )
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+SubmissionDeletion model class
+"""
+
+from datetime import timedelta
+
+from django.db import models
+from django.utils import timezone
+
+# Markers older than this are ignored, e.g. those left by a failed deletion.
+SUBMISSION_DELETION_TTL = timedelta(hours=1)
+
+
+class SubmissionDeletion(models.Model):
+    """
+    Submissions of a form whose deletion is in progress.
+
+    A row without an ``instance_id`` marks every submission of the form.
+    """
+
+    xform = models.ForeignKey(
+        "logger.XForm", related_name="submission_deletions", on_delete=models.CASCADE
+    )
+    instance_id = models.IntegerField(null=True, blank=True)
+    date_created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        app_label = "logger"
+        indexes = [
+            models.Index(
+                fields=["xform", "instance_id"], name="logger_subdel_xform_inst_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.xform_id}|{self.instance_id or '*'}"
+
+    @classmethod
+    def mark(cls, xform, instance_ids=None):
+        """Mark ``instance_ids``, or every submission of ``xform``, as deleting."""
+        cls.purge_stale()
+
+        if not instance_ids:
+            cls.objects.create(xform=xform)
+            return
+
+        cls.objects.bulk_create(
+            [cls(xform=xform, instance_id=pk) for pk in instance_ids], batch_size=1000
+        )
+
+    @classmethod
+    def unmark(cls, xform, instance_ids=None):
+        """Remove the markers added by ``mark`` for the same arguments."""
+        queryset = cls.objects.filter(xform=xform)
+
+        if not instance_ids:
+            queryset.filter(instance_id__isnull=True).delete()
+            return
+
+        queryset.filter(instance_id__in=instance_ids).delete()
+
+    @classmethod
+    def purge_stale(cls):
+        """Remove the markers older than ``SUBMISSION_DELETION_TTL``."""
+        cls.objects.filter(
+            date_created__lt=timezone.now() - SUBMISSION_DELETION_TTL
+        ).delete()
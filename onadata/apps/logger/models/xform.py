@@ -19,8 +19,7 @@ from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.fields import GenericRelation
 from django.core.exceptions import ObjectDoesNotExist
 from django.db import models, transaction
-from django.db.models import Sum
-from django.db.models.signals import post_delete, pre_save
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.html import conditional_escape
@@ -53,7 +52,10 @@ from onadata.libs.utils.cache_tools import (
     XFORM_DEC_SUBMISSION_COUNT,
     XFORM_SUBMISSION_COUNT_FOR_DAY,
     XFORM_SUBMISSION_COUNT_FOR_DAY_DATE,
+    XFORM_SUBMISSION_UUID_CACHE,
+    bump_xform_perms_version,
     clear_project_owner_cache,
+    get_xform_submission_id_string_key,
     safe_cache_delete,
     safe_cache_get,
 )
@@ -1453,12 +1455,12 @@ class XForm(XFormMixin, BaseModel):
         """Returns the form's number of submission."""
         if self.num_of_submissions == 0 or force_update:
             if self.is_merged_dataset:
-                count = (
-                    self.mergedxform.xforms.aggregate(
-                        num=Sum("num_of_submissions")
-                    ).get("num")
-                    or 0
+                # pylint: disable=import-outside-toplevel
+                from onadata.apps.logger.models.merged_xform import (
+                    get_merged_xform_descriptor,
                 )
+
+                count = get_merged_xform_descriptor(self.pk)["num_of_submissions"]
             else:
                 count = self.instances.filter(deleted_at__isnull=True).count()
 
@@ -1612,6 +1614,36 @@ post_delete.connect(
     xform_post_delete_callback, sender=XForm, dispatch_uid="xform_post_delete_callback"
 )
 
+
+# XForm fields that affect which form a submission resolves to
+SUBMISSION_TARGET_FIELDS = {"uuid", "id_string", "user", "deleted_at"}
+
+
+# pylint: disable=unused-argument
+def clear_submission_target_cache(sender, instance, **kwargs):
+    """Clear the cached submission target lookups for an XForm."""
+    update_fields = kwargs.get("update_fields")
+    if update_fields and not SUBMISSION_TARGET_FIELDS.intersection(update_fields):
+        # counter updates made on every submission leave the lookups valid
+        return
+
+    safe_cache_delete(f"{XFORM_SUBMISSION_UUID_CACHE}{instance.uuid}")
+    safe_cache_delete(
+        get_xform_submission_id_string_key(instance.user.username, instance.id_string)
+    )
+
+
+post_save.connect(
+    clear_submission_target_cache,
+    sender=XForm,
+    dispatch_uid="clear_submission_target_cache_save",
+)
+post_delete.connect(
+    clear_submission_target_cache,
+    sender=XForm,
+    dispatch_uid="clear_submission_target_cache_delete",
+)
+
 # Register XForm in django-reversion
 reversion.register(XForm)
 
@@ -1630,6 +1662,72 @@ class XFormGroupObjectPermission(GroupObjectPermissionBase):
     content_object = models.ForeignKey(XForm, on_delete=models.CASCADE)
 
 
+# pylint: disable=unused-argument
+def clear_xform_perms_cache(sender, instance, **kwargs):
+    """Invalidate cached permission decisions when XForm permissions change."""
+    bump_xform_perms_version(instance.content_object_id)
+
+
+post_save.connect(
+    clear_xform_perms_cache,
+    sender=XFormUserObjectPermission,
+    dispatch_uid="clear_xform_user_perms_cache_save",
+)
+post_delete.connect(
+    clear_xform_perms_cache,
+    sender=XFormUserObjectPermission,
+    dispatch_uid="clear_xform_user_perms_cache_delete",
+)
+post_save.connect(
+    clear_xform_perms_cache,
+    sender=XFormGroupObjectPermission,
+    dispatch_uid="clear_xform_group_perms_cache_save",
+)
+post_delete.connect(
+    clear_xform_perms_cache,
+    sender=XFormGroupObjectPermission,
+    dispatch_uid="clear_xform_group_perms_cache_delete",
+)
+
+
+# pylint: disable=unused-argument,too-many-arguments
+def clear_group_members_perms_cache(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    """Invalidate cached permission decisions when team members change.
+
+    Members hold the permissions of their groups, so the permissions version
+    of every form the changed groups have permissions on is bumped.
+    """
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+
+    if reverse:
+        group_ids = [instance.pk]
+    elif action == "pre_clear":
+        group_ids = list(instance.groups.values_list("pk", flat=True))
+    else:
+        group_ids = pk_set
+
+    if not group_ids:
+        return
+
+    xform_ids = (
+        XFormGroupObjectPermission.objects.filter(group_id__in=group_ids)
+        .values_list("content_object_id", flat=True)
+        .distinct()
+    )
+    for xform_id in xform_ids:
+        bump_xform_perms_version(xform_id)
+
+
+m2m_changed.connect(
+    clear_group_members_perms_cache,
+    sender=User.groups.through,
+    dispatch_uid="clear_group_members_perms_cache",
+)
+
+
 def check_xform_uuid(new_uuid):
     """
     Checks if a new_uuid has already been used, if it has it raises the
@@ -10,8 +10,9 @@ from celery.exceptions import MaxRetriesExceededError
 from multidb.pinning import use_master
 from valigetta.exceptions import ConnectionException as ValigettaConnectionException
 
-from onadata.apps.logger.models import Entity, EntityList, Instance, Project, XForm
+from onadata.apps.logger.models import Entity, EntityList, Instance, XForm
 from onadata.apps.logger.models.instance import (
+    commit_cached_project_date_modified,
     save_full_json,
     update_project_date_modified,
     update_xform_submission_count,
@@ -24,6 +25,7 @@ from onadata.libs.kms.tools import (
     adjust_xform_num_of_decrypted_submissions,
     commit_cached_xform_num_of_decrypted_submissions,
     decrypt_instance,
+    decrypt_instances,
     disable_expired_keys,
     rotate_expired_keys,
     save_decryption_error,
@@ -31,11 +33,6 @@ from onadata.libs.kms.tools import (
     send_key_rotation_reminder,
 )
 from onadata.libs.permissions import set_project_perms_to_object
-from onadata.libs.utils.cache_tools import (
-    PROJECT_DATE_MODIFIED_CACHE,
-    safe_cache_delete,
-    safe_cache_get,
-)
 from onadata.libs.utils.common_tags import DECRYPTION_FAILURE_MAX_RETRIES
 from onadata.libs.utils.entities_utils import (
     adjust_elist_num_entities,
@@ -80,16 +77,7 @@ def apply_project_date_modified_async():
     """
     Batch update projects date_modified field periodically
     """
-    project_ids = safe_cache_get(PROJECT_DATE_MODIFIED_CACHE, {})
-    if not project_ids:
-        return
-
-    # Update project date_modified field in batches
-    for project_id, timestamp in project_ids.items():
-        Project.objects.filter(pk=project_id).update(date_modified=timestamp)
-
-    # Clear cache after updating
-    safe_cache_delete(PROJECT_DATE_MODIFIED_CACHE)
+    commit_cached_project_date_modified()
 
 
 @app.task(base=AutoRetryTask)
@@ -241,6 +229,43 @@ def decrypt_instance_async(self, instance_id: int):
         )
 
 
+class DecryptInstancesAutoRetryTask(AutoRetryTask):
+    """Custom task class for decrypting a batch of instances with auto-retry"""
+
+    retry_backoff = 5
+    max_retries = 8
+    autoretry_for = (*AutoRetryTask.autoretry_for, ValigettaConnectionException)
+
+
+@app.task(base=DecryptInstancesAutoRetryTask, bind=True)
+@use_master
+def decrypt_instances_async(self, instance_ids: list[int]):
+    """Decrypt a batch of encrypted Instances asynchronously.
+
+    Instances decrypted before a retry are skipped on the next attempt.
+    Instances still waiting for media are handed to `decrypt_instance_async`
+    which retries them individually.
+
+    :param instance_ids: Primary keys for the Instances
+    """
+    summary = decrypt_instances(instance_ids)
+
+    for instance_id in summary["pending"]:
+        decrypt_instance_async.delay(instance_id)
+
+    logger.info(
+        "Batch decryption successful - Decrypted: %s; Failed: %s; "
+        "Files per second: %s; Bytes per second: %s; Task: %s",
+        summary["decrypted"],
+        len(summary["failed"]),
+        summary["files_per_second"],
+        summary["bytes_per_second"],
+        self.request.id,
+    )
+
+    return summary
+
+
 @app.task(base=AutoRetryTask)
 @use_master
 def rotate_expired_keys_async():
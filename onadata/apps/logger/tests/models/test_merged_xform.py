@@ -2,6 +2,12 @@
 
 from unittest.mock import call, patch
 
+from onadata.apps.logger.models import Instance
+from onadata.apps.logger.models.merged_xform import (
+    clear_merged_xform_cache,
+    get_merged_xform_descriptor,
+    get_merged_xform_ids,
+)
 from onadata.apps.main.tests.test_base import TestBase
 
 
@@ -18,3 +24,55 @@ class MergedXFormTestCase(TestBase):
             call(merged_xf.pk, self.project.pk),
         ]
         mock_set_perms.assert_has_calls(calls, any_order=True)
+
+    def test_merged_xform_descriptor(self):
+        """The child forms descriptor is cached until the child forms change"""
+        merged_xf = self._create_merged_dataset(make_submissions=True)
+        xf1 = merged_xf.xforms.get(id_string="a")
+        xf2 = merged_xf.xforms.get(id_string="b")
+        xf2.refresh_from_db()
+
+        descriptor = get_merged_xform_descriptor(merged_xf.pk)
+        self.assertEqual(descriptor["xform_ids"], [xf1.pk, xf2.pk])
+        self.assertEqual(descriptor["active_xform_ids"], [xf1.pk, xf2.pk])
+        self.assertEqual(descriptor["num_of_submissions"], 2)
+        self.assertEqual(descriptor["last_submission_time"], xf2.last_submission_time)
+
+        with self.assertNumQueries(0):
+            get_merged_xform_descriptor(merged_xf.pk)
+
+        # a new submission updates the combined count
+        xml = '<data id="a"><fruit>mango</fruit></data>'
+        Instance(xform=xf1, xml=xml).save()
+        descriptor = get_merged_xform_descriptor(merged_xf.pk)
+        self.assertEqual(descriptor["num_of_submissions"], 3)
+
+        # deleted and removed child forms are excluded
+        xf2.soft_delete()
+        descriptor = get_merged_xform_descriptor(merged_xf.pk)
+        self.assertEqual(descriptor["xform_ids"], [xf1.pk])
+        merged_xf.xforms.remove(xf1)
+        self.assertEqual(get_merged_xform_descriptor(merged_xf.pk)["xform_ids"], [])
+        self.assertEqual(get_merged_xform_ids(merged_xf), [merged_xf.pk])
+
+    def test_clear_merged_xform_cache(self):
+        """The merged datasets of a form are cached until their forms change"""
+        merged_xf = self._create_merged_dataset()
+        xf1 = merged_xf.xforms.get(id_string="a")
+        xf2 = merged_xf.xforms.get(id_string="b")
+        merged_xf.xforms.remove(xf2)
+        clear_merged_xform_cache(xf2.pk)
+
+        with self.assertNumQueries(0):
+            clear_merged_xform_cache(xf2.pk)
+
+        # a form added to a merged dataset clears the merged dataset's descriptor
+        merged_xf.xforms.add(xf2)
+        self.assertEqual(
+            get_merged_xform_descriptor(merged_xf.pk)["xform_ids"], [xf1.pk, xf2.pk]
+        )
+        xml = '<data id="b"><fruit>mango</fruit></data>'
+        Instance(xform=xf2, xml=xml).save()
+        self.assertEqual(
+            get_merged_xform_descriptor(merged_xf.pk)["num_of_submissions"], 1
+        )
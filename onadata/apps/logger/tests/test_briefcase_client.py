@@ -5,6 +5,7 @@ Test Briefcase client
 
 import os.path
 from io import BytesIO
+from unittest.mock import patch
 
 from django.conf import settings
 from django.contrib.auth import authenticate
@@ -207,6 +208,48 @@ class TestBriefcaseClient(TestBase):
         )
         self.assertTrue(storage.exists(media_path))
 
+    def test_download_instances_resumes_from_cursor(self):
+        """Submission downloads resume from the last downloaded chunk"""
+        self._download_xforms()
+        self._download_submissions()
+        instance = Instance.objects.get(xform=self.xform)
+        cursor_path = os.path.join(
+            "deno", "briefcase", "forms", self.xform.id_string, "resumption_cursor"
+        )
+        with storage.open(cursor_path) as cursor_file:
+            self.assertEqual(cursor_file.read().decode("utf-8"), str(instance.pk))
+
+        summary = self.briefcase_client.get_summary()
+        self.assertEqual(summary["forms"], 1)
+        self.assertEqual(summary["instances"], 1)
+        self.assertEqual(summary["media_files"], 2)
+        self.assertEqual(summary["failed"], 0)
+
+        with requests_mock.Mocker() as mocker:
+            mocker.get(requests_mock.ANY, content=submission_list)
+            self.briefcase_client.download_instances(self.xform.id_string)
+            # only the chunk after the saved cursor is requested
+            self.assertEqual(mocker.call_count, 1)
+            self.assertIn(f"cursor={instance.pk}", mocker.request_history[0].url)
+
+    def test_download_instances_keeps_cursor_on_failure(self):
+        """The cursor is not saved past a chunk with failed media downloads"""
+        self._download_xforms()
+        with patch.object(
+            self.briefcase_client, "_get_media_response", return_value=None
+        ):
+            self._download_submissions()
+        cursor_path = os.path.join(
+            "deno", "briefcase", "forms", self.xform.id_string, "resumption_cursor"
+        )
+        self.assertFalse(storage.exists(cursor_path))
+        self.assertEqual(self.briefcase_client.get_summary()["failed"], 2)
+
+        # the failed media files are downloaded on the next run
+        self._download_submissions()
+        self.assertTrue(storage.exists(cursor_path))
+        self.assertEqual(self.briefcase_client.get_summary()["media_files"], 2)
+
     def test_push(self):
         """Test ODK briefcase client push function."""
         xforms = XForm.objects.filter(
@@ -2,7 +2,9 @@
 
 import json
 import sys
+from datetime import timedelta
 from io import StringIO
+from threading import Thread
 from types import SimpleNamespace
 from unittest.mock import patch
 
@@ -16,12 +18,14 @@ from celery.exceptions import MaxRetriesExceededError
 from valigetta.exceptions import ConnectionException as ValigettaConnectionException
 
 from onadata.apps.logger.models import EntityList
+from onadata.apps.logger.models.instance import update_project_date_modified
 from onadata.apps.logger.tasks import (
     adjust_xform_num_of_decrypted_submissions_async,
     apply_project_date_modified_async,
     commit_cached_elist_num_entities_async,
     commit_cached_xform_num_of_decrypted_submissions_async,
     decrypt_instance_async,
+    decrypt_instances_async,
     disable_expired_keys_async,
     import_entities_from_csv_async,
     rotate_expired_keys_async,
@@ -31,7 +35,13 @@ from onadata.apps.logger.tasks import (
 )
 from onadata.apps.main.tests.test_base import TestBase
 from onadata.libs.exceptions import NotAllMediaReceivedError
-from onadata.libs.utils.cache_tools import PROJECT_DATE_MODIFIED_CACHE
+from onadata.libs.utils.cache_tools import (
+    PROJECT_DATE_MODIFIED_CACHE,
+    PROJECT_DATE_MODIFIED_IDS,
+    PROJECT_DATE_MODIFIED_SHARDS,
+    PROJECT_DATE_MODIFIED_TRACKED,
+    CacheLockError,
+)
 from onadata.libs.utils.user_auth import get_user_default_project
 
 
@@ -87,12 +97,24 @@ class UpdateProjectDateModified(TestBase):
         super().setUp()
         self.project = get_user_default_project(self.user)
 
+    def _instance(self, project_id, date_modified=None):
+        return SimpleNamespace(
+            xform=SimpleNamespace(project_id=project_id),
+            date_modified=date_modified or timezone.now(),
+        )
+
+    def _tracked_project_ids(self):
+        project_ids = set()
+        for shard in range(PROJECT_DATE_MODIFIED_SHARDS):
+            project_ids |= cache.get(f"{PROJECT_DATE_MODIFIED_IDS}{shard}") or set()
+
+        return project_ids
+
     def test_update_project_date_modified(self):
         """Test project date_modified field is updated"""
-        project_ids = cache.get(PROJECT_DATE_MODIFIED_CACHE, {})
-        project_ids[self.project.pk] = timezone.now()
         initial_date_modified = self.project.date_modified
-        cache.set(PROJECT_DATE_MODIFIED_CACHE, project_ids, timeout=300)
+        update_project_date_modified(self._instance(self.project.pk))
+        self.assertEqual(self._tracked_project_ids(), {self.project.pk})
 
         apply_project_date_modified_async.delay()
         self.project.refresh_from_db()
@@ -104,21 +126,79 @@ class UpdateProjectDateModified(TestBase):
         # check if current date modified is greater than initial
         self.assertGreater(current_date_modified, initial_date_modified)
 
-        # assert that cache is cleared once task completes
-        self.assertIsNone(cache.get(PROJECT_DATE_MODIFIED_CACHE))
+        # assert that the project is untracked once task completes
+        self.assertEqual(self._tracked_project_ids(), set())
+        self.assertIsNone(
+            cache.get(f"{PROJECT_DATE_MODIFIED_TRACKED}{self.project.pk}")
+        )
 
     def test_update_project_date_modified_empty_cache(self):
         """Test project date modified empty cache"""
-        # Ensure the cache is empty, meaning no projects exist
-        cache.delete(PROJECT_DATE_MODIFIED_CACHE)
+        initial_date_modified = self.project.date_modified
 
         # Run cronjon
         apply_project_date_modified_async.delay()
 
         # Verify that no projects were updated
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.date_modified, initial_date_modified)
+        self.assertEqual(self._tracked_project_ids(), set())
+
+    def test_older_date_not_applied(self):
+        """A cached date older than the project's date_modified is not applied"""
+        initial_date_modified = self.project.date_modified
+        update_project_date_modified(
+            self._instance(self.project.pk, initial_date_modified - timedelta(days=1))
+        )
+
+        apply_project_date_modified_async.delay()
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.date_modified, initial_date_modified)
+
+    @patch("onadata.apps.logger.models.instance.set_cache_with_lock")
+    def test_repeat_changes_not_tracked(self, mock_set_cache):
+        """Only the first change to a project since the last commit is tracked"""
+        for _ in range(10):
+            update_project_date_modified(self._instance(self.project.pk))
+
+        mock_set_cache.assert_called_once()
+
+    @patch("onadata.apps.logger.models.instance.set_cache_with_lock")
+    def test_lock_error(self, mock_set_cache):
+        """The date is written to the project if the project cannot be tracked"""
+        mock_set_cache.side_effect = CacheLockError
+        date_modified = timezone.now() + timedelta(minutes=1)
+        update_project_date_modified(self._instance(self.project.pk, date_modified))
+
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.date_modified, date_modified)
         self.assertIsNone(
-            cache.get(PROJECT_DATE_MODIFIED_CACHE)
-        )  # Cache should remain empty
+            cache.get(f"{PROJECT_DATE_MODIFIED_TRACKED}{self.project.pk}")
+        )
+
+    def test_concurrent_changes(self):
+        """Concurrent changes to many projects are all tracked"""
+        project_ids = range(1000, 1200)
+        latest = timezone.now() + timedelta(hours=1)
+
+        def submit(offset):
+            for project_id in project_ids:
+                update_project_date_modified(
+                    self._instance(project_id, latest - timedelta(seconds=offset))
+                )
+
+        threads = [Thread(target=submit, args=(offset,)) for offset in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self._tracked_project_ids(), set(project_ids))
+        for project_id in project_ids:
+            self.assertLessEqual(
+                latest - cache.get(f"{PROJECT_DATE_MODIFIED_CACHE}{project_id}"),
+                timedelta(seconds=7),
+            )
 
 
 @patch("onadata.apps.logger.tasks.commit_cached_elist_num_entities")
@@ -442,6 +522,40 @@ class DecryptInstanceAsyncTestCase(TestBase):
         )
 
 
+@patch("onadata.apps.logger.tasks.decrypt_instance_async.delay")
+@patch("onadata.apps.logger.tasks.decrypt_instances")
+class DecryptInstancesAsyncTestCase(TestBase):
+    """Tests for decrypt_instances_async"""
+
+    def test_decrypt_instances(self, mock_decrypt, mock_decrypt_async):
+        """Instances are decrypted and pending media ones are queued"""
+        mock_decrypt.return_value = {
+            "decrypted": 1,
+            "failed": [],
+            "pending": [3],
+            "files": 2,
+            "bytes": 1024,
+            "duration": 1,
+            "decrypted_per_second": 1,
+            "files_per_second": 2,
+            "bytes_per_second": 1024,
+        }
+        decrypt_instances_async.delay([1, 2, 3])
+
+        mock_decrypt.assert_called_once_with([1, 2, 3])
+        mock_decrypt_async.assert_called_once_with(3)
+
+    @patch("onadata.apps.logger.tasks.decrypt_instances_async.retry")
+    def test_retry_exceptions(self, mock_retry, mock_decrypt, mock_decrypt_async):
+        """Connection exceptions are retried"""
+        mock_decrypt.side_effect = ValigettaConnectionException
+        decrypt_instances_async.delay([1])
+
+        self.assertTrue(mock_retry.called)
+        _, kwargs = mock_retry.call_args_list[0]
+        self.assertTrue(isinstance(kwargs["exc"], ValigettaConnectionException))
+
+
 @patch("onadata.apps.logger.tasks.default_storage.open")
 @patch("onadata.apps.logger.tasks.import_entities_from_csv")
 class ImportEntitiesFromCSVAsyncTestCase(TestBase):
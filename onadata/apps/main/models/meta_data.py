@@ -33,7 +33,9 @@ from onadata.libs.utils.cache_tools import (
     ENKETO_URL_CACHE,
     ENKETO_URLS_CACHE,
     XFORM_MANIFEST_CACHE,
+    XFORM_META_PERMS_ENABLED_CACHE,
     XFORM_METADATA_CACHE,
+    bump_xform_perms_version,
     safe_cache_delete,
 )
 from onadata.libs.utils.common_tags import (
@@ -631,6 +633,11 @@ def clear_cached_metadata_instance_object(
     if instance.data_type == "media":
         safe_cache_delete(f"{XFORM_MANIFEST_CACHE}{xform_id}")
 
+    if instance.data_type == XFORM_META_PERMS:
+        safe_cache_delete(f"{XFORM_META_PERMS_ENABLED_CACHE}{xform_id}")
+        # the cached per user scopes depend on the meta permissions setting
+        bump_xform_perms_version(xform_id)
+
     if instance.data_type in (
         "enketo_url",
         "enketo_preview_url",
@@ -23,7 +23,28 @@ def call_backend(backend, instance_id, backend_options=None):
         backend_class(options=backend_options).send(instance)
 
 
-class BaseBackend:  # pylint: disable=too-few-public-methods
+@use_master
+def call_backend_many(backend, instance_ids, backend_options=None):
+    """
+    Call notification backends like MQTT to send a batch of messages
+
+    Returns the ids of the messages that were not sent.
+    """
+    instances = list(
+        Action.objects.filter(pk__in=instance_ids)
+        .prefetch_related("actor", "target")
+        .order_by("pk")
+    )
+    if not instances:
+        return []
+
+    backend_class = import_string(backend)
+    unsent = backend_class(options=backend_options).send_many(instances)
+
+    return [instance.pk for instance in unsent]
+
+
+class BaseBackend:
     """
     Base class for notification backends
     """
@@ -36,3 +57,12 @@ class BaseBackend:  # pylint: disable=too-few-public-methods
         This method actually sends the message
         """
         raise NotImplementedError()
+
+    def send_many(self, instances):
+        """
+        Sends the messages one at a time, returns the messages not sent
+        """
+        for instance in instances:
+            self.send(instance)
+
+        return []
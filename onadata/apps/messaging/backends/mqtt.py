@@ -5,11 +5,15 @@ Messaging notification backend for MQTT
 from __future__ import unicode_literals
 
 import json
+import os
 import ssl
+import threading
+import time
 
 from django.conf import settings
 
-from paho.mqtt import publish
+from paho.mqtt import client as mqtt
+from paho.mqtt.enums import CallbackAPIVersion
 
 from onadata.apps.logger.models import XForm
 from onadata.apps.messaging.backends.base import BaseBackend
@@ -21,6 +25,96 @@ from onadata.apps.messaging.constants import (
     XFORM,
 )
 
+DEFAULT_PORT = 1883
+# Limit of the form topics cached by a worker before the cache is reset
+TOPIC_CACHE_MAX_SIZE = 10000
+
+_clients = {}
+_clients_lock = threading.Lock()
+_xform_topics = {}
+
+
+def get_client(host, port=None, tls=None, connect_timeout=10):
+    """
+    Returns the process' long lived MQTT client connected to ``host``
+
+    The client's network loop runs in a background thread which reconnects to
+    the broker when the connection is lost. Clients are kept per process since
+    the network thread does not survive a fork.
+
+    Only a new client waits up to ``connect_timeout`` seconds for the broker.
+    A client that has lost its connection fails fast while it reconnects.
+    """
+    key = (os.getpid(), host, port, json.dumps(tls, sort_keys=True, default=str))
+
+    with _clients_lock:
+        is_new = key not in _clients
+        if is_new:
+            connected = threading.Event()
+
+            # pylint: disable=unused-argument,too-many-arguments
+            def on_connect(client, userdata, flags, reason_code, properties):
+                if not reason_code.is_failure:
+                    connected.set()
+
+            # pylint: disable=unused-argument,too-many-arguments
+            def on_disconnect(client, userdata, flags, reason_code, properties):
+                connected.clear()
+
+            client = mqtt.Client(CallbackAPIVersion.VERSION2)
+            if tls:
+                client.tls_set(**tls)
+            client.on_connect = on_connect
+            client.on_disconnect = on_disconnect
+            client.reconnect_delay_set(min_delay=1, max_delay=30)
+            client.connect_async(host, port or DEFAULT_PORT)
+            client.loop_start()
+            _clients[key] = (client, connected)
+
+        client, connected = _clients[key]
+
+    if not connected.wait(connect_timeout if is_new else 0):
+        raise ConnectionError(f"Unable to connect to the MQTT broker {host}.")
+
+    return client
+
+
+def is_published(message_info, timeout):
+    """
+    Waits up to ``timeout`` seconds for a message to be published
+
+    Returns False if the message was not published, e.g. it was not queued
+    because the client is disconnected.
+    """
+    try:
+        message_info.wait_for_publish(max(timeout, 0))
+        return message_info.is_published()
+    except (RuntimeError, ValueError):
+        return False
+
+
+def get_xform_topic_kwargs(xform_id, ttl=300):
+    """
+    Returns the organization username and project id in an XForm's topic
+
+    The values are cached by the worker for ``ttl`` seconds.
+    """
+    now = time.monotonic()
+    cached = _xform_topics.get(xform_id)
+    if cached and cached[0] > now:
+        return cached[1]
+
+    xform = XForm.objects.select_related("project__organization").get(id=xform_id)
+    topic_kwargs = {
+        "organization_username": xform.project.organization.username,
+        "project_id": xform.project.id,
+    }
+    if len(_xform_topics) >= TOPIC_CACHE_MAX_SIZE:
+        _xform_topics.clear()
+    _xform_topics[xform_id] = (now + ttl, topic_kwargs)
+
+    return topic_kwargs
+
 
 def get_target_metadata(target_obj):
     """
@@ -114,6 +208,9 @@ class MQTTBackend(BaseBackend):
         self.qos = options.get("QOS", 0)
         self.retain = options.get("RETAIN", False)
         self.topic_base = options.get("TOPIC_BASE", "onadata")
+        self.topic_cache_ttl = options.get("TOPIC_CACHE_TTL", 300)
+        self.connect_timeout = options.get("CONNECT_TIMEOUT", 10)
+        self.publish_timeout = options.get("PUBLISH_TIMEOUT", 10)
 
     def get_topic(self, instance):
         """
@@ -126,15 +223,17 @@ class MQTTBackend(BaseBackend):
         """
         kwargs = {
             "target_id": instance.target_object_id,
-            "target_name": instance.target._meta.model_name,
+            "target_name": instance.target_content_type.model,
             "topic_base": self.topic_base,
             "verb": instance.verb,
         }
         if kwargs.get("target_name") == XFORM:
-            xform = XForm.objects.get(id=instance.target_object_id)
-            kwargs["organization_username"] = xform.project.organization.username
+            kwargs.update(
+                get_xform_topic_kwargs(
+                    int(instance.target_object_id), self.topic_cache_ttl
+                )
+            )
             kwargs["verb"] = VERB_TOPIC_DICT[instance.verb]
-            kwargs["project_id"] = xform.project.id
             return (
                 "/{topic_base}/organization/{organization_username}/"
                 "project/{project_id}/{target_name}/{target_id}/{verb}/"
@@ -152,16 +251,43 @@ class MQTTBackend(BaseBackend):
         """
         Sends the message to appropriate MQTT topic(s)
         """
-        topic = self.get_topic(instance)
-        payload = get_payload(instance)
-        # send it
-
-        return publish.single(
-            topic,
-            payload=payload,
-            hostname=self.host,
-            port=self.port,
-            tls=self.cert_info,
-            qos=self.qos,
-            retain=self.retain,
-        )
+        if self.send_many([instance]):
+            raise ConnectionError(
+                f"The message was not published to the MQTT broker {self.host}."
+            )
+
+    def send_many(self, instances):
+        """
+        Publishes the messages in a batch over the long lived connection
+
+        The messages are queued on the client before waiting up to
+        PUBLISH_TIMEOUT seconds for the batch to be sent. Returns the messages
+        that were not sent, all of them while the client reconnects, so that
+        they can be retried.
+        """
+        try:
+            client = get_client(
+                self.host, self.port, self.cert_info, self.connect_timeout
+            )
+        except ConnectionError:
+            return list(instances)
+
+        message_infos = [
+            (
+                instance,
+                client.publish(
+                    self.get_topic(instance),
+                    payload=get_payload(instance),
+                    qos=self.qos,
+                    retain=self.retain,
+                ),
+            )
+            for instance in instances
+        ]
+        deadline = time.monotonic() + self.publish_timeout
+
+        return [
+            instance
+            for instance, message_info in message_infos
+            if not is_published(message_info, deadline - time.monotonic())
+        ]
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+benchmark_mqtt command
+
+Compares publishing messages with a connection per message against the
+messaging backend's long lived client.
+"""
+
+import json
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils.translation import gettext as _
+
+from paho.mqtt import publish
+
+from onadata.apps.messaging.backends.mqtt import get_client
+
+
+class Command(BaseCommand):
+    """Benchmark publishing messages to an MQTT broker"""
+
+    help = _("Benchmark publishing messages to an MQTT broker")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="localhost", help=_("Broker host"))
+        parser.add_argument("--port", type=int, default=1883, help=_("Broker port"))
+        parser.add_argument(
+            "--messages", type=int, default=1000, help=_("Number of messages")
+        )
+        parser.add_argument("--qos", type=int, default=0, help=_("Quality of service"))
+        parser.add_argument(
+            "--topic", default="/onadata/benchmark", help=_("Topic to publish to")
+        )
+
+    def _report(self, name, num_messages, duration):
+        self.stdout.write(
+            f"{name}: {num_messages} messages in {duration:.3f}s "
+            f"({num_messages / duration:.1f} messages/s)"
+        )
+
+    def handle(self, *args, **options):
+        host, port, qos = options["host"], options["port"], options["qos"]
+        topic = options["topic"]
+        payloads = [
+            json.dumps({"id": i, "verb": "submission_created", "message": "benchmark"})
+            for i in range(options["messages"])
+        ]
+
+        start = time.monotonic()
+        for payload in payloads:
+            publish.single(topic, payload=payload, hostname=host, port=port, qos=qos)
+        self._report("connection per message", len(payloads), time.monotonic() - start)
+
+        client = get_client(host, port)
+        start = time.monotonic()
+        message_infos = [
+            client.publish(topic, payload=payload, qos=qos) for payload in payloads
+        ]
+        for message_info in message_infos:
+            message_info.wait_for_publish()
+        self._report("long lived client", len(payloads), time.monotonic() - start)
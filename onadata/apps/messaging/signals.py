@@ -4,13 +4,69 @@ Messaging signal handlers
 """
 from __future__ import unicode_literals
 
+import json
+import threading
+from functools import partial
+
 from actstream.models import Action
 from django.conf import settings
+from django.db import transaction
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 
 from onadata.apps.messaging.backends.base import call_backend
-from onadata.apps.messaging.tasks import call_backend_async
+from onadata.apps.messaging.tasks import call_backend_many_async
+
+_pending = threading.local()
+
+
+def send_batches(batches):
+    """
+    Queues a task per batch of messages to send to a notification backend
+    """
+    for backend, backend_options, instance_ids in batches.values():
+        # Sometimes the Action isn't created yet, hence
+        # the need to delay 2 seconds
+        call_backend_many_async.apply_async(
+            (backend, instance_ids, backend_options), countdown=2
+        )
+
+
+def get_pending_batches():
+    """
+    Returns the batches of messages sent when the current transaction commits
+
+    The connection replaces its list of commit callbacks once they run or the
+    transaction is rolled back, a new batch is started after that.
+    """
+    connection = transaction.get_connection()
+    pending = getattr(_pending, "batches", None)
+    if pending is None or pending[0] is not connection.run_on_commit:
+        batches = {}
+        transaction.on_commit(partial(send_batches, batches))
+        pending = _pending.batches = (connection.run_on_commit, batches)
+
+    return pending[1]
+
+
+def queue_message(backend, instance_id, backend_options=None):
+    """
+    Queues a message to be sent to a notification backend in a batch
+
+    Messages created in a transaction are sent in one batch once it commits.
+    """
+    batch = (backend, backend_options, [instance_id])
+
+    if not transaction.get_connection().in_atomic_block:
+        send_batches({backend: batch})
+        return
+
+    key = (backend, json.dumps(backend_options, sort_keys=True, default=str))
+    batches = get_pending_batches()
+    if key in batches:
+        batches[key][2].append(instance_id)
+    else:
+        batches[key] = batch
 
 
 @receiver(post_save, sender=Action, dispatch_uid="messaging_backends_handler")
@@ -27,10 +83,6 @@ def messaging_backends_handler(sender, **kwargs):  # pylint: disable=unused-argu
             backend = backends[name]["BACKEND"]
             backend_options = backends[name].get("OPTIONS")
             if as_task:
-                # Sometimes the Action isn't created yet, hence
-                # the need to delay 2 seconds
-                call_backend_async.apply_async(
-                    (backend, instance.id, backend_options), countdown=2
-                )
+                queue_message(backend, instance.id, backend_options)
             else:
                 call_backend(backend, instance.id, backend_options)
@@ -4,9 +4,13 @@ Messaging tasks
 """
 from __future__ import unicode_literals
 
-from onadata.apps.messaging.backends.base import call_backend
+from onadata.apps.messaging.backends.base import call_backend, call_backend_many
 from onadata.celeryapp import app
 
+# Retries of the messages a backend could not send, e.g. while reconnecting
+MAX_SEND_RETRIES = 8
+MAX_SEND_RETRY_DELAY = 60
+
 
 @app.task(ignore_result=True)
 def call_backend_async(backend, instance_id, backend_options=None):
@@ -14,3 +18,19 @@ def call_backend_async(backend, instance_id, backend_options=None):
     Task to send messages to notification backeds such as MQTT
     """
     call_backend(backend, instance_id, backend_options)
+
+
+@app.task(bind=True, ignore_result=True, max_retries=MAX_SEND_RETRIES)
+def call_backend_many_async(self, backend, instance_ids, backend_options=None):
+    """
+    Task to send a batch of messages to notification backends such as MQTT
+
+    The messages the backend did not send are retried with a backoff.
+    """
+    unsent_ids = call_backend_many(backend, instance_ids, backend_options)
+
+    if unsent_ids:
+        raise self.retry(
+            args=(backend, unsent_ids, backend_options),
+            countdown=min(2**self.request.retries, MAX_SEND_RETRY_DELAY),
+        )
@@ -4,9 +4,12 @@ Tests Messaging backends base module.
 """
 from __future__ import unicode_literals
 
+from unittest.mock import patch
+
 from django.test import TestCase
 
-from onadata.apps.messaging.backends.base import call_backend
+from onadata.apps.messaging.backends.base import (BaseBackend, call_backend,
+                                                  call_backend_many)
 from onadata.apps.messaging.tests.test_base import (_create_message,
                                                     _create_user)
 
@@ -27,3 +30,23 @@ class TestBackendsBase(TestCase):
         with self.assertRaises(NotImplementedError):
             call_backend('onadata.apps.messaging.backends.base.BaseBackend',
                          instance.id, {'HOST': 'localhost'})
+
+    @patch.object(BaseBackend, 'send')
+    def test_call_backend_many(self, mock_send):
+        """
+        Test messaging call_backend_many sends every message.
+        """
+        from_user = _create_user('Bob')
+        to_user = _create_user('Alice')
+        instances = [
+            _create_message(from_user, to_user, f'Message {i}')
+            for i in range(2)]
+
+        unsent = call_backend_many(
+            'onadata.apps.messaging.backends.base.BaseBackend',
+            [instance.id for instance in instances], {'HOST': 'localhost'})
+
+        self.assertEqual(unsent, [])
+        self.assertEqual(
+            [args[0] for args, _kwargs in mock_send.call_args_list],
+            instances)
@@ -12,6 +12,7 @@ from django.test import TestCase
 
 from onadata.apps.messaging.backends.mqtt import (
     MQTTBackend,
+    get_client,
     get_payload,
     get_target_metadata,
 )
@@ -112,7 +113,7 @@ class TestMQTTBackend(TestCase):
             json.dumps(expected_payload), get_payload(instance, verbose_payload=False)
         )
 
-    @patch("onadata.apps.messaging.backends.mqtt.publish.single")
+    @patch("onadata.apps.messaging.backends.mqtt.get_client")
     def test_mqtt_send(self, mocked):
         """
         Test MQTT Backend send method
@@ -132,13 +133,9 @@ class TestMQTTBackend(TestCase):
         )
         mqtt.send(instance=instance)
         self.assertTrue(mocked.called)
-        args, kwargs = mocked.call_args_list[0]
-        self.assertEqual(mqtt.get_topic(instance), args[0])
-        self.assertEqual(get_payload(instance), kwargs["payload"])
-        self.assertEqual("localhost", kwargs["hostname"])
-        self.assertEqual(8883, kwargs["port"])
-        self.assertEqual(0, kwargs["qos"])
-        self.assertEqual(False, kwargs["retain"])
+        args, _kwargs = mocked.call_args_list[0]
+        self.assertEqual("localhost", args[0])
+        self.assertEqual(8883, args[1])
         self.assertDictEqual(
             dict(
                 ca_certs="cacert.pem",
@@ -147,5 +144,115 @@ class TestMQTTBackend(TestCase):
                 tls_version=ssl.PROTOCOL_TLSv1_2,
                 cert_reqs=ssl.CERT_NONE,
             ),
-            kwargs["tls"],
+            args[2],
         )
+        publish = mocked.return_value.publish
+        args, kwargs = publish.call_args_list[0]
+        self.assertEqual(mqtt.get_topic(instance), args[0])
+        self.assertEqual(get_payload(instance), kwargs["payload"])
+        self.assertEqual(0, kwargs["qos"])
+        self.assertEqual(False, kwargs["retain"])
+        publish.return_value.wait_for_publish.assert_called_once()
+        (timeout,), _kwargs = publish.return_value.wait_for_publish.call_args
+        self.assertLessEqual(timeout, 10)
+
+    @patch("onadata.apps.messaging.backends.mqtt.get_client")
+    def test_mqtt_send_not_published(self, mocked):
+        """
+        Test MQTT Backend send raises ConnectionError if it is not published
+        """
+        from_user = _create_user("Bob")
+        to_user = _create_user("Alice")
+        instance = _create_message(from_user, to_user, "I love oov")
+        message_info = mocked.return_value.publish.return_value
+        message_info.wait_for_publish.side_effect = RuntimeError
+        mqtt = MQTTBackend(options={"HOST": "localhost"})
+
+        with self.assertRaises(ConnectionError):
+            mqtt.send(instance)
+
+    @patch("onadata.apps.messaging.backends.mqtt.get_client")
+    def test_mqtt_send_many(self, mocked):
+        """
+        Test MQTT Backend send_many publishes every message before waiting
+        and returns the messages that were not published
+        """
+        from_user = _create_user("Bob")
+        to_user = _create_user("Alice")
+        instances = [
+            _create_message(from_user, to_user, f"Message {i}") for i in range(3)
+        ]
+        client = mocked.return_value
+        message_infos = [MagicMock() for _instance in instances]
+        message_infos[1].is_published.return_value = False
+        client.publish.side_effect = message_infos
+        mqtt = MQTTBackend(options={"HOST": "localhost"})
+
+        self.assertEqual(mqtt.send_many(instances), [instances[1]])
+        mocked.assert_called_once()
+        self.assertEqual(
+            [kwargs["payload"] for _args, kwargs in client.publish.call_args_list],
+            [get_payload(instance) for instance in instances],
+        )
+        for message_info in message_infos:
+            message_info.wait_for_publish.assert_called_once()
+
+    @patch("onadata.apps.messaging.backends.mqtt.get_client")
+    def test_mqtt_send_many_reconnecting(self, mocked):
+        """
+        Test MQTT Backend send_many returns every message while reconnecting
+        """
+        from_user = _create_user("Bob")
+        to_user = _create_user("Alice")
+        instances = [
+            _create_message(from_user, to_user, f"Message {i}") for i in range(2)
+        ]
+        mocked.side_effect = ConnectionError
+        mqtt = MQTTBackend(options={"HOST": "localhost"})
+
+        self.assertEqual(mqtt.send_many(instances), instances)
+        mocked.return_value.publish.assert_not_called()
+
+    @patch.dict("onadata.apps.messaging.backends.mqtt._clients", clear=True)
+    @patch("onadata.apps.messaging.backends.mqtt.mqtt.Client")
+    def test_get_client_fails_fast_when_disconnected(self, mock_client):
+        """
+        Test only a new client waits for the broker connection
+        """
+        client = mock_client.return_value
+        client.connect_async.side_effect = lambda *args: client.on_connect(
+            client, None, None, MagicMock(is_failure=False), None
+        )
+
+        self.assertEqual(get_client("localhost"), client)
+
+        client.on_disconnect(client, None, None, None, None)
+        with patch("threading.Event.wait", return_value=False) as mock_wait:
+            with self.assertRaises(ConnectionError):
+                get_client("localhost", connect_timeout=10)
+        mock_wait.assert_called_once_with(0)
+        mock_client.assert_called_once()
+
+    @patch.dict("onadata.apps.messaging.backends.mqtt._xform_topics", clear=True)
+    @patch("onadata.apps.messaging.backends.mqtt.XForm.objects.select_related")
+    def test_mqtt_get_topic_cached(self, mock_select_related):
+        """
+        Test the topic of an XForm message is resolved once per XForm
+        """
+        xform = MagicMock()
+        xform.project.id = 7331
+        xform.project.organization.username = "bob"
+        mock_select_related.return_value.get.return_value = xform
+        instance = MagicMock()
+        instance.target_object_id = "1337"
+        instance.target_content_type.model = XFORM
+        instance.verb = "submission_created"
+        mqtt = MQTTBackend(options={"HOST": "localhost"})
+        expected = (
+            "/onadata/organization/bob/project/7331/xform/1337/submission/created/"
+            "messages/publish"
+        )
+
+        self.assertEqual(mqtt.get_topic(instance), expected)
+        self.assertEqual(mqtt.get_topic(instance), expected)
+        mock_select_related.return_value.get.assert_called_once_with(id=1337)
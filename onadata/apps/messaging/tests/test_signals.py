@@ -26,15 +26,29 @@ class TestSignals(TestCase):
         },
         MESSAGING_ASYNC_NOTIFICATION=True,
     )
-    @patch("onadata.apps.messaging.signals.call_backend_async.apply_async")
+    @patch("onadata.apps.messaging.signals.call_backend_many_async.apply_async")
     def test_messaging_backends_handler_async(self, call_backend_async_mock):
         """
         Test messaging backends handler function.
         """
-        messaging_backends_handler(Action, instance=Action(id=9), created=True)
-        self.assertTrue(call_backend_async_mock.called)
-        call_backend_async_mock.assert_called_with(
-            ("onadata.apps.messaging.backends.base.BaseBackend", 9, None), countdown=2
+        with self.captureOnCommitCallbacks(execute=True):
+            messaging_backends_handler(Action, instance=Action(id=9), created=True)
+            messaging_backends_handler(Action, instance=Action(id=10), created=True)
+            call_backend_async_mock.assert_not_called()
+
+        # The messages of a transaction are sent in one batch once it commits
+        call_backend_async_mock.assert_called_once_with(
+            ("onadata.apps.messaging.backends.base.BaseBackend", [9, 10], None),
+            countdown=2,
+        )
+
+        call_backend_async_mock.reset_mock()
+        with self.captureOnCommitCallbacks(execute=True):
+            messaging_backends_handler(Action, instance=Action(id=11), created=True)
+
+        call_backend_async_mock.assert_called_once_with(
+            ("onadata.apps.messaging.backends.base.BaseBackend", [11], None),
+            countdown=2,
         )
 
     @override_settings(
@@ -4,10 +4,14 @@ Tests Messaging app tasks.
 """
 from __future__ import unicode_literals
 
+from unittest.mock import patch
+
+from celery.exceptions import Retry
 from django.test import TestCase
 from django.test.utils import override_settings
 
-from onadata.apps.messaging.tasks import call_backend_async
+from onadata.apps.messaging.tasks import (call_backend_async,
+                                          call_backend_many_async)
 from onadata.apps.messaging.tests.test_base import (_create_message,
                                                     _create_user)
 
@@ -31,3 +35,26 @@ class TestTasks(TestCase):
                 backend='onadata.apps.messaging.backends.base.BaseBackend',
                 instance_id=instance.id,
                 backend_options=None).get()
+
+    @patch('onadata.apps.messaging.tasks.call_backend_many_async.retry')
+    @patch('onadata.apps.messaging.tasks.call_backend_many')
+    def test_call_backend_many_async_retries_unsent(self, mock_call,
+                                                    mock_retry):
+        """
+        Test call_backend_many_async retries only the unsent messages.
+        """
+        backend = 'onadata.apps.messaging.backends.mqtt.MQTTBackend'
+        options = {'HOST': 'localhost'}
+        mock_call.return_value = [2]
+        mock_retry.side_effect = Retry
+        with self.assertRaises(Retry):
+            call_backend_many_async(backend, [1, 2, 3], options)
+
+        mock_call.assert_called_once_with(backend, [1, 2, 3], options)
+        _args, kwargs = mock_retry.call_args
+        self.assertEqual(kwargs['args'], (backend, [2], options))
+
+        mock_retry.reset_mock()
+        mock_call.return_value = []
+        call_backend_many_async(backend, [1], options)
+        mock_retry.assert_not_called()
@@ -8,5 +8,8 @@ class RestServiceInterface:  # pylint: disable=too-few-public-methods
     """RestServiceInterface base class."""
 
     def send(self, url, data=None):
-        """The class method to implement when sending data."""
+        """The class method to implement when sending data.
+
+        Returns the service's HTTP response, if any.
+        """
         raise NotImplementedError
@@ -4,9 +4,8 @@ Formhub/Ona Data to DHIS2 service - push submissions to DHIS2 instance.
 """
 from django.conf import settings
 
-import requests
-
 from onadata.apps.restservice.interface import RestServiceInterface
+from onadata.apps.restservice.utils import get_session
 
 WEBHOOK_TIMEOUT = getattr(settings, "WEBHOOK_TIMEOUT", 30)
 
@@ -26,4 +25,6 @@ class ServiceDefinition(RestServiceInterface):  # pylint: disable=too-few-public
                 "uuid": data.uuid,
             }
             valid_url = url % info
-            requests.get(valid_url, timeout=WEBHOOK_TIMEOUT)
+            return get_session(valid_url).get(valid_url, timeout=WEBHOOK_TIMEOUT)
+
+        return None
@@ -6,10 +6,10 @@ import json
 
 from django.conf import settings
 
-import requests
 from requests.exceptions import ConnectionError as RequestsConnectionError
 
 from onadata.apps.restservice.interface import RestServiceInterface
+from onadata.apps.restservice.utils import get_session
 
 WEBHOOK_TIMEOUT = getattr(settings, "WEBHOOK_TIMEOUT", 30)
 
@@ -27,8 +27,10 @@ class ServiceDefinition(RestServiceInterface):  # pylint: disable=too-few-public
             post_data = json.dumps(data.json)
             headers = {"Content-Type": "application/json"}
             try:
-                requests.post(
+                return get_session(url).post(
                     url, headers=headers, data=post_data, timeout=WEBHOOK_TIMEOUT
                 )
             except RequestsConnectionError:
                 pass
+
+        return None
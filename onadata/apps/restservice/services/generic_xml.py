@@ -3,9 +3,9 @@
 Post submisison XML data to an external service that accepts an XML post.
 """
 from django.conf import settings
-import requests
 
 from onadata.apps.restservice.interface import RestServiceInterface
+from onadata.apps.restservice.utils import get_session
 
 WEBHOOK_TIMEOUT = getattr(settings, "WEBHOOK_TIMEOUT", 30)
 
@@ -24,4 +24,6 @@ class ServiceDefinition(RestServiceInterface):  # pylint: disable=too-few-public
         Post submisison XML data to an external service that accepts an XML post.
         """
         headers = {"Content-Type": "application/xml"}
-        requests.post(url, data=data.xml, headers=headers, timeout=WEBHOOK_TIMEOUT)
+        return get_session(url).post(
+            url, data=data.xml, headers=headers, timeout=WEBHOOK_TIMEOUT
+        )
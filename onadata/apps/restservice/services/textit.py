@@ -6,11 +6,11 @@ import json
 
 from django.conf import settings
 
-import requests
 from six import iteritems, string_types
 
 from onadata.apps.main.models import MetaData
 from onadata.apps.restservice.interface import RestServiceInterface
+from onadata.apps.restservice.utils import get_session
 from onadata.libs.utils.common_tags import TEXTIT
 from onadata.settings.common import METADATA_SEPARATOR
 
@@ -48,13 +48,15 @@ class ServiceDefinition(RestServiceInterface):
                 "Authorization": f"Token {token}",
             }
 
-            requests.post(
+            return get_session(url).post(
                 url,
                 headers=headers,
                 data=json.dumps(post_data),
                 timeout=WEBHOOK_TIMEOUT,
             )
 
+        return None
+
     def clean_keys_of_slashes(self, record):
         """
         Replaces the slashes found in a dataset keys with underscores
@@ -2,13 +2,17 @@
 """
 Test RestService model
 """
+import json
 import os
+import threading
 import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import patch
 
 from django.test.utils import override_settings
 from django.urls import reverse
 
+from onadata.apps.logger.models import Instance
 from onadata.apps.logger.models.xform import XForm
 from onadata.apps.main.models import MetaData
 from onadata.apps.main.tests.test_base import TestBase
@@ -16,9 +20,26 @@ from onadata.apps.main.views import show
 from onadata.apps.restservice.models import RestService
 from onadata.apps.restservice.interface import RestServiceInterface
 from onadata.apps.restservice.services.textit import ServiceDefinition
+from onadata.apps.restservice.utils import call_service, get_delivery_summary
 from onadata.apps.restservice.views import add_service, delete_service
 
 
+class WebhookStubHandler(BaseHTTPRequestHandler):
+    """Records the requests made to a local webhook stub."""
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        """Record the request and reply with the next queued status code."""
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.received.append((self.path, self.headers["Content-Type"], body))
+        status = self.server.statuses.pop(0) if self.server.statuses else 200
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        """Keep the test output quiet."""
+
+
 class RestServiceTest(TestBase):
     """
     Test RestService model
@@ -133,7 +154,7 @@ class RestServiceTest(TestBase):
         self.assertEqual(response.status_code, 404)
 
     @override_settings(CELERY_TASK_ALWAYS_EAGER=True)
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_textit_service(self, mock_http):
         """Test the textit service."""
         service_url = "https://textit.io/api/v1/runs.json"
@@ -161,7 +182,7 @@ class RestServiceTest(TestBase):
         self.assertEqual(mock_http.call_count, 1)
 
     @override_settings(CELERY_TASK_ALWAYS_EAGER=True)
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_rest_service_not_set(self, mock_http):
         """Test a requests.post is not called when a service is not defined."""
         xml_submission = os.path.join(
@@ -191,3 +212,110 @@ class RestServiceTest(TestBase):
         }
 
         self.assertEqual(expected_data, service.clean_keys_of_slashes(test_data))
+
+    def _start_webhook_stub(self, statuses=None):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), WebhookStubHandler)
+        server.received = []
+        server.statuses = list(statuses or [])
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+    def test_call_service_delivers_to_services_concurrently(self):
+        """Test call_service() posts a submission to every service of the form."""
+        xml_submission = os.path.join(
+            self.this_directory, "fixtures", "dhisform_submission1.xml"
+        )
+        self._make_submission(xml_submission)
+        instance = Instance.objects.get(xform=self.xform)
+        server, url = self._start_webhook_stub()
+        for name in ["json", "xml"]:
+            RestService.objects.create(
+                service_url=f"{url}/{name}", xform=self.xform, name=name
+            )
+
+        deliveries = call_service(instance)
+
+        self.assertEqual(
+            sorted((d["service"], d["status"], d["error"]) for d in deliveries),
+            [("json", 200, None), ("xml", 200, None)],
+        )
+        received = {path: request for path, *request in server.received}
+        self.assertEqual(received["/json"][0], "application/json")
+        self.assertEqual(json.loads(received["/json"][1])["_id"], instance.pk)
+        self.assertEqual(received["/xml"], ["application/xml", instance.xml.encode()])
+
+    def test_call_service_retries_failed_deliveries(self):
+        """Test a delivery is retried when the service is unavailable."""
+        xml_submission = os.path.join(
+            self.this_directory, "fixtures", "dhisform_submission1.xml"
+        )
+        self._make_submission(xml_submission)
+        instance = Instance.objects.get(xform=self.xform)
+        server, url = self._start_webhook_stub(statuses=[503])
+        RestService.objects.create(service_url=url, xform=self.xform, name="json")
+
+        deliveries = call_service(instance)
+
+        self.assertEqual(deliveries[0]["status"], 200)
+        self.assertEqual(len(server.received), 2)
+
+    def test_call_service_does_not_retry_server_errors(self):
+        """Test a delivery the service may have processed is not retried."""
+        xml_submission = os.path.join(
+            self.this_directory, "fixtures", "dhisform_submission1.xml"
+        )
+        self._make_submission(xml_submission)
+        instance = Instance.objects.get(xform=self.xform)
+        server, url = self._start_webhook_stub(statuses=[500])
+        RestService.objects.create(service_url=url, xform=self.xform, name="json")
+
+        deliveries = call_service(instance)
+
+        self.assertEqual(deliveries[0]["status"], 500)
+        self.assertEqual(deliveries[0]["error"], "Service responded with HTTP 500")
+        self.assertEqual(len(server.received), 1)
+
+    def test_call_service_reports_error_responses_as_failed(self):
+        """Test non-2xx responses are counted as failed deliveries."""
+        xml_submission = os.path.join(
+            self.this_directory, "fixtures", "dhisform_submission1.xml"
+        )
+        self._make_submission(xml_submission)
+        instance = Instance.objects.get(xform=self.xform)
+        _server, url = self._start_webhook_stub(statuses=[404])
+        for name in ["json", "xml"]:
+            RestService.objects.create(
+                service_url=f"{url}/{name}", xform=self.xform, name=name
+            )
+
+        with patch("onadata.apps.restservice.utils.WEBHOOK_MAX_WORKERS", 1):
+            deliveries = call_service(instance)
+
+        self.assertEqual(
+            sorted((d["status"], d["error"] or "") for d in deliveries),
+            [(200, ""), (404, "Service responded with HTTP 404")],
+        )
+        summary = get_delivery_summary(deliveries, 1)
+        self.assertEqual(summary["failed"], 1)
+        self.assertEqual(summary["status_codes"], {200: 1, 404: 1})
+
+    def test_get_delivery_summary(self):
+        """Test the summary counts exceptions and error responses as failed."""
+        deliveries = [
+            {"status": 201, "error": None, "duration": 0.5},
+            {"status": 500, "error": "Service responded with HTTP 500", "duration": 1},
+            {"status": None, "error": "Connection refused", "duration": 1.5},
+            {"status": 201, "error": None, "duration": 1},
+        ]
+
+        summary = get_delivery_summary(deliveries, 2)
+
+        self.assertEqual(summary["deliveries"], 4)
+        self.assertEqual(summary["failed"], 2)
+        self.assertEqual(summary["status_codes"], {201: 2, 500: 1})
+        self.assertEqual(summary["per_second"], 2)
+        self.assertEqual(summary["latency_avg"], 1)
+        self.assertEqual(summary["latency_max"], 1.5)
@@ -4,24 +4,182 @@ restservice utility functions.
 """
 import logging
 import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+from django.conf import settings
+from django.db import connection
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from onadata.apps.restservice.models import RestService
 from onadata.libs.utils.common_tags import GOOGLE_SHEET
 from onadata.libs.utils.common_tools import report_exception
 
+WEBHOOK_MAX_RETRIES = getattr(settings, "WEBHOOK_MAX_RETRIES", 3)
+WEBHOOK_RETRY_BACKOFF = getattr(settings, "WEBHOOK_RETRY_BACKOFF", 0.5)
+WEBHOOK_RETRY_BACKOFF_MAX = getattr(settings, "WEBHOOK_RETRY_BACKOFF_MAX", 5)
+WEBHOOK_POOL_SIZE = getattr(settings, "WEBHOOK_POOL_SIZE", 10)
+WEBHOOK_MAX_WORKERS = getattr(settings, "WEBHOOK_MAX_WORKERS", 4)
+WEBHOOK_RETRY_STATUS_CODES = (429, 503)
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def get_session(url):
+    """Returns the keep-alive session shared by all requests to the url's host.
+
+    Sessions are created per process, so a Celery worker reuses its connections
+    to a webhook host across submissions. Failed connections and 429 and 503
+    replies, which the service did not process, are retried with an
+    exponential backoff of at most WEBHOOK_RETRY_BACKOFF_MAX seconds. Read
+    errors are not retried as the service may have received the submission.
+    """
+    parsed_url = urlparse(url)
+    key = (parsed_url.scheme, parsed_url.netloc)
+
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            retry = Retry(
+                total=WEBHOOK_MAX_RETRIES,
+                read=0,
+                other=0,
+                backoff_factor=WEBHOOK_RETRY_BACKOFF,
+                backoff_max=WEBHOOK_RETRY_BACKOFF_MAX,
+                status_forcelist=WEBHOOK_RETRY_STATUS_CODES,
+                allowed_methods=None,
+                respect_retry_after_header=False,
+                raise_on_status=False,
+            )
+            session = requests.Session()
+            session.mount(
+                f"{parsed_url.scheme}://",
+                HTTPAdapter(
+                    pool_connections=1,
+                    pool_maxsize=WEBHOOK_POOL_SIZE,
+                    max_retries=retry,
+                ),
+            )
+            _sessions[key] = session
+
+    return session
+
+
+def _deliver(service_def, submission_instance):
+    """Sends a submission to a service and returns the delivery record.
+
+    A delivery fails when the service call raises or the service replies with
+    a non-2xx status, the record's error describes the failure.
+    """
+    delivery = {
+        "service": service_def.name,
+        "url": service_def.service_url,
+        "status": None,
+        "error": None,
+    }
+    start = time.monotonic()
+    # pylint: disable=broad-except
+    try:
+        service = service_def.get_service_definition()()
+        response = service.send(service_def.service_url, submission_instance)
+        delivery["status"] = getattr(response, "status_code", None)
+        if delivery["status"] is not None and not 200 <= delivery["status"] < 300:
+            delivery["error"] = f"Service responded with HTTP {delivery['status']}"
+            logging.warning(
+                "Webhook %s %s failed: %s",
+                delivery["service"],
+                delivery["url"],
+                delivery["error"],
+            )
+    except Exception as error:
+        delivery["error"] = str(error)
+        report_exception(f"Service call failed: {error}", error, sys.exc_info())
+        logging.exception("Service threw exception: %s", error)
+    delivery["duration"] = time.monotonic() - start
+    logging.info(
+        "Webhook %s %s: status=%s duration=%.3fs",
+        delivery["service"],
+        delivery["url"],
+        delivery["status"],
+        delivery["duration"],
+    )
+
+    return delivery
+
+
+def _deliver_in_thread(service_def, submission_instance):
+    try:
+        return _deliver(service_def, submission_instance)
+    finally:
+        # Database connections are per thread, close the one this thread opened
+        connection.close()
+
+
+def get_delivery_summary(deliveries, duration):
+    """Returns throughput, latency and status code metrics of deliveries."""
+    latencies = [delivery["duration"] for delivery in deliveries]
+    status_codes = Counter(
+        delivery["status"] for delivery in deliveries if delivery["status"]
+    )
+
+    return {
+        "deliveries": len(deliveries),
+        "failed": sum(1 for delivery in deliveries if delivery["error"]),
+        "status_codes": dict(sorted(status_codes.items())),
+        "duration": duration,
+        "per_second": len(deliveries) / duration if duration else 0,
+        "latency_avg": sum(latencies) / len(latencies) if latencies else 0,
+        "latency_max": max(latencies, default=0),
+    }
+
 
 def call_service(submission_instance):
-    """Sends submissions to linked services."""
+    """Sends submissions to linked services.
+
+    The services are called concurrently and the delivery records are returned.
+    """
     # lookup service which is not google sheet service
-    services = RestService.objects.filter(
-        xform_id=submission_instance.xform_id
-    ).exclude(name=GOOGLE_SHEET)
-    # call service send with url and data parameters
-    for service_def in services:
-        # pylint: disable=broad-except
-        try:
-            service = service_def.get_service_definition()()
-            service.send(service_def.service_url, submission_instance)
-        except Exception as error:
-            report_exception(f"Service call failed: {error}", error, sys.exc_info())
-            logging.exception("Service threw exception: %s", error)
+    services = list(
+        RestService.objects.filter(xform_id=submission_instance.xform_id).exclude(
+            name=GOOGLE_SHEET
+        )
+    )
+    if not services:
+        return []
+
+    start = time.monotonic()
+    max_workers = min(WEBHOOK_MAX_WORKERS, len(services))
+    if max_workers < 2:
+        deliveries = [_deliver(service, submission_instance) for service in services]
+    else:
+        # load the form once instead of in each thread
+        submission_instance.xform  # pylint: disable=pointless-statement
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            deliveries = list(
+                executor.map(
+                    lambda service: _deliver_in_thread(service, submission_instance),
+                    services,
+                )
+            )
+    summary = get_delivery_summary(deliveries, time.monotonic() - start)
+    logging.info(
+        "Delivered submission %s to %d services in %.3fs (%.1f/s, %d failed, "
+        "status codes %s, latency avg %.3fs max %.3fs)",
+        submission_instance.pk,
+        summary["deliveries"],
+        summary["duration"],
+        summary["per_second"],
+        summary["failed"],
+        summary["status_codes"],
+        summary["latency_avg"],
+        summary["latency_max"],
+    )
+
+    return deliveries
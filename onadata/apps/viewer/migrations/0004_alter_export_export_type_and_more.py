@@ -0,0 +1,57 @@
+# Generated by Django 5.2.14 on 2026-10-19 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("viewer", "0003_genericexport"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="export",
+            name="export_type",
+            field=models.CharField(
+                choices=[
+                    ("xlsx", "Excel"),
+                    ("csv", "CSV"),
+                    ("zip", "ZIP"),
+                    ("kml", "kml"),
+                    ("csv_zip", "CSV ZIP"),
+                    ("sav_zip", "SAV ZIP"),
+                    ("sav", "SAV"),
+                    ("external", "Excel"),
+                    ("osm", "osm"),
+                    ("gsheets", "Google Sheets"),
+                    ("geojson", "geojson"),
+                    ("parquet", "Parquet"),
+                ],
+                default="xlsx",
+                max_length=10,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="genericexport",
+            name="export_type",
+            field=models.CharField(
+                choices=[
+                    ("xlsx", "Excel"),
+                    ("csv", "CSV"),
+                    ("zip", "ZIP"),
+                    ("kml", "kml"),
+                    ("csv_zip", "CSV ZIP"),
+                    ("sav_zip", "SAV ZIP"),
+                    ("sav", "SAV"),
+                    ("external", "Excel"),
+                    ("osm", "osm"),
+                    ("gsheets", "Google Sheets"),
+                    ("geojson", "geojson"),
+                    ("parquet", "Parquet"),
+                ],
+                default="xlsx",
+                max_length=10,
+            ),
+        ),
+    ]
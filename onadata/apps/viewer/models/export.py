@@ -90,6 +90,7 @@ class ExportBaseModel(models.Model):
     OSM_EXPORT = OSM
     GOOGLE_SHEETS_EXPORT = "gsheets"
     GEOJSON_EXPORT = "geojson"
+    PARQUET_EXPORT = "parquet"
 
     EXPORT_MIMES = {
         "xls": "vnd.ms-excel",
@@ -101,6 +102,7 @@ class ExportBaseModel(models.Model):
         "sav": "sav",
         "kml": "vnd.google-earth.kml+xml",
         "geojson": "geo+json",
+        "parquet": "vnd.apache.parquet",
         OSM: OSM,
     }
 
@@ -116,6 +118,7 @@ class ExportBaseModel(models.Model):
         (OSM, OSM),
         (GOOGLE_SHEETS_EXPORT, "Google Sheets"),
         (GEOJSON_EXPORT, "geojson"),
+        (PARQUET_EXPORT, "Parquet"),
     ]
 
     EXPORT_OPTION_FIELDS = [
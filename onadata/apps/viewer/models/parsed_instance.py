@@ -4,9 +4,11 @@ ParsedInstance model
 """
 
 import datetime
+from hashlib import md5
 
 from django.conf import settings
 from django.db import connection, models
+from django.utils import timezone
 from django.utils.translation import gettext as _
 
 import six
@@ -14,7 +16,9 @@ import ujson as json
 from dateutil import parser
 
 from onadata.apps.logger.models.instance import Instance, _get_attachments_from_instance
+from onadata.apps.logger.models.merged_xform import get_merged_xform_ids
 from onadata.apps.logger.models.note import Note
+from onadata.apps.logger.models.submission_deletion import SUBMISSION_DELETION_TTL
 from onadata.apps.logger.models.xform import _encode_for_mongo
 from onadata.apps.viewer.parsed_instance_tools import NONE_JSON_FIELDS, get_where_clause
 from onadata.libs.models.sorting import (
@@ -22,7 +26,7 @@ from onadata.libs.models.sorting import (
     json_order_by_params,
     sort_from_mongo_sort_str,
 )
-from onadata.libs.utils.cache_tools import XFORM_SUBMISSIONS_DELETING, safe_cache_get
+from onadata.libs.utils.cache_tools import get_xform_submissions_version
 from onadata.libs.utils.common_tags import (
     ATTACHMENTS,
     BAMBOO_DATASET_ID,
@@ -113,7 +117,24 @@ def _parse_sort_fields(fields):
             yield NONE_JSON_FIELDS.get(field, field)
 
 
-def _query_iterator(sql, fields=None, params=None, count=False):
+def _iter_chunked_rows(sql, params, chunk_size):
+    """Yields the rows of ``sql`` fetched ``chunk_size`` rows at a time.
+
+    The rows are read from a server-side cursor unless server-side cursors are
+    disabled for the database.
+    """
+    if connection.settings_dict.get("DISABLE_SERVER_SIDE_CURSORS"):
+        cursor = connection.cursor()
+    else:
+        cursor = connection.chunked_cursor()
+
+    with cursor:
+        cursor.execute(sql, params)
+        while rows := cursor.fetchmany(chunk_size):
+            yield from rows
+
+
+def _query_iterator(sql, fields=None, params=None, count=False, chunk_size=None):
     def parse_json(data):
         try:
             return json.loads(data)
@@ -123,7 +144,6 @@ def _query_iterator(sql, fields=None, params=None, count=False):
     if not sql:
         raise ValueError(_(f"Bad SQL: {sql}"))
     params = [] if params is None else params
-    cursor = connection.cursor()
     sql_params = fields + params if fields is not None else params
 
     if count:
@@ -132,12 +152,18 @@ def _query_iterator(sql, fields=None, params=None, count=False):
         sql = "SELECT COUNT(*) FROM (" + sql + ") AS CQ"
         fields = ["count"]
 
-    cursor.execute(sql, sql_params)
+    if chunk_size:
+        rows = _iter_chunked_rows(sql, sql_params, chunk_size)
+    else:
+        cursor = connection.cursor()
+        cursor.execute(sql, sql_params)
+        rows = cursor.fetchall()
+
     if fields is None:
-        for row in cursor.fetchall():
+        for row in rows:
             yield parse_json(row[0]) if row[0] else None
     else:
-        for row in cursor.fetchall():
+        for row in rows:
             yield dict(
                 zip(fields, (json.loads(s) if isinstance(s, str) else s for s in row))
             )
@@ -159,6 +185,18 @@ def get_etag_hash_from_query(sql=None, params=None):
     return f"{datetime.datetime.utcnow()}"
 
 
+def get_etag_hash_from_submissions_version(xform_ids, *args):
+    """Returns md5 hash from the submissions versions of the forms and ``args``
+
+    The hash changes whenever a submission of the forms changes, without querying
+    the submissions.
+    """
+    versions = [get_xform_submissions_version(xform_id) for xform_id in xform_ids]
+    etag_value = "|".join(str(value) for value in [*versions, *args])
+
+    return md5(etag_value.encode("utf-8")).hexdigest()
+
+
 # pylint: disable=too-many-arguments, too-many-positional-arguments
 def _start_index_limit(sql, params, start_index, limit):
     if (start_index is not None and start_index < 0) or (
@@ -183,19 +221,29 @@ def _get_sort_fields(sort):
     return list(_parse_sort_fields(sort))
 
 
-def exclude_deleting_submissions_clause(xform_id: int) -> tuple[str, list[int]]:
+def exclude_deleting_submissions_clause() -> tuple[str, list]:
     """Return SQL clause to exclude submissions whose deletion is in progress
 
-    :param xform_id: XForm ID
-    :return: SQL and list of submission IDs under deletion
-    """
-    instance_ids = safe_cache_get(f"{XFORM_SUBMISSIONS_DELETING}{xform_id}", [])
-
-    if not instance_ids:
-        return ("", [])
+    The clause has the same size however many submissions are being deleted.
+    Markers for the whole form and for single submissions are checked in
+    separate anti-joins so that each is an index lookup on
+    ``logger_subdel_xform_inst_idx``.
 
-    placeholders = ", ".join(["%s"] * len(instance_ids))
-    return (f"logger_instance.id NOT IN ({placeholders})", instance_ids)
+    :return: SQL and its parameters
+    """
+    pending_since = timezone.now() - SUBMISSION_DELETION_TTL
+
+    return (
+        "NOT EXISTS (SELECT 1 FROM logger_submissiondeletion"
+        " WHERE logger_submissiondeletion.xform_id = logger_instance.xform_id"
+        " AND logger_submissiondeletion.instance_id IS NULL"
+        " AND logger_submissiondeletion.date_created > %s)"
+        " AND NOT EXISTS (SELECT 1 FROM logger_submissiondeletion"
+        " WHERE logger_submissiondeletion.xform_id = logger_instance.xform_id"
+        " AND logger_submissiondeletion.instance_id = logger_instance.id"
+        " AND logger_submissiondeletion.date_created > %s)",
+        [pending_since, pending_since],
+    )
 
 
 # pylint: disable=too-many-locals
@@ -250,25 +298,12 @@ def build_sql_where(
         sql_where += " AND logger_instance.decryption_status = %s"
         where_params += [decryption_status]
 
-    exclude_sql, exclude_params = exclude_deleting_submissions_clause(xform.pk)
-
-    if exclude_sql:
-        # Exclude submissions whose deletion is in progress
-        sql_where += f" AND {exclude_sql}"
-        where_params += exclude_params
-
-    xform_pks = [xform.pk]
-
-    if xform.is_merged_dataset:
-        merged_xform_ids = list(
-            xform.mergedxform.xforms.filter(deleted_at__isnull=True).values_list(
-                "id", flat=True
-            )
-        )
-        if merged_xform_ids:
-            xform_pks = list(merged_xform_ids)
+    # Exclude submissions whose deletion is in progress
+    exclude_sql, exclude_params = exclude_deleting_submissions_clause()
+    sql_where += f" AND {exclude_sql}"
+    where_params += exclude_params
 
-    params = [tuple(xform_pks)] + where_params
+    params = [tuple(get_merged_xform_ids(xform))] + where_params
 
     return sql_where, params
 
@@ -397,8 +432,12 @@ def query_fields_data(
     limit=None,
     is_encrypted=None,
     decryption_status=None,
+    chunk_size=None,
 ):
-    """Query the submissions table and return json fields data"""
+    """Query the submissions table and return json fields data
+
+    With ``chunk_size`` set the rows are fetched ``chunk_size`` at a time.
+    """
     sql, params = get_sql_with_params(
         xform,
         query=query,
@@ -415,7 +454,7 @@ def query_fields_data(
     if isinstance(fields, six.string_types):
         fields = json.loads(fields)
 
-    return _query_iterator(sql, fields, params)
+    return _query_iterator(sql, fields, params, chunk_size=chunk_size)
 
 
 def query_data(
@@ -429,8 +468,13 @@ def query_data(
     json_only: bool = True,
     is_encrypted=None,
     decryption_status=None,
+    chunk_size=None,
 ):
-    """Query the submissions table and returns the results"""
+    """Query the submissions table and returns the results
+
+    With ``chunk_size`` set the submissions' json is fetched ``chunk_size``
+    rows at a time from a server-side cursor.
+    """
     sql, params = get_sql_with_params(
         xform,
         query=query,
@@ -444,6 +488,12 @@ def query_data(
         decryption_status=decryption_status,
     )
 
+    if chunk_size and json_only:
+        # the json is the last selected column
+        for row in _iter_chunked_rows(sql, params, chunk_size):
+            yield json.loads(row[-1]) if isinstance(row[-1], str) else row[-1]
+        return
+
     instances = Instance.objects.raw(sql, params)
 
     for instance in instances.iterator():
@@ -26,6 +26,66 @@ NONE_JSON_FIELDS = {
 OPERANDS = {"$gt": ">", "$gte": ">=", "$lt": "<", "$lte": "<=", "$i": "~*"}
 
 
+def _reject_constant(constant):
+    raise ValueError(f"{constant} is not valid in jsonb")
+
+
+def _get_json_scalar(value):
+    """Returns the number or boolean ``value`` parses as, None otherwise."""
+    try:
+        scalar = json.loads(value, parse_constant=_reject_constant)
+    except ValueError:
+        return None
+
+    return scalar if isinstance(scalar, (bool, int, float)) else None
+
+
+def _json_equals_sql(key, value):
+    """Returns the where clause and params matching ``value`` at the json ``key``.
+
+    The json containment (``@>``) predicates can use a ``jsonb_path_ops`` GIN
+    index on the json column. Numeric strings are stored as numbers in the json
+    so both forms are looked up, the ``->>`` comparison keeps the text semantics.
+    Other json scalars, e.g. booleans, are looked up the same way.
+    """
+    value = text(value)
+    candidates = [json.dumps({key: value})]
+    scalar = _get_json_scalar(value)
+    if scalar is not None:
+        candidates.append(json.dumps({key: scalar}))
+    contains = " OR ".join(["logger_instance.json @> %s::jsonb"] * len(candidates))
+
+    return (
+        f"(({contains}) AND logger_instance.json->>%s = %s)",
+        candidates + [key, value],
+    )
+
+
+def get_query_fields(query):
+    """Returns the json fields a ``query`` parameter filters on."""
+    try:
+        query = query if isinstance(query, dict) else json.loads(query)
+    except (TypeError, ValueError):
+        return []
+    if isinstance(query, list):
+        query = query[0] if query else {}
+    if not isinstance(query, dict):
+        return []
+
+    queries = [query] + [
+        item for item in query.get("$or", []) if isinstance(item, dict)
+    ]
+
+    return sorted(
+        {
+            key
+            for item in queries
+            for key in item
+            if key != "$or" and key not in NONE_JSON_FIELDS
+        }
+    )
+
+
 def _json_sql_str(key, known_integers=None, known_dates=None, known_decimals=None):
     if known_integers is None:
         known_integers = []
@@ -95,8 +155,9 @@ def _parse_where(query, known_integers, known_decimals, or_where, or_params):
                 where.append("logger_instance.json->>%s IS NULL")
                 where_params.append(field_key)
             else:
-                where.append("logger_instance.json->>%s = %s")
-                where_params.extend((field_key, text(field_value)))
+                equals_sql, equals_params = _json_equals_sql(field_key, field_value)
+                where.append(equals_sql)
+                where_params.extend(equals_params)
 
     return where + or_where, where_params + or_params
 
@@ -166,11 +227,13 @@ def get_where_clause(query, form_integer_fields=None, form_decimal_fields=None):
                             or_params.extend([key])
                         elif isinstance(value, list):
                             for item in value:
-                                or_where.extend(["logger_instance.json->>%s = %s"])
-                                or_params.extend([key, item])
+                                equals_sql, equals_params = _json_equals_sql(key, item)
+                                or_where.append(equals_sql)
+                                or_params.extend(equals_params)
                         else:
-                            or_where.extend(["logger_instance.json->>%s = %s"])
-                            or_params.extend([key, value])
+                            equals_sql, equals_params = _json_equals_sql(key, value)
+                            or_where.append(equals_sql)
+                            or_params.extend(equals_params)
 
                 or_where = ["".join(["(", " OR ".join(or_where), ")"])]
 
@@ -181,7 +244,8 @@ def get_where_clause(query, form_integer_fields=None, form_decimal_fields=None):
     except (ValueError, AttributeError) as error:
         if query and isinstance(query, six.string_types) and query.startswith("{"):
             raise error
-        # cast query param to text
+        # cast query param to text, a pg_trgm GIN index on the json text is used
+        # when it exists, see the json_indexes management command
         where = ["logger_instance.json::text ~* cast(%s as text)"]
         where_params = [query]
 
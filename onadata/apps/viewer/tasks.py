@@ -102,6 +102,7 @@ def create_async_export(xform, export_type, query, force_xlsx, options=None):
         Export.OSM_EXPORT: create_osm_export,
         Export.EXTERNAL_EXPORT: create_external_export,
         Export.GEOJSON_EXPORT: create_geojson_export,
+        Export.PARQUET_EXPORT: create_parquet_export,
     }
 
     # start async export
@@ -205,6 +206,37 @@ def create_csv_export(username, id_string, export_id, **options):
     return gen_export.id
 
 
+@app.task(track_started=True)
+def create_parquet_export(username, id_string, export_id, **options):
+    """
+    Parquet export task.
+    """
+    export = _get_export_object(export_id)
+
+    try:
+        gen_export = generate_export(
+            Export.PARQUET_EXPORT, export.xform, export_id, options
+        )
+    except NoRecordsFoundError:
+        export.internal_status = Export.FAILED
+        export.save()
+    except Exception as error:
+        export.internal_status = Export.FAILED
+        export.error_message = str(error)
+        export.save()
+        # mail admins
+        details = _get_export_details(username, id_string, export_id)
+
+        report_exception(
+            "Parquet Export Exception: Export ID - "
+            "%(export_id)s, /%(username)s/%(id_string)s" % details,
+            error,
+            sys.exc_info(),
+        )
+        raise
+    return gen_export.id
+
+
 @app.task(track_started=True)
 def create_kml_export(username, id_string, export_id, **options):
     """
@@ -3,15 +3,17 @@ from datetime import datetime
 
 from rest_framework.exceptions import ParseError
 
+from onadata.apps.logger.models import SubmissionDeletion
 from onadata.apps.logger.models.instance import Instance
 from onadata.apps.main.models.user_profile import UserProfile
 from onadata.apps.main.tests.test_base import TestBase
 from onadata.apps.viewer.models.parsed_instance import (
     _parse_sort_fields,
+    exclude_deleting_submissions_clause,
     get_sql_with_params,
     get_where_clause,
 )
-from onadata.apps.viewer.parsed_instance_tools import _parse_where
+from onadata.apps.viewer.parsed_instance_tools import _parse_where, get_query_fields
 
 
 class TestParsedInstance(TestBase):
@@ -26,11 +28,11 @@ class TestParsedInstance(TestBase):
         )
 
         expected_where = [
-            "logger_instance.json->>%s = %s",
+            "((logger_instance.json @> %s::jsonb) AND logger_instance.json->>%s = %s)",
             "CAST(logger_instance.json->>%s AS INT) > %s",
             "is_active = true",
         ]
-        expected_where_params = ["name", "bla", "age", "18"]
+        expected_where_params = ['{"name": "bla"}', "name", "bla", "age", "18"]
 
         self.assertEqual(where, expected_where)
         self.assertEqual(where_params, expected_where_params)
@@ -80,8 +82,51 @@ class TestParsedInstance(TestBase):
     def test_get_where_clause_with_json_query(self):
         query = '{"name": "bla"}'
         where, where_params = get_where_clause(query)
-        self.assertEqual(where, ["logger_instance.json->>%s = %s"])
-        self.assertEqual(where_params, ["name", "bla"])
+        self.assertEqual(
+            where,
+            [
+                "((logger_instance.json @> %s::jsonb) "
+                "AND logger_instance.json->>%s = %s)"
+            ],
+        )
+        self.assertEqual(where_params, ['{"name": "bla"}', "name", "bla"])
+
+    def test_get_where_clause_with_numeric_value(self):
+        """Numeric values are looked up as json strings and numbers"""
+        where, where_params = get_where_clause('{"age": "25"}')
+        self.assertEqual(
+            where,
+            [
+                "((logger_instance.json @> %s::jsonb OR logger_instance.json @> "
+                "%s::jsonb) AND logger_instance.json->>%s = %s)"
+            ],
+        )
+        self.assertEqual(where_params, ['{"age": "25"}', '{"age": 25}', "age", "25"])
+
+    def test_get_where_clause_with_boolean_value(self):
+        """Boolean values are looked up as json strings and booleans"""
+        where, where_params = get_where_clause('{"_edited": "true"}')
+        self.assertEqual(
+            where,
+            [
+                "((logger_instance.json @> %s::jsonb OR logger_instance.json @> "
+                "%s::jsonb) AND logger_instance.json->>%s = %s)"
+            ],
+        )
+        self.assertEqual(
+            where_params,
+            ['{"_edited": "true"}', '{"_edited": true}', "_edited", "true"],
+        )
+
+    def test_get_query_fields(self):
+        """The json fields a query filters on are returned"""
+        self.assertEqual(
+            get_query_fields(
+                '{"name": "bla", "_id": 1, "$or": [{"age": 1}, {"sex": "m"}]}'
+            ),
+            ["age", "name", "sex"],
+        )
+        self.assertEqual(get_query_fields("bla"), [])
 
     def test_get_where_clause_with_string_query(self):
         query = "bla"
@@ -269,6 +314,33 @@ class TestParsedInstance(TestBase):
             f"All instances {all_instances_debug}",
         )
 
+    def test_exclude_deleting_submissions_clause(self):
+        self._publish_transportation_form()
+        self._make_submissions()
+        instance_ids = list(
+            self.xform.instances.order_by("pk").values_list("pk", flat=True)
+        )
+        sql, params = exclude_deleting_submissions_clause()
+        self.assertEqual(Instance.objects.extra(where=[sql], params=params).count(), 4)
+
+        SubmissionDeletion.mark(self.xform, instance_ids[:3])
+        deleting_sql, deleting_params = exclude_deleting_submissions_clause()
+        # the clause does not grow with the number of submissions being deleted
+        self.assertEqual(deleting_sql, sql)
+        self.assertEqual(len(deleting_params), len(params))
+        self.assertEqual(
+            list(
+                Instance.objects.extra(where=[deleting_sql], params=deleting_params)
+                .order_by("pk")
+                .values_list("pk", flat=True)
+            ),
+            instance_ids[3:],
+        )
+
+        SubmissionDeletion.mark(self.xform)
+        sql, params = exclude_deleting_submissions_clause()
+        self.assertEqual(Instance.objects.extra(where=[sql], params=params).count(), 0)
+
     def test_parse_sort_fields_function(self):
         """
         Test that the _parse_sort_fields function works as intended
@@ -8,12 +8,11 @@ from __future__ import unicode_literals
 import base64
 import binascii
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Optional, Tuple
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.contrib.auth.models import update_last_login
 from django.core.exceptions import ImproperlyConfigured
 from django.core.signing import BadSignature
 from django.db import DataError
@@ -43,8 +42,10 @@ from onadata.apps.api.models.temp_token import TempToken
 from onadata.apps.api.tasks import send_account_lockout_email
 from onadata.libs.permissions import is_organization_user
 from onadata.libs.utils.cache_tools import (
+    LAST_LOGIN_UPDATE,
     LOCKOUT_IP,
     LOGIN_ATTEMPTS,
+    safe_cache_add,
     safe_cache_get,
     safe_cache_incr,
     safe_cache_set,
@@ -216,6 +217,45 @@ def expired(time_token_created):
     return time_diff > token_expiry_time
 
 
+def update_last_login_throttled(user):
+    """Persist ``user.last_login`` at most once per configured interval.
+
+    ODK Collect authenticates every form list and submission request, so
+    writing ``auth_user`` on each request is avoided. The ``last_login`` on
+    the already loaded user and a per-user cache key coalesce the writes to
+    one per ``LAST_LOGIN_MIN_INTERVAL_SECONDS``.
+    """
+    if user is None or not getattr(user, "pk", None):
+        return
+
+    now = timezone.now()
+    min_interval = getattr(settings, "LAST_LOGIN_MIN_INTERVAL_SECONDS", 300)
+    stale_before = now - timedelta(seconds=min_interval)
+
+    if min_interval > 0:
+        if user.last_login and user.last_login > stale_before:
+            return
+
+        if not safe_cache_add(f"{LAST_LOGIN_UPDATE}{user.pk}", True, min_interval):
+            return
+
+    User.objects.filter(
+        Q(last_login__isnull=True) | Q(last_login__lte=stale_before), pk=user.pk
+    ).update(last_login=now)
+    user.last_login = now
+
+
+class LastLoginMixin:  # pylint: disable=too-few-public-methods
+    """Records a throttled ``last_login`` when credentials are valid."""
+
+    def authenticate_credentials(self, *args, **kwargs):
+        """Authenticate the credentials and update the user's last login."""
+        user, auth = super().authenticate_credentials(*args, **kwargs)
+        update_last_login_throttled(user)
+
+        return user, auth
+
+
 def get_api_token(cookie_jwt):
     """Get API Token from JSON Web Token"""
     # having this here allows the values to be mocked easily as oppossed to
@@ -249,7 +289,7 @@ class DigestAuthentication(BaseAuthentication):
         try:
             check_lockout(request)
             if self.authenticator.authenticate(request):
-                update_last_login(None, request.user)
+                update_last_login_throttled(request.user)
                 return request.user, None
             attempts = login_attempts(request)
             remaining_attempts = getattr(settings, "MAX_LOGIN_ATTEMPTS", 10) - attempts
@@ -272,7 +312,7 @@ class DigestAuthentication(BaseAuthentication):
         return response["WWW-Authenticate"]
 
 
-class LockoutBasicAuthentication(BasicAuthentication):
+class LockoutBasicAuthentication(LastLoginMixin, BasicAuthentication):
     """HTTP Basic authentication with failed-login lockout.
 
     Stock ``BasicAuthentication`` returns ``401`` indefinitely on wrong
@@ -324,6 +364,10 @@ class LockoutBasicAuthentication(BasicAuthentication):
             raise
 
 
+class LastLoginTokenAuthentication(LastLoginMixin, TokenAuthentication):
+    """Token authentication that records a throttled ``last_login``."""
+
+
 class TempTokenAuthentication(TokenAuthentication):
     """TempToken authentication using "Authorization: TempToken xxxx" header."""
 
@@ -370,6 +414,8 @@ class TempTokenAuthentication(TokenAuthentication):
         if expired(token.created):
             raise exceptions.AuthenticationFailed(_("Token expired"))
 
+        update_last_login_throttled(token.user)
+
         return (token.user, token)
 
     def authenticate_header(self, request):
@@ -9,6 +9,7 @@ from django.conf import settings
 from django.db import connection
 
 from onadata.apps.logger.models.data_view import DataView
+from onadata.apps.logger.models.merged_xform import get_merged_xform_ids
 from onadata.libs.utils.common_tags import SUBMISSION_TIME, SUBMITTED_BY
 from onadata.libs.utils.common_tools import get_abbreviated_xpath
 
@@ -216,13 +217,9 @@ def _query_args(field, name, xform, group_by=None):
     }
 
     if xform.is_merged_dataset:
-        xforms = tuple(
-            __
-            for __ in xform.mergedxform.xforms.filter(
-                deleted_at__isnull=True
-            ).values_list("id", flat=True)
-        ) or (xform.pk, xform.pk)
-        qargs["restrict_value"] = xforms
+        xforms = tuple(get_merged_xform_ids(xform))
+        # a single element tuple would render as an invalid "(id,)" SQL list
+        qargs["restrict_value"] = xforms if len(xforms) > 1 else xforms * 2
 
     if isinstance(group_by, list):
         for index, value in enumerate(group_by):
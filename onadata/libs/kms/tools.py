@@ -6,10 +6,15 @@ import importlib
 import logging
 import mimetypes
 import os
-from contextlib import suppress
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, suppress
 from datetime import timedelta
+from functools import partial
 from hashlib import sha256
 from io import BytesIO
+from tempfile import SpooledTemporaryFile
 
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
@@ -41,6 +46,7 @@ from onadata.apps.logger.models import (
     XForm,
     XFormKey,
 )
+from onadata.apps.logger.models.instance import bump_submissions_version
 from onadata.libs.exceptions import (
     DecryptionError,
     EncryptionError,
@@ -75,6 +81,9 @@ from onadata.libs.utils.model_tools import (
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_DECRYPTION_SPOOL_MAX_SIZE = 5 * 1024 * 1024
+DEFAULT_DECRYPTION_MAX_WORKERS = 4
+
 
 def _get_kms_client_class():
     """Return the KMS client that is active."""
@@ -468,30 +477,77 @@ def save_decryption_error(instance: Instance, error_name: str):
         json=json,
         decryption_status=Instance.DecryptionStatus.FAILED,
     )
+    # the direct update skips the post save submissions version bump
+    bump_submissions_version(instance.xform_id)
 
 
-# pylint: disable=too-many-locals,too-many-statements
-def decrypt_instance(instance: Instance) -> None:
-    """Decrypt encrypted Instance
+def _get_kms_decryption_spool_max_size():
+    """Size in bytes above which encrypted media is spooled to disk."""
+    return getattr(
+        settings, "KMS_DECRYPTION_SPOOL_MAX_SIZE", DEFAULT_DECRYPTION_SPOOL_MAX_SIZE
+    )
 
-    :param instance: Instance to be decrypted
+
+def _get_kms_decryption_max_workers():
+    """Number of threads fetching encrypted media and decrypting a batch."""
+    return getattr(
+        settings, "KMS_DECRYPTION_MAX_WORKERS", DEFAULT_DECRYPTION_MAX_WORKERS
+    )
+
+
+def _spool_encrypted_file(attachment, max_size):
+    """Copy an encrypted media file in chunks into a temporary file.
+
+    The file is held in memory until it exceeds ``max_size`` bytes after
+    which it is rolled over to disk.
     """
-    # Avoid cyclic dependency errors
-    logger_tasks = importlib.import_module("onadata.apps.logger.tasks")
-    incr_task = logger_tasks.adjust_xform_num_of_decrypted_submissions_async
+    name = attachment.name or attachment.media_file.name.split("/")[-1]
+    # pylint: disable=consider-using-with
+    spooled_file = SpooledTemporaryFile(max_size=max_size)
 
-    def get_encrypted_files(attachment_qs):
-        """Get Instance's encrypted media files"""
-        enc_files = {}
+    try:
+        with attachment.media_file.open("rb") as file:
+            for chunk in file.chunks():
+                spooled_file.write(chunk)
+    except Exception:
+        spooled_file.close()
+        raise
+
+    spooled_file.seek(0)
+
+    return name, spooled_file
+
+
+def _get_encrypted_files(attachment_qs, stack: ExitStack) -> dict:
+    """Get Instance's encrypted media files
+
+    The files are fetched from storage concurrently and closed when
+    ``stack`` exits.
+    """
+    attachments = list(attachment_qs)
+    max_size = _get_kms_decryption_spool_max_size()
+    max_workers = max(1, min(_get_kms_decryption_max_workers(), len(attachments)))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(_spool_encrypted_file, attachment, max_size)
+            for attachment in attachments
+        ]
+
+    # Close every fetched file on exit even if another fetch failed
+    for future in futures:
+        if future.exception() is None:
+            stack.callback(future.result()[1].close)
 
-        for attachment in queryset_iterator(attachment_qs):
-            name = attachment.name or attachment.media_file.name.split("/")[-1]
+    return dict(future.result() for future in futures)
 
-            with attachment.media_file.open("rb") as file:
-                enc_files[name] = BytesIO(file.read())
 
-        return enc_files
+def _get_decryption_key(instance: Instance) -> XFormKey:
+    """Get the XFormKey that encrypted ``instance``
 
+    :raises DecryptionError: If the Instance can not be decrypted
+    :raises NotAllMediaReceivedError: If the Instance media is incomplete
+    """
     if not instance.check_encrypted():
         raise DecryptionError(
             DECRYPTION_FAILURE_MESSAGES[DECRYPTION_FAILURE_INSTANCE_NOT_ENCRYPTED]
@@ -504,7 +560,9 @@ def decrypt_instance(instance: Instance) -> None:
 
     try:
         # Get the key that encrypted the submission
-        xform_key = XFormKey.objects.get(version=instance.version, xform=instance.xform)
+        xform_key = XFormKey.objects.select_related("kms_key").get(
+            version=instance.version, xform=instance.xform
+        )
 
     except XFormKey.DoesNotExist as exc:
         save_decryption_error(instance, DECRYPTION_FAILURE_KEY_NOT_FOUND)
@@ -524,17 +582,77 @@ def decrypt_instance(instance: Instance) -> None:
             DECRYPTION_FAILURE_MESSAGES[DECRYPTION_FAILURE_NOT_ALL_MEDIA_RECEIVED]
         )
 
-    submission_xml = BytesIO(instance.xml.encode("utf-8"))
-    kms_client = get_kms_client()
-    # Decrypt submission files
-    attachment_qs = instance.attachments.filter(deleted_at__isnull=True)
-    decrypted_files = decrypt_submission(
-        kms_client=kms_client,
-        key_id=xform_key.kms_key.key_id,
-        submission_xml=submission_xml,
-        enc_files=get_encrypted_files(attachment_qs),
-    )
-    # Replace encrypted submission with decrypted submission
+    return xform_key
+
+
+def _spool_decrypted_file(name, decrypted_file, max_size):
+    """Move a decrypted file into a temporary file.
+
+    The file is held in memory until it exceeds ``max_size`` bytes after
+    which it is rolled over to disk.
+    """
+    # pylint: disable=consider-using-with
+    spooled_file = SpooledTemporaryFile(max_size=max_size)
+
+    with decrypted_file:
+        decrypted_file.seek(0)
+        shutil.copyfileobj(decrypted_file, spooled_file)
+
+    size = spooled_file.tell()
+    spooled_file.seek(0)
+
+    return name, spooled_file, size
+
+
+def _decrypt_files(kms_client, key_id, submission_xml, attachments) -> list:
+    """Decrypt a submission's XML and media files
+
+    Does not query the database so it can run in a worker thread. The
+    decrypted files are spooled to temporary files the caller closes.
+
+    :returns: List of (original name, decrypted file, size in bytes)
+    """
+    max_size = _get_kms_decryption_spool_max_size()
+    decrypted_files = []
+
+    try:
+        with ExitStack() as stack:
+            for name, decrypted_file in decrypt_submission(
+                kms_client=kms_client,
+                key_id=key_id,
+                submission_xml=BytesIO(submission_xml.encode("utf-8")),
+                enc_files=_get_encrypted_files(attachments, stack),
+            ):
+                decrypted_files.append(
+                    _spool_decrypted_file(name, decrypted_file, max_size)
+                )
+    except Exception:
+        for _name, decrypted_file, _size in decrypted_files:
+            decrypted_file.close()
+        raise
+
+    return decrypted_files
+
+
+def _save_decrypted_files(instance: Instance, attachment_qs, decrypt) -> tuple:
+    """Replace an encrypted Instance with the files returned by ``decrypt``
+
+    :param instance: Instance being decrypted
+    :param attachment_qs: Instance's encrypted attachments
+    :param decrypt: Callable returning the decrypted files
+    :returns: Number of decrypted files and bytes
+    """
+    # Avoid cyclic dependency errors
+    logger_tasks = importlib.import_module("onadata.apps.logger.tasks")
+    incr_task = logger_tasks.adjust_xform_num_of_decrypted_submissions_async
+
+    try:
+        decrypted_files = decrypt()
+
+    except InvalidSubmissionException as exc:
+        save_decryption_error(instance, DECRYPTION_FAILURE_INVALID_SUBMISSION)
+        raise DecryptionError(str(exc)) from exc
+
     # Check if this is an edit (has prior history) before creating new history
     is_edit = instance.submission_history.exists()
     # Initialize InstanceHistory before replacement
@@ -548,51 +666,159 @@ def decrypt_instance(instance: Instance) -> None:
     )
     decrypted_attachment_ids = []
 
-    try:
-        with transaction.atomic():
-            for original_name, decrypted_file in decrypted_files:
-                if original_name.lower() == "submission.xml":
-                    # Replace submission with decrypted submission
-                    xml = decrypted_file.getvalue()
-
-                    instance.xml = xml.decode("utf-8")
-                    instance.checksum = sha256(xml).hexdigest()
-                    instance.is_encrypted = False
-                    instance.decryption_status = Instance.DecryptionStatus.SUCCESS
-                    instance.save(force=True)
-
-                else:
-                    # Save decrypted media file
-                    media_file = File(decrypted_file, name=original_name)
-                    mimetype, _ = mimetypes.guess_type(original_name)
-                    _, extension = os.path.splitext(original_name)
-                    attachment = instance.attachments.create(
-                        xform=instance.xform,
-                        user=instance.user,
-                        media_file=media_file,
-                        name=original_name,
-                        mimetype=mimetype or "application/octet-stream",
-                        extension=extension.lstrip("."),
-                        file_size=len(decrypted_file.getbuffer()),
-                    )
-                    decrypted_attachment_ids.append(attachment.id)
-
-            # Commit history after saving decrypted files
-            history.save()
-            # Soft delete encrypted attachments
-            attachment_qs.exclude(id__in=decrypted_attachment_ids).update(
-                deleted_at=timezone.now()
+    with ExitStack() as stack:
+        for _name, decrypted_file, _size in decrypted_files:
+            stack.callback(decrypted_file.close)
+
+        stack.enter_context(transaction.atomic())
+        # Replace encrypted submission with decrypted submission
+        for original_name, decrypted_file, size in decrypted_files:
+            if original_name.lower() == "submission.xml":
+                # Replace submission with decrypted submission
+                xml = decrypted_file.read()
+
+                instance.xml = xml.decode("utf-8")
+                instance.checksum = sha256(xml).hexdigest()
+                instance.is_encrypted = False
+                instance.decryption_status = Instance.DecryptionStatus.SUCCESS
+                instance.save(force=True)
+
+            else:
+                # Save decrypted media file
+                media_file = File(decrypted_file, name=original_name)
+                mimetype, _ = mimetypes.guess_type(original_name)
+                _, extension = os.path.splitext(original_name)
+                attachment = instance.attachments.create(
+                    xform=instance.xform,
+                    user=instance.user,
+                    media_file=media_file,
+                    name=original_name,
+                    mimetype=mimetype or "application/octet-stream",
+                    extension=extension.lstrip("."),
+                    file_size=size,
+                )
+                decrypted_attachment_ids.append(attachment.id)
+
+        # Commit history after saving decrypted files
+        history.save()
+        # Soft delete encrypted attachments
+        attachment_qs.exclude(id__in=decrypted_attachment_ids).update(
+            deleted_at=timezone.now()
+        )
+        # Increment XForm num_of_decrypted_submissions only for new
+        # submissions
+        if not is_edit:
+            transaction.on_commit(lambda: incr_task.delay(instance.xform_id, delta=1))
+
+    return len(decrypted_files), sum(size for _name, _file, size in decrypted_files)
+
+
+def decrypt_instance(instance: Instance, kms_client=None) -> None:
+    """Decrypt encrypted Instance
+
+    :param instance: Instance to be decrypted
+    :param kms_client: KMS client to reuse, a new client is created if not set
+    """
+    xform_key = _get_decryption_key(instance)
+    attachment_qs = instance.attachments.filter(deleted_at__isnull=True)
+    decrypt = partial(
+        _decrypt_files,
+        kms_client or get_kms_client(),
+        xform_key.kms_key.key_id,
+        instance.xml,
+        list(attachment_qs),
+    )
+    _save_decrypted_files(instance, attachment_qs, decrypt)
+
+
+# pylint: disable=too-many-locals
+def decrypt_instances(instance_ids) -> dict:
+    """Decrypt many encrypted Instances reusing a single KMS client
+
+    The submissions are decrypted concurrently and saved one at a time.
+
+    :param instance_ids: Primary keys of the Instances to decrypt
+    :returns: Summary of the decrypted, failed and pending media Instances
+    """
+    kms_client = get_kms_client()
+    instance_qs = Instance.objects.filter(
+        pk__in=instance_ids, is_encrypted=True, deleted_at__isnull=True
+    ).select_related("xform")
+    summary = {"decrypted": 0, "failed": [], "pending": [], "files": 0, "bytes": 0}
+    started_at = time.monotonic()
+    jobs = []
+
+    for instance in queryset_iterator(instance_qs):
+        try:
+            xform_key = _get_decryption_key(instance)
+
+        except NotAllMediaReceivedError:
+            summary["pending"].append(instance.pk)
+
+        except DecryptionError as exc:
+            summary["failed"].append(instance.pk)
+            logger.warning("Decrypting Instance %s failed: %s", instance.pk, exc)
+
+        else:
+            attachment_qs = instance.attachments.filter(deleted_at__isnull=True)
+            jobs.append((instance, xform_key, attachment_qs, list(attachment_qs)))
+
+    max_workers = max(1, min(_get_kms_decryption_max_workers(), len(jobs)))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            (
+                instance,
+                attachment_qs,
+                executor.submit(
+                    _decrypt_files,
+                    kms_client,
+                    xform_key.kms_key.key_id,
+                    instance.xml,
+                    attachments,
+                ),
             )
-            # Increment XForm num_of_decrypted_submissions only for new
-            # submissions
-            if not is_edit:
-                transaction.on_commit(
-                    lambda: incr_task.delay(instance.xform_id, delta=1)
+            for instance, xform_key, attachment_qs, attachments in jobs
+        ]
+
+        for instance, attachment_qs, future in futures:
+            try:
+                num_files, num_bytes = _save_decrypted_files(
+                    instance, attachment_qs, future.result
                 )
 
-    except InvalidSubmissionException as exc:
-        save_decryption_error(instance, DECRYPTION_FAILURE_INVALID_SUBMISSION)
-        raise DecryptionError(str(exc)) from exc
+            except DecryptionError as exc:
+                summary["failed"].append(instance.pk)
+                logger.warning("Decrypting Instance %s failed: %s", instance.pk, exc)
+
+            else:
+                summary["decrypted"] += 1
+                summary["files"] += num_files
+                summary["bytes"] += num_bytes
+
+    duration = time.monotonic() - started_at
+    summary["duration"] = round(duration, 3)
+
+    for key in ["decrypted", "files", "bytes"]:
+        summary[f"{key}_per_second"] = (
+            round(summary[key] / duration, 2) if duration else summary[key]
+        )
+
+    logger.info(
+        "Batch decryption - Decrypted: %s; Failed: %s; Pending media: %s; "
+        "Files: %s; Bytes: %s; Duration: %ss; Files per second: %s; "
+        "Bytes per second: %s",
+        summary["decrypted"],
+        len(summary["failed"]),
+        len(summary["pending"]),
+        summary["files"],
+        summary["bytes"],
+        summary["duration"],
+        summary["files_per_second"],
+        summary["bytes_per_second"],
+    )
+
+    return summary
 
 
 @transaction.atomic()
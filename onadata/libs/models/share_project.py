@@ -6,6 +6,7 @@ ShareProject model - facilitate sharing of a project to a user.
 from django.contrib.auth import get_user_model
 from django.db import transaction
 
+from onadata.apps.logger.models import MergedXForm, XForm
 from onadata.libs.permissions import (
     ROLES,
     ManagerRole,
@@ -32,29 +33,38 @@ User = get_user_model()
 def remove_xform_permissions(project, user, role):
     """Remove user permissions to all forms for the given ``project``."""
     # remove role from project forms as well
-    xform_qs = project.xform_set.all()
-    for xform in queryset_iterator(xform_qs):
-        # pylint: disable=protected-access
-        role._remove_obj_permissions(user, xform)
-        # Removed MergedXForm permissions if XForm is also a MergedXForm
-        if hasattr(xform, "mergedxform"):
-            role._remove_obj_permissions(user, xform.mergedxform)
+    xforms = list(project.xform_set.all())
+    role.bulk_remove(user, xforms)
+    # Removed MergedXForm permissions if XForm is also a MergedXForm
+    role.bulk_remove(user, MergedXForm.objects.filter(project=project))
 
 
 def remove_dataview_permissions(project, user, role):
     """Remove user permissions to all dataviews for the given ``project``."""
-    dataview_qs = project.dataview_set.all()
-    for dataview in queryset_iterator(dataview_qs):
-        # pylint: disable=protected-access
-        role._remove_obj_permissions(user, dataview.xform)
+    role.bulk_remove(user, get_dataview_xforms(project))
 
 
 def remove_entity_list_permissions(project, user, role):
     """Remove user permissions for all entitylists for the given project"""
-    entity_list_qs = project.entity_lists.all()
-    for entity_list in queryset_iterator(entity_list_qs):
-        # pylint: disable=protected-access
-        role._remove_obj_permissions(user, entity_list)
+    role.bulk_remove(user, project.entity_lists.all())
+
+
+def get_dataview_xforms(project, matches_parent=None):
+    """Return the distinct forms of the dataviews in the given ``project``."""
+    dataview_qs = project.dataview_set.all()
+    if matches_parent is not None:
+        dataview_qs = dataview_qs.filter(matches_parent=matches_parent)
+
+    return XForm.objects.filter(pk__in=dataview_qs.values("xform_id"))
+
+
+def get_meta_perms_xform_ids(project):
+    """Return ids of the forms in the ``project`` with meta permissions set."""
+    return set(
+        project.xform_set.filter(metadata_set__data_type=XFORM_META_PERMS)
+        .values_list("pk", flat=True)
+        .distinct()
+    )
 
 
 class ShareProject:
@@ -84,35 +94,34 @@ class ShareProject:
             role = ROLES.get(self.role)
 
             if role and self.user and self.project:
-                role.add(self.user, self.project)
+                user = self.user
+                role.add(user, self.project)
 
                 # apply same role to forms under the project
-                xform_qs = self.project.xform_set.all()
-                for xform in queryset_iterator(xform_qs):
+                meta_perms_xform_ids = get_meta_perms_xform_ids(self.project)
+                xforms = []
+                for xform in queryset_iterator(self.project.xform_set.all()):
                     # check if there is xform meta perms set
-                    if xform.metadata_set.filter(
-                        data_type=XFORM_META_PERMS
-                    ) and role not in [ReadOnlyRoleNoDownload, ManagerRole, OwnerRole]:
+                    if xform.pk in meta_perms_xform_ids and role not in [
+                        ReadOnlyRoleNoDownload,
+                        ManagerRole,
+                        OwnerRole,
+                    ]:
                         update_role_by_meta_xform_perms(
-                            xform, user=self.user, user_role=role
+                            xform, user=user, user_role=role
                         )
                     else:
                         clear_permissions_cache(xform)
-                        role.add(self.user, xform)
+                        xforms.append(xform)
+                role.bulk_add(user, xforms)
 
-                    # Set MergedXForm permissions if XForm is also a MergedXForm
-                    if hasattr(xform, "mergedxform"):
-                        role.add(self.user, xform.mergedxform)
+                # Set MergedXForm permissions if XForm is also a MergedXForm
+                role.bulk_add(user, MergedXForm.objects.filter(project=self.project))
 
-                dataview_qs = self.project.dataview_set.all()
-                for dataview in queryset_iterator(dataview_qs):
-                    if dataview.matches_parent:
-                        role.add(self.user, dataview.xform)
+                role.bulk_add(user, get_dataview_xforms(self.project, True))
 
                 # Apply same role to EntityLists under project
-                entity_list_qs = self.project.entity_lists.all()
-                for entity_list in queryset_iterator(entity_list_qs):
-                    role.add(self.user, entity_list)
+                role.bulk_add(user, self.project.entity_lists.all())
 
         # clear cache
         clear_project_owner_cache(self.project.pk)
@@ -125,8 +134,9 @@ class ShareProject:
         role = ROLES.get(self.role)
 
         if role and self.user and self.project:
-            remove_xform_permissions(self.project, self.user, role)
-            remove_dataview_permissions(self.project, self.user, role)
-            remove_entity_list_permissions(self.project, self.user, role)
+            user = self.user
+            remove_xform_permissions(self.project, user, role)
+            remove_dataview_permissions(self.project, user, role)
+            remove_entity_list_permissions(self.project, user, role)
             # pylint: disable=protected-access
-            role._remove_obj_permissions(self.user, self.project)
+            role._remove_obj_permissions(user, self.project)
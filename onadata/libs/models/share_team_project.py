@@ -3,6 +3,10 @@
 ShareTeamProject model - facilitate sharing a project to a team.
 """
 
+from onadata.libs.models.share_project import (
+    get_dataview_xforms,
+    get_meta_perms_xform_ids,
+)
 from onadata.libs.permissions import ROLES
 from onadata.libs.utils.cache_tools import (
     PROJ_PERM_CACHE,
@@ -10,7 +14,6 @@ from onadata.libs.utils.cache_tools import (
     clear_project_owner_cache,
     safe_cache_delete,
 )
-from onadata.libs.utils.common_tags import XFORM_META_PERMS
 from onadata.libs.utils.xform_utils import update_role_by_meta_xform_perms
 
 
@@ -34,16 +37,13 @@ class ShareTeamProject:
 
             if role and self.team and self.project:
                 role.add(self.team, self.project)
+                role.bulk_add(self.team, self.project.xform_set.all())
 
-                for xform in self.project.xform_set.all():
-                    role.add(self.team, xform)
-
-                    if xform.metadata_set.filter(data_type=XFORM_META_PERMS):
-                        update_role_by_meta_xform_perms(xform)
+                meta_perms_xform_ids = get_meta_perms_xform_ids(self.project)
+                for xform in self.project.xform_set.filter(pk__in=meta_perms_xform_ids):
+                    update_role_by_meta_xform_perms(xform)
 
-                for dataview in self.project.dataview_set.all():
-                    if dataview.matches_parent:
-                        role.add(self.team, dataview.xform)
+                role.bulk_add(self.team, get_dataview_xforms(self.project, True))
 
             # clear cache
             clear_project_owner_cache(self.project.pk)
@@ -58,13 +58,8 @@ class ShareTeamProject:
             # pylint: disable=protected-access
             role._remove_obj_permissions(self.team, self.project)
 
-            for xform in self.project.xform_set.all():
-                # pylint: disable=protected-access
-                role._remove_obj_permissions(self.team, xform)
-
-            for dataview in self.project.dataview_set.all():
-                # pylint: disable=protected-access
-                role._remove_obj_permissions(self.team, dataview.xform)
+            role.bulk_remove(self.team, self.project.xform_set.all())
+            role.bulk_remove(self.team, get_dataview_xforms(self.project))
 
             # clear cache
             clear_project_owner_cache(self.project.pk)
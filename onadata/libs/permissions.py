@@ -8,11 +8,19 @@ from collections import defaultdict
 from typing import Any
 
 from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
 from django.db.models import Q
 from django.db.models.base import ModelBase
 
 import six
-from guardian.shortcuts import assign_perm, get_perms, get_users_with_perms, remove_perm
+from guardian.ctypes import get_content_type
+from guardian.shortcuts import get_perms, get_users_with_perms
+from guardian.utils import (
+    get_group_obj_perms_model,
+    get_identity,
+    get_user_obj_perms_model,
+)
 
 from onadata.apps.logger.models.project import (
     Project,
@@ -25,8 +33,15 @@ from onadata.apps.logger.models.xform import (
     XFormUserObjectPermission,
 )
 from onadata.libs.exceptions import NoRecordsPermission
+from onadata.libs.utils.cache_tools import (
+    XFORM_META_PERMS_ENABLED_CACHE,
+    bump_xform_perms_version,
+    get_xform_meta_perms_cache_ttl,
+    get_xform_meta_perms_scope_key,
+    safe_cache_get,
+    safe_cache_set,
+)
 from onadata.libs.utils.common_tags import OWNER_TEAM_NAME, XFORM_META_PERMS
-from onadata.libs.utils.model_tools import queryset_iterator
 
 # Userprofile Permissions
 CAN_ADD_USERPROFILE = "add_userprofile"
@@ -58,6 +73,11 @@ CAN_TRANSFER_OWNERSHIP = "transfer_xform"
 CAN_MOVE_TO_FOLDER = "move_xform"
 CAN_EXPORT_XFORM = "can_export_xform_data"
 
+# XForm meta permissions data scopes
+META_PERMS_SCOPE_ALL = "all"
+META_PERMS_SCOPE_OWN = "own"
+META_PERMS_SCOPE_NONE = "none"
+
 # MergedXform Permissions
 CAN_VIEW_MERGED_XFORM = "view_mergedxform"
 
@@ -90,6 +110,7 @@ MergedXForm = apps.get_model("logger", "MergedXForm")
 OrganizationProfile = apps.get_model("api", "OrganizationProfile")
 UserProfile = apps.get_model("main", "UserProfile")
 EntityList = apps.get_model("logger", "EntityList")
+User = get_user_model()
 
 
 class Role:
@@ -102,8 +123,7 @@ class Role:
 
     @classmethod
     def _remove_obj_permissions(cls, user, obj):
-        for perm in get_perms(user, obj):
-            remove_perm(perm, user, obj)
+        bulk_remove_obj_perms(user, [obj])
 
     @classmethod
     def remove_obj_permissions(cls, user, obj):
@@ -117,9 +137,32 @@ class Role:
         """
         Add obj permissions to the a user.
         """
-        cls._remove_obj_permissions(user, obj)
-        for codename in cls.class_to_permissions.get(obj.__class__, []):
-            assign_perm(codename, user, obj)
+        cls.bulk_add(user, [obj])
+
+    @classmethod
+    def bulk_add(cls, user, objs):
+        """
+        Add the role's permissions to a user or group on many objects.
+
+        Existing permissions of the user or group on the objects are
+        replaced, as with add(), using one delete and one insert for all
+        the objects. The objects should all be of the same model.
+        """
+        objs = list(objs)
+        if not objs:
+            return
+
+        bulk_remove_obj_perms(user, objs)
+        bulk_assign_obj_perms(
+            cls.class_to_permissions.get(objs[0].__class__, []), user, objs
+        )
+
+    @classmethod
+    def bulk_remove(cls, user, objs):
+        """
+        Remove all permissions a user or group has on many objects.
+        """
+        bulk_remove_obj_perms(user, objs)
 
     @classmethod
     def has_role(cls, permissions, obj):
@@ -535,90 +578,161 @@ def get_role_in_org(user, organization):
     return get_role(perms, organization) or MemberRole.name
 
 
-def get_user_perms(obj):
+def _get_obj_perms_model_and_filter(user_or_group, objs):
     """
-    Return XFormUserObjectPermission or ProjectUserObjectPermission queryset.
+    Return the object permission model and the filter matching the object
+    permissions of user_or_group on objs.
     """
-    model = XFormUserObjectPermission if isinstance(obj, XForm) else None
-    model = ProjectUserObjectPermission if isinstance(obj, Project) else model
+    user, group = get_identity(user_or_group)
+    if user:
+        model = get_user_obj_perms_model(objs[0])
+        filters = Q(user=user)
+    else:
+        model = get_group_obj_perms_model(objs[0])
+        filters = Q(group=group)
 
-    return (
-        queryset_iterator(model.objects.filter(content_object_id=obj.pk))
-        if model
-        else None
-    )
+    if model.objects.is_generic():
+        filters &= Q(
+            content_type=get_content_type(objs[0]),
+            object_pk__in=[str(obj.pk) for obj in objs],
+        )
+    else:
+        filters &= Q(content_object_id__in=[obj.pk for obj in objs])
 
+    return model, filters
 
-def get_group_perms(obj):
+
+def _clear_obj_perms_cache(objs):
     """
-    Return XFormGroupObjectPermission or ProjectGroupObjectPermission queryset.
+    Clear cached permission decisions, bulk writes do not fire model signals.
     """
-    model = XFormGroupObjectPermission if isinstance(obj, XForm) else None
-    model = ProjectGroupObjectPermission if isinstance(obj, Project) else model
-
-    return (
-        queryset_iterator(model.objects.filter(content_object_id=obj.pk))
-        if model
-        else None
-    )
+    for obj in objs:
+        if isinstance(obj, XForm):
+            bump_xform_perms_version(obj.pk)
 
 
-def _get_group_users_with_perms(obj, attach_perms=False, user_perms=None):
+def bulk_assign_obj_perms(codenames, user_or_group, objs):
     """
-    Returns a list of users in the groups with permissions on the object obj.
+    Assign permissions with the given codenames to a user or group on objs.
+
+    All the (permission, object) rows are written with a single bulk insert.
+    The objects should all be of the same model.
     """
-    group_obj_perms = get_group_perms(obj)
-    if group_obj_perms is None:
-        return get_users_with_perms(
-            obj, attach_perms=attach_perms, with_group_users=True
+    objs = list(objs)
+    if not objs or not codenames:
+        return
+
+    content_type = get_content_type(objs[0])
+    permissions = list(
+        Permission.objects.filter(content_type=content_type, codename__in=codenames)
+    )
+    if len(permissions) != len(set(codenames)):
+        raise Permission.DoesNotExist(
+            f"Missing permissions {codenames} for {content_type}"
         )
-    group_users = {}
-    if attach_perms:
-        if user_perms:
-            group_users.update(user_perms)
-        _cache = {}
-        for perm in group_obj_perms:
-            if perm.group not in _cache:
-                _cache[perm.group] = perm.group.user_set.all()
-            for user in _cache[perm.group]:
-                if user in group_users:
-                    group_users[user].add(perm.permission.codename)
-                else:
-                    group_users[user] = set([perm.permission.codename])
+
+    user, group = get_identity(user_or_group)
+    model, _filters = _get_obj_perms_model_and_filter(user_or_group, objs)
+    identity = {"user": user} if user else {"group": group}
+
+    if model.objects.is_generic():
+        rows = [
+            model(
+                permission=permission,
+                content_type=content_type,
+                object_pk=str(obj.pk),
+                **identity,
+            )
+            for obj in objs
+            for permission in permissions
+        ]
     else:
-        group_users = set() if not user_perms else set(user_perms)
-        for perm in group_obj_perms.distinct("group"):
-            group_users.union(set(user for user in perm.group.user_set.all()))
-        group_users = list(group_obj_perms)
+        rows = [
+            model(permission=permission, content_object=obj, **identity)
+            for obj in objs
+            for permission in permissions
+        ]
+
+    model.objects.bulk_create(rows, ignore_conflicts=True)
+    _clear_obj_perms_cache(objs)
+
+
+def bulk_remove_obj_perms(user_or_group, objs):
+    """
+    Remove all the permissions a user or group has on objs.
+
+    The objects should all be of the same model.
+    """
+    objs = list(objs)
+    if not objs:
+        return
 
-    return group_users
+    model, filters = _get_obj_perms_model_and_filter(user_or_group, objs)
+    model.objects.filter(filters).delete()
+    _clear_obj_perms_cache(objs)
+
+
+def _get_object_permission_models(obj):
+    """
+    Return the user and group object permission models for obj.
+    """
+    if isinstance(obj, XForm):
+        return XFormUserObjectPermission, XFormGroupObjectPermission
+    if isinstance(obj, Project):
+        return ProjectUserObjectPermission, ProjectGroupObjectPermission
+
+    return None, None
 
 
 def _get_users_with_perms(obj, attach_perms=False, with_group_users=None):
     """
     Returns a list of users with their permissions on an object obj.
+
+    User permissions, group permissions, group memberships and the users
+    with their profiles are each fetched in a single query so the number
+    of queries does not grow with the number of users or teams.
     """
-    user_obj_perms = get_user_perms(obj)
-    if user_obj_perms is None:
+    user_model, group_model = _get_object_permission_models(obj)
+    if user_model is None:
         return get_users_with_perms(
             obj, attach_perms=attach_perms, with_group_users=with_group_users
         )
-    user_perms = {}
-    if attach_perms:
-        for perm in user_obj_perms:
-            if perm.user in user_perms:
-                user_perms[perm.user].add(perm.permission.codename)
-            else:
-                user_perms[perm.user] = set([perm.permission.codename])
-    else:
-        user_perms = [
-            perm.user for perm in user_obj_perms.only("user").distinct("user")
-        ]
+
+    user_perms = defaultdict(set)
+    for user_id, codename in (
+        user_model.objects.filter(content_object_id=obj.pk)
+        .order_by("pk")
+        .values_list("user_id", "permission__codename")
+    ):
+        user_perms[user_id].add(codename)
 
     if with_group_users:
-        user_perms = _get_group_users_with_perms(obj, attach_perms, user_perms)
+        group_perms = defaultdict(set)
+        for group_id, codename in group_model.objects.filter(
+            content_object_id=obj.pk
+        ).values_list("group_id", "permission__codename"):
+            group_perms[group_id].add(codename)
+
+        if group_perms:
+            for user_id, group_id in (
+                User.groups.through.objects.filter(group_id__in=group_perms)
+                .order_by("group_id", "user_id")
+                .values_list("user_id", "group_id")
+            ):
+                user_perms[user_id].update(group_perms[group_id])
+
+    users = User.objects.select_related("profile__organizationprofile").in_bulk(
+        list(user_perms)
+    )
+
+    if attach_perms:
+        return {
+            users[user_id]: perms
+            for user_id, perms in user_perms.items()
+            if user_id in users
+        }
 
-    return user_perms
+    return [users[user_id] for user_id in user_perms if user_id in users]
 
 
 # pylint: disable=invalid-name
@@ -679,7 +793,50 @@ def _check_meta_perms_enabled(xform):
     :param xform:
     :return: bool
     """
-    return xform.metadata_set.filter(data_type=XFORM_META_PERMS).count() > 0
+    cache_key = f"{XFORM_META_PERMS_ENABLED_CACHE}{xform.pk}"
+    enabled = safe_cache_get(cache_key)
+
+    if enabled is None:
+        enabled = xform.metadata_set.filter(data_type=XFORM_META_PERMS).exists()
+        safe_cache_set(cache_key, enabled, get_xform_meta_perms_cache_ttl())
+
+    return enabled
+
+
+def _get_user_meta_perms_scope(xform, user):
+    """Resolve a user's meta permissions data scope from their permissions."""
+    if user.has_perm(CAN_VIEW_XFORM_ALL, xform):
+        return META_PERMS_SCOPE_ALL
+    if user.has_perm(CAN_VIEW_XFORM_DATA, xform):
+        return META_PERMS_SCOPE_OWN
+
+    return META_PERMS_SCOPE_NONE
+
+
+def get_xform_meta_perms_scope(xform, user):
+    """
+    Return the submissions ``user`` may view on ``xform``.
+
+    META_PERMS_SCOPE_ALL ==> all the data
+    META_PERMS_SCOPE_OWN ==> only the data submitted by the user
+    META_PERMS_SCOPE_NONE ==> none of the data
+
+    The per (user, form) scope is cached and cleared on permission changes.
+    """
+    if xform.shared_data or not _check_meta_perms_enabled(xform):
+        return META_PERMS_SCOPE_ALL
+
+    if not user.is_authenticated:
+        return _get_user_meta_perms_scope(xform, user)
+
+    cache_key = get_xform_meta_perms_scope_key(xform.pk, user.pk)
+    scope = safe_cache_get(cache_key)
+
+    if scope is None:
+        scope = _get_user_meta_perms_scope(xform, user)
+        safe_cache_set(cache_key, scope, get_xform_meta_perms_cache_ttl())
+
+    return scope
 
 
 # pylint: disable=invalid-name
@@ -687,13 +844,10 @@ def exclude_items_from_queryset_using_xform_meta_perms(xform, user, queryset):
     """
     Exclude instances from the queryset if meta-perms have been enabled
     """
-    if (
-        user.has_perm(CAN_VIEW_XFORM_ALL, xform)
-        or xform.shared_data
-        or not _check_meta_perms_enabled(xform)
-    ):
+    scope = get_xform_meta_perms_scope(xform, user)
+    if scope == META_PERMS_SCOPE_ALL:
         return queryset
-    if user.has_perm(CAN_VIEW_XFORM_DATA, xform):
+    if scope == META_PERMS_SCOPE_OWN:
         return queryset.exclude(~Q(user=user), xform=xform)
     return queryset.none()
 
@@ -709,13 +863,10 @@ def filter_queryset_xform_meta_perms(xform, user, instance_queryset):
     :param instance_queryset:
     :return: data
     """
-    if (
-        user.has_perm(CAN_VIEW_XFORM_ALL, xform)
-        or xform.shared_data
-        or not _check_meta_perms_enabled(xform)
-    ):
+    scope = get_xform_meta_perms_scope(xform, user)
+    if scope == META_PERMS_SCOPE_ALL:
         return instance_queryset
-    if user.has_perm(CAN_VIEW_XFORM_DATA, xform):
+    if scope == META_PERMS_SCOPE_OWN:
         return instance_queryset.filter(user=user)
 
     return instance_queryset.none()
@@ -732,13 +883,10 @@ def filter_queryset_xform_meta_perms_sql(xform, user, query):
     :param instance_queryset:
     :return: data
     """
-    if (
-        user.has_perm(CAN_VIEW_XFORM_ALL, xform)
-        or xform.shared_data
-        or not _check_meta_perms_enabled(xform)
-    ):
+    scope = get_xform_meta_perms_scope(xform, user)
+    if scope == META_PERMS_SCOPE_ALL:
         return query
-    if user.has_perm(CAN_VIEW_XFORM_DATA, xform):
+    if scope == META_PERMS_SCOPE_OWN:
         try:
             if query and isinstance(query, six.string_types):
                 query = json.loads(query)
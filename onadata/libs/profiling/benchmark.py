@@ -0,0 +1,466 @@
+# -*- coding: utf-8 -*-
+"""
+Endpoint benchmarks - latency percentiles, query counts and peak memory.
+
+A synthetic form is seeded with submissions and the hot endpoints are requested
+through the Django test client. The results are compared to a baseline saved
+from an earlier run so that regressions in a release fail the benchmark.
+"""
+
+import json
+import os
+import statistics
+import tempfile
+import time
+import tracemalloc
+import uuid
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.db import connection, transaction
+from django.db.models import Max
+from django.test import Client, override_settings
+from django.utils import timezone
+
+from rest_framework.authtoken.models import Token
+
+from onadata.apps.logger.management.commands.generate_platform_stats import (
+    _write_stats_to_file,
+)
+from onadata.apps.logger.models import Instance, Project, SurveyType, XForm
+from onadata.apps.main.models import UserProfile
+from onadata.apps.viewer.models import Export
+from onadata.libs.profiling.sql import track_queries
+from onadata.libs.utils.common_tags import (
+    EDITED,
+    GEOLOCATION,
+    LAST_EDITED_BY,
+    MEDIA_ALL_RECEIVED,
+    MEDIA_COUNT,
+    META_INSTANCE_ID,
+    NOTES,
+    STATUS,
+    SUBMISSION_TIME,
+    SUBMITTED_BY,
+    TAGS,
+    TOTAL_MEDIA,
+    UUID,
+    VERSION,
+    XFORM_ID,
+    XFORM_ID_STRING,
+)
+from onadata.libs.utils.logger_tools import publish_xml_form
+
+User = get_user_model()
+
+BENCHMARK_USERNAME = "benchmark"
+# Number of submissions inserted at a time
+SEED_BATCH_SIZE = 5000
+# Allowed latency and memory increase over the baseline
+DEFAULT_TOLERANCE = 0.2
+PERCENTILES = (50, 95, 99)
+# Names of the benchmark cases, in the order they run
+CASES = (
+    "data",
+    "data_page",
+    "data_ndjson",
+    "forms",
+    "form_list",
+    "submission",
+    "csv_export",
+    "parquet_export",
+    "platform_stats",
+)
+
+FORM_XML = """<?xml version="1.0"?>
+<h:html xmlns="http://www.w3.org/2002/xforms" xmlns:h="http://www.w3.org/1999/xhtml"
+ xmlns:jr="http://openrosa.org/javarosa" xmlns:odk="http://www.opendatakit.org/xforms">
+  <h:head>
+    <h:title>{id_string}</h:title>
+    <model odk:xforms-version="1.0.0">
+      <instance>
+        <data id="{id_string}" version="1">
+          <formhub>
+            <uuid/>
+          </formhub>
+          <name/>
+          <age/>
+          <score/>
+          <color/>
+          <meta>
+            <instanceID/>
+          </meta>
+        </data>
+      </instance>
+      <bind nodeset="/data/name" type="string"/>
+      <bind nodeset="/data/age" type="int"/>
+      <bind nodeset="/data/score" type="decimal"/>
+      <bind nodeset="/data/color" type="string"/>
+      <bind jr:preload="uid" nodeset="/data/meta/instanceID" readonly="true()"
+       type="string"/>
+    </model>
+  </h:head>
+  <h:body>
+    <input ref="/data/name">
+      <label>Name</label>
+    </input>
+    <input ref="/data/age">
+      <label>Age</label>
+    </input>
+    <input ref="/data/score">
+      <label>Score</label>
+    </input>
+    <select1 ref="/data/color">
+      <label>Color</label>
+      <item>
+        <label>Red</label>
+        <value>red</value>
+      </item>
+      <item>
+        <label>Blue</label>
+        <value>blue</value>
+      </item>
+    </select1>
+  </h:body>
+</h:html>
+"""
+
+SUBMISSION_XML = (
+    '<?xml version="1.0"?><data id="{id_string}" version="1">'
+    "<formhub><uuid>{form_uuid}</uuid></formhub>"
+    "<name>{name}</name><age>{age}</age><score>{score}</score>"
+    "<color>{color}</color>"
+    "<meta><instanceID>uuid:{uuid}</instanceID></meta></data>"
+)
+
+
+def get_benchmark_user():
+    """Returns the user owning the benchmark forms and its API token."""
+    user, created = User.objects.get_or_create(username=BENCHMARK_USERNAME)
+    if created:
+        user.set_unusable_password()
+        user.save()
+    UserProfile.objects.get_or_create(user=user)
+    token, _created = Token.objects.get_or_create(user=user)
+
+    return user, token.key
+
+
+def _get_submission_values(index):
+    return {
+        "name": f"name {index}",
+        "age": index % 100,
+        "score": round(index % 1000 / 10, 1),
+        "color": ("red", "blue")[index % 2],
+        "uuid": uuid.uuid4(),
+    }
+
+
+def get_submission_xml(xform, index):
+    """Returns the XML of a synthetic submission to ``xform``."""
+    return SUBMISSION_XML.format(
+        id_string=xform.id_string,
+        form_uuid=xform.uuid,
+        **_get_submission_values(index),
+    )
+
+
+def _get_instances(xform, survey_type, start, stop):
+    date_created = timezone.now()
+    for index in range(start, stop):
+        values = _get_submission_values(index)
+        instance_uuid = str(values["uuid"])
+        yield Instance(
+            xform=xform,
+            user=xform.user,
+            survey_type=survey_type,
+            uuid=instance_uuid,
+            version=xform.version,
+            date_created=date_created,
+            date_modified=date_created,
+            xml=SUBMISSION_XML.format(
+                id_string=xform.id_string, form_uuid=xform.uuid, **values
+            ),
+            json={
+                "formhub/uuid": xform.uuid,
+                "name": values["name"],
+                "age": str(values["age"]),
+                "score": str(values["score"]),
+                "color": values["color"],
+                META_INSTANCE_ID: f"uuid:{instance_uuid}",
+                UUID: instance_uuid,
+                STATUS: "submitted_via_web",
+                VERSION: xform.version,
+                XFORM_ID_STRING: xform.id_string,
+                XFORM_ID: xform.pk,
+                GEOLOCATION: [None, None],
+                SUBMITTED_BY: xform.user.username,
+                SUBMISSION_TIME: date_created.isoformat(),
+                TOTAL_MEDIA: 0,
+                MEDIA_COUNT: 0,
+                MEDIA_ALL_RECEIVED: True,
+                EDITED: False,
+                LAST_EDITED_BY: None,
+                TAGS: [],
+                NOTES: [],
+            },
+        )
+
+
+def seed_submissions(xform, num_of_submissions, batch_size=SEED_BATCH_SIZE):
+    """Bulk inserts ``num_of_submissions`` synthetic submissions to ``xform``.
+
+    The submissions are inserted a batch at a time and the ``_id`` is added to
+    the json of each batch with a single UPDATE.
+    """
+    survey_type, _created = SurveyType.objects.get_or_create(slug=xform.id_string)
+    for start in range(0, num_of_submissions, batch_size):
+        stop = min(start + batch_size, num_of_submissions)
+        with transaction.atomic():
+            instances = Instance.objects.bulk_create(
+                _get_instances(xform, survey_type, start, stop)
+            )
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "UPDATE logger_instance"
+                    " SET json = json || jsonb_build_object('_id', id)"
+                    " WHERE xform_id = %s AND id BETWEEN %s AND %s",
+                    [xform.pk, instances[0].pk, instances[-1].pk],
+                )
+
+    XForm.objects.filter(pk=xform.pk).update(
+        num_of_submissions=num_of_submissions,
+        last_submission_time=timezone.now(),
+    )
+
+
+def seed(num_of_submissions, num_of_forms=1, reseed=False):
+    """Returns the benchmark form with ``num_of_submissions`` submissions.
+
+    The forms seeded by an earlier run are reused unless ``reseed`` is set.
+    ``num_of_forms`` forms are published to the benchmark project, only the
+    first one has submissions.
+    """
+    user, _token = get_benchmark_user()
+    project, _created = Project.objects.get_or_create(
+        name=f"benchmark {num_of_submissions}",
+        organization=user,
+        defaults={"created_by": user},
+    )
+    forms = XForm.objects.filter(project=project, deleted_at__isnull=True)
+    if reseed:
+        forms.delete()
+
+    for index in range(forms.count(), num_of_forms):
+        id_string = f"benchmark_{num_of_submissions}_{index}"
+        publish_xml_form(
+            ContentFile(FORM_XML.format(id_string=id_string), name=f"{id_string}.xml"),
+            user,
+            project,
+        )
+
+    xform = forms.order_by("pk").first()
+    if xform.instances.count() != num_of_submissions:
+        xform.instances.all().delete()
+        seed_submissions(xform, num_of_submissions)
+        xform.refresh_from_db()
+
+    return xform
+
+
+def get_percentiles(values):
+    """Returns the PERCENTILES of ``values``."""
+    if len(values) < 2:
+        return {f"p{percentile}": values[0] for percentile in PERCENTILES}
+
+    quantiles = statistics.quantiles(values, n=100, method="inclusive")
+    return {f"p{percentile}": quantiles[percentile - 1] for percentile in PERCENTILES}
+
+
+class EndpointBenchmark:
+    """
+    Requests the endpoints of the benchmark form and records their latency,
+    number of queries and peak memory.
+    """
+
+    def __init__(self, xform, iterations=20, warmup=2):
+        self.xform = xform
+        self.iterations = iterations
+        self.warmup = warmup
+        _user, token = get_benchmark_user()
+        self.client = Client(HTTP_AUTHORIZATION=f"Token {token}")
+        self.submission_index = xform.num_of_submissions
+
+    def _get(self, path, **params):
+        return self.client.get(path, params)
+
+    def _submit(self):
+        self.submission_index += 1
+        submission = ContentFile(
+            get_submission_xml(self.xform, self.submission_index),
+            name="submission.xml",
+        )
+        return self.client.post(
+            f"/{self.xform.user.username}/submission",
+            {"xml_submission_file": submission},
+        )
+
+    def _delete_exports(self):
+        Export.objects.filter(xform=self.xform).delete()
+
+    @staticmethod
+    def _generate_platform_stats():
+        now = timezone.now()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            _write_stats_to_file(
+                now.month, now.year, True, os.path.join(temp_dir, "stats.csv")
+            )
+
+    def get_cases(self):
+        """Returns the benchmarked endpoints as name: (request, setup) pairs.
+
+        ``setup`` is called before each request, outside of the measurements.
+        The platform_stats case generates the platform statistics report
+        instead of requesting an endpoint.
+        """
+        pk = self.xform.pk
+        cases = {
+            "data": (lambda: self._get(f"/api/v1/data/{pk}"), None),
+            "data_page": (
+                lambda: self._get(f"/api/v1/data/{pk}", page=1, page_size=100),
+                None,
+            ),
+            "data_ndjson": (lambda: self._get(f"/api/v1/data/{pk}.ndjson"), None),
+            "forms": (lambda: self._get("/api/v1/forms"), None),
+            "form_list": (
+                lambda: self._get(f"/{self.xform.user.username}/formList"),
+                None,
+            ),
+            "submission": (self._submit, None),
+            "csv_export": (
+                lambda: self._get(f"/api/v1/forms/{pk}.csv"),
+                self._delete_exports,
+            ),
+            "parquet_export": (
+                lambda: self._get(f"/api/v1/forms/{pk}.parquet"),
+                self._delete_exports,
+            ),
+            "platform_stats": (self._generate_platform_stats, None),
+        }
+
+        return {name: cases[name] for name in CASES}
+
+    @staticmethod
+    def _request(request):
+        response = request()
+        if response is None:
+            return
+        if response.streaming:
+            for _chunk in response.streaming_content:
+                pass
+        if response.status_code >= 400:
+            raise RuntimeError(f"Request failed with {response.status_code}")
+
+    def run_case(self, request, setup=None):
+        """Returns the latency percentiles, queries and peak memory of a case.
+
+        The latency is measured without tracing memory allocations, the peak
+        memory is measured in one more, traced, request.
+        """
+        latencies = []
+        num_queries = 0
+        for iteration in range(self.warmup + self.iterations):
+            if setup:
+                setup()
+            with track_queries() as stats:
+                start = time.perf_counter()
+                self._request(request)
+                duration = time.perf_counter() - start
+            if iteration >= self.warmup:
+                latencies.append(duration)
+                num_queries = max(num_queries, stats.num_queries)
+
+        if setup:
+            setup()
+        tracemalloc.start()
+        try:
+            self._request(request)
+            _current, peak_memory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        percentiles = get_percentiles(latencies)
+        return {
+            **{key: round(value, 6) for key, value in percentiles.items()},
+            "queries": num_queries,
+            "peak_memory": peak_memory,
+        }
+
+    def _cleanup(self, last_pk):
+        Instance.objects.filter(xform=self.xform, pk__gt=last_pk).delete()
+        XForm.objects.filter(pk=self.xform.pk).update(
+            num_of_submissions=self.xform.num_of_submissions
+        )
+        self._delete_exports()
+
+    def run(self, names=None):
+        """Runs the ``names`` cases, all of them by default.
+
+        The submissions and exports created by the cases are deleted.
+        """
+        cases = self.get_cases()
+        last_pk = self.xform.instances.aggregate(last_pk=Max("pk"))["last_pk"] or 0
+        results = {}
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+            try:
+                for name in names or cases:
+                    results[name] = self.run_case(*cases[name])
+            finally:
+                self._cleanup(last_pk)
+
+        return results
+
+
+def load_baseline(path, num_of_submissions):
+    """Returns the baseline results saved for ``num_of_submissions``."""
+    with open(path, encoding="utf-8") as baseline_file:
+        return json.load(baseline_file).get(str(num_of_submissions), {})
+
+
+def save_baseline(path, num_of_submissions, results):
+    """Saves ``results`` as the baseline for ``num_of_submissions``."""
+    try:
+        with open(path, encoding="utf-8") as baseline_file:
+            baselines = json.load(baseline_file)
+    except FileNotFoundError:
+        baselines = {}
+
+    baselines[str(num_of_submissions)] = results
+    with open(path, "w", encoding="utf-8") as baseline_file:
+        json.dump(baselines, baseline_file, indent=2, sort_keys=True)
+
+
+def get_regressions(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Returns a description of each result worse than its baseline.
+
+    The query count of a case is its budget, any extra query is a regression.
+    The p95 latency and peak memory may exceed the baseline by ``tolerance``.
+    """
+    regressions = []
+    for name, result in results.items():
+        expected = baseline.get(name)
+        if not expected:
+            continue
+        if result["queries"] > expected["queries"]:
+            regressions.append(
+                f"{name}: {result['queries']} queries, "
+                f"the budget is {expected['queries']}"
+            )
+        for key in ("p95", "peak_memory"):
+            if result[key] > expected[key] * (1 + tolerance):
+                regressions.append(
+                    f"{name}: {key} {result[key]}, the baseline is {expected[key]}"
+                )
+
+    return regressions
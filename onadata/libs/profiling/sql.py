@@ -1,39 +1,183 @@
 # -*- coding: utf-8 -*-
 """
 SqlTimingMiddleware - log SQL execution times per request.
+
+Queries are timed with database execute wrappers, so the counts and times are
+recorded with DEBUG off. Only a sample of requests is timed, see the
+SQL_TIMING_SAMPLE_RATE setting.
 """
 import logging
+import random
+import time
+from contextlib import ExitStack, contextmanager
 
-from django.db import connection
+from django.conf import settings
+from django.db import connections
+from django.utils.module_loading import import_string
 
 SQL_LOG = logging.getLogger("sql_logger")
 TOTALS_LOG = logging.getLogger("sql_totals_logger")
 
-# modified from
-# http://johnparsons.net/index.php/2013/08/15/easy-sql-query-counting-in-django
+# Length the slowest statement is truncated to in the exported record
+SLOWEST_SQL_MAX_LENGTH = 1000
+
+_wrapper_cost = None
+
+
+class QueryStats:
+    """
+    A database execute wrapper counting and timing the queries it runs.
+
+    Only the slowest statement is kept, the others are not copied.
+    """
+
+    def __init__(self):
+        self.num_queries = 0
+        self.time = 0.0
+        self.slowest_sql = None
+        self.slowest_time = 0.0
+        self.log_queries = SQL_LOG.isEnabledFor(logging.DEBUG)
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            self.num_queries += 1
+            self.time += duration
+            if duration > self.slowest_time:
+                self.slowest_time = duration
+                self.slowest_sql = sql
+            if self.log_queries:
+                SQL_LOG.debug(
+                    context["connection"].alias, extra={"time": duration, "sql": sql}
+                )
+
+
+@contextmanager
+def track_queries(stats=None):
+    """Records the queries run on every database connection in the block.
+
+    Yields the QueryStats the queries are recorded to, ``stats`` if set.
+    """
+    stats = stats or QueryStats()
+    with ExitStack() as stack:
+        for conn in connections.all():
+            stack.enter_context(conn.execute_wrapper(stats))
+        yield stats
+
+
+def get_wrapper_cost(iterations=10000):
+    """Returns the time QueryStats adds to each query, in seconds.
+
+    Measured once per process by wrapping a no-op execute.
+    """
+    global _wrapper_cost  # pylint: disable=global-statement
+
+    if _wrapper_cost is None:
+        stats = QueryStats()
+        stats.log_queries = False
+        context = {"connection": None}
+
+        def execute(sql, params, many, context):  # pylint: disable=unused-argument
+            return None
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            execute("SELECT 1", None, False, context)
+        baseline = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            stats(execute, "SELECT 1", None, False, context)
+        _wrapper_cost = max(time.perf_counter() - start - baseline, 0) / iterations
+
+    return _wrapper_cost
+
+
+def log_sql_timing(record):
+    """Logs a request's SQL timing record as key=value pairs."""
+    message = " ".join(
+        f"{key}={value!r}" if key == "slowest_sql" else f"{key}={value}"
+        for key, value in record.items()
+    )
+    TOTALS_LOG.info(
+        message,
+        extra={"time": record["db_time"], "num_queries": record["queries"]},
+    )
 
 
 class SqlTimingMiddleware:  # pylint: disable=too-few-public-methods
     """
-    Logs the time taken by each sql query over requests.
-    Logs the total time taken to run sql queries and the number of sql queries
-    per request.
+    Logs the total time taken to run sql queries, the number of sql queries and
+    the slowest sql query of a sample of requests.
+
+    The record of each sampled request is passed to the SQL_TIMING_SINK
+    callable, which logs it to the sql_totals_logger by default. The queries
+    run while a streaming response is consumed are included, the record is
+    sent when the response is closed. Async streaming responses are recorded
+    without them.
     """
 
     def __init__(self, get_response):
         self.get_response = get_response
+        self.sample_rate = getattr(settings, "SQL_TIMING_SAMPLE_RATE", 0.1)
+        sink = getattr(settings, "SQL_TIMING_SINK", None)
+        self.sink = import_string(sink) if sink else log_sql_timing
 
     def __call__(self, request):
-        path_info = f"{request.method} {request.path_info}"
-        response = self.get_response(request)
-        sqltime = 0  # Variable to store execution time
-        for query in connection.queries:
-            # Add the time that the query took to the total
-            sqltime += float(query["time"])
-            SQL_LOG.debug(path_info, extra=query)
-
-        TOTALS_LOG.debug(
-            path_info, extra={"time": sqltime, "num_queries": len(connection.queries)}
-        )
+        if not self.sample_rate or random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        start = time.perf_counter()
+        with track_queries() as stats:
+            response = self.get_response(request)
+
+        if response.streaming and not getattr(response, "is_async", False):
+            response.streaming_content = self._track_streaming_content(
+                response.streaming_content, request, response, stats, start
+            )
+        else:
+            self._record(request, response, stats, start)
 
         return response
+
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    def _track_streaming_content(self, content, request, response, stats, start):
+        """Yields the chunks of ``content``, recording the queries of each."""
+        iterator = iter(content)
+        try:
+            while True:
+                with track_queries(stats):
+                    try:
+                        chunk = next(iterator)
+                    except StopIteration:
+                        return
+                yield chunk
+        finally:
+            self._record(request, response, stats, start)
+
+    def _record(self, request, response, stats, start):
+        duration = time.perf_counter() - start
+        resolver_match = getattr(request, "resolver_match", None)
+        slowest_sql = (stats.slowest_sql or "")[:SLOWEST_SQL_MAX_LENGTH]
+        self.sink(
+            {
+                "method": request.method,
+                "path": request.path_info,
+                "view": resolver_match.view_name if resolver_match else None,
+                "status": response.status_code,
+                "duration": round(duration, 6),
+                "queries": stats.num_queries,
+                "db_time": round(stats.time, 6),
+                "slowest_time": round(stats.slowest_time, 6),
+                # the estimated share of the request time spent in the wrapper
+                "overhead": (
+                    round(stats.num_queries * get_wrapper_cost() / duration, 6)
+                    if duration
+                    else 0
+                ),
+                "slowest_sql": " ".join(slowest_sql.split()),
+            }
+        )
@@ -574,6 +574,67 @@ class GeoJsonRenderer(BaseRenderer):  # pylint: disable=too-few-public-methods
     def render(self, data, accepted_media_type=None, renderer_context=None):
         return json.dumps(data)
 
+    def stream_data(self, data, serializer):
+        """Returns a FeatureCollection streamed one feature at a time."""
+        yield '{"type": "FeatureCollection", "features": ['
+
+        for index, item in enumerate(data):
+            if index:
+                yield ","
+            yield json.dumps(serializer.to_representation(item))
+
+        yield "]}"
+
+
+class NDJSONRenderer(BaseRenderer):  # pylint: disable=too-few-public-methods
+    """
+    NDJSONRenderer - render newline delimited JSON, one record per line.
+    """
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, list):
+            return "".join(f"{json.dumps(item)}\n" for item in data)
+
+        return json.dumps(data)
+
+
+class ParquetRenderer(BaseRenderer):  # pylint: disable=too-few-public-methods
+    """
+    ParquetRenderer - renders a columnar Apache Parquet file.
+    """
+
+    media_type = "application/vnd.apache.parquet"
+    format = "parquet"
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, six.text_type):
+            return data.encode("utf-8")
+        if isinstance(data, dict):
+            return json.dumps(data).encode("utf-8")
+        return data
+
+
+class MVTRenderer(BaseRenderer):  # pylint: disable=too-few-public-methods
+    """
+    MVTRenderer - render Mapbox Vector Tiles, errors are rendered as json.
+    """
+
+    media_type = "application/vnd.mapbox-vector-tile"
+    format = "pbf"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, (bytes, memoryview)):
+            return bytes(data)
+
+        return json.dumps(data).encode("utf-8")
+
 
 class OSMRenderer(BaseRenderer):  # pylint: disable=too-few-public-methods
     """
@@ -5,12 +5,16 @@ The GeoJsonSerializer class - uses the GeoJSON structure for submission data.
 import json
 
 import geojson
+from pyxform.section import RepeatingSection
 from rest_framework_gis import serializers
 
 from onadata.apps.logger.models.instance import Instance
 from onadata.libs.utils.common_tools import str_to_bool
 from onadata.libs.utils.dict_tools import get_values_matching_key
 
+GEO_FIELD_PLANS = "geo_field_plans"
+SEARCHED_GEO_TYPES = ("geotrace", "geoshape")
+
 
 def create_feature(instance, geo_field, fields):
     """
@@ -86,6 +90,30 @@ def geometry_from_string(points, simple_style):
     return geometry
 
 
+def get_geo_field_plan(xform, geo_field):
+    """
+    Returns a ``(geo_type, nested)`` tuple describing how ``geo_field`` is read.
+
+    ``geo_type`` is the field's ``geotrace`` or ``geoshape`` bind type, None
+    for any other field. ``nested`` is True when the field is inside a repeat
+    and its value has to be searched for in the submission JSON.
+    """
+    element = xform.get_element(geo_field)
+    bind = getattr(element, "bind", None) or {}
+    geo_type = bind.get("type")
+
+    if geo_type not in SEARCHED_GEO_TYPES:
+        return None, False
+
+    parent = element.parent
+    while parent is not None:
+        if isinstance(parent, RepeatingSection):
+            return geo_type, True
+        parent = parent.parent
+
+    return geo_type, False
+
+
 class GeometryField(serializers.GeometryField):
     """
     The GeometryField class - representation for single GeometryField.
@@ -112,6 +140,21 @@ class GeoJsonSerializer(serializers.GeoFeatureModelSerializer):
         id_field = False
         fields = ("id", "xform")
 
+    def get_geo_field_plan(self, instance, geo_field):
+        """
+        Returns the ``geo_field`` plan of the instance's form.
+
+        Plans are kept in the serializer context so that they are computed
+        once per form for all the features of a request.
+        """
+        plans = self.context.setdefault(GEO_FIELD_PLANS, {})
+        key = (instance.xform_id, geo_field)
+
+        if key not in plans:
+            plans[key] = get_geo_field_plan(instance.xform, geo_field)
+
+        return plans[key]
+
     def to_representation(self, instance):
         ret = super().to_representation(instance)
         request = self.context.get("request")
@@ -133,14 +176,12 @@ class GeoJsonSerializer(serializers.GeoFeatureModelSerializer):
                     ret["properties"][field] = instance.json.get(field)
 
             if geo_field:
-                xform = instance.xform
-                geotrace_xpaths = xform.geotrace_xpaths()
-                polygon_xpaths = xform.polygon_xpaths()
+                geo_type, nested = self.get_geo_field_plan(instance, geo_field)
                 if "properties" in ret:
                     if title:
                         ret["properties"]["title"] = instance.json.get(title)
                 points = instance.json.get(geo_field)
-                if geo_field in geotrace_xpaths or geo_field in polygon_xpaths:
+                if geo_type and nested:
                     value = get_values_matching_key(instance.json, geo_field)
                     # handle empty geoms
                     try:
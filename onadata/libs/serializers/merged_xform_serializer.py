@@ -15,6 +15,7 @@ from pyxform.errors import PyXFormError
 from rest_framework import serializers
 
 from onadata.apps.logger.models import MergedXForm, XForm
+from onadata.apps.logger.models.merged_xform import get_merged_xform_descriptor
 from onadata.apps.logger.models.xform import XFORM_TITLE_LENGTH
 from onadata.libs.utils.common_tags import MULTIPLE_SELECT_TYPE, SELECT_ONE
 from onadata.libs.utils.common_tools import get_abbreviated_xpath
@@ -212,14 +213,11 @@ class MergedXFormSerializer(serializers.HyperlinkedModelSerializer):
 
     def get_last_submission_time(self, obj):
         """Return datetime of last submission from all forms"""
-        values = [
-            x.last_submission_time.isoformat()
-            for x in obj.xforms.only("last_submission_time")
-            if x.last_submission_time
+        last_submission_time = get_merged_xform_descriptor(obj.pk)[
+            "last_submission_time"
         ]
-        if values:
-            return sorted(values, reverse=True)[0]
-        return None
+
+        return last_submission_time.isoformat() if last_submission_time else None
 
     def create(self, validated_data):
         request = self.context["request"]
@@ -152,18 +152,19 @@ def get_users(project, context, all_perms=True):
     request_user = context["request"].user
 
     if not request_user.is_anonymous:
-        request_user_perms = [
-            perm.permission.codename
-            for perm in project.projectuserobjectpermission_set.filter(
+        request_user_perms = list(
+            project.projectuserobjectpermission_set.filter(
                 user=request_user
-            )
-        ]
+            ).values_list("permission__codename", flat=True)
+        )
         request_user_role = get_role(request_user_perms, project)
         request_user_is_admin = request_user_role in [OwnerRole.name, ManagerRole.name]
     else:
         request_user_is_admin = False
 
-    for perm in project.projectuserobjectpermission_set.filter(user__is_active=True):
+    for perm in project.projectuserobjectpermission_set.filter(
+        user__is_active=True
+    ).select_related("user__profile__organizationprofile", "permission"):
         if perm.user_id not in data:
             user = perm.user
 
@@ -29,6 +29,7 @@ from onadata.apps.logger.models import (
     XForm,
     XFormVersion,
 )
+from onadata.apps.logger.models.merged_xform import get_merged_xform_descriptor
 from onadata.apps.main.models.meta_data import MetaData
 from onadata.apps.main.models.user_profile import UserProfile
 from onadata.libs.exceptions import EncryptionError, EnketoError
@@ -371,13 +372,11 @@ class XFormMixin(XFormEntityListsMixin):
             return None
 
         if obj.is_merged_dataset:
-            values = [
-                x.last_submission_time.isoformat()
-                for x in obj.mergedxform.xforms.only("last_submission_time")
-                if x.last_submission_time
+            last_submission_time = get_merged_xform_descriptor(obj.pk)[
+                "last_submission_time"
             ]
-            if values:
-                return sorted(values, reverse=True)[0]
+            if last_submission_time:
+                return last_submission_time.isoformat()
 
         return (
             obj.last_submission_time.isoformat() if obj.last_submission_time else None
@@ -48,6 +48,7 @@ from onadata.libs.kms.tools import (
     commit_cached_xform_num_of_decrypted_submissions,
     create_key,
     decrypt_instance,
+    decrypt_instances,
     disable_expired_keys,
     disable_key,
     disable_xform_encryption,
@@ -1013,7 +1014,31 @@ class DecryptInstanceTestCase(TestBase):
         self.org = self._create_organization(
             username="valigetta", name="Valigetta Inc", created_by=self.user
         )
-        self.dec_submission_xml = f"""
+        self.dec_media = {
+            "sunset.png": BytesIO(b"Fake PNG image data"),
+            "forest.mp4": BytesIO(b"Fake MP4 video data"),
+        }
+        self.kms_key = create_key(self.org)
+
+        md = """
+        | survey  |
+        |         | type  | name   | label                |
+        |         | photo | sunset | Take photo of sunset |
+        |         | video | forest | Take a video of forest|
+        """
+        self.xform = self._publish_markdown(md, self.user, id_string="nature")
+        self.xform.is_managed = True
+        self.xform.save(update_fields=["is_managed"])
+        self.survey_type = SurveyType.objects.create(slug="slug-foo")
+        self.dec_submission_xml = self._get_dec_submission_xml(self.instance_uuid)
+        self.dec_submission_file = BytesIO(self.dec_submission_xml.encode("utf-8"))
+        self.instance = self._create_encrypted_instance(self.instance_uuid)
+        self.metadata_xml = self.instance.xml
+        self.metadata_xml_file = BytesIO(self.metadata_xml.encode("utf-8"))
+        self.xform.kms_keys.create(version="202502131337", kms_key=self.kms_key)
+
+    def _get_dec_submission_xml(self, instance_uuid):
+        return f"""
         <data xmlns:jr="http://openrosa.org/javarosa" xmlns:orx="http://openrosa.org/xforms"
             id="{self.form_id}" version="{self.instance_version}">
             <formhub>
@@ -1022,17 +1047,17 @@ class DecryptInstanceTestCase(TestBase):
             <sunset>sunset.png</sunset>
             <forest>forest.mp4</forest>
             <meta>
-                <instanceID>{self.instance_uuid}</instanceID>
+                <instanceID>{instance_uuid}</instanceID>
             </meta>
         </data>
         """.strip()
-        self.dec_submission_file = BytesIO(self.dec_submission_xml.encode("utf-8"))
-        self.dec_media = {
-            "sunset.png": BytesIO(b"Fake PNG image data"),
-            "forest.mp4": BytesIO(b"Fake MP4 video data"),
-        }
+
+    def _create_encrypted_instance(self, instance_uuid):
+        """Create an Instance encrypted with the KMS key."""
+        dec_submission_file = BytesIO(
+            self._get_dec_submission_xml(instance_uuid).encode("utf-8")
+        )
         dec_aes_key = b"0123456789abcdef0123456789abcdef"
-        self.kms_key = create_key(self.org)
         enc_aes_key = self._kms_encrypt(
             key_id=self.kms_key.key_id, plain_text=dec_aes_key
         )
@@ -1041,55 +1066,42 @@ class DecryptInstanceTestCase(TestBase):
             form_id=self.form_id,
             version=self.instance_version,
             enc_aes_key=enc_aes_key,
-            instance_uuid=self.instance_uuid,
-            dec_submission=self.dec_submission_file,
+            instance_uuid=instance_uuid,
+            dec_submission=dec_submission_file,
             dec_media=self.dec_media,
         )
         enc_key_b64 = base64.b64encode(enc_aes_key).decode("utf-8")
         enc_signature_b64 = base64.b64encode(enc_signature).decode("utf-8")
-
-        self.metadata_xml = self._create_encrypted_submission_manifest(
+        metadata_xml = self._create_encrypted_submission_manifest(
             form_id=self.form_id,
             version=self.instance_version,
             enc_key_b64=enc_key_b64,
-            instance_uuid=self.instance_uuid,
+            instance_uuid=instance_uuid,
             enc_signature_b64=enc_signature_b64,
             media_files=["sunset.png.enc", "forest.mp4.enc"],
         )
-        self.metadata_xml_file = BytesIO(self.metadata_xml.encode("utf-8"))
-
-        md = """
-        | survey  |
-        |         | type  | name   | label                |
-        |         | photo | sunset | Take photo of sunset |
-        |         | video | forest | Take a video of forest|
-        """
-        self.xform = self._publish_markdown(md, self.user, id_string="nature")
-        self.xform.is_managed = True
-        self.xform.save(update_fields=["is_managed"])
-        survey_type = SurveyType.objects.create(slug="slug-foo")
-        self.instance = Instance.objects.create(
+        instance = Instance.objects.create(
             xform=self.xform,
-            xml=self.metadata_xml,
+            xml=metadata_xml,
             user=self.user,
-            survey_type=survey_type,
-            checksum=sha256(self.metadata_xml_file.getvalue()).hexdigest(),
+            survey_type=self.survey_type,
+            checksum=sha256(metadata_xml.encode("utf-8")).hexdigest(),
         )
-        self.instance.refresh_from_db()
+        instance.refresh_from_db()
         dec_files = [
             ("sunset.png", self.dec_media["sunset.png"]),
             ("forest.mp4", self.dec_media["forest.mp4"]),
-            ("submission.xml", self.dec_submission_file),
+            ("submission.xml", dec_submission_file),
         ]
         attachments = []
 
         for index, (name, file) in enumerate(dec_files, start=1):
             enc_file_name = f"{name}.enc"
             enc_file = self._encrypt_submission_file(
-                dec_aes_key, self.instance_uuid, index, file.getvalue()
+                dec_aes_key, instance_uuid, index, file.getvalue()
             )
             attachment = Attachment(
-                instance=self.instance,
+                instance=instance,
                 xform=self.xform,
                 media_file=File(enc_file, name=enc_file_name),
                 mimetype="application/octet-stream",
@@ -1101,7 +1113,7 @@ class DecryptInstanceTestCase(TestBase):
 
         Attachment.objects.bulk_create(attachments)
 
-        self.xform.kms_keys.create(version="202502131337", kms_key=self.kms_key)
+        return instance
 
     def _compute_file_sha256(self, buffer):
         return sha256(buffer.getvalue()).hexdigest()
@@ -1303,6 +1315,85 @@ class DecryptInstanceTestCase(TestBase):
             self.instance.json.get("_decryption_error"), "KMS_KEY_NOT_FOUND"
         )
 
+    @override_settings(KMS_DECRYPTION_SPOOL_MAX_SIZE=1, KMS_DECRYPTION_MAX_WORKERS=1)
+    @patch(
+        "onadata.apps.logger.tasks.adjust_xform_num_of_decrypted_submissions_async.delay"
+    )
+    def test_decrypt_submission_spooled_to_disk(self, mock_adjust):
+        """Encrypted media larger than the spool size is decrypted."""
+        decrypt_instance(self.instance)
+
+        self.instance.refresh_from_db()
+
+        self.assertEqual(self.instance.xml, self.dec_submission_xml)
+        self.assertFalse(self.instance.is_encrypted)
+        att = Attachment.objects.get(instance=self.instance, name="sunset.png")
+
+        with att.media_file.open("rb") as dec_file:
+            self.assertEqual(dec_file.read(), self.dec_media["sunset.png"].getvalue())
+
+    @patch(
+        "onadata.apps.logger.tasks.adjust_xform_num_of_decrypted_submissions_async.delay"
+    )
+    def test_decrypt_instances(self, mock_adjust):
+        """A batch of Instances is decrypted with a single KMS client."""
+        other_uuid = "uuid:5a1d7f4e-3b0c-4a57-9a4e-2f0b3c6d8e91"
+        pending_uuid = "uuid:0f6c2d3e-8b1a-4c5d-9e7f-1a2b3c4d5e6f"
+        other_instance = self._create_encrypted_instance(other_uuid)
+        pending_instance = self._create_encrypted_instance(pending_uuid)
+        Instance.objects.filter(pk=pending_instance.pk).update(media_all_received=False)
+        instance_ids = [self.instance.pk, other_instance.pk, pending_instance.pk]
+
+        with patch(
+            "onadata.libs.kms.tools.get_kms_client", wraps=get_kms_client
+        ) as mock_get_kms_client:
+            summary = decrypt_instances(instance_ids)
+
+        mock_get_kms_client.assert_called_once_with()
+        self.assertEqual(summary["decrypted"], 2)
+        self.assertEqual(summary["failed"], [])
+        self.assertEqual(summary["pending"], [pending_instance.pk])
+        # The submission XML and 2 media files of each Instance
+        self.assertEqual(summary["files"], 6)
+        media_size = sum(len(file.getvalue()) for file in self.dec_media.values())
+        xml_size = sum(
+            len(self._get_dec_submission_xml(uuid).encode("utf-8"))
+            for uuid in [self.instance_uuid, other_uuid]
+        )
+        self.assertEqual(summary["bytes"], 2 * media_size + xml_size)
+        self.assertGreater(summary["files_per_second"], 0)
+        self.assertGreater(summary["bytes_per_second"], 0)
+
+        for instance, uuid in [
+            (self.instance, self.instance_uuid),
+            (other_instance, other_uuid),
+        ]:
+            instance.refresh_from_db()
+            self.assertFalse(instance.is_encrypted)
+            self.assertEqual(instance.xml, self._get_dec_submission_xml(uuid))
+
+        # Decrypted Instances are skipped
+        summary = decrypt_instances(instance_ids)
+
+        self.assertEqual(summary["decrypted"], 0)
+        self.assertEqual(summary["pending"], [pending_instance.pk])
+
+    @override_settings(KMS_DECRYPTION_SPOOL_MAX_SIZE=1)
+    @patch(
+        "onadata.apps.logger.tasks.adjust_xform_num_of_decrypted_submissions_async.delay"
+    )
+    def test_decrypt_instances_spooled_to_disk(self, mock_adjust):
+        """Decrypted files larger than the spool size are saved."""
+        summary = decrypt_instances([self.instance.pk])
+
+        self.assertEqual(summary["decrypted"], 1)
+        att = Attachment.objects.get(instance=self.instance, name="forest.mp4")
+
+        with att.media_file.open("rb") as dec_file:
+            self.assertEqual(dec_file.read(), self.dec_media["forest.mp4"].getvalue())
+
+        self.assertEqual(att.file_size, len(self.dec_media["forest.mp4"].getvalue()))
+
     def _mock_decrypt_submission(*args, **kwargs):
         def _gen():
             raise InvalidSubmissionException("Invalid signature.")
@@ -1334,6 +1425,22 @@ class DecryptInstanceTestCase(TestBase):
             self.instance.json.get("_decryption_error"), "INVALID_SUBMISSION"
         )
 
+    @patch("onadata.libs.kms.tools.decrypt_submission")
+    def test_decrypt_instances_failure(self, mock_decrypt_submission):
+        """Instances failing decryption are reported in the batch summary."""
+        mock_decrypt_submission.side_effect = self._mock_decrypt_submission
+
+        summary = decrypt_instances([self.instance.pk])
+
+        self.assertEqual(summary["decrypted"], 0)
+        self.assertEqual(summary["failed"], [self.instance.pk])
+        self.assertEqual(summary["files"], 0)
+        self.instance.refresh_from_db()
+        self.assertTrue(self.instance.is_encrypted)
+        self.assertEqual(
+            self.instance.json.get("_decryption_error"), "INVALID_SUBMISSION"
+        )
+
     def test_encryption_unmanaged(self):
         """Decryption fails if encryption is not using managed keys."""
         self.xform.kms_keys.all().delete()
@@ -0,0 +1,96 @@
+"""Tests for module onadata.libs.profiling.benchmark"""
+
+import os
+import tempfile
+
+from django.test import SimpleTestCase
+
+from onadata.apps.main.tests.test_base import TestBase
+from onadata.libs.profiling.benchmark import (
+    EndpointBenchmark,
+    get_percentiles,
+    get_regressions,
+    load_baseline,
+    save_baseline,
+    seed,
+)
+
+RESULT = {"p50": 0.1, "p95": 0.2, "p99": 0.3, "queries": 5, "peak_memory": 1000}
+
+
+class BenchmarkResultsTestCase(SimpleTestCase):
+    """Tests for the benchmark percentiles and baselines"""
+
+    def test_get_percentiles(self):
+        """The 50th, 95th and 99th percentiles are returned"""
+        percentiles = get_percentiles([i / 100 for i in range(1, 101)])
+
+        self.assertAlmostEqual(percentiles["p50"], 0.505)
+        self.assertAlmostEqual(percentiles["p95"], 0.9505)
+        self.assertAlmostEqual(percentiles["p99"], 0.9901)
+        self.assertEqual(get_percentiles([0.5]), {"p50": 0.5, "p95": 0.5, "p99": 0.5})
+
+    def test_get_regressions(self):
+        """Extra queries and slower or bigger results are regressions"""
+        baseline = {"data": RESULT}
+
+        self.assertEqual(get_regressions({"data": RESULT}, baseline), [])
+        self.assertEqual(
+            get_regressions({"data": {**RESULT, "p95": 0.23}}, baseline), []
+        )
+        self.assertEqual(get_regressions({"forms": {**RESULT, "queries": 9}}, {}), [])
+
+        regressions = get_regressions(
+            {"data": {**RESULT, "queries": 6, "p95": 0.3, "peak_memory": 2000}},
+            baseline,
+        )
+        self.assertEqual(
+            regressions,
+            [
+                "data: 6 queries, the budget is 5",
+                "data: p95 0.3, the baseline is 0.2",
+                "data: peak_memory 2000, the baseline is 1000",
+            ],
+        )
+
+    def test_save_baseline(self):
+        """The baselines of each number of submissions are kept"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "baseline.json")
+            save_baseline(path, 100, {"data": RESULT})
+            save_baseline(path, 1000, {"forms": RESULT})
+
+            self.assertEqual(load_baseline(path, 100), {"data": RESULT})
+            self.assertEqual(load_baseline(path, 1000), {"forms": RESULT})
+            self.assertEqual(load_baseline(path, 10), {})
+
+
+class EndpointBenchmarkTestCase(TestBase):
+    """Tests for EndpointBenchmark"""
+
+    def test_seed(self):
+        """The form is seeded once with the number of submissions"""
+        xform = seed(25, num_of_forms=2)
+
+        self.assertEqual(xform.num_of_submissions, 25)
+        self.assertEqual(xform.project.xform_set.count(), 2)
+        self.assertEqual(
+            sorted(xform.instances.values_list("json___id", flat=True)),
+            sorted(xform.instances.values_list("pk", flat=True)),
+        )
+        self.assertEqual(seed(25, num_of_forms=2), xform)
+
+    def test_run(self):
+        """The latency, queries and peak memory of each endpoint are recorded"""
+        xform = seed(10)
+        benchmark = EndpointBenchmark(xform, iterations=2, warmup=1)
+
+        results = benchmark.run(["data", "forms", "form_list", "submission"])
+
+        self.assertEqual(list(results), ["data", "forms", "form_list", "submission"])
+        for result in results.values():
+            self.assertGreater(result["queries"], 0)
+            self.assertGreater(result["peak_memory"], 0)
+            self.assertLessEqual(result["p50"], result["p99"])
+        # the submissions made by the benchmark are deleted
+        self.assertEqual(xform.instances.count(), 10)
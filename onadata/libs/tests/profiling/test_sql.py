@@ -0,0 +1,88 @@
+"""Tests for module onadata.libs.profiling.sql"""
+
+from unittest.mock import MagicMock, patch
+
+from django.contrib.auth import get_user_model
+from django.http import StreamingHttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from onadata.libs.profiling.sql import (
+    SqlTimingMiddleware,
+    get_wrapper_cost,
+    track_queries,
+)
+
+User = get_user_model()
+
+
+class SqlTimingTestCase(TestCase):
+    """Tests for SqlTimingMiddleware"""
+
+    def _view(self, request):  # pylint: disable=unused-argument
+        list(User.objects.all())
+        User.objects.filter(username="bob").exists()
+        return MagicMock(status_code=200)
+
+    def test_track_queries(self):
+        """Queries are counted and timed with DEBUG off"""
+        with track_queries() as stats:
+            self._view(None)
+
+        self.assertEqual(stats.num_queries, 2)
+        self.assertGreater(stats.time, 0)
+        self.assertGreaterEqual(stats.time, stats.slowest_time)
+        self.assertIn("auth_user", stats.slowest_sql)
+
+    @override_settings(SQL_TIMING_SAMPLE_RATE=1)
+    def test_sampled_request_recorded(self):
+        """A record is sent to the sink for a sampled request"""
+        sink = MagicMock()
+        middleware = SqlTimingMiddleware(self._view)
+        middleware.sink = sink
+        middleware(RequestFactory().get("/api/v1/forms"))
+
+        record = sink.call_args[0][0]
+        self.assertEqual(record["method"], "GET")
+        self.assertEqual(record["path"], "/api/v1/forms")
+        self.assertEqual(record["status"], 200)
+        self.assertEqual(record["queries"], 2)
+        self.assertIn("auth_user", record["slowest_sql"])
+        self.assertLess(record["overhead"], 0.01)
+
+    @override_settings(SQL_TIMING_SAMPLE_RATE=1)
+    def test_streaming_response_recorded(self):
+        """Queries run while a streaming response is consumed are recorded"""
+
+        def stream():
+            yield str(User.objects.count())
+            yield str(User.objects.filter(username="bob").exists())
+
+        sink = MagicMock()
+        middleware = SqlTimingMiddleware(
+            lambda request: StreamingHttpResponse(stream())
+        )
+        middleware.sink = sink
+        response = middleware(RequestFactory().get("/api/v1/forms"))
+
+        sink.assert_not_called()
+        list(response.streaming_content)
+        response.close()
+
+        sink.assert_called_once()
+        self.assertEqual(sink.call_args[0][0]["queries"], 2)
+
+    @override_settings(SQL_TIMING_SAMPLE_RATE=0)
+    @patch("onadata.libs.profiling.sql.track_queries")
+    def test_unsampled_request(self, mock_track_queries):
+        """Requests that are not sampled are not instrumented"""
+        sink = MagicMock()
+        middleware = SqlTimingMiddleware(self._view)
+        middleware.sink = sink
+        middleware(RequestFactory().get("/api/v1/forms"))
+
+        mock_track_queries.assert_not_called()
+        sink.assert_not_called()
+
+    def test_wrapper_cost(self):
+        """The wrapper adds a few microseconds to a query"""
+        self.assertLess(get_wrapper_cost(), 0.0001)
@@ -1,7 +1,13 @@
+from unittest.mock import patch
+
 from rest_framework.test import APIRequestFactory
 from django.contrib.gis.geos import GeometryCollection, Point
 
-from onadata.libs.serializers.geojson_serializer import GeoJsonSerializer
+from onadata.apps.logger.models import Instance
+from onadata.libs.serializers.geojson_serializer import (
+    GeoJsonSerializer,
+    get_geo_field_plan,
+)
 from onadata.apps.api.tests.viewsets.test_abstract_viewset import TestAbstractViewSet
 
 
@@ -21,3 +27,41 @@ class TestGeoJsonSerializer(TestAbstractViewSet):
         self.assertTrue(serializer.is_valid())
         geometry = serializer.validated_data["geom"]
         self.assertEqual(geometry.geojson, data.get("geom").geojson)
+
+    def _publish_geo_form(self):
+        md = """
+        | survey |
+        |        | type         | name     | label    |
+        |        | geopoint     | location | Location |
+        |        | geoshape     | area     | Area     |
+        |        | begin repeat | segment  | Segment  |
+        |        | geotrace     | blueline | Trace    |
+        |        | end repeat   |          |          |
+        """
+        return self._publish_markdown(md, self.user, id_string="geo_plan")
+
+    def test_get_geo_field_plan(self):
+        xform = self._publish_geo_form()
+
+        self.assertEqual(get_geo_field_plan(xform, "location"), (None, False))
+        self.assertEqual(get_geo_field_plan(xform, "area"), ("geoshape", False))
+        self.assertEqual(
+            get_geo_field_plan(xform, "segment/blueline"), ("geotrace", True)
+        )
+        self.assertEqual(get_geo_field_plan(xform, "missing"), (None, False))
+
+    def test_geo_field_plan_computed_once_per_form(self):
+        xform = self._publish_geo_form()
+        serializer = GeoJsonSerializer(context={})
+
+        with patch(
+            "onadata.libs.serializers.geojson_serializer.get_geo_field_plan",
+            wraps=get_geo_field_plan,
+        ) as mock_get_plan:
+            for _ in range(3):
+                plan = serializer.get_geo_field_plan(
+                    Instance(xform=xform), "segment/blueline"
+                )
+
+        self.assertEqual(plan, ("geotrace", True))
+        mock_get_plan.assert_called_once_with(xform, "segment/blueline")
@@ -11,12 +11,14 @@ from django.utils import timezone
 
 import jwt
 from oauth2_provider.models import AccessToken, get_application_model
+from rest_framework.authtoken.models import Token
 from rest_framework.exceptions import AuthenticationFailed
 from rest_framework.test import APIRequestFactory
 
 from onadata.apps.api.models.temp_token import TempToken
 from onadata.libs.authentication import (
     DigestAuthentication,
+    LastLoginTokenAuthentication,
     LockoutBasicAuthentication,
     MasterReplicaOAuth2Validator,
     TempTokenAuthentication,
@@ -27,6 +29,7 @@ from onadata.libs.authentication import (
     get_client_ip,
     get_lockout_username,
     is_lockout_excluded_path,
+    update_last_login_throttled,
 )
 from onadata.libs.utils.cache_tools import LOCKOUT_IP, safe_cache_set, safe_key
 from onadata.libs.utils.common_tags import API_TOKEN
@@ -115,6 +118,61 @@ class TestTempTokenAuthentication(TestCase):
         self.assertEqual(token, returned_token)
 
 
+class TestUpdateLastLoginThrottled(TestCase):
+    """Tests for update_last_login_throttled"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="bob", password="secret")
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_sets_last_login_when_missing(self):
+        """last_login is persisted for a user who has never logged in"""
+        self.assertIsNone(self.user.last_login)
+        update_last_login_throttled(self.user)
+
+        self.user.refresh_from_db()
+        self.assertIsNotNone(self.user.last_login)
+
+    def test_recent_last_login_not_written(self):
+        """No query is made when last_login is within the interval"""
+        update_last_login_throttled(self.user)
+
+        with self.assertNumQueries(0):
+            update_last_login_throttled(self.user)
+
+    def test_cache_coalesces_writes(self):
+        """Concurrent stale user objects only write once per interval"""
+        update_last_login_throttled(self.user)
+        stale_user = User.objects.get(pk=self.user.pk)
+        stale_user.last_login = timezone.now() - timedelta(days=1)
+
+        with self.assertNumQueries(0):
+            update_last_login_throttled(stale_user)
+
+    @override_settings(LAST_LOGIN_MIN_INTERVAL_SECONDS=0)
+    def test_no_throttling_when_interval_disabled(self):
+        """Every call writes when the interval is 0"""
+        update_last_login_throttled(self.user)
+        first_login = self.user.last_login
+        update_last_login_throttled(self.user)
+
+        self.assertGreater(self.user.last_login, first_login)
+
+    def test_token_authentication_updates_last_login(self):
+        """Token authentication records the last login"""
+        token = Token.objects.create(user=self.user)
+        user, _token = LastLoginTokenAuthentication().authenticate_credentials(
+            token.key
+        )
+
+        self.assertEqual(user, self.user)
+        self.user.refresh_from_db()
+        self.assertIsNotNone(self.user.last_login)
+
+
 class TestTempTokenURLParameterAuthentication(TestCase):
     def setUp(self):
         self.factory = APIRequestFactory()
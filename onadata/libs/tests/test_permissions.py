@@ -5,14 +5,21 @@ Tests onadata.libs.permissions module
 from unittest.mock import patch
 
 from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from guardian.shortcuts import get_users_with_perms
 
 from onadata.apps.api import tools
+from onadata.apps.main.models.meta_data import MetaData
 from onadata.apps.main.models.user_profile import UserProfile
 from onadata.apps.main.tests.test_base import TestBase
 from onadata.libs.permissions import (
     CAN_ADD_XFORM_TO_PROFILE,
+    META_PERMS_SCOPE_ALL,
+    META_PERMS_SCOPE_NONE,
+    META_PERMS_SCOPE_OWN,
     DataEntryMinorRole,
     EditorRole,
     ManagerRole,
@@ -22,6 +29,12 @@ from onadata.libs.permissions import (
     ReadOnlyRoleNoDownload,
     filter_queryset_xform_meta_perms_sql,
     get_object_users_with_permissions,
+    get_xform_meta_perms_scope,
+)
+from onadata.libs.utils.cache_tools import (
+    XFORM_META_PERMS_ENABLED_CACHE,
+    get_xform_meta_perms_scope_key,
+    get_xform_perms_version,
 )
 
 
@@ -189,6 +202,110 @@ class TestPermissions(TestBase):
         self.assertEqual("alice", users_with_perms[2]["user"].username)
         self.assertTrue(hasattr(users_with_perms[2]["user"], "profile"))
 
+    def test_get_object_users_with_permissions_query_count(self):
+        """
+        Test the number of queries does not grow with the number of users.
+        """
+        self._publish_transportation_form()
+        demo_grp = Group.objects.create(name="demo")
+        EditorRole.add(demo_grp, self.xform)
+
+        def add_users(prefix, count):
+            for i in range(count):
+                user = self._create_user(f"{prefix}{i}", "password")
+                UserProfile.objects.get_or_create(user=user)
+                if i % 2:
+                    user.groups.add(demo_grp)
+                else:
+                    EditorRole.add(user, self.xform)
+
+        def count_queries():
+            with CaptureQueriesContext(connection) as context:
+                get_object_users_with_permissions(self.xform, with_group_users=True)
+            return len(context.captured_queries)
+
+        add_users("few", 2)
+        few_users_queries = count_queries()
+        add_users("many", 20)
+
+        self.assertEqual(count_queries(), few_users_queries)
+        usernames = [
+            perm["user"].username
+            for perm in get_object_users_with_permissions(
+                self.xform, with_group_users=True
+            )
+        ]
+        for i in range(20):
+            self.assertIn(f"many{i}", usernames)
+
+    def test_role_bulk_add_and_remove(self):
+        """
+        Test bulk adding and removing a role on several forms.
+        """
+        md = """
+        | survey |
+        |        | type | name  | label |
+        |        | text | name  | Name  |
+        """
+        xforms = [
+            self._publish_markdown(md, self.user, id_string=f"form_{i}")
+            for i in range(3)
+        ]
+        alice = self._create_user("alice", "alice")
+        demo_grp = Group.objects.create(name="demo")
+        ReadOnlyRole.add(alice, xforms[0])
+
+        def count_queries(objs):
+            with CaptureQueriesContext(connection) as context:
+                EditorRole.bulk_add(alice, objs)
+            return len(context.captured_queries)
+
+        self.assertEqual(count_queries(xforms[:1]), count_queries(xforms))
+        EditorRole.bulk_add(demo_grp, xforms)
+
+        for xform in xforms:
+            alice = type(alice).objects.get(pk=alice.pk)
+            self.assertTrue(EditorRole.user_has_role(alice, xform))
+            self.assertTrue(EditorRole.has_role(perms_for(alice, xform), xform))
+            self.assertFalse(OwnerRole.user_has_role(alice, xform))
+
+        EditorRole.bulk_remove(alice, xforms)
+
+        for xform in xforms:
+            self.assertEqual(
+                get_users_with_perms(
+                    xform, attach_perms=True, with_group_users=False
+                ).get(alice, []),
+                [],
+            )
+
+    def test_group_members_change_bumps_perms_version(self):
+        """
+        Test adding and removing team members clears the group's form caches.
+        """
+        self._publish_transportation_form()
+        alice = self._create_user("alice", "alice")
+        demo_grp = Group.objects.create(name="demo")
+        other_grp = Group.objects.create(name="other")
+        EditorRole.bulk_add(demo_grp, [self.xform])
+
+        def assert_bumped(change):
+            version = get_xform_perms_version(self.xform.pk)
+            change()
+            self.assertNotEqual(get_xform_perms_version(self.xform.pk), version)
+
+        assert_bumped(lambda: alice.groups.add(demo_grp))
+        assert_bumped(lambda: alice.groups.remove(demo_grp))
+        assert_bumped(lambda: demo_grp.user_set.add(alice))
+        assert_bumped(alice.groups.clear)
+        alice.groups.add(demo_grp)
+        assert_bumped(demo_grp.user_set.clear)
+
+        # groups without permissions on the form leave its caches alone
+        version = get_xform_perms_version(self.xform.pk)
+        alice.groups.add(other_grp)
+        self.assertEqual(get_xform_perms_version(self.xform.pk), version)
+
     def test_readonly_no_downloads_has_role(self):
         """
         Test readonly no downloads role.
@@ -238,3 +355,62 @@ class TestPermissions(TestBase):
 
         result = filter_queryset_xform_meta_perms_sql(self.xform, alice, None)
         self.assertEqual(result, {"_submitted_by": "alice"})
+
+    def test_get_xform_meta_perms_scope(self):
+        """
+        Test the meta permissions scope is cached and cleared on changes.
+        """
+        self._publish_transportation_form()
+        cache.clear()
+        alice = self._create_user("alice", "alice")
+        enabled_key = f"{XFORM_META_PERMS_ENABLED_CACHE}{self.xform.pk}"
+
+        def cached_scope():
+            return cache.get(get_xform_meta_perms_scope_key(self.xform.pk, alice.pk))
+
+        self.assertEqual(
+            get_xform_meta_perms_scope(self.xform, alice), META_PERMS_SCOPE_ALL
+        )
+        self.assertFalse(cache.get(enabled_key))
+
+        MetaData.xform_meta_permission(self.xform, "editor|dataentry|readonly")
+        self.assertIsNone(cache.get(enabled_key))
+        self.assertEqual(
+            get_xform_meta_perms_scope(self.xform, alice), META_PERMS_SCOPE_NONE
+        )
+        self.assertEqual(cached_scope(), META_PERMS_SCOPE_NONE)
+
+        with self.assertNumQueries(0):
+            get_xform_meta_perms_scope(self.xform, alice)
+
+        DataEntryMinorRole.add(alice, self.xform)
+        self.assertIsNone(cached_scope())
+        self.assertEqual(
+            get_xform_meta_perms_scope(self.xform, alice), META_PERMS_SCOPE_OWN
+        )
+
+        # changing the meta permissions setting clears the cached scopes
+        MetaData.xform_meta_permission(self.xform, "editor|dataentry-minor|readonly")
+        self.assertIsNone(cached_scope())
+
+    def test_get_xform_meta_perms_scope_team_member_removed(self):
+        """
+        Test the cached scope of a team member is cleared on removal.
+        """
+        self._publish_transportation_form()
+        alice = self._create_user("alice", "alice")
+        MetaData.xform_meta_permission(self.xform, "editor|dataentry|readonly")
+        team = Group.objects.create(name="data collectors")
+        EditorRole.bulk_add(team, [self.xform])
+        alice.groups.add(team)
+
+        self.assertEqual(
+            get_xform_meta_perms_scope(self.xform, alice), META_PERMS_SCOPE_ALL
+        )
+
+        alice.groups.remove(team)
+        alice = type(alice).objects.get(pk=alice.pk)
+
+        self.assertEqual(
+            get_xform_meta_perms_scope(self.xform, alice), META_PERMS_SCOPE_NONE
+        )
@@ -25,11 +25,15 @@ from onadata.libs.utils.cache_tools import (
     PROJ_SUB_DATE_CACHE,
     PROJ_V2_OWNER_CACHE,
     PROJ_V2_PUBLIC_OWNER_CACHE,
+    bump_xform_submissions_version,
     clear_project_owner_cache,
     get_project_cache_key,
     get_project_cache_keys,
     get_shared_project_detail_cache_data,
+    get_xform_query_field_counts,
+    get_xform_submissions_version,
     project_cache_prefixes,
+    record_xform_query_fields,
     reset_project_cache,
     safe_cache_add,
     safe_cache_decr,
@@ -439,3 +443,58 @@ class SafeCacheDeleteTestCase(TestCase):
                 # Reset mocks for next iteration
                 mock_logger.reset_mock()
                 mock_delete.reset_mock()
+
+
+class XFormSubmissionsVersionTestCase(TestCase):
+    """Test methods `get_xform_submissions_version` and
+    `bump_xform_submissions_version`"""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_version_is_stable(self):
+        """The version is the same until it is bumped"""
+        version = get_xform_submissions_version(1)
+
+        self.assertEqual(get_xform_submissions_version(1), version)
+        bump_xform_submissions_version(1)
+        self.assertEqual(get_xform_submissions_version(1), version + 1)
+        # other forms are not affected
+        self.assertNotEqual(get_xform_submissions_version(2), version + 1)
+
+    def test_bump_lost_version(self):
+        """A version lost from the cache restarts from a greater value"""
+        version = get_xform_submissions_version(1)
+        cache.clear()
+        bump_xform_submissions_version(1)
+
+        self.assertGreater(get_xform_submissions_version(1), version)
+
+
+class XFormQueryFieldsTestCase(TestCase):
+    """Test methods `record_xform_query_fields` and
+    `get_xform_query_field_counts`"""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_fields_counted(self):
+        """Each field of a form is counted in its own key"""
+        record_xform_query_fields(1, ["name", "age"])
+        record_xform_query_fields(1, ["age"])
+        record_xform_query_fields(1, [])
+        record_xform_query_fields(2, ["name"])
+
+        self.assertEqual(get_xform_query_field_counts(1), {"name": 1, "age": 2})
+        self.assertEqual(get_xform_query_field_counts(2), {"name": 1})
+        self.assertEqual(get_xform_query_field_counts(3), {})
+
+    def test_known_fields_not_rewritten(self):
+        """The form's field names are only written for new fields"""
+        record_xform_query_fields(1, ["name"])
+
+        with patch("onadata.libs.utils.cache_tools.safe_cache_set") as mock_set:
+            record_xform_query_fields(1, ["name"])
+
+        mock_set.assert_not_called()
+        self.assertEqual(get_xform_query_field_counts(1), {"name": 2})
@@ -22,6 +22,8 @@ from django.test import RequestFactory
 from django.test.utils import override_settings
 from django.utils import timezone
 
+import pyarrow as pa
+from pyarrow import parquet as pq
 from pyxform.builder import create_survey_from_xls
 from rest_framework import exceptions
 from rest_framework.authtoken.models import Token
@@ -667,6 +669,50 @@ class TestExportTools(TestAbstractViewSet):
         self.assertTrue(export.is_successful)
         self.assertNotEqual(export_id, export.pk)
 
+    @override_settings(PARQUET_ROW_GROUP_SIZE=1)
+    def test_parquet_export(self):
+        """Submissions are exported to a Parquet file a row group at a time"""
+        md = """
+        | survey |
+        |        | type         | name     | label    |
+        |        | text         | name     | Name     |
+        |        | integer      | age      | Age      |
+        |        | decimal      | height   | Height   |
+        |        | begin repeat | kids     | Kids     |
+        |        | text         | kid_name | Kid name |
+        |        | end repeat   |          |          |
+        """
+        xform = self._publish_markdown(md, self.user, id_string="parq")
+        for xml in [
+            '<data id="parq"><name>Ann</name><age>30</age><height>1.7</height>'
+            "<kids><kid_name>Bo</kid_name></kids>"
+            "<kids><kid_name>Cy</kid_name></kids></data>",
+            '<data id="parq"><name>Dan</name><age>x</age></data>',
+        ]:
+            Instance(xform=xform, xml=xml).save()
+        xform.refresh_from_db()
+
+        export = generate_export(Export.PARQUET_EXPORT, xform, None, {})
+        self.assertTrue(export.is_successful)
+        self.assertTrue(export.filename.endswith(".parquet"))
+
+        parquet_file = pq.ParquetFile(export.full_filepath)
+        self.assertEqual(parquet_file.metadata.num_row_groups, 2)
+        table = parquet_file.read()
+        self.assertEqual(table.schema.field("_id").type, pa.int64())
+        self.assertEqual(table.schema.field("age").type, pa.int64())
+        self.assertEqual(table.schema.field("height").type, pa.float64())
+        self.assertEqual(table.schema.field("name").type, pa.string())
+
+        rows = sorted(table.to_pylist(), key=lambda row: row["_id"])
+        self.assertEqual(
+            [(row["name"], row["age"], row["height"]) for row in rows],
+            [("Ann", 30, 1.7), ("Dan", None, None)],
+        )
+        self.assertEqual(rows[0]["kids[1]/kid_name"], "Bo")
+        self.assertEqual(rows[0]["kids[2]/kid_name"], "Cy")
+        self.assertIsNone(rows[1]["kids[2]/kid_name"])
+
     def test_kml_export_data(self):
         """
         Test kml_export_data(id_string, user, xform=None).
@@ -10,32 +10,50 @@ from io import BytesIO
 from unittest.mock import Mock, patch
 
 from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
 from django.core.cache import cache
 from django.core.exceptions import PermissionDenied
 from django.core.files.base import ContentFile
 from django.core.files.uploadedfile import InMemoryUploadedFile
+from django.db import DatabaseError
+from django.http import Http404
 from django.http.request import HttpRequest
 from django.test.utils import override_settings
 from django.utils import timezone
 
 from defusedxml import minidom
 from defusedxml.ElementTree import ParseError
+from guardian.shortcuts import assign_perm, remove_perm
 
 from onadata.apps.logger.import_tools import django_file
-from onadata.apps.logger.models import Instance, InstanceHistory
+from onadata.apps.logger.models import (
+    Attachment,
+    Instance,
+    InstanceHistory,
+    SubmissionDeletion,
+)
 from onadata.apps.logger.models.survey_type import SurveyType
 from onadata.apps.logger.models.xform import XForm
 from onadata.apps.logger.models.xform_version import XFormVersion
 from onadata.apps.logger.xform_instance_parser import AttachmentNameError
 from onadata.apps.main.tests.test_base import TestBase
 from onadata.libs.test_utils.pyxform_test_case import PyxformTestCase
+from onadata.libs.utils.cache_tools import (
+    XFORM_DEC_SUBMISSION_COUNT,
+    XFORM_SUBMISSION_UUID_CACHE,
+    get_xform_submission_id_string_key,
+    get_xform_submission_perm_key,
+)
 from onadata.libs.utils.common_tags import MEDIA_ALL_RECEIVED, MEDIA_COUNT, TOTAL_MEDIA
 from onadata.libs.utils.logger_tools import (
     InstanceEditConflictError,
+    check_submission_permissions,
     create_instance,
     delete_xform_submissions,
     generate_content_disposition_header,
     get_storages_media_download_url,
+    get_xform_from_submission,
     publish_xls_form,
     publish_xml_form,
     response_with_mimetype_and_name,
@@ -43,6 +61,8 @@ from onadata.libs.utils.logger_tools import (
 )
 from onadata.libs.utils.user_auth import get_user_default_project
 
+User = get_user_model()
+
 
 class CreateInstanceTestCase(PyxformTestCase, TestBase):
     """Tests for create_instance() function."""
@@ -1171,12 +1191,79 @@ class DeleteXFormSubmissionsTestCase(TestBase):
         with self.assertRaises(PermissionDenied):
             delete_xform_submissions(self.xform, self.user, soft_delete=False)
 
-    def test_cache_deleted(self):
-        """Cache tracking submissions being deleted is cleared"""
-        cache.set(f"xfm-submissions-deleting-{self.xform.id}", [self.instances[0].pk])
+    def test_deletion_markers_removed(self):
+        """Markers of the submissions being deleted are removed"""
+        SubmissionDeletion.mark(self.xform, [self.instances[0].pk])
+        SubmissionDeletion.mark(self.xform)
+        delete_xform_submissions(self.xform, self.user, [self.instances[0].pk])
+
+        self.assertEqual(
+            list(self.xform.submission_deletions.values_list("instance_id", flat=True)),
+            [None],
+        )
+
         delete_xform_submissions(self.xform, self.user)
 
-        self.assertIsNone(cache.get(f"xfm-submissions-deleting-{self.xform.id}"))
+        self.assertFalse(self.xform.submission_deletions.exists())
+
+    @patch("onadata.libs.utils.logger_tools._soft_delete_xform_submissions")
+    def test_deletion_markers_removed_on_failure(self, mock_soft_delete):
+        """Markers are removed when the deletion fails"""
+        mock_soft_delete.side_effect = DatabaseError
+        SubmissionDeletion.mark(self.xform, [self.instances[0].pk])
+
+        with self.assertRaises(DatabaseError):
+            delete_xform_submissions(self.xform, self.user, [self.instances[0].pk])
+
+        self.assertFalse(self.xform.submission_deletions.exists())
+
+    def test_stale_deletion_markers_purged(self):
+        """Markers older than the TTL are removed when marking"""
+        SubmissionDeletion.mark(self.xform)
+        self.xform.submission_deletions.update(
+            date_created=timezone.now() - timedelta(hours=2)
+        )
+        SubmissionDeletion.mark(self.xform, [self.instances[0].pk])
+
+        self.assertEqual(
+            list(self.xform.submission_deletions.values_list("instance_id", flat=True)),
+            [self.instances[0].pk],
+        )
+
+    def test_live_decrypted_submission_count_after_delete(self):
+        """Pending decrypted submission count deltas are folded in the recount"""
+        self.xform.is_managed = True
+        self.xform.save(update_fields=["is_managed"])
+        cache.set(f"{XFORM_DEC_SUBMISSION_COUNT}{self.xform.pk}", 4)
+
+        delete_xform_submissions(
+            self.xform, self.user, instance_ids=[self.instances[0].pk]
+        )
+
+        self.xform.refresh_from_db()
+        self.assertEqual(self.xform.num_of_decrypted_submissions, 3)
+        self.assertEqual(self.xform.live_num_of_decrypted_submissions, 3)
+
+    def test_attachments_and_json_updated(self):
+        """Attachments are soft deleted and the JSON records the deletion"""
+        instance = self.instances[0]
+        Attachment.objects.create(
+            instance=instance, media_file=ContentFile(b"image", name="image.jpg")
+        )
+        delete_xform_submissions(self.xform, self.user, [str(instance.pk)])
+
+        instance.refresh_from_db()
+        self.assertEqual(instance.json["_deleted_at"], instance.deleted_at.isoformat())
+        self.assertEqual(
+            instance.json["_date_modified"], instance.date_modified.isoformat()
+        )
+        self.assertFalse(instance.attachments.filter(deleted_at__isnull=True).exists())
+        self.assertTrue(
+            all(
+                attachment.deleted_by == self.user
+                for attachment in instance.attachments.all()
+            )
+        )
 
     def test_decrypted_submission_count_updated(self):
         """Decrypted submission count is updated"""
@@ -1514,3 +1601,105 @@ class PublishXLSFormTestCase(TestBase):
         self.assertEqual(updated_dd.pk, active_xform.pk)
         active_xform.refresh_from_db()
         self.assertEqual(active_xform.title, "Fruits updated")
+
+
+class GetXFormFromSubmissionTestCase(TestBase):
+    """Tests for get_xform_from_submission"""
+
+    def setUp(self):
+        super().setUp()
+        self._publish_transportation_form()
+        self.xml = (
+            f'<?xml version="1.0" ?><{self.xform.id_string} '
+            f'id="{self.xform.id_string}"><formhub><uuid>{self.xform.uuid}'
+            f"</uuid></formhub></{self.xform.id_string}>"
+        )
+
+    def tearDown(self):
+        cache.clear()
+        super().tearDown()
+
+    def test_uuid_lookup_is_cached(self):
+        """The form id resolved from the form uuid is cached"""
+        self.assertEqual(
+            get_xform_from_submission(self.xml, self.user.username), self.xform
+        )
+        self.assertEqual(
+            cache.get(f"{XFORM_SUBMISSION_UUID_CACHE}{self.xform.uuid}"),
+            self.xform.pk,
+        )
+
+        with self.assertNumQueries(1):
+            xform = get_xform_from_submission(self.xml, self.user.username)
+
+        self.assertEqual(xform, self.xform)
+
+    def test_id_string_lookup_is_cached(self):
+        """The form id resolved from username and id_string is cached"""
+        xml = (
+            f'<?xml version="1.0" ?><{self.xform.id_string} '
+            f'id="{self.xform.id_string}"></{self.xform.id_string}>'
+        )
+        self.assertEqual(get_xform_from_submission(xml, "BOB"), self.xform)
+        self.assertEqual(
+            cache.get(get_xform_submission_id_string_key("bob", self.xform.id_string)),
+            self.xform.pk,
+        )
+
+    def test_cache_cleared_on_xform_save(self):
+        """Saving the form clears the cached lookups"""
+        get_xform_from_submission(self.xml, self.user.username)
+        self.xform.save()
+
+        self.assertIsNone(cache.get(f"{XFORM_SUBMISSION_UUID_CACHE}{self.xform.uuid}"))
+
+    def test_deleted_form_not_resolved_from_cache(self):
+        """A cached id for a soft deleted form is not returned"""
+        get_xform_from_submission(self.xml, self.user.username)
+        XForm.objects.filter(pk=self.xform.pk).update(deleted_at=timezone.now())
+
+        with self.assertRaises(Http404):
+            get_xform_from_submission(self.xml, self.user.username)
+
+    def test_submission_permission_cached(self):
+        """The can-submit decision is cached and cleared on permission change"""
+        alice = self._create_user("alice", "alice")
+        request = HttpRequest()
+        request.path = "/submission"
+        request.user = alice
+
+        def cached_decision():
+            return cache.get(get_xform_submission_perm_key(self.xform.pk, alice.pk))
+
+        with self.assertRaises(PermissionDenied):
+            check_submission_permissions(request, self.xform)
+
+        self.assertIs(cached_decision(), False)
+
+        assign_perm("report_xform", alice, self.xform)
+        self.assertIsNone(cached_decision())
+        # refresh the user to clear guardian's per instance permission cache
+        request.user = User.objects.get(pk=alice.pk)
+        check_submission_permissions(request, self.xform)
+        self.assertIs(cached_decision(), True)
+
+        remove_perm("report_xform", alice, self.xform)
+        self.assertIsNone(cached_decision())
+
+    def test_submission_permission_cleared_on_team_removal(self):
+        """A member removed from a team can no longer submit with its perms"""
+        alice = self._create_user("alice", "alice")
+        team = Group.objects.create(name="data collectors")
+        assign_perm("report_xform", team, self.xform)
+        alice.groups.add(team)
+        request = HttpRequest()
+        request.path = "/submission"
+        request.user = User.objects.get(pk=alice.pk)
+
+        check_submission_permissions(request, self.xform)
+
+        alice.groups.remove(team)
+        request.user = User.objects.get(pk=alice.pk)
+
+        with self.assertRaises(PermissionDenied):
+            check_submission_permissions(request, self.xform)
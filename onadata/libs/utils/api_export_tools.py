@@ -90,6 +90,7 @@ EXPORT_EXT = {
     OSM: Export.OSM_EXPORT,
     "gsheets": Export.GOOGLE_SHEETS_EXPORT,
     "geojson": Export.GEOJSON_EXPORT,
+    "parquet": Export.PARQUET_EXPORT,
 }
 
 
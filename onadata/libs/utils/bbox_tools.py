@@ -1,18 +1,175 @@
 # -*- coding: utf-8 -*-
 """
-Geometry bbox helpers for tile-based map views.
+Geometry bbox and vector tile helpers for tile-based map views.
 
-Mirrors the filter shape of the `form_tiles()` PostGIS function so the frontend
-can fit the map to the same dataset Martin serves: non-deleted instances whose
-`xform_id` is in the requested set, optionally filtered by a DataView's query
-JSON (same semantics `form_tiles()` applies server-side).
+Both cover the same dataset: non-deleted instances whose `xform_id` is in the
+requested set, optionally filtered by a DataView's query JSON. The bbox mirrors
+the filter shape of the `form_tiles()` PostGIS function served by Martin while
+`generate_instance_tile` renders Mapbox Vector Tiles natively.
 """
 
 from django.contrib.gis.db.models import Extent
+from django.db import connection
+from django.db.models import Q
+from django.http import HttpResponse
+from django.utils.translation import gettext as _
+
+from rest_framework.exceptions import NotFound
 
 from onadata.apps.logger.models import Instance
+from onadata.libs.permissions import (
+    META_PERMS_SCOPE_ALL,
+    META_PERMS_SCOPE_OWN,
+    get_xform_meta_perms_scope,
+)
+from onadata.libs.utils.cache_tools import (
+    get_tile_cache_key,
+    get_tile_cache_ttl,
+    safe_cache_get,
+    safe_cache_set,
+)
 from onadata.libs.utils.dataview_filters import apply_filters
 
+MVT_CONTENT_TYPE = "application/vnd.mapbox-vector-tile"
+TILE_LAYER_NAME = "submissions"
+MAX_TILE_ZOOM = 22
+
+# Instance geoms are collections of geopoints, extracted as MultiPoints since
+# GeometryCollections can not be encoded in a vector tile.
+TILE_SQL = """
+WITH bounds AS (SELECT ST_TileEnvelope(%s, %s, %s) AS geom),
+mvtgeom AS (
+    SELECT
+        ST_AsMVTGeom(
+            ST_Transform(ST_CollectionExtract(i.geom, 1), 3857), bounds.geom
+        ) AS geom,
+        i.id,
+        i.xform_id
+    FROM logger_instance i, bounds
+    WHERE i.id IN ({instances_sql})
+    AND ST_Intersects(i.geom, ST_Transform(bounds.geom, 4326))
+)
+SELECT ST_AsMVT(mvtgeom.*, %s) FROM mvtgeom
+"""
+
+
+def get_geolocated_instances(xform_ids, dataview=None, own_xform_ids=(), user=None):
+    """Return the non-deleted instances with geoms for the requested forms.
+
+    Only the instances submitted by ``user`` are returned for ``own_xform_ids``.
+    """
+    queryset = Instance.objects.filter(
+        Q(xform_id__in=xform_ids) | Q(xform_id__in=own_xform_ids, user=user),
+        deleted_at__isnull=True,
+        geom__isnull=False,
+    )
+
+    if dataview is not None:
+        queryset = apply_filters(queryset, dataview.query)
+
+    return queryset
+
+
+def get_tile_coordinates(z, x, y):
+    """Return ``z/x/y`` as integers, raises NotFound for a nonexistent tile."""
+    z, x, y = int(z), int(x), int(y)
+
+    if not (0 <= z <= MAX_TILE_ZOOM and 0 <= x < 2**z and 0 <= y < 2**z):
+        raise NotFound(_("Tile not found."))
+
+    return z, x, y
+
+
+def get_tile_response(tile):
+    """Return the vector tile HTTP response, 204 No Content for empty tiles."""
+    if not tile:
+        return HttpResponse(status=204)
+
+    return HttpResponse(tile, content_type=MVT_CONTENT_TYPE)
+
+
+# pylint: disable=too-many-arguments,too-many-positional-arguments
+def generate_instance_tile(
+    xform_ids, z, x, y, dataview=None, own_xform_ids=(), user=None
+):
+    """Return the ``z/x/y`` Mapbox Vector Tile of the requested forms.
+
+    Each geolocated submission is a feature of the ``submissions`` layer with
+    its ``id`` and ``xform_id`` as properties. ``dataview``, when supplied,
+    applies its ``query`` JSON filters. Only the submissions of ``user`` are
+    included for ``own_xform_ids``. Returns empty bytes when no submission
+    falls within the tile.
+    """
+    ids = list(xform_ids)
+    own_ids = list(own_xform_ids)
+    if not ids and not own_ids:
+        return b""
+
+    instances_sql, instances_params = (
+        get_geolocated_instances(ids, dataview, own_ids, user)
+        .values("id")
+        .query.sql_with_params()
+    )
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            TILE_SQL.format(instances_sql=instances_sql),
+            [z, x, y, *instances_params, TILE_LAYER_NAME],
+        )
+        row = cursor.fetchone()
+
+    return bytes(row[0]) if row and row[0] else b""
+
+
+def get_meta_perms_xform_ids(xforms, user):
+    """Split ``xforms`` by the submissions ``user`` may view on them.
+
+    Returns the ids of the forms whose submissions are all visible and the
+    ids of the forms where only the user's own submissions are visible, as
+    the data endpoint does with the xform meta permissions. Anonymous users
+    have no submissions of their own to view.
+    """
+    xform_ids, own_xform_ids = [], []
+    for xform in xforms:
+        scope = get_xform_meta_perms_scope(xform, user)
+        if scope == META_PERMS_SCOPE_ALL:
+            xform_ids.append(xform.pk)
+        elif scope == META_PERMS_SCOPE_OWN and user.is_authenticated:
+            own_xform_ids.append(xform.pk)
+
+    return xform_ids, own_xform_ids
+
+
+# pylint: disable=too-many-arguments,too-many-positional-arguments
+def get_cached_instance_tile(
+    cache_prefix, obj_id, xforms, z, x, y, user, dataview=None
+):
+    """Return the ``z/x/y`` tile of ``obj_id`` from the cache or generate it.
+
+    The tile only includes the submissions of ``xforms`` that ``user`` may
+    view. Tiles are cached per data scope until a submission to any of
+    ``xforms`` is created, edited or deleted, or until ``dataview`` is modified.
+    """
+    ids, own_ids = get_meta_perms_xform_ids(xforms, user)
+    if not ids and not own_ids:
+        return b""
+
+    # users that only view their own submissions get their own tiles
+    scope = f"own-{user.pk}-{sorted(own_ids)}" if own_ids else "all"
+    modified = dataview.date_modified if dataview is not None else None
+    cache_key = get_tile_cache_key(
+        cache_prefix, obj_id, ids + own_ids, z, x, y, modified, scope=scope
+    )
+    tile = safe_cache_get(cache_key)
+
+    if tile is None:
+        tile = generate_instance_tile(
+            ids, z, x, y, dataview=dataview, own_xform_ids=own_ids, user=user
+        )
+        safe_cache_set(cache_key, tile, get_tile_cache_ttl())
+
+    return tile
+
 
 def compute_instance_bbox(xform_ids, dataview=None):
     """Return ``[min_lng, min_lat, max_lng, max_lat]`` for the requested forms.
@@ -30,15 +187,7 @@ def compute_instance_bbox(xform_ids, dataview=None):
     if not ids:
         return None
 
-    queryset = Instance.objects.filter(
-        xform_id__in=ids,
-        deleted_at__isnull=True,
-        geom__isnull=False,
-    )
-
-    if dataview is not None:
-        queryset = apply_filters(queryset, dataview.query)
-
+    queryset = get_geolocated_instances(ids, dataview)
     extent = queryset.aggregate(extent=Extent("geom")).get("extent")
     if not extent:
         return None
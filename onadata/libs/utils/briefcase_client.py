@@ -3,6 +3,11 @@
 import logging
 import mimetypes
 import os
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from io import StringIO
 from xml.parsers.expat import ExpatError
 
@@ -11,17 +16,21 @@ from six.moves.urllib.parse import urljoin
 from django.core.files.base import ContentFile
 from django.core.files.storage import default_storage
 from django.core.files.uploadedfile import InMemoryUploadedFile
-from django.db import transaction
+from django.db import connections, transaction
 
 import requests
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPDigestAuth
+from urllib3.util.retry import Retry
 
 from onadata.apps.logger.xform_instance_parser import clean_and_parse_xml
-from onadata.libs.utils.common_tools import retry
 from onadata.libs.utils.logger_tools import PublishXForm, create_instance, publish_form
 
 NUM_RETRIES = 3
 DEFAULT_REQUEST_TIMEOUT = 45
+DEFAULT_MAX_WORKERS = 8
+# Stores the cursor of the last downloaded chunk of a form's submissions
+RESUMPTION_CURSOR_FILENAME = "resumption_cursor"
 
 
 def django_file(file_obj, field_name, content_type):
@@ -75,11 +84,48 @@ def _get_instances_uuids(xml_doc):
     return uuids
 
 
+def _get_resumption_cursor(xml_doc):
+    cursor_nodes = xml_doc.getElementsByTagName("resumptionCursor")
+
+    if cursor_nodes and cursor_nodes[0].childNodes:
+        return cursor_nodes[0].childNodes[0].nodeValue
+
+    return None
+
+
+def _get_session(max_workers):
+    """Returns a requests session with a connection pool for every worker."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=max_workers,
+        pool_maxsize=max_workers,
+        max_retries=Retry(
+            total=NUM_RETRIES,
+            backoff_factor=1,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["HEAD", "GET"],
+        ),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    return session
+
+
+def _call_in_worker(func, item):
+    try:
+        return func(item)
+    finally:
+        # worker threads open their own database connections
+        connections.close_all()
+
+
 # pylint: disable=too-many-instance-attributes
 class BriefcaseClient:
     """ODK BriefcaseClient class"""
 
-    def __init__(self, url, username, password, user):
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    def __init__(self, url, username, password, user, max_workers=DEFAULT_MAX_WORKERS):
         self.url = url
         self.user = user
         self.auth = HTTPDigestAuth(username, password)
@@ -89,12 +135,51 @@ class BriefcaseClient:
         self.forms_path = os.path.join(self.user.username, "briefcase", "forms")
         self.resumption_cursor = 0
         self.logger = logging.getLogger("console_logger")
+        self.max_workers = max(1, max_workers)
+        self.session = _get_session(self.max_workers)
+        self.stats = Counter()
+        self._stats_lock = threading.Lock()
+        self._started = time.monotonic()
+
+    def _count(self, key, value=1):
+        with self._stats_lock:
+            self.stats[key] += value
+
+    def _map(self, func, items):
+        """Calls ``func`` on every item in the worker pool, returns the results."""
+        items = list(items)
+
+        if self.max_workers == 1 or len(items) < 2:
+            return [func(item) for item in items]
+
+        max_workers = min(self.max_workers, len(items))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(partial(_call_in_worker, func), items))
+
+    def get_summary(self):
+        """
+        Returns the number of forms, submissions, media files and bytes downloaded
+        or uploaded, the failures and the submissions and media files per second.
+        """
+        duration = time.monotonic() - self._started
+        summary = {
+            key: self.stats[key]
+            for key in ["forms", "instances", "media_files", "bytes", "failed"]
+        }
+        summary["duration"] = round(duration, 3)
+        summary["per_second"] = (
+            round((summary["instances"] + summary["media_files"]) / duration, 2)
+            if duration
+            else 0
+        )
+
+        return summary
 
     def download_manifest(self, manifest_url, id_string):
         """Downloads the XForm manifest from an ODK server."""
-        if self._get_response(manifest_url):
-            manifest_res = getattr(self, "_current_response")
+        manifest_res = self._get_response(manifest_url)
 
+        if manifest_res is not None:
             try:
                 manifest_doc = clean_and_parse_xml(manifest_res.content)
             except ExpatError:
@@ -108,16 +193,12 @@ class BriefcaseClient:
     def download_xforms(self, include_instances=False):
         """Downloads the XForm XML form an ODK server."""
         # fetch formList
-        if not self._get_response(self.form_list_url):
-            _current_response = getattr(self, "_current_response")
-            response = (
-                _current_response.content if _current_response else "Unknown Error"
-            )
-            self.logger.error("Failed to download xforms %s.", response)
+        response = self._get_response(self.form_list_url)
+        if response is None:
+            self.logger.error("Failed to download xforms.")
 
             return
 
-        response = getattr(self, "_current_response")
         forms = _get_form_list(response.content)
 
         self.logger.debug("Successfull fetched %s.", self.form_list_url)
@@ -126,16 +207,14 @@ class BriefcaseClient:
             form_path = os.path.join(self.forms_path, id_string, f"{id_string}.xml")
 
             if not default_storage.exists(form_path):
-                if not self._get_response(download_url):
+                form_res = self._get_response(download_url)
+                if form_res is None:
                     self.logger.error("Failed to download xform %s.", download_url)
                     continue
 
-                form_res = getattr(self, "_current_response")
                 content = ContentFile(form_res.content.strip())
                 default_storage.save(form_path, content)
-            else:
-                form_res = default_storage.open(form_path)
-                content = form_res.read()
+                self._count("forms")
 
             self.logger.debug("Fetched %s.", download_url)
 
@@ -146,42 +225,61 @@ class BriefcaseClient:
                 self.download_instances(id_string)
                 self.logger.debug("Done downloading submissions for %s", id_string)
 
-    @retry(NUM_RETRIES)
+        self.logger.info("Briefcase download summary: %s", self.get_summary())
+
     def _get_response(self, url, params=None):
         """
-        Downloads the url and sets self._current_response with the contents.
+        Returns the response of a GET request to the url or None if it failed.
         """
-        setattr(self, "_current_response", None)
-        response = requests.get(
-            url, auth=self.auth, params=params, timeout=DEFAULT_REQUEST_TIMEOUT
-        )
-        success = response.status_code == 200
-        setattr(self, "_current_response", response)
+        try:
+            response = self.session.get(
+                url, auth=self.auth, params=params, timeout=DEFAULT_REQUEST_TIMEOUT
+            )
+        except requests.RequestException as error:
+            self.logger.error("Failed to fetch %s: %s", url, error)
+            self._count("failed")
+            return None
 
-        return success
+        if response.status_code != 200:
+            self.logger.error(
+                "Failed to fetch %s: %s %s", url, response.status_code, response.content
+            )
+            self._count("failed")
+            return None
+
+        self._count("bytes", len(response.content))
+
+        return response
 
-    @retry(NUM_RETRIES)
     def _get_media_response(self, url):
         """
-        Downloads the media file and sets self._current_response with the contents.
+        Returns the response of a media file download or None if it failed.
         """
-        setattr(self, "_current_response", None)
-        head_response = requests.head(
-            url, auth=self.auth, timeout=DEFAULT_REQUEST_TIMEOUT
-        )
+        try:
+            head_response = self.session.head(
+                url, auth=self.auth, timeout=DEFAULT_REQUEST_TIMEOUT
+            )
 
-        # S3 redirects, avoid using formhub digest on S3
-        if head_response.status_code == 302:
-            url = head_response.headers.get("location")
+            # S3 redirects, avoid using formhub digest on S3
+            if head_response.status_code == 302:
+                url = head_response.headers.get("location")
 
-        response = requests.get(url, timeout=DEFAULT_REQUEST_TIMEOUT)
-        success = response.status_code == 200
-        setattr(self, "_current_response", response)
+            response = self.session.get(url, timeout=DEFAULT_REQUEST_TIMEOUT)
+        except requests.RequestException as error:
+            self.logger.error("Failed to fetch %s: %s", url, error)
+            return None
 
-        return success
+        if response.status_code != 200:
+            return None
+
+        self._count("bytes", len(response.content))
+
+        return response
+
+    def _get_media_files(self, xml_doc, media_path):
+        """Returns the (path, download URL) of media files not downloaded yet."""
+        media_files = []
 
-    def download_media_files(self, xml_doc, media_path):
-        """Downloads media files from an ODK server."""
         for media_node in xml_doc.getElementsByTagName("mediaFile"):
             filename_node = media_node.getElementsByTagName("filename")
             url_node = media_node.getElementsByTagName("downloadUrl")
@@ -191,84 +289,144 @@ class BriefcaseClient:
                 if default_storage.exists(path):
                     continue
                 download_url = url_node[0].childNodes[0].nodeValue
-                if self._get_media_response(download_url):
-                    download_res = getattr(self, "_current_response")
-                    media_content = ContentFile(download_res.content)
-                    default_storage.save(path, media_content)
-                    self.logger.debug("Fetched %s.", filename)
-                else:
-                    self.logger.error("Failed to fetch %s.", filename)
+                media_files.append((path, download_url))
 
-    # pylint: disable=too-many-locals
-    def download_instances(self, form_id, cursor=0, num_entries=100):
-        """Download the XML submissions."""
-        self.logger.debug("Starting submissions download for %s", form_id)
-        downloaded = self._get_response(
-            self.submission_list_url,
-            params={"formId": form_id, "numEntries": num_entries, "cursor": cursor},
-        )
-        if not downloaded:
-            self.logger.error(
-                "Fetching %s formId: %s, cursor: %s",
-                self.submission_list_url,
-                form_id,
-                cursor,
-            )
-            return
+        return media_files
+
+    def _download_media_file(self, media_file):
+        path, download_url = media_file
+        filename = os.path.basename(path)
+        download_res = self._get_media_response(download_url)
 
-        response = getattr(self, "_current_response")
-        self.logger.debug(
-            "Fetching %s formId: %s, cursor: %s",
-            self.submission_list_url,
+        if download_res is not None:
+            default_storage.save(path, ContentFile(download_res.content))
+            self._count("media_files")
+            self.logger.debug("Fetched %s.", filename)
+            return True
+
+        self._count("failed")
+        self.logger.error("Failed to fetch %s.", filename)
+        return False
+
+    def download_media_files(self, xml_doc, media_path):
+        """Downloads media files from an ODK server."""
+        self._map(self._download_media_file, self._get_media_files(xml_doc, media_path))
+
+    def _download_instance(self, form_id, uuid):
+        """Downloads a submission's XML and returns the parsed XML."""
+        self.logger.debug("Fetching %s %s submission", uuid, form_id)
+        form_str = (
+            "%(formId)s[@version=null and @uiVersion=null]/"
+            "%(formId)s[@key=%(instanceId)s]" % {"formId": form_id, "instanceId": uuid}
+        )
+        instance_path = os.path.join(
+            self.forms_path,
             form_id,
-            cursor,
+            "instances",
+            uuid.replace(":", ""),
+            "submission.xml",
         )
+        if not default_storage.exists(instance_path):
+            instance_res = self._get_response(
+                self.download_submission_url, params={"formId": form_str}
+            )
+            if instance_res is None:
+                return None
+
+            content = instance_res.content.strip()
+            default_storage.save(instance_path, ContentFile(content))
+            self._count("instances")
+        else:
+            with default_storage.open(instance_path) as instance_file:
+                content = instance_file.read()
+
         try:
-            xml_doc = clean_and_parse_xml(response.content)
+            return clean_and_parse_xml(content)
         except ExpatError:
-            return
+            return None
+
+    def _get_cursor_path(self, form_id):
+        return os.path.join(self.forms_path, form_id, RESUMPTION_CURSOR_FILENAME)
+
+    def _save_cursor(self, form_id, cursor):
+        cursor_path = self._get_cursor_path(form_id)
+
+        if default_storage.exists(cursor_path):
+            default_storage.delete(cursor_path)
+        default_storage.save(cursor_path, ContentFile(str(cursor).encode("utf-8")))
 
-        instances = _get_instances_uuids(xml_doc)
-        path = os.path.join(self.forms_path, form_id, "instances")
+    def _load_cursor(self, form_id):
+        cursor_path = self._get_cursor_path(form_id)
 
-        for uuid in instances:
-            self.logger.debug("Fetching %s %s submission", uuid, form_id)
-            form_str = (
-                "%(formId)s[@version=null and @uiVersion=null]/"
-                "%(formId)s[@key=%(instanceId)s]"
-                % {"formId": form_id, "instanceId": uuid}
+        if not default_storage.exists(cursor_path):
+            return 0
+
+        with default_storage.open(cursor_path) as cursor_file:
+            return cursor_file.read().decode("utf-8").strip() or 0
+
+    def download_instances(self, form_id, cursor=None, num_entries=100):
+        """
+        Download the XML submissions.
+
+        Downloads resume from the cursor of the last downloaded chunk of
+        submissions when ``cursor`` is not set. The cursor is not saved past a
+        chunk with failed submission or media downloads, so they are retried
+        on the next run.
+        """
+        self.logger.debug("Starting submissions download for %s", form_id)
+        if cursor is None:
+            cursor = self._load_cursor(form_id)
+        failed = False
+
+        while True:
+            self.logger.debug(
+                "Fetching %s formId: %s, cursor: %s",
+                self.submission_list_url,
+                form_id,
+                cursor,
             )
-            instance_path = os.path.join(path, uuid.replace(":", ""), "submission.xml")
-            if not default_storage.exists(instance_path):
-                downloaded = self._get_response(
-                    self.download_submission_url, params={"formId": form_str}
-                )
-                if downloaded:
-                    instance_res = getattr(self, "_current_response")
-                    content = instance_res.content.strip()
-                    default_storage.save(instance_path, ContentFile(content))
-                else:
-                    continue
-            else:
-                instance_res = default_storage.open(instance_path)
-                content = instance_res.read()
+            response = self._get_response(
+                self.submission_list_url,
+                params={"formId": form_id, "numEntries": num_entries, "cursor": cursor},
+            )
+            if response is None:
+                return
 
             try:
-                instance_doc = clean_and_parse_xml(content)
+                xml_doc = clean_and_parse_xml(response.content)
             except ExpatError:
-                continue
+                return
 
-            media_path = os.path.join(path, uuid.replace(":", ""))
-            self.download_media_files(instance_doc, media_path)
-            self.logger.debug("Fetched %s %s submission", form_id, uuid)
+            uuids = _get_instances_uuids(xml_doc)
+            instance_docs = self._map(partial(self._download_instance, form_id), uuids)
+            path = os.path.join(self.forms_path, form_id, "instances")
+            media_files = [
+                media_file
+                for uuid, instance_doc in zip(uuids, instance_docs)
+                if instance_doc is not None
+                for media_file in self._get_media_files(
+                    instance_doc, os.path.join(path, uuid.replace(":", ""))
+                )
+            ]
+            media_downloads = self._map(self._download_media_file, media_files)
+            self.logger.debug("Fetched %d %s submissions", len(uuids), form_id)
+
+            if not failed and (None in instance_docs or not all(media_downloads)):
+                failed = True
+                self.logger.error(
+                    "Failed downloads in %s chunk at cursor %s, the cursor is "
+                    "not saved past it",
+                    form_id,
+                    cursor,
+                )
 
-        if xml_doc.getElementsByTagName("resumptionCursor"):
-            rs_node = xml_doc.getElementsByTagName("resumptionCursor")[0]
-            cursor = rs_node.childNodes[0].nodeValue
+            next_cursor = _get_resumption_cursor(xml_doc)
+            if next_cursor is None or next_cursor == str(cursor):
+                break
 
-            if self.resumption_cursor != cursor:
-                self.resumption_cursor = cursor
-                self.download_instances(form_id, cursor)
+            cursor = self.resumption_cursor = next_cursor
+            if not failed:
+                self._save_cursor(form_id, cursor)
 
     @transaction.atomic
     def _upload_xform(self, path, file_name):
@@ -306,40 +464,45 @@ class BriefcaseClient:
 
         create_instance(self.user.username, new_xml_file, attachments)
 
-    def _upload_instances(self, path):
-        instances_count = 0
-        dirs, _not_in_use = default_storage.listdir(path)
+    def _upload_instance_dir(self, instance_dir_path):
+        """Uploads the submission in the directory, returns True if uploaded."""
+        _dirs, files = default_storage.listdir(instance_dir_path)
 
-        for instance_dir in dirs:
-            instance_dir_path = os.path.join(path, instance_dir)
-            _dirs, files = default_storage.listdir(instance_dir_path)
-            xml_file = None
+        if "submission.xml" not in files:
+            return False
 
-            if "submission.xml" in files:
-                file_obj = default_storage.open(
-                    os.path.join(instance_dir_path, "submission.xml")
-                )
-                xml_file = file_obj
+        try:
+            with default_storage.open(
+                os.path.join(instance_dir_path, "submission.xml")
+            ) as xml_file:
+                self._upload_instance(xml_file, instance_dir_path, files)
+        except ExpatError:
+            return False
+        # pylint: disable=broad-except
+        except Exception as error:
+            # keep going despite some errors.
+            logging.exception(
+                (
+                    "Ignoring exception, processing XML submission "
+                    "raised exception: %s"
+                ),
+                str(error),
+            )
+            self._count("failed")
+            return False
 
-            if xml_file:
-                try:
-                    self._upload_instance(xml_file, instance_dir_path, files)
-                except ExpatError:
-                    continue
-                # pylint: disable=broad-except
-                except Exception as error:
-                    # keep going despite some errors.
-                    logging.exception(
-                        (
-                            "Ignoring exception, processing XML submission "
-                            "raised exception: %s"
-                        ),
-                        str(error),
-                    )
-                else:
-                    instances_count += 1
+        self._count("instances")
 
-        return instances_count
+        return True
+
+    def _upload_instances(self, path):
+        dirs, _not_in_use = default_storage.listdir(path)
+        uploaded = self._map(
+            self._upload_instance_dir,
+            [os.path.join(path, instance_dir) for instance_dir in dirs],
+        )
+
+        return sum(uploaded)
 
     def push(self):
         """Publishes XForms and XForm submissions."""
@@ -354,6 +517,7 @@ class BriefcaseClient:
                 if isinstance(published_xform, dict):
                     self.logger.error("Failed to publish %s", form_dir)
                 else:
+                    self._count("forms")
                     self.logger.debug("Successfully published %s", form_dir)
             if "instances" in form_dirs:
                 self.logger.debug("Uploading instances")
@@ -363,3 +527,5 @@ class BriefcaseClient:
                 self.logger.debug(
                     "Published %d instances for %s", submission_count, form_dir
                 )
+
+        self.logger.info("Briefcase upload summary: %s", self.get_summary())
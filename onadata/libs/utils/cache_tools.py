@@ -90,6 +90,75 @@ def get_bbox_cache_ttl():
     return getattr(settings, "BBOX_CACHE_TTL", BBOX_CACHE_TTL_DEFAULT)
 
 
+# Merged dataset descriptors: the child form ids, combined number of submissions
+# and last submission time. Cleared when the child forms, their submissions or
+# the merged dataset's forms change; the TTL is only a safety net for changes
+# to the child forms' organizations.
+MERGED_XFORM_DESCRIPTOR_CACHE = "mxf-descriptor-"
+MERGED_XFORM_DESCRIPTOR_CACHE_TTL_DEFAULT = 60 * 60  # 1 hour converted to seconds
+# Ids of the merged datasets a form is part of, cleared when the forms of a
+# merged dataset change
+XFORM_MERGED_XFORM_IDS_CACHE = "xfm-merged-ids-"
+
+
+def get_merged_xform_descriptor_cache_ttl():
+    """Return the merged dataset descriptor cache TTL."""
+    return getattr(
+        settings,
+        "MERGED_XFORM_DESCRIPTOR_CACHE_TTL",
+        MERGED_XFORM_DESCRIPTOR_CACHE_TTL_DEFAULT,
+    )
+
+
+# Vector tile endpoint caches (forms, dataviews, merged datasets). Tile keys
+# embed the tiles version of every xform they cover which invalidate_bbox_cache
+# bumps on submission create/edit/delete, so stale tiles are never read.
+XFORM_TILE_CACHE = "xfs-tile-"
+DATAVIEW_TILE_CACHE = "dvs-tile-"
+MERGED_XFORM_TILE_CACHE = "mxf-tile-"
+XFORM_TILES_VERSION_CACHE = "xfs-tiles_version-"
+TILE_CACHE_TTL_DEFAULT = 60 * 60  # 1 hour converted to seconds
+
+
+def get_tile_cache_ttl():
+    """Return the tile cache TTL, overridable via the TILE_CACHE_TTL setting."""
+    return getattr(settings, "TILE_CACHE_TTL", TILE_CACHE_TTL_DEFAULT)
+
+
+def get_xform_tiles_version(xform_id):
+    """Return the current vector tiles version of an XForm."""
+    cache_key = f"{XFORM_TILES_VERSION_CACHE}{xform_id}"
+    version = safe_cache_get(cache_key)
+
+    if version is None:
+        version = time.time_ns()
+        safe_cache_set(cache_key, version)
+
+    return version
+
+
+def bump_xform_tiles_version(xform_id):
+    """Invalidate all cached vector tiles covering an XForm."""
+    safe_cache_set(f"{XFORM_TILES_VERSION_CACHE}{xform_id}", time.time_ns())
+
+
+# pylint: disable=too-many-arguments,too-many-positional-arguments
+def get_tile_cache_key(prefix, obj_id, xform_ids, z, x, y, modified=None, scope=None):
+    """Return the cache key of the ``z/x/y`` tile of the object ``obj_id``.
+
+    The key changes whenever any of ``xform_ids`` receives a submission change
+    or when ``modified``, e.g. a dataview's date_modified, changes. ``scope``
+    separates the tiles of users that may only view some of the submissions.
+    """
+    versions = "-".join(
+        f"{xform_id}:{get_xform_tiles_version(xform_id)}"
+        for xform_id in sorted(xform_ids)
+    )
+    version = safe_key(f"{versions}-{modified}-{scope}")
+
+    return f"{prefix}{obj_id}-{version}-{z}-{x}-{y}"
+
+
 # Cache names used in organization profile viewset
 ORG_PROFILE_CACHE = "org-profile-"
 
@@ -99,6 +168,7 @@ LOGIN_ATTEMPTS = "login_attempts-"
 LOCKOUT_CHANGE_PASSWORD_USER = "lockout_change_password_user-"  # noqa
 CHANGE_PASSWORD_ATTEMPTS = "change_password_attempts-"  # noqa
 PASSWORD_RESET_ATTEMPTS = "password_reset_attempts-"  # noqa
+LAST_LOGIN_UPDATE = "last_login_update-"
 
 # Cache names used in XForm Model
 XFORM_SUBMISSION_COUNT_FOR_DAY = "xfm-get_submission_count-"
@@ -106,11 +176,10 @@ XFORM_SUBMISSION_COUNT_FOR_DAY_DATE = "xfm-get_submission_count_date-"
 XFORM_SUBMISSION_STAT = "xfm-get_form_submissions_grouped_by_field-"
 XFORM_CHARTS = "xfm-get_form_charts-"
 XFORM_REGENERATE_INSTANCE_JSON_TASK = "xfm-regenerate_instance_json_task-"
+XFORM_REGENERATE_INSTANCE_JSON_PROGRESS = "xfm-regenerate_instance_json_progress-"
 XFORM_MANIFEST_CACHE = "xfm-manifest-"
 XFORM_LIST_CACHE = "xfm-list-"
 XFROM_LIST_CACHE_TTL = 10 * 60  # 10 minutes converted to seconds
-XFORM_SUBMISSIONS_DELETING = "xfm-submissions-deleting-"
-XFORM_SUBMISSIONS_DELETING_TTL = 60 * 60  # 1 hour converted to seconds
 XFORM_DEC_SUBMISSION_COUNT = "xfm-dec-submission-count-"
 XFORM_DEC_SUBMISSION_COUNT_IDS = "xfm-dec-submission-count-ids"
 XFORM_DEC_SUBMISSION_COUNT_LOCK = f"{XFORM_DEC_SUBMISSION_COUNT_IDS}-lock"
@@ -124,8 +193,172 @@ XFORM_REGENERATE_INSTANCE_JSON_TASK_TTL = 24 * 60 * 60  # 24 hrs converted to se
 XFORM_MANIFEST_CACHE_TTL = 10 * 60  # 10 minutes converted to seconds
 XFORM_MANIFEST_CACHE_LOCK_TTL = 300  # 5 minutes converted to seconds
 
-# Project date modified cache
-PROJECT_DATE_MODIFIED_CACHE = "project_date_modified"
+# Cache names used when resolving the target XForm of an OpenRosa submission.
+# Entries are short lived and busted on XForm saves; the cached form id is
+# re-validated against the lookup on read.
+XFORM_SUBMISSION_UUID_CACHE = "xfm-submission-uuid-"
+XFORM_SUBMISSION_ID_STRING_CACHE = "xfm-submission-id_string-"
+XFORM_SUBMISSION_PERM_CACHE = "xfm-submission-perm-"
+XFORM_SUBMISSION_CACHE_TTL_DEFAULT = 5 * 60  # 5 minutes converted to seconds
+
+# Per XForm object permissions version. Cached per user permission decisions
+# embed the version in their key so a single bump invalidates all of them.
+XFORM_PERMS_VERSION_CACHE = "xfm-perms_version-"
+
+# Per XForm submissions data version, bumped when a submission is created, edited
+# or deleted. ETags of the form's data embed the version instead of hashing rows.
+XFORM_SUBMISSIONS_VERSION_CACHE = "xfm-submissions_version-"
+
+# Per XForm count of the json fields used in data `query` filters. The counts
+# are approximate, they pick the fields worth a per form index. Each field is
+# counted in its own key, the form's key holds the names of the counted fields.
+XFORM_QUERY_FIELDS_CACHE = "xfm-query_fields-"
+XFORM_QUERY_FIELD_COUNT_CACHE = "xfm-query_field_count-"
+XFORM_QUERY_FIELDS_CACHE_TTL = 7 * 24 * 60 * 60  # 7 days converted to seconds
+
+
+def get_xform_submission_cache_ttl():
+    """Return the submission target cache TTL, overridable via settings."""
+    return getattr(
+        settings, "XFORM_SUBMISSION_CACHE_TTL", XFORM_SUBMISSION_CACHE_TTL_DEFAULT
+    )
+
+
+def get_xform_submission_id_string_key(username, id_string):
+    """Return the submission target cache key for a username and id_string."""
+    return (
+        f"{XFORM_SUBMISSION_ID_STRING_CACHE}"
+        f"{safe_key(f'{username.lower()}:{id_string.lower()}')}"
+    )
+
+
+def get_xform_perms_version(xform_id):
+    """Return the current object permissions version of an XForm."""
+    cache_key = f"{XFORM_PERMS_VERSION_CACHE}{xform_id}"
+    version = safe_cache_get(cache_key)
+
+    if version is None:
+        version = time.time_ns()
+        safe_cache_set(cache_key, version)
+
+    return version
+
+
+def bump_xform_perms_version(xform_id):
+    """Invalidate all cached permission decisions for an XForm."""
+    safe_cache_set(f"{XFORM_PERMS_VERSION_CACHE}{xform_id}", time.time_ns())
+
+
+def get_xform_submissions_version(xform_id):
+    """Return the current version of an XForm's submissions data."""
+    cache_key = f"{XFORM_SUBMISSIONS_VERSION_CACHE}{xform_id}"
+    version = safe_cache_get(cache_key)
+
+    if version is None:
+        version = time.time_ns()
+        if not safe_cache_add(cache_key, version, None):
+            version = safe_cache_get(cache_key, version)
+
+    return version
+
+
+def bump_xform_submissions_version(xform_id):
+    """Bump the version of an XForm's submissions data after a change."""
+    cache_key = f"{XFORM_SUBMISSIONS_VERSION_CACHE}{xform_id}"
+
+    # A version lost from the cache restarts from the current time, which is
+    # greater than any version it had.
+    if not safe_cache_add(cache_key, time.time_ns(), None):
+        safe_cache_incr(cache_key)
+
+
+def get_xform_query_field_count_key(xform_id, field):
+    """Return the cache key counting the data queries of a form on ``field``."""
+    return f"{XFORM_QUERY_FIELD_COUNT_CACHE}{xform_id}-{safe_key(field)}"
+
+
+def record_xform_query_fields(xform_id, fields):
+    """Count the json fields a data `query` filter of an XForm used.
+
+    Counts are incremented atomically. The form's field names are only
+    updated, under a lock, the first time a field is counted.
+    """
+    new_fields = []
+    for field in fields:
+        count_key = get_xform_query_field_count_key(xform_id, field)
+        if safe_cache_add(count_key, 1, XFORM_QUERY_FIELDS_CACHE_TTL):
+            new_fields.append(field)
+        else:
+            safe_cache_incr(count_key)
+
+    if not new_fields:
+        return
+
+    try:
+        set_cache_with_lock(
+            f"{XFORM_QUERY_FIELDS_CACHE}{xform_id}",
+            lambda known_fields: sorted({*(known_fields or []), *new_fields}),
+            XFORM_QUERY_FIELDS_CACHE_TTL,
+        )
+    except CacheLockError:
+        # Count the fields again next time so they are added to the names
+        safe_cache_delete_many(
+            [get_xform_query_field_count_key(xform_id, field) for field in new_fields]
+        )
+
+
+def get_xform_query_field_counts(xform_id):
+    """Return the number of data queries of an XForm that used each json field."""
+    fields = safe_cache_get(f"{XFORM_QUERY_FIELDS_CACHE}{xform_id}") or []
+    count_keys = {
+        field: get_xform_query_field_count_key(xform_id, field) for field in fields
+    }
+    counts = safe_cache_get_many(list(count_keys.values()))
+
+    return {
+        field: counts[count_key]
+        for field, count_key in count_keys.items()
+        if count_key in counts
+    }
+
+
+def get_xform_submission_perm_key(xform_id, user_id):
+    """Return the cache key holding a user's can-submit decision for a form."""
+    version = get_xform_perms_version(xform_id)
+
+    return f"{XFORM_SUBMISSION_PERM_CACHE}{xform_id}-{version}-{user_id}"
+
+
+# Cache names used when applying xform meta permissions to data queries.
+# Busted on XForm meta perms MetaData changes and XForm permission version
+# bumps.
+XFORM_META_PERMS_ENABLED_CACHE = "xfm-meta_perms_enabled-"
+XFORM_META_PERMS_SCOPE_CACHE = "xfm-meta_perms_scope-"
+XFORM_META_PERMS_CACHE_TTL_DEFAULT = 5 * 60  # 5 minutes converted to seconds
+
+
+def get_xform_meta_perms_cache_ttl():
+    """Return the meta permissions cache TTL, overridable via settings."""
+    return getattr(
+        settings, "XFORM_META_PERMS_CACHE_TTL", XFORM_META_PERMS_CACHE_TTL_DEFAULT
+    )
+
+
+def get_xform_meta_perms_scope_key(xform_id, user_id):
+    """Return the cache key holding a user's data view scope for a form."""
+    version = get_xform_perms_version(xform_id)
+
+    return f"{XFORM_META_PERMS_SCOPE_CACHE}{xform_id}-{version}-{user_id}"
+
+
+# Project date modified cache. Each project's last modified date has its own key
+# and the modified projects are tracked in sharded id sets until the dates are
+# written to the projects, so submissions do not rewrite a value shared by all
+# the projects.
+PROJECT_DATE_MODIFIED_CACHE = "project_date_modified-"
+PROJECT_DATE_MODIFIED_TRACKED = "project_date_modified_tracked-"
+PROJECT_DATE_MODIFIED_IDS = "project_date_modified_ids-"
+PROJECT_DATE_MODIFIED_SHARDS = 16
 
 
 # Entities
@@ -267,6 +500,29 @@ def safe_cache_get(key, default=None):
     return _safe_cache_operation(lambda: cache.get(key, default), default)
 
 
+def safe_cache_get_many(keys):
+    """
+    Safely get the values of several keys from the cache.
+
+    If the cache is not reachable, the operation silently fails.
+
+    :param keys: The cache keys to get.
+    :return: A dict of the keys found in the cache and their values.
+    """
+    return _safe_cache_operation(lambda: cache.get_many(keys), {})
+
+
+def safe_cache_delete_many(keys):
+    """
+    Safely delete several keys from the cache.
+
+    If the cache is not reachable, the operation silently fails.
+
+    :param keys: The cache keys to delete.
+    """
+    return _safe_cache_operation(lambda: cache.delete_many(keys))
+
+
 def safe_cache_add(key, value, timeout=DEFAULT_TIMEOUT):
     """
     Safely add a value to the cache.
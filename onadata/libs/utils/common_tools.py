@@ -189,6 +189,14 @@ def json_stream(data, json_string):
         yield "]"
 
 
+def ndjson_stream(data, json_string):
+    """
+    Generator function to stream newline delimited JSON data
+    """
+    for item in data:
+        yield json_string(item) + "\n"
+
+
 def retry(tries, delay=3, backoff=2):
     """
     Adapted from code found here:
@@ -138,6 +138,23 @@ def get_column_names_only(columns, data_dictionary, group_delimiter):
     return new_columns
 
 
+def get_column_headers(columns, remove_group_name, data_dictionary, group_delimiter):
+    """Return the header of each of the export ``columns``."""
+    # Check if to truncate the group name prefix
+    if remove_group_name and data_dictionary:
+        headers = get_column_names_only(columns, data_dictionary, group_delimiter)
+    else:
+        headers = columns
+
+    # use a different group delimiter if needed
+    if group_delimiter != DEFAULT_GROUP_DELIMITER:
+        headers = [
+            group_delimiter.join(col.split(DEFAULT_GROUP_DELIMITER)) for col in headers
+        ]
+
+    return headers
+
+
 # pylint: disable=unused-argument,too-many-arguments,too-many-positional-arguments
 def write_to_csv(
     path,
@@ -162,22 +179,10 @@ def write_to_csv(
     with open(path, "wb") as csvfile:
         writer = csv.writer(csvfile, encoding=encoding, lineterminator="\n")
 
-        # Check if to truncate the group name prefix
         if not include_labels_only:
-            if remove_group_name and data_dictionary:
-                new_cols = get_column_names_only(
-                    columns, data_dictionary, group_delimiter
-                )
-            else:
-                new_cols = columns
-
-            # use a different group delimiter if needed
-            if group_delimiter != DEFAULT_GROUP_DELIMITER:
-                new_cols = [
-                    group_delimiter.join(col.split(DEFAULT_GROUP_DELIMITER))
-                    for col in new_cols
-                ]
-
+            new_cols = get_column_headers(
+                columns, remove_group_name, data_dictionary, group_delimiter
+            )
             writer.writerow([sanitize_for_export(c) for c in new_cols])
 
         if include_labels or include_labels_only:
@@ -862,19 +867,24 @@ class CSVDataFrameBuilder(AbstractDataFrameBuilder):
                 flat_dict.update(reindexed)
             yield flat_dict
 
-    def export_to(self, path, cursor, dataview=None):
-        """Export a CSV formated to the given ``path``."""
+    def _get_columns_and_data(self, cursor, dataview=None, column_cursor=None):
+        """Returns the columns, HXL columns and flattened records of the export.
+
+        The repeat columns are collected from ``column_cursor``, a second iterator
+        over the records. A copy of ``cursor`` is used if it is not provided.
+        """
         columns = []
         columns_with_hxl = None
 
         if self.entity_list is None:
-            # creator copy of iterator cursor
-            cursor, ordered_col_cursor = tee(cursor)
+            if column_cursor is None:
+                # creator copy of iterator cursor
+                cursor, column_cursor = tee(cursor)
 
             self._build_ordered_columns(
                 self.data_dictionary.survey, self.ordered_columns
             )
-            self._add_ordered_columns_for_repeat_data(ordered_col_cursor)
+            self._add_ordered_columns_for_repeat_data(column_cursor)
             self._add_ordered_columns_for_select_multiples()
             self._add_ordered_columns_for_gps_fields()
             # Unpack xform columns and data
@@ -925,6 +935,14 @@ class CSVDataFrameBuilder(AbstractDataFrameBuilder):
             # Unpack xform columns and data
             data = self._format_for_dataframe(cursor)
 
+        return columns, columns_with_hxl, data
+
+    def export_to(self, path, cursor, dataview=None):
+        """Export a CSV formated to the given ``path``."""
+        columns, columns_with_hxl, data = self._get_columns_and_data(
+            cursor, dataview=dataview
+        )
+
         write_to_csv(
             path,
             data,
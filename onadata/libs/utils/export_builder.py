@@ -1155,18 +1155,12 @@ class ExportBuilder:
         work_book.save(filename=path)
 
     # pylint: disable=too-many-locals,unused-argument
-    def to_flat_csv_export(
-        self, path, data, username, id_string, filter_query, **kwargs
+    def _get_data_frame_builder(
+        self, builder_class, username, id_string, filter_query, **kwargs
     ):
-        """
-        Generates a flattened CSV file for submitted data.
-        """
-        # pylint: disable=import-outside-toplevel
-        from onadata.libs.utils.csv_builder import CSVDataFrameBuilder
-
+        """Returns a ``builder_class`` data frame builder for the export."""
         start = kwargs.get("start")
         end = kwargs.get("end")
-        dataview = kwargs.get("dataview")
         xform = kwargs.get("xform")
         options = kwargs.get("options", {})
         total_records = kwargs.get("total_records")
@@ -1177,7 +1171,7 @@ class ExportBuilder:
         language = options.get("language") or self.language
         entity_list = kwargs.get("entity_list")
 
-        csv_builder = CSVDataFrameBuilder(
+        return builder_class(
             username,
             id_string,
             filter_query,
@@ -1203,7 +1197,43 @@ class ExportBuilder:
             entity_list=entity_list,
         )
 
-        csv_builder.export_to(path, data, dataview=dataview)
+    def to_flat_csv_export(
+        self, path, data, username, id_string, filter_query, **kwargs
+    ):
+        """
+        Generates a flattened CSV file for submitted data.
+        """
+        # pylint: disable=import-outside-toplevel
+        from onadata.libs.utils.csv_builder import CSVDataFrameBuilder
+
+        csv_builder = self._get_data_frame_builder(
+            CSVDataFrameBuilder, username, id_string, filter_query, **kwargs
+        )
+
+        csv_builder.export_to(path, data, dataview=kwargs.get("dataview"))
+
+    def to_parquet_export(
+        self, path, data, username, id_string, filter_query, **kwargs
+    ):
+        """
+        Generates a Parquet file with the columns of the flattened CSV export.
+
+        ``column_data`` is an optional second iterator over the submitted data
+        the repeat columns are collected from.
+        """
+        # pylint: disable=import-outside-toplevel
+        from onadata.libs.utils.parquet_builder import ParquetDataFrameBuilder
+
+        parquet_builder = self._get_data_frame_builder(
+            ParquetDataFrameBuilder, username, id_string, filter_query, **kwargs
+        )
+
+        parquet_builder.export_to(
+            path,
+            data,
+            dataview=kwargs.get("dataview"),
+            column_cursor=kwargs.get("column_data"),
+        )
 
     def get_default_language(self, languages):
         """Return the default languange of the XForm."""
@@ -47,6 +47,7 @@ from onadata.apps.logger.models import (
     XForm,
 )
 from onadata.apps.logger.models.data_view import DataView
+from onadata.apps.logger.models.merged_xform import get_merged_xform_ids
 from onadata.apps.main.models.meta_data import MetaData
 from onadata.apps.viewer.models.export import (
     Export,
@@ -74,6 +75,7 @@ from onadata.libs.utils.common_tools import (
 from onadata.libs.utils.export_builder import ExportBuilder
 from onadata.libs.utils.model_tools import get_columns_with_hxl, queryset_iterator
 from onadata.libs.utils.osm import get_combined_osm
+from onadata.libs.utils.parquet_builder import DEFAULT_ROW_GROUP_SIZE
 from onadata.libs.utils.viewer_tools import create_attachments_zipfile, image_urls
 
 DEFAULT_GROUP_DELIMITER = "/"
@@ -190,6 +192,7 @@ def generate_export(export_type, xform, export_id=None, options=None):  # noqa C
         Export.CSV_ZIP_EXPORT: "to_zipped_csv",
         Export.SAV_ZIP_EXPORT: "to_zipped_sav",
         Export.GOOGLE_SHEETS_EXPORT: "to_google_sheets",
+        Export.PARQUET_EXPORT: "to_parquet_export",
     }
 
     if xform is None:
@@ -200,6 +203,7 @@ def generate_export(export_type, xform, export_id=None, options=None):  # noqa C
         )
 
     dataview = None
+    column_data = None
     if options.get("dataview_pk"):
         dataview = DataView.objects.get(pk=options.get("dataview_pk"))
         records = dataview.query_data(
@@ -216,14 +220,37 @@ def generate_export(export_type, xform, export_id=None, options=None):  # noqa C
             0
         ].get("count")
     else:
+        # Parquet exports read the submissions in row groups from a server-side
+        # cursor
+        chunk_size = None
+        if export_type == Export.PARQUET_EXPORT:
+            chunk_size = getattr(
+                settings, "PARQUET_ROW_GROUP_SIZE", DEFAULT_ROW_GROUP_SIZE
+            )
+
         records = query_data(
             xform,
             query=filter_query,
             start=start,
             end=end,
             sort=sort,
+            chunk_size=chunk_size,
         )
 
+        if chunk_size:
+            # Collect the repeat columns from a second read of the submissions
+            # rather than holding the records in memory
+            column_data = iter(())
+            if xform.get_survey_elements_of_type("repeat"):
+                column_data = query_data(
+                    xform,
+                    query=filter_query,
+                    start=start,
+                    end=end,
+                    sort=sort,
+                    chunk_size=chunk_size,
+                )
+
         if filter_query:
             total_records = query_count(
                 xform,
@@ -304,6 +331,7 @@ def generate_export(export_type, xform, export_id=None, options=None):  # noqa C
             options=options,
             columns_with_hxl=columns_with_hxl,
             total_records=total_records,
+            column_data=column_data,
         )
     except NoRecordsFoundError:
         pass
@@ -537,11 +565,7 @@ def generate_attachments_zip_export(
         )
         if xform.is_merged_dataset:
             attachment_qs = attachment_qs.filter(
-                instance__xform_id__in=list(
-                    xform.mergedxform.xforms.filter(
-                        deleted_at__isnull=True
-                    ).values_list("id", flat=True)
-                )
+                instance__xform_id__in=get_merged_xform_ids(xform)
             ).filter(instance_id__in=[i_id["_id"] for i_id in instance_ids])
         else:
             attachment_qs = attachment_qs.filter(instance__xform_id=xform.pk).filter(
@@ -742,15 +766,7 @@ def kml_export_data(id_string, user, xform=None):
 
     data_kwargs = {"geom__isnull": False}
     if xform.is_merged_dataset:
-        data_kwargs.update(
-            {
-                "xform_id__in": list(
-                    xform.mergedxform.xforms.filter(
-                        deleted_at__isnull=True
-                    ).values_list("id", flat=True)
-                )
-            }
-        )
+        data_kwargs.update({"xform_id__in": get_merged_xform_ids(xform)})
     else:
         data_kwargs.update({"xform_id": xform.pk})
     instances = Instance.objects.filter(**data_kwargs).order_by("id")
@@ -794,11 +810,7 @@ def get_osm_data_kwargs(xform):
     kwargs = {"instance__deleted_at__isnull": True}
 
     if xform.is_merged_dataset:
-        kwargs["instance__xform_id__in"] = list(
-            xform.mergedxform.xforms.filter(deleted_at__isnull=True).values_list(
-                "id", flat=True
-            )
-        )
+        kwargs["instance__xform_id__in"] = get_merged_xform_ids(xform)
     else:
         kwargs["instance__xform_id"] = xform.pk
 
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+Concurrent, partition aware index builds.
+
+Postgres cannot CREATE INDEX CONCURRENTLY on a partitioned table. When a table
+is partitioned, the index is built concurrently on each partition and attached
+to an index created ON ONLY the parent.
+"""
+
+import hashlib
+
+
+def short_hash(value):
+    """Returns a short hash of ``value`` for use in index names."""
+    return hashlib.md5(value.encode("utf-8")).hexdigest()[:8]  # nosec
+
+
+def get_relkind(cursor, relation):
+    """Returns the pg_class relkind of ``relation``, None if it does not exist."""
+    cursor.execute(
+        """
+        SELECT c.relkind
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = 'public' AND c.relname = %s
+        """,
+        [relation],
+    )
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def _drop_invalid_index(cursor, index_name):
+    """Drop an index left invalid by an interrupted concurrent build."""
+    cursor.execute(
+        """
+        SELECT c.relkind, i.indisvalid
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        JOIN pg_index i ON i.indexrelid = c.oid
+        WHERE n.nspname = 'public' AND c.relname = %s
+        """,
+        [index_name],
+    )
+    row = cursor.fetchone()
+
+    # A partitioned index is invalid until every partition index is attached,
+    # which is the state a resumed run continues from.
+    if row and row[0] == "i" and not row[1]:
+        cursor.execute(f'DROP INDEX CONCURRENTLY "{index_name}"')
+
+
+def _child_partitions(cursor, table):
+    cursor.execute(
+        """
+        SELECT c.relname
+        FROM pg_inherits h
+        JOIN pg_class c ON c.oid = h.inhrelid
+        WHERE h.inhparent = %s::regclass
+        ORDER BY c.relname
+        """,
+        [table],
+    )
+    return [row[0] for row in cursor.fetchall()]
+
+
+def _is_attached(cursor, parent_index, child_index):
+    cursor.execute(
+        """
+        SELECT 1 FROM pg_inherits
+        WHERE inhrelid = %s::regclass AND inhparent = %s::regclass
+        """,
+        [child_index, parent_index],
+    )
+    return cursor.fetchone() is not None
+
+
+def ensure_index(cursor, table, index_name, definition):
+    """Creates the ``definition`` index on ``table`` without blocking writes.
+
+    The build resumes where an interrupted run stopped. Partition indexes are
+    named after the parent index and a hash of the partition name.
+    """
+    _drop_invalid_index(cursor, index_name)
+
+    if get_relkind(cursor, table) == "p":
+        cursor.execute(
+            f'CREATE INDEX IF NOT EXISTS "{index_name}" ON ONLY "{table}" {definition}'
+        )
+        for child in _child_partitions(cursor, table):
+            child_index = f"{index_name[:50]}_{short_hash(child)}"
+            ensure_index(cursor, child, child_index, definition)
+            if not _is_attached(cursor, index_name, child_index):
+                cursor.execute(
+                    f'ALTER INDEX "{index_name}" ATTACH PARTITION "{child_index}"'
+                )
+    else:
+        cursor.execute(
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{index_name}" '
+            f'ON "{table}" {definition}'
+        )
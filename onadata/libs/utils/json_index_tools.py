@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+Managed indexes on the submissions json, used by the `query` data filters.
+
+- A ``jsonb_path_ops`` GIN index serves the json containment (``@>``)
+  predicates built by ``get_where_clause`` for equality filters.
+- An optional ``pg_trgm`` GIN index on the json text serves the free text
+  ``json::text ~* %s`` search.
+- Per form partial expression indexes serve a form's frequently filtered
+  fields.
+
+Indexes are built concurrently and partition aware, see ``ensure_index``.
+"""
+
+from django.db import connection
+
+from onadata.libs.utils.index_tools import ensure_index, get_relkind, short_hash
+
+INSTANCE_TABLE = "logger_instance"
+JSON_INDEX_PREFIX = "logger_inst_json_"
+JSON_PATH_INDEX = f"{JSON_INDEX_PREFIX}path_idx"
+JSON_TRGM_INDEX = f"{JSON_INDEX_PREFIX}trgm_idx"
+
+
+def get_field_index_name(xform_id, field):
+    """Returns the name of a form's expression index on a json field."""
+    return f"{JSON_INDEX_PREFIX}{xform_id}_{short_hash(field)}_idx"
+
+
+def _quote_literal(value):
+    return "'" + value.replace("'", "''") + "'"
+
+
+def create_json_path_index():
+    """Creates the GIN index serving json containment filters."""
+    with connection.cursor() as cursor:
+        ensure_index(
+            cursor, INSTANCE_TABLE, JSON_PATH_INDEX, "USING gin (json jsonb_path_ops)"
+        )
+
+    return JSON_PATH_INDEX
+
+
+def create_json_trigram_index():
+    """Creates the pg_trgm GIN index serving the free text search."""
+    with connection.cursor() as cursor:
+        cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        ensure_index(
+            cursor,
+            INSTANCE_TABLE,
+            JSON_TRGM_INDEX,
+            "USING gin ((json::text) gin_trgm_ops)",
+        )
+
+    return JSON_TRGM_INDEX
+
+
+def create_json_field_index(xform_id, field):
+    """Creates a form's partial expression index on a json field.
+
+    The index serves ``json->>'field' = %s`` filters on the form's submissions.
+    """
+    index_name = get_field_index_name(xform_id, field)
+    with connection.cursor() as cursor:
+        ensure_index(
+            cursor,
+            INSTANCE_TABLE,
+            index_name,
+            f"((json->>{_quote_literal(field)})) "
+            f"WHERE xform_id = {int(xform_id)} AND deleted_at IS NULL",
+        )
+
+    return index_name
+
+
+def drop_json_index(index_name):
+    """Drops a managed json index."""
+    if not index_name.startswith(JSON_INDEX_PREFIX):
+        raise ValueError(f"{index_name} is not a managed json index")
+
+    with connection.cursor() as cursor:
+        if get_relkind(cursor, INSTANCE_TABLE) == "p":
+            # Partitioned indexes cannot be dropped concurrently
+            cursor.execute(f'DROP INDEX IF EXISTS "{index_name}"')
+        else:
+            cursor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{index_name}"')
+
+
+def get_json_indexes():
+    """Returns the name, definition and size of the managed json indexes."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT indexname, indexdef,
+                pg_size_pretty(pg_relation_size(quote_ident(indexname)::regclass))
+            FROM pg_indexes
+            WHERE schemaname = 'public' AND tablename = %s AND indexname LIKE %s
+            ORDER BY indexname
+            """,
+            [INSTANCE_TABLE, f"{JSON_INDEX_PREFIX}%"],
+        )
+        return cursor.fetchall()
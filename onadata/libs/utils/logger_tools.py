@@ -29,15 +29,17 @@ from django.core.exceptions import (
     ValidationError,
 )
 from django.core.files.storage import storages
-from django.db import DataError, IntegrityError, transaction
+from django.db import DataError, IntegrityError, connection, transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
 from django.http import (
+    Http404,
     HttpResponse,
     HttpResponseNotFound,
     HttpResponseRedirect,
     StreamingHttpResponse,
     UnreadablePostError,
 )
-from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from django.utils.encoding import DjangoUnicodeDecodeError
 from django.utils.translation import gettext as _
@@ -53,13 +55,21 @@ from pyxform.validators.odk_validate import ODKValidateError
 from pyxform.xform2json import create_survey_element_from_xml
 from rest_framework.response import Response
 
-from onadata.apps.logger.models import Attachment, Instance, XForm, XFormVersion
+from onadata.apps.logger.models import (
+    Attachment,
+    Instance,
+    SubmissionDeletion,
+    XForm,
+    XFormVersion,
+)
 from onadata.apps.logger.models.instance import (
     FormInactiveError,
     FormIsMergedDatasetError,
     InstanceHistory,
+    clear_xform_submission_cache,
     get_id_string_from_xml_str,
 )
+from onadata.apps.logger.models.merged_xform import clear_merged_xform_cache
 from onadata.apps.logger.models.xform import DuplicateUUIDError, XLSFormError
 from onadata.apps.logger.xform_instance_parser import (
     AttachmentNameError,
@@ -87,8 +97,21 @@ from onadata.apps.viewer.models.data_dictionary import DataDictionary
 from onadata.apps.viewer.models.parsed_instance import ParsedInstance
 from onadata.apps.viewer.signals import process_submission
 from onadata.libs.utils.analytics import TrackObjectEvent
-from onadata.libs.utils.cache_tools import XFORM_SUBMISSIONS_DELETING, safe_cache_delete
+from onadata.libs.utils.cache_tools import (
+    XFORM_SUBMISSION_COUNT_FOR_DAY,
+    XFORM_SUBMISSION_UUID_CACHE,
+    bump_xform_submissions_version,
+    get_xform_submission_cache_ttl,
+    get_xform_submission_id_string_key,
+    get_xform_submission_perm_key,
+    safe_cache_decr,
+    safe_cache_delete,
+    safe_cache_get,
+    safe_cache_set,
+)
 from onadata.libs.utils.common_tags import (
+    DATE_MODIFIED,
+    DELETEDAT,
     INSTANCE_EDIT_CONFLICT_LAST_WINS,
     INSTANCE_EDIT_CONFLICT_REJECT,
     METADATA_FIELDS,
@@ -318,8 +341,12 @@ def get_xform_from_submission(xml, username, uuid=None, request=None):
 
     if uuid:
         # try find the form by its uuid which is the ideal condition
-        if XForm.objects.filter(uuid=uuid, deleted_at__isnull=True).count() > 0:
-            xform = XForm.objects.get(uuid=uuid, deleted_at__isnull=True)
+        xform = _get_cached_submission_xform(
+            f"{XFORM_SUBMISSION_UUID_CACHE}{uuid}",
+            uuid=uuid,
+            deleted_at__isnull=True,
+        )
+        if xform is not None:
             # If request is present, verify that the request user
             # has the correct permissions
             if request:
@@ -339,8 +366,8 @@ def get_xform_from_submission(xml, username, uuid=None, request=None):
 
     id_string = get_id_string_from_xml_str(xml)
     try:
-        return get_object_or_404(
-            XForm,
+        xform = _get_cached_submission_xform(
+            get_xform_submission_id_string_key(username or "", id_string or ""),
             id_string__iexact=id_string,
             user__username__iexact=username,
             deleted_at__isnull=True,
@@ -348,6 +375,39 @@ def get_xform_from_submission(xml, username, uuid=None, request=None):
     except MultipleObjectsReturned as e:
         raise NonUniqueFormIdError() from e
 
+    if xform is None:
+        raise Http404("No XForm matches the given query.")
+
+    return xform
+
+
+def _get_cached_submission_xform(cache_key, **lookup):
+    """Returns the XForm matching ``lookup`` or None.
+
+    The matched XForm's id is cached under ``cache_key`` so that repeat
+    submissions to the same form resolve with a single primary key query.
+    The cached id is always re-checked against ``lookup`` so a stale entry
+    can never resolve to a different or deleted form.
+    """
+    queryset = XForm.objects.select_related("user__profile")
+    xform_id = safe_cache_get(cache_key)
+
+    if xform_id is not None:
+        xform = queryset.filter(pk=xform_id, **lookup).first()
+        if xform is not None:
+            return xform
+
+        safe_cache_delete(cache_key)
+
+    try:
+        xform = queryset.get(**lookup)
+    except XForm.DoesNotExist:
+        return None
+
+    safe_cache_set(cache_key, xform.pk, get_xform_submission_cache_ttl())
+
+    return xform
+
 
 def _has_edit_xform_permission(xform, user):
     if isinstance(xform, XForm) and isinstance(user, User):
@@ -398,7 +458,7 @@ def check_submission_permissions(request, xform):
     if (
         requires_authentication
         and xform.user != request.user
-        and not request.user.has_perm("report_xform", xform)
+        and not _can_submit_to_xform(request.user, xform)
     ):
         raise PermissionDenied(
             _(
@@ -413,6 +473,25 @@ def check_submission_permissions(request, xform):
         )
 
 
+def _can_submit_to_xform(user, xform):
+    """Returns True if ``user`` has the report_xform permission on ``xform``.
+
+    The decision is cached per (user, form) and cleared whenever the form's
+    object permissions or the members of a team with permissions on it change.
+    """
+    if not user.is_authenticated:
+        return user.has_perm("report_xform", xform)
+
+    cache_key = get_xform_submission_perm_key(xform.pk, user.pk)
+    can_submit = safe_cache_get(cache_key)
+
+    if can_submit is None:
+        can_submit = user.has_perm("report_xform", xform)
+        safe_cache_set(cache_key, can_submit, get_xform_submission_cache_ttl())
+
+    return can_submit
+
+
 def is_valid_encrypted_submission(xform_is_encrypted: bool, xml: bytes) -> bool:
     """
     Check that the submission is encrypted or unencrypted depending on the
@@ -1376,6 +1455,101 @@ class PublishXForm:  # pylint: disable=too-few-public-methods
         return publish_xml_form(self.xml_file, self.user, self.project)
 
 
+SOFT_DELETE_INSTANCES_SQL = """
+UPDATE logger_instance
+SET deleted_at = %(deleted_at)s,
+    date_modified = %(deleted_at)s,
+    deleted_by_id = %(deleted_by_id)s,
+    json = logger_instance.json || jsonb_build_object(
+        %(deleted_at_key)s::text, %(deleted_at_iso)s::text,
+        %(date_modified_key)s::text, %(deleted_at_iso)s::text
+    )
+WHERE xform_id = %(xform_id)s AND id = ANY(%(instance_ids)s) AND deleted_at IS NULL
+RETURNING id, date_created
+"""
+SOFT_DELETE_ATTACHMENTS_SQL = """
+UPDATE logger_attachment
+SET deleted_at = %(deleted_at)s, deleted_by_id = %(deleted_by_id)s
+WHERE instance_id = ANY(%(instance_ids)s) AND deleted_at IS NULL
+"""
+
+
+def _iter_instance_id_chunks(xform, instance_ids=None, chunk_size=1000):
+    """Yield ``instance_ids``, or the ids of the form's submissions, in chunks."""
+    if instance_ids:
+        for start in range(0, len(instance_ids), chunk_size):
+            yield instance_ids[start : start + chunk_size]
+        return
+
+    last_id = 0
+    while True:
+        chunk = list(
+            xform.instances.filter(deleted_at__isnull=True, pk__gt=last_id)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:chunk_size]
+        )
+        if not chunk:
+            return
+
+        yield chunk
+        last_id = chunk[-1]
+
+
+def _soft_delete_xform_submissions(xform, deleted_by, instance_ids=None):
+    """Soft delete submissions with set based updates, without Instance signals.
+
+    Each chunk of submissions and their attachments is updated in a transaction.
+    The form is then recounted and the profile counter adjusted once for all the
+    chunks.
+    """
+    chunk_size = getattr(settings, "SUBMISSION_DELETE_CHUNK_SIZE", 1000)
+    deleted_at = timezone.now()
+    params = {
+        "deleted_at": deleted_at,
+        "deleted_by_id": deleted_by.pk,
+        "xform_id": xform.pk,
+        "deleted_at_iso": deleted_at.isoformat(),
+        "deleted_at_key": DELETEDAT,
+        "date_modified_key": DATE_MODIFIED,
+    }
+    today = timezone.localdate()
+    num_deleted = num_deleted_today = 0
+
+    for chunk in _iter_instance_id_chunks(xform, instance_ids, chunk_size):
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(SOFT_DELETE_INSTANCES_SQL, {**params, "instance_ids": chunk})
+            rows = cursor.fetchall()
+            if rows:
+                cursor.execute(
+                    SOFT_DELETE_ATTACHMENTS_SQL,
+                    {**params, "instance_ids": [row[0] for row in rows]},
+                )
+            if instance_ids:
+                SubmissionDeletion.unmark(xform, chunk)
+
+        num_deleted += len(rows)
+        num_deleted_today += sum(
+            1 for _pk, created in rows if timezone.localdate(created) == today
+        )
+
+    if not num_deleted:
+        return
+
+    # Recount instead of subtracting, the counters may have pending deltas
+    xform.submission_count(force_update=True)
+    xform.update_num_of_decrypted_submissions()
+    User.profile.get_queryset().filter(user_id=xform.user_id).update(
+        num_of_submissions=Greatest(F("num_of_submissions") - num_deleted, 0)
+    )
+
+    count_key = f"{XFORM_SUBMISSION_COUNT_FOR_DAY}{xform.pk}"
+    count_for_today = safe_cache_get(count_key)
+    if count_for_today and num_deleted_today:
+        safe_cache_decr(count_key, min(count_for_today, num_deleted_today))
+    clear_xform_submission_cache(xform)
+    clear_merged_xform_cache(xform.pk)
+
+
 def delete_xform_submissions(
     xform: XForm,
     deleted_by: User,
@@ -1395,30 +1569,40 @@ def delete_xform_submissions(
     ):
         raise PermissionDenied("Hard delete is not enabled")
 
-    instance_qs = xform.instances.filter(deleted_at__isnull=True)
-
-    if instance_ids:
-        instance_qs = instance_qs.filter(id__in=instance_ids)
+    instance_ids = sorted({int(pk) for pk in instance_ids}) if instance_ids else None
 
-    if soft_delete:
-        now = timezone.now()
-        instance_qs.update(deleted_at=now, date_modified=now, deleted_by=deleted_by)
-    else:
-        # Hard delete
-        instance_qs.delete()
-
-    if instance_ids is None:
-        # Every submission has been deleted
-        xform.num_of_submissions = 0
-        xform.save(update_fields=["num_of_submissions"])
-    # Force update of submission counts since Queryset.update() does not trigger signals
-    xform.submission_count(force_update=True)
-    xform.update_num_of_decrypted_submissions()
+    try:
+        if soft_delete:
+            _soft_delete_xform_submissions(xform, deleted_by, instance_ids)
+        else:
+            # Hard delete
+            instance_qs = xform.instances.filter(deleted_at__isnull=True)
+
+            if instance_ids:
+                instance_qs = instance_qs.filter(id__in=instance_ids)
+
+            instance_qs.delete()
+
+            if instance_ids is None:
+                # Every submission has been deleted
+                xform.num_of_submissions = 0
+                xform.save(update_fields=["num_of_submissions"])
+            # Force update of submission counts since Queryset.update() does not
+            # trigger signals
+            xform.submission_count(force_update=True)
+            xform.update_num_of_decrypted_submissions()
+    finally:
+        # Remove the markers left by a failed deletion too, the submissions
+        # that were not deleted are listed again.
+        if instance_ids is None:
+            SubmissionDeletion.unmark(xform)
+        else:
+            for chunk in _iter_instance_id_chunks(xform, instance_ids):
+                SubmissionDeletion.unmark(xform, chunk)
 
     xform.project.date_modified = timezone.now()
     xform.project.save(update_fields=["date_modified"])
 
-    safe_cache_delete(f"{XFORM_SUBMISSIONS_DELETING}{xform.pk}")
     send_message(
         instance_id=instance_ids or [],
         target_id=xform.id,
@@ -1426,3 +1610,47 @@ def delete_xform_submissions(
         user=deleted_by,
         message_verb=SUBMISSION_DELETED,
     )
+
+
+# Related rows read by Instance.get_full_dict
+INSTANCE_JSON_PREFETCH = (
+    "attachments",
+    "tags",
+    "notes__created_by",
+    "osm_data",
+    "reviews__note",
+)
+
+
+def regenerate_instances_json(xform, start_id, end_id, chunk_size=None):
+    """Regenerate the json of the form's submissions with ids in [start_id, end_id].
+
+    Submissions are read in chunks with their related rows prefetched and each
+    chunk is written with a single bulk update, without Instance signals.
+    Yields the last id and the number of submissions of each chunk written.
+    """
+    chunk_size = chunk_size or getattr(settings, "INSTANCE_JSON_CHUNK_SIZE", 500)
+    queryset = (
+        xform.instances.filter(deleted_at__isnull=True, pk__lte=end_id)
+        .select_related("user", "last_edited_by")
+        .prefetch_related(*INSTANCE_JSON_PREFETCH)
+        .order_by("pk")
+    )
+    last_id = start_id - 1
+
+    while True:
+        instances = list(queryset.filter(pk__gt=last_id)[:chunk_size])
+        if not instances:
+            return
+
+        for instance in instances:
+            instance.xform = xform
+            instance.json = instance.get_full_dict()
+
+        # bulk_update does not call Instance.save which would update
+        # date_modified and fire the post save side effects
+        Instance.objects.bulk_update(instances, ["json"])
+        bump_xform_submissions_version(xform.pk)
+        last_id = instances[-1].pk
+
+        yield last_id, len(instances)
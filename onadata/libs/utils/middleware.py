@@ -4,6 +4,7 @@ Custom middleware classes.
 """
 
 import logging
+import time
 import traceback
 from sys import stdout
 
@@ -104,19 +105,32 @@ class LocaleMiddlewareWithTweaks(LocaleMiddleware):
 class SqlLogging:  # pylint: disable=too-few-public-methods
     """
     SQL logging middleware.
+
+    Prints the queries run by a request to a terminal, with DEBUG on or off.
     """
 
     def __init__(self, get_response):
         self.get_response = get_response
 
     def __call__(self, request):
-        response = self.get_response(request)
+        if not stdout.isatty():
+            return self.get_response(request)
+
+        queries = []
+
+        def log_query(execute, sql, params, many, context):
+            start = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                queries.append((time.perf_counter() - start, sql))
+
+        with connection.execute_wrapper(log_query):
+            response = self.get_response(request)
 
-        if stdout.isatty():
-            for query in connection.queries:
-                time = query["time"]
-                sql = " ".join(query["sql"].split())
-                print(f"\033[1;31m[{time}]\033[0m \033[1m{sql}\033[0m")
+        for duration, sql in queries:
+            sql = " ".join(sql.split())
+            print(f"\033[1;31m[{duration:.3f}]\033[0m \033[1m{sql}\033[0m")
 
         return response
 
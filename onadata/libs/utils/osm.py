@@ -9,17 +9,35 @@ import logging
 
 from django.contrib.gis.geos import GeometryCollection, LineString, Point, Polygon
 from django.contrib.gis.geos.error import GEOSException
-from django.db import IntegrityError, models, transaction
+from django.db import models, transaction
+from django.utils.timezone import now
 
 from defusedxml.lxml import _etree, fromstring, tostring
 from six import iteritems
 
 from onadata.apps.logger.models.attachment import Attachment
-from onadata.apps.logger.models.instance import Instance
-from onadata.apps.logger.models.osmdata import OsmData
+from onadata.apps.logger.models.instance import (
+    Instance,
+    bump_submissions_version,
+    update_project_date_modified,
+)
+from onadata.apps.logger.models.osmdata import OsmData, OsmTagKey
 from onadata.apps.restservice.signals import trigger_webhook
 from onadata.celeryapp import app
+from onadata.libs.utils.common_tags import DATE_MODIFIED
 from onadata.libs.utils.common_tools import get_abbreviated_xpath
+from onadata.libs.utils.model_tools import update_fields_directly
+
+# Fields updated when a submission's OSM field data is saved again
+OSM_DATA_UPDATE_FIELDS = [
+    "xml",
+    "osm_id",
+    "osm_type",
+    "tags",
+    "geom",
+    "filename",
+    "date_modified",
+]
 
 
 def _get_xml_obj(xml):
@@ -37,14 +55,25 @@ def _get_xml_obj(xml):
     return None
 
 
-def _get_node(ref, root):
-    point = None
-    nodes = root.xpath(f'//node[@id="{ref}"]')
-    if nodes:
-        node = nodes[0]
-        point = Point(float(node.get("lon")), float(node.get("lat")))
+def _get_osm_root(osm_xml):
+    """Returns the parsed OSM XML, parsing ``osm_xml`` only if it is a string."""
+    # pylint: disable=c-extension-no-member,protected-access
+    if isinstance(osm_xml, _etree._Element):
+        return osm_xml
+
+    return _get_xml_obj(osm_xml)
 
-    return point
+
+def _get_nodes_index(root):
+    """Returns a dict of the OSM nodes' points keyed by node id."""
+    nodes = {}
+    for node in root.iter("node"):
+        if node.get("id") not in nodes:
+            nodes[node.get("id")] = Point(
+                float(node.get("lon")), float(node.get("lat"))
+            )
+
+    return nodes
 
 
 def get_combined_osm(osm_list):
@@ -79,13 +108,14 @@ def parse_osm_ways(osm_xml, include_osm_id=False):
     """Converts an OSM XMl to a list of GEOSGeometry objects"""
     items = []
 
-    root = _get_xml_obj(osm_xml)
+    root = _get_osm_root(osm_xml)
+    nodes = None
 
     for way in root.findall("way"):
         geom = None
-        points = []
-        for node in way.findall("nd"):
-            points.append(_get_node(node.get("ref"), root))
+        if nodes is None:
+            nodes = _get_nodes_index(root)
+        points = [nodes.get(node.get("ref")) for node in way.findall("nd")]
         try:
             geom = Polygon(points)
         except GEOSException:
@@ -103,7 +133,7 @@ def parse_osm_nodes(osm_xml, include_osm_id=False):
     """Converts an OSM XMl to a list of GEOSGeometry objects"""
     items = []
 
-    root = _get_xml_obj(osm_xml)
+    root = _get_osm_root(osm_xml)
 
     for node in root.findall("node"):
         point = Point(float(node.get("lon")), float(node.get("lat")))
@@ -131,11 +161,15 @@ def parse_osm(osm_xml, include_osm_id=False):
     """
     Parses OSM XML and return a list of ways or nodes.
     """
-    ways = parse_osm_ways(osm_xml, include_osm_id)
+    root = _get_osm_root(osm_xml)
+    if root is None:
+        return []
+
+    ways = parse_osm_ways(root, include_osm_id)
     if ways:
         return ways
 
-    nodes = parse_osm_nodes(osm_xml, include_osm_id)
+    nodes = parse_osm_nodes(root, include_osm_id)
 
     return nodes
 
@@ -148,6 +182,52 @@ def save_osm_data_async(instance_id):
     save_osm_data(instance_id)
 
 
+def _get_osm_field(osm_filenames, attachment):
+    """Returns the OSM field name and filename an attachment was submitted for."""
+    for field_name, filename in osm_filenames.items():
+        if attachment.filename.startswith(filename.replace(".osm", "")):
+            return field_name, filename
+
+    return None, None
+
+
+def _read_osm_attachment(attachment):
+    try:
+        osm_xml = attachment.media_file.read()
+    except IOError as io_error:
+        logging.exception("IOError saving osm data: %s", str(io_error))
+        return None
+
+    return osm_xml.decode("utf-8") if isinstance(osm_xml, bytes) else osm_xml
+
+
+def _update_instance_osm_json(instance, osm_data_list, previous_keys):
+    """
+    Updates the OSM tags in the submission's JSON without saving the submission.
+    """
+    osm_json = {}
+    for osm_data in osm_data_list:
+        osm_json.update(osm_data.get_tags_with_prefix())
+
+    with transaction.atomic():
+        json = (
+            Instance.objects.select_for_update()
+            .values_list("json", flat=True)
+            .get(pk=instance.pk)
+        )
+        for key in previous_keys - set(osm_json):
+            json.pop(key, None)
+        json.update(osm_json)
+        instance.date_modified = now()
+        json[DATE_MODIFIED] = instance.date_modified.isoformat()
+        instance.json = json
+        update_fields_directly(
+            instance, json=json, date_modified=instance.date_modified
+        )
+        # the direct update skips the post save submissions version bump
+        bump_submissions_version(instance.xform_id)
+
+
 def save_osm_data(instance_id):
     """
     Includes the OSM data in the specified submission json data.
@@ -165,58 +245,55 @@ def save_osm_data(instance_id):
         osm_filenames = {
             field: instance.json[field] for field in fields if field in instance.json
         }
+        # A submission has a single OsmData per OSM field, the first way or
+        # node of the field's latest attachment.
+        osm_data_by_field = {}
 
         for osm in osm_attachments:
-            try:
-                osm_xml = osm.media_file.read()
-                if isinstance(osm_xml, bytes):
-                    osm_xml = osm_xml.decode("utf-8")
-            except IOError as io_error:
-                logging.exception("IOError saving osm data: %s", str(io_error))
+            field_name, filename = _get_osm_field(osm_filenames, osm)
+            if field_name is None:
+                continue
+            osm_xml = _read_osm_attachment(osm)
+            if osm_xml is None:
                 continue
-            else:
-                filename = None
-                field_name = None
-                for key, value in osm_filenames.items():
-                    if osm.filename.startswith(value.replace(".osm", "")):
-                        filename = value
-                        field_name = key
-                        break
-
-                if field_name is None:
-                    continue
-                filename = osm.filename if filename is None else filename
-                osm_list = parse_osm(osm_xml, include_osm_id=True)
-                for osmd in osm_list:
-                    try:
-                        with transaction.atomic():
-                            osm_data = OsmData(
-                                instance=instance,
-                                xml=osm_xml,
-                                osm_id=osmd["osm_id"],
-                                osm_type=osmd["osm_type"],
-                                tags=osmd["tags"],
-                                geom=GeometryCollection(osmd["geom"]),
-                                filename=filename,
-                                field_name=field_name,
-                            )
-                            osm_data.save()
-                    except IntegrityError:
-                        with transaction.atomic():
-                            osm_data = (
-                                OsmData.objects.exclude(xml=osm_xml)
-                                .filter(instance=instance, field_name=field_name)
-                                .first()
-                            )
-                            if osm_data:
-                                osm_data.xml = osm_xml
-                                osm_data.osm_id = osmd["osm_id"]
-                                osm_data.osm_type = osmd["osm_type"]
-                                osm_data.tags = osmd["tags"]
-                                osm_data.geom = GeometryCollection(osmd["geom"])
-                                osm_data.filename = filename
-                                osm_data.save()
-        instance.save()
+            osm_list = parse_osm(osm_xml, include_osm_id=True)
+            if not osm_list:
+                continue
+            osmd = osm_list[0]
+            osm_data = OsmData(
+                instance=instance,
+                xml=osm_xml,
+                osm_id=osmd["osm_id"],
+                osm_type=osmd["osm_type"],
+                tags=osmd["tags"],
+                geom=GeometryCollection(osmd["geom"]),
+                filename=filename,
+                field_name=field_name,
+            )
+            # bulk_create() does not call OsmData.save()
+            # pylint: disable=protected-access
+            osm_data._set_centroid_in_tags()
+            osm_data_by_field[field_name] = osm_data
+
+        if not osm_data_by_field:
+            return
+
+        previous_keys = {
+            key
+            for osm_data in OsmData.objects.filter(
+                instance=instance, field_name__in=osm_data_by_field
+            )
+            for key in osm_data.get_tags_with_prefix()
+        }
+        saved_osm_data = OsmData.objects.bulk_create(
+            osm_data_by_field.values(),
+            update_conflicts=True,
+            unique_fields=["instance", "field_name"],
+            update_fields=OSM_DATA_UPDATE_FIELDS,
+        )
+        OsmTagKey.add_tag_keys(instance.xform_id, saved_osm_data)
+        _update_instance_osm_json(instance, saved_osm_data, previous_keys)
+        update_project_date_modified(instance)
         trigger_webhook.send(sender=instance.__class__, instance=instance)
 
 
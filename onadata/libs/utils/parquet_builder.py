@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""
+Parquet export utility functions.
+
+Records are flattened into the same columns as the CSV export and written to
+the Parquet file one row group at a time, so only a row group is held in memory.
+"""
+
+import json
+
+from django.conf import settings
+from django.utils.translation import gettext as _
+
+try:
+    import pyarrow
+    from pyarrow import parquet
+except ImportError:
+    pyarrow = parquet = None
+
+from onadata.libs.utils.common_tags import ID
+from onadata.libs.utils.common_tools import get_abbreviated_xpath, track_task_progress
+from onadata.libs.utils.csv_builder import (
+    DEFAULT_GROUP_DELIMITER,
+    AbstractDataFrameBuilder,
+    CSVDataFrameBuilder,
+    get_column_headers,
+)
+
+# Number of rows written to the file at a time
+DEFAULT_ROW_GROUP_SIZE = 10000
+
+
+def _to_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_str(value):
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+
+    return str(value)
+
+
+def get_column_types(columns, data_dictionary=None):
+    """Return the Parquet type and value converter of each of the ``columns``.
+
+    Integer and decimal questions are stored as numbers, values that are not
+    numbers are stored as nulls. Other columns are stored as strings.
+    """
+    numeric_types = {
+        "integer": (pyarrow.int64(), _to_int),
+        "decimal": (pyarrow.float64(), _to_float),
+    }
+    types = {ID: numeric_types["integer"]}
+
+    if data_dictionary is not None:
+        for element_type, column_type in numeric_types.items():
+            for element in data_dictionary.get_survey_elements_of_type(element_type):
+                types[get_abbreviated_xpath(element.get_xpath())] = column_type
+
+    return [types.get(column, (pyarrow.string(), _to_str)) for column in columns]
+
+
+# pylint: disable=too-many-arguments,too-many-positional-arguments
+def write_to_parquet(
+    path,
+    rows,
+    columns,
+    remove_group_name=False,
+    data_dictionary=None,
+    group_delimiter=DEFAULT_GROUP_DELIMITER,
+    total_records=None,
+    row_group_size=None,
+):
+    """Writes ``rows`` to a file in Parquet format, a row group at a time."""
+    if pyarrow is None:
+        raise ImportError(_("pyarrow is required for Parquet exports."))
+
+    row_group_size = row_group_size or getattr(
+        settings, "PARQUET_ROW_GROUP_SIZE", DEFAULT_ROW_GROUP_SIZE
+    )
+    headers = get_column_headers(
+        columns, remove_group_name, data_dictionary, group_delimiter
+    )
+    column_types = get_column_types(columns, data_dictionary)
+    schema = pyarrow.schema(
+        [
+            (header, column_type)
+            for header, (column_type, _convert) in zip(headers, column_types)
+        ]
+    )
+
+    def get_row_group(batch):
+        arrays = []
+        for col, (column_type, convert) in zip(columns, column_types):
+            values = [row.get(col) for row in batch]
+            arrays.append(
+                pyarrow.array(
+                    [None if value is None else convert(value) for value in values],
+                    type=column_type,
+                )
+            )
+
+        return pyarrow.Table.from_arrays(arrays, schema=schema)
+
+    with parquet.ParquetWriter(path, schema) as writer:
+        batch = []
+        for i, row in enumerate(rows, start=1):
+            for col in AbstractDataFrameBuilder.IGNORED_COLUMNS:
+                row.pop(col, None)
+            batch.append(row)
+            if len(batch) == row_group_size:
+                writer.write_table(get_row_group(batch))
+                batch = []
+            track_task_progress(i, total_records)
+
+        if batch:
+            writer.write_table(get_row_group(batch))
+
+
+class ParquetDataFrameBuilder(CSVDataFrameBuilder):
+    """
+    Builds a Parquet export with the columns of the flat CSV export.
+    """
+
+    # pylint: disable=arguments-differ
+    def export_to(self, path, cursor, dataview=None, column_cursor=None):
+        """Export the records to a Parquet file at the given ``path``.
+
+        ``column_cursor`` is a second iterator over the records, the repeat
+        columns are collected from it so that ``cursor`` is not held in memory.
+        """
+        columns, _columns_with_hxl, data = self._get_columns_and_data(
+            cursor, dataview=dataview, column_cursor=column_cursor
+        )
+
+        write_to_parquet(
+            path,
+            data,
+            columns,
+            remove_group_name=self.remove_group_name,
+            data_dictionary=self.data_dictionary,
+            group_delimiter=self.group_delimiter,
+            total_records=self.total_records,
+        )
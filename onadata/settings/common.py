@@ -326,7 +326,7 @@ REST_FRAMEWORK = {
         "onadata.libs.authentication.EnketoTokenAuthentication",
         "oauth2_provider.contrib.rest_framework.OAuth2Authentication",
         "rest_framework.authentication.SessionAuthentication",
-        "rest_framework.authentication.TokenAuthentication",
+        "onadata.libs.authentication.LastLoginTokenAuthentication",
     ),
     "DEFAULT_RENDERER_CLASSES": (
         "rest_framework.renderers.JSONRenderer",
@@ -495,11 +495,12 @@ LOGGING = {
         #     'level': 'DEBUG',
         #     'propagate': True
         # },
-        # 'sql_totals_logger': {
-        #     'handlers': ['sql_totals_handler'],
-        #     'level': 'DEBUG',
-        #     'propagate': True
-        # }
+        # Sampled per request SQL timing, see SQL_TIMING_SAMPLE_RATE
+        "sql_totals_logger": {
+            "handlers": ["console"],
+            "level": "INFO",
+            "propagate": False,
+        },
     },
 }
 
@@ -507,6 +508,12 @@ LOGGING = {
 PROFILE_API_ACTION_FUNCTION = False
 PROFILE_LOG_BASE = "/tmp/"
 
+# Fraction of requests whose SQL query count, time and slowest query are
+# recorded by SqlTimingMiddleware. SQL_TIMING_SINK is the dotted path of a
+# callable receiving each record, the records are logged by default.
+SQL_TIMING_SAMPLE_RATE = 0.1
+SQL_TIMING_SINK = None
+
 
 def configure_logging(logger, **kwargs):
     """
@@ -702,6 +709,8 @@ SECRET_KEY = "mlfs33^s1l4xf6a36$0#j%dd*sisfoi&)&4s-v=91#^l01v)*j"  # noqa
 # Time in minutes to lock out user from account
 LOCKOUT_TIME = 30 * 60
 MAX_LOGIN_ATTEMPTS = 10
+# Minimum number of seconds between last_login writes for API authentication
+LAST_LOGIN_MIN_INTERVAL_SECONDS = 5 * 60
 MAX_PASSWORD_RESET_ATTEMPTS = 3
 PASSWORD_RESET_ATTEMPT_WINDOW = 15 * 60
 SUPPORT_EMAIL = "support@example.com"
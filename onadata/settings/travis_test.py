@@ -69,5 +69,8 @@ MIDDLEWARE = (
 
 VERIFIED_KEY_TEXT = "ALREADY_ACTIVATED"
 
+# Do not time a random sample of the test requests
+SQL_TIMING_SAMPLE_RATE = 0
+
 ODK_TOKEN_FERNET_KEY = "ROsB4T8s1rCJskAdgpTQEKfH2x2K_EX_YBi3UFyoYng="
 OPENID_CONNECT_PROVIDERS = {}